@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Benchmark: query autocomplete over the normalizer vocabulary and a query log.
+
+Builds the prefix index from the normalizer's canonical names plus a
+synthetic query log, then reports the build time, the completion latency per
+prefix length (first call, which may rank and cache a wide range, and warm
+calls), and the cost of counting one more query incrementally.
+
+Usage:
+    python benchmarks/bench_autocomplete.py --queries 100000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmarks.bench_query_normalizer import make_query_log
+from src.query_normalizer.autocomplete import Autocomplete, fold_query
+from src.query_normalizer.real_normalizer import RealQueryNormalizer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark query autocomplete.")
+    parser.add_argument('--queries', type=int, default=100000, help="Queries in the log")
+    parser.add_argument('--k', type=int, default=5, help="Completions per lookup")
+    args = parser.parse_args()
+
+    queries = make_query_log(args.queries)
+    start = time.perf_counter()
+    index = Autocomplete.from_normalizer(RealQueryNormalizer(), queries)
+    build = time.perf_counter() - start
+    print(f"built {len(index)} completions from {len(queries)} queries in {build:.2f} s")
+
+    rng = random.Random(3)
+    sample = [fold_query(query) for query in rng.sample(queries, 1000)]
+    print(f"{'prefix len':>10}  {'first':>10}  {'warm':>10}")
+    for length in (1, 2, 3, 4, 6, 10):
+        prefixes = [query[:length] for query in sample]
+        fresh = Autocomplete.from_normalizer(RealQueryNormalizer(), queries)
+        start = time.perf_counter()
+        for prefix in prefixes:
+            fresh.complete(prefix, args.k)
+        first = (time.perf_counter() - start) / len(prefixes)
+        start = time.perf_counter()
+        for prefix in prefixes:
+            fresh.complete(prefix, args.k)
+        warm = (time.perf_counter() - start) / len(prefixes)
+        print(f"{length:>10}  {first * 1e6:7.1f} us  {warm * 1e6:7.1f} us")
+
+    for prefix in ("i", "ip", "iph", "s", "m", "n"):
+        index.complete(prefix, args.k)
+    extra = make_query_log(10000, seed=99)
+    start = time.perf_counter()
+    for query in extra:
+        index.add(query)
+    update = (time.perf_counter() - start) / len(extra)
+    print(f"incremental add: {update * 1e6:.1f} us per query")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark: batch mode against a loop over Orchestrator.run.
+
+Builds a JSONL-style stream of (query, country) requests from a synthetic
+query log and runs it twice:
+
+- a plain loop calling `Orchestrator.run` on one orchestrator
+- `BatchRunner` (the engine of `main.py batch`) with shared work
+
+and reports the wall time and the work computed versus asked for per shared
+stage. Memory is then traced with small memo/cache/LRU limits at two input
+sizes: once the limits are reached the peak stays flat, since nothing is
+kept per request.
+
+Usage:
+    python benchmarks/bench_batch.py --requests 2000 --workers 4
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(ROOT)
+
+from benchmarks.bench_query_normalizer import make_query_log
+from src.config.loader import load_config
+from src.orchestrator.batch import BatchRunner, read_requests
+from src.orchestrator.interface import Orchestrator
+
+COUNTRIES = ["US", "UK", "IN", "DE"]
+
+
+def request_lines(count, seed=7, chunk=1000):
+    """JSONL request lines, generated lazily (a chunk of the query log at a time)."""
+    for start in range(0, count, chunk):
+        queries = make_query_log(min(chunk, count - start), seed=seed + start)
+        for index, query in enumerate(queries, start):
+            yield json.dumps({"query": query, "country": COUNTRIES[index % len(COUNTRIES)]})
+
+
+def run_loop(config, count):
+    orchestrator = Orchestrator(config)
+    for number, request in read_requests(request_lines(count)):
+        try:
+            orchestrator.run(request)
+        except Exception:
+            pass  # as batch mode, which reports it and moves on
+
+
+def run_batch(config, count, workers, **limits):
+    runner = BatchRunner(config, workers=workers, **limits) if limits else BatchRunner.from_config(config, workers=workers)
+    for _ in runner.run(read_requests(request_lines(count))):
+        pass
+    return runner
+
+
+def peak_memory(function, *args, **kwargs):
+    """Peak traced allocation of a call, in MB."""
+    tracemalloc.start()
+    try:
+        function(*args, **kwargs)
+        return tracemalloc.get_traced_memory()[1] / 1e6
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batch mode.")
+    parser.add_argument('--requests', type=int, default=2000, help="Requests in the batch")
+    parser.add_argument('--workers', type=int, default=4, help="Batch workers")
+    args = parser.parse_args()
+
+    # Mock HTML paths in the config are relative to the repository root
+    os.chdir(ROOT)
+    config = load_config(os.path.join('config', 'phase1_config.yaml'))
+    # Line-buffered, as in `main.py batch`: block buffering from several threads queues the progress lines
+    with open(os.devnull, 'w', buffering=1) as quiet, contextlib.redirect_stdout(quiet):
+        start = time.perf_counter()
+        run_loop(config, args.requests)
+        loop = time.perf_counter() - start
+        start = time.perf_counter()
+        runner = run_batch(config, args.requests, args.workers)
+        batch = time.perf_counter() - start
+        # Small limits, so that both sizes reach them (the normalizers' LRUs are bounded too)
+        limits = {'shared_entries': 128, 'result_cache_entries': 64}
+        modules = config['modules']
+        small_config = dict(config, modules=dict(modules, query_normalizer=dict(modules['query_normalizer'], cache_size=64)))
+        small = peak_memory(run_batch, small_config, args.requests // 4, args.workers, **limits)
+        large = peak_memory(run_batch, small_config, args.requests, args.workers, **limits)
+
+    print(f"{args.requests} requests")
+    print(f"  Orchestrator.run loop        {loop:7.2f} s  ({args.requests / loop:6.0f} req/s)")
+    print(f"  batch, {args.workers} workers            {batch:7.2f} s  ({args.requests / batch:6.0f} req/s)")
+    print(f"{'stage':<14} {'calls':>8} {'computed':>9} {'shared':>8}")
+    for stage, counts in runner.stats()['shared'].items():
+        print(f"{stage:<14} {counts['calls']:>8} {counts['computed']:>9} {counts['shared']:>8}")
+    print(f"peak traced memory (small limits): {small:.1f} MB at {args.requests // 4} requests, "
+          f"{large:.1f} MB at {args.requests}")
+
+
+if __name__ == "__main__":
+    main()
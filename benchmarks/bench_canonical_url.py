@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark: URL canonicalization and fetch deduplication.
+
+Gives every mock search result `--variants` extra copies under equivalent
+URLs (tracking parameters, www/mobile hosts, trailing slashes, fragments),
+as different search paths return them, and runs each query in every country
+twice on one orchestrator, with `--fetch-ms` simulated latency per fetch:
+
+- without canonicalization (every variant fetched; the product-data cache
+  keyed by the URL as given)
+- with canonicalization (variants collapsed before Step 4; the product-data
+  cache keyed by the canonical URL)
+
+Also reports the cost of canonicalizing one URL, cold and memoized.
+
+Usage:
+    python benchmarks/bench_canonical_url.py --variants 3 --fetch-ms 10
+"""
+import argparse
+import contextlib
+import copy
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(ROOT)
+
+from benchmarks.bench_batch import COUNTRIES
+from benchmarks.bench_compare import QUERIES
+from benchmarks.bench_run_many import SlowScraper
+from src.config.loader import load_config
+from src.orchestrator.interface import Orchestrator
+from src.scraper.canonical_url import UrlCanonicalizer
+
+VARIANTS = [
+    lambda url: url + "?utm_source=newsletter&utm_medium=email",
+    lambda url: url.replace("https://", "https://www.", 1) + "/",
+    lambda url: url.replace("https://", "https://m.", 1) + "?ref=search#reviews",
+    lambda url: url + "?gclid=Cj0KCQ&utm_campaign=sale",
+]
+
+
+def with_variants(config, variants):
+    """Config whose mock search results repeat every page under `variants` other URLs."""
+    config = copy.deepcopy(config)
+    for site_results in config['modules']['search_agent']['mock_results'].values():
+        groups = site_results.values() if isinstance(site_results, dict) else [site_results]
+        for group in groups:
+            group[:] = [dict(result, url=make(result['url'])) for result in group
+                        for make in [lambda url: url] + VARIANTS[:variants]]
+    return config
+
+
+class CountingSlowScraper(SlowScraper):
+    """SlowScraper that counts fetches."""
+
+    def __init__(self, scraper, delay):
+        super().__init__(scraper, delay)
+        self.fetches = 0
+
+    def fetch_html(self, url_entry):
+        self.fetches += 1
+        return super().fetch_html(url_entry)
+
+
+def run_twice(config, delay, canonical):
+    """Run every query in every country twice; (seconds, fetches)."""
+    orchestrator = Orchestrator(config)
+    scraper = orchestrator.scraper = CountingSlowScraper(orchestrator.scraper, delay)
+    if not canonical:
+        orchestrator._collapse_urls = lambda search_results: search_results
+        orchestrator.cache_manager.canonicalize_url = None
+    start = time.perf_counter()
+    for _ in range(2):
+        for query in QUERIES:
+            for country in COUNTRIES:
+                try:
+                    orchestrator.run({"query": query, "country": country})
+                except Exception:
+                    pass  # broken mock pages fail their request, as in `main.py`
+                orchestrator.cache_manager.invalidate_query_cache(query, country)
+    return time.perf_counter() - start, scraper.fetches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark URL canonicalization.")
+    parser.add_argument('--variants', type=int, default=3, choices=range(len(VARIANTS) + 1),
+                        help="Extra URLs per page")
+    parser.add_argument('--fetch-ms', type=float, default=10.0, help="Simulated latency per page fetch")
+    parser.add_argument('--urls', type=int, default=100000, help="URLs for the canonicalization timing")
+    args = parser.parse_args()
+
+    # Mock HTML paths in the config are relative to the repository root
+    os.chdir(ROOT)
+    config = with_variants(load_config(os.path.join('config', 'phase1_config.yaml')), args.variants)
+    delay = args.fetch_ms / 1000
+    with open(os.devnull, 'w', buffering=1) as quiet, contextlib.redirect_stdout(quiet):
+        plain = run_twice(config, delay, canonical=False)
+        canonical = run_twice(config, delay, canonical=True)
+
+    print(f"{len(QUERIES)} queries x {len(COUNTRIES)} countries, twice; "
+          f"{args.variants} extra URLs per page, {args.fetch_ms:g} ms per fetch")
+    print(f"  URLs as given       {plain[0]:6.2f} s  {plain[1]:5} fetches")
+    print(f"  canonical URLs      {canonical[0]:6.2f} s  {canonical[1]:5} fetches  ({plain[0] / canonical[0]:.1f}x)")
+
+    urls = [f"https://www.amazon.com/item-{index}/dp/B0{index:08d}/ref=sr_1_{index % 9}?tag=aff-20&qid={index}"
+            for index in range(args.urls)]
+    canonicalizer = UrlCanonicalizer(cache_size=args.urls)
+    start = time.perf_counter()
+    for url in urls:
+        canonicalizer.canonicalize(url)
+    cold = time.perf_counter() - start
+    start = time.perf_counter()
+    for url in urls:
+        canonicalizer.canonicalize(url)
+    warm = time.perf_counter() - start
+    print(f"canonicalize(): {cold / args.urls * 1e6:.1f} us per URL cold, {warm / args.urls * 1e6:.2f} us memoized")
+
+
+if __name__ == "__main__":
+    main()
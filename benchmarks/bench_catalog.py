@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Benchmark: incremental matching against the persistent canonical catalog.
+
+Fills a catalog with a growing history of listings and times how long one
+run of new listings (a mix of previously seen names, renamed variants and
+brand-new products) takes to match at each catalog size. The per-run cost
+should stay roughly flat as the history grows.
+
+Usage:
+    python benchmarks/bench_catalog.py --history 10000 100000 --run 1000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmarks.bench_near_duplicate import make_listings
+from src.deduplicator.catalog import CanonicalCatalog
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark incremental canonical catalog matching.")
+    parser.add_argument('--history', type=int, nargs='+', default=[10000, 100000],
+                        help="Catalog history sizes (listings) to benchmark")
+    parser.add_argument('--run', type=int, default=1000, help="New listings per run")
+    args = parser.parse_args()
+
+    print(f"{'history':>10}  {'fill':>10}  {'run':>6}  {'assign':>10}  {'matched':>8}  {'new':>6}")
+    for history in args.history:
+        # Product bases shared between history and the run, so most run
+        # listings are variants of something already in the catalog
+        listings, _ = make_listings(history + args.run, seed=5)
+        past, current = listings[:history], listings[history:]
+
+        with tempfile.TemporaryDirectory() as directory:
+            catalog = CanonicalCatalog(os.path.join(directory, 'catalog.sqlite'))
+
+            start = time.perf_counter()
+            for offset in range(0, len(past), 10000):
+                catalog.assign(past[offset:offset + 10000])
+            fill = time.perf_counter() - start
+
+            start = time.perf_counter()
+            catalog.assign(current)
+            assign = time.perf_counter() - start
+
+            run = catalog.stats()['last_run']
+            catalog.close()
+
+        print(f"{history:>10}  {fill:8.2f} s  {args.run:>6}  {assign * 1000:7.1f} ms  "
+              f"{run['matched']:>8}  {run['new_products']:>6}")
+
+
+if __name__ == "__main__":
+    main()
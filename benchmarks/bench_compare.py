@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Orchestrator.compare against one Orchestrator.run per country.
+
+Compares a few queries across four countries both ways on fresh
+orchestrators. Mock page fetches are local file reads, so `--fetch-ms` adds
+a simulated network latency to each fetch: run() fetches the countries'
+pages one after another, compare() fetches all of them together, so its
+time follows the slowest country rather than the sum.
+
+Usage:
+    python benchmarks/bench_compare.py --fetch-ms 50
+"""
+import argparse
+import contextlib
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(ROOT)
+
+from benchmarks.bench_batch import COUNTRIES
+from benchmarks.bench_run_many import make_orchestrator
+from src.config.loader import load_config
+
+QUERIES = ["iPhone 16 Pro, 128GB", "Samsung Galaxy S24", "MacBook Air M3"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Orchestrator.compare.")
+    parser.add_argument('--fetch-ms', type=float, default=50.0, help="Simulated latency per page fetch")
+    parser.add_argument('--concurrency', type=int, default=8, help="Fetches in flight for compare")
+    args = parser.parse_args()
+
+    # Mock HTML paths in the config are relative to the repository root
+    os.chdir(ROOT)
+    config = load_config(os.path.join('config', 'phase1_config.yaml'))
+    delay = args.fetch_ms / 1000
+
+    print(f"{len(COUNTRIES)} countries, {args.fetch_ms:g} ms per fetch")
+    print(f"{'query':<22} {'run() per country':>18} {'compare()':>10}")
+    for query in QUERIES:
+        with open(os.devnull, 'w', buffering=1) as quiet, contextlib.redirect_stdout(quiet):
+            orchestrator = make_orchestrator(config, delay)
+            start = time.perf_counter()
+            for country in COUNTRIES:
+                try:
+                    orchestrator.run({"query": query, "country": country})
+                except Exception:
+                    pass  # as compare, which reports the country and moves on
+            sequential = time.perf_counter() - start
+
+            orchestrator = make_orchestrator(config, delay)
+            start = time.perf_counter()
+            orchestrator.compare(query, COUNTRIES, max_concurrency=args.concurrency)
+            compared = time.perf_counter() - start
+        print(f"{query:<22} {sequential:16.2f} s {compared:8.2f} s  ({sequential / compared:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
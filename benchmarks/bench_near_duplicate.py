@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark: MinHash/LSH near-duplicate clustering at crawl scale.
+
+Generates listings where each base product appears under several noisy
+name variants (case, punctuation, word order) and reports clustering time
+and how many variant groups were recovered.
+
+Usage:
+    python benchmarks/bench_near_duplicate.py --sizes 10000 100000 1000000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.deduplicator.near_duplicate import NearDuplicateEngine
+from src.models.product_batch import ProductBatch
+
+
+BRANDS = ['Apple', 'Samsung', 'Google', 'Sony', 'Dell', 'Lenovo', 'HP', 'Asus']
+COLORS = ['Black', 'Silver', 'Blue', 'Natural Titanium', 'White']
+STORAGE = ['64GB', '128GB', '256GB', '512GB', '1TB']
+
+
+def variant(rng, tokens):
+    """Render one noisy listing title for a base product."""
+    style = rng.randrange(4)
+    if style == 0:
+        return " ".join(tokens)
+    if style == 1:
+        return ", ".join(tokens).lower()
+    if style == 2:
+        return " ".join(tokens[:-1]) + " - " + tokens[-1]
+    return " ".join(tokens[1:] + tokens[:1]).upper()
+
+
+def make_listings(count, variants_per_product=5, seed=11):
+    """Build listings plus the base product index of each one."""
+    rng = random.Random(seed)
+    base_count = max(1, count // variants_per_product)
+    bases = [
+        [BRANDS[i % len(BRANDS)], f"Model{i}", STORAGE[i % len(STORAGE)], COLORS[(i // 7) % len(COLORS)]]
+        for i in range(base_count)
+    ]
+    truth = [rng.randrange(base_count) for _ in range(count)]
+    listings = [
+        {"productName": variant(rng, bases[b]), "price": "999", "currency": "USD", "link": f"https://shop/{i}"}
+        for i, b in enumerate(truth)
+    ]
+    return listings, np.asarray(truth)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark MinHash/LSH near-duplicate clustering.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000],
+                        help="Listing counts to benchmark")
+    args = parser.parse_args()
+
+    engine = NearDuplicateEngine()
+    print(f"{'listings':>10}  {'names':>8}  {'batch build':>12}  {'cluster':>10}  {'clusters':>9}  {'expected':>9}")
+    for size in args.sizes:
+        listings, truth = make_listings(size)
+
+        start = time.perf_counter()
+        batch = ProductBatch.from_products(listings)
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        labels = engine.cluster(batch)
+        cluster = time.perf_counter() - start
+
+        print(f"{size:>10}  {len(batch.name_vocab):>8}  {build * 1000:9.1f} ms  {cluster * 1000:7.1f} ms  "
+              f"{len(np.unique(labels)):>9}  {len(np.unique(truth)):>9}")
+
+
+if __name__ == "__main__":
+    main()
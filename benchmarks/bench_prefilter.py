@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark: the pre-fetch relevance filter at several thresholds.
+
+Mock search results carry no titles, so this gives every result the title
+of the product its page holds; pages that do not hold the product (mock
+"Unknown Product" pages and broken mocks) stand in for accessories and get
+accessory titles. Every `--noisy`th real title leaves out the storage, as
+marketplace titles often do, so that a strict threshold loses recall.
+
+Each query runs in every country with the filter off and at each threshold,
+with `--fetch-ms` simulated latency per fetch. Recall lost is counted by
+auditing every dropped result (in a separate, untimed run), which also
+reports how many pages the audits had to fetch themselves.
+
+Usage:
+    python benchmarks/bench_prefilter.py --fetch-ms 20
+"""
+import argparse
+import contextlib
+import copy
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(ROOT)
+
+from benchmarks.bench_batch import COUNTRIES
+from benchmarks.bench_compare import QUERIES
+from benchmarks.bench_run_many import make_orchestrator
+from src.config.loader import load_config
+from src.orchestrator.interface import Orchestrator
+
+
+def titled_config(config, noisy):
+    """Config whose mock search results carry titles (accessory titles for pages without the product)."""
+    config = copy.deepcopy(config)
+    probe = Orchestrator(config)
+    mock_results = config['modules']['search_agent']['mock_results']
+    count = 0
+    for site_results in mock_results.values():
+        groups = site_results.values() if isinstance(site_results, dict) else [site_results]
+        for result in (result for group in groups for result in group):
+            try:
+                html = probe.scraper.fetch_html(result)
+                name = (probe.extractor.extract(html, result['url']) or {}).get('productName')
+            except Exception:
+                name = None
+            if not name or name == 'Unknown Product':
+                result['title'] = f"Protective case for {result['url'].rsplit('/', 1)[-1]}"
+                continue
+            count += 1
+            result['title'] = ' '.join(word for word in name.split() if not word.endswith('GB')) \
+                if noisy and count % noisy == 0 else name
+    return config
+
+
+def run_all(config, delay):
+    """Run every query in every country; (seconds, products returned, relevance filter)."""
+    orchestrator = make_orchestrator(config, delay)
+    products = 0
+    start = time.perf_counter()
+    for query in QUERIES:
+        for country in COUNTRIES:
+            try:
+                products += len(orchestrator.run({"query": query, "country": country}))
+            except Exception:
+                pass  # broken mock pages fail their request, as in `main.py`
+    return time.perf_counter() - start, products, orchestrator.relevance_filter
+
+
+def with_prefilter(config, **prefilter):
+    search_agent = dict(config['modules']['search_agent'], prefilter=prefilter)
+    return dict(config, modules=dict(config['modules'], search_agent=search_agent))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the pre-fetch relevance filter.")
+    parser.add_argument('--fetch-ms', type=float, default=20.0, help="Simulated latency per page fetch")
+    parser.add_argument('--noisy', type=int, default=4, help="Every Nth real title leaves out the storage (0: none)")
+    parser.add_argument('--thresholds', type=float, nargs='+', default=[0.5, 0.6, 1.0], help="Thresholds to try")
+    args = parser.parse_args()
+
+    # Mock HTML paths in the config are relative to the repository root
+    os.chdir(ROOT)
+    with open(os.devnull, 'w', buffering=1) as quiet, contextlib.redirect_stdout(quiet):
+        config = titled_config(load_config(os.path.join('config', 'phase1_config.yaml')), args.noisy)
+        delay = args.fetch_ms / 1000
+        rows = [('off',) + run_all(with_prefilter(config, enabled=False), delay)[:2] + (None, None, None)]
+        for threshold in args.thresholds:
+            seconds, products, timed = run_all(with_prefilter(config, threshold=threshold), delay)
+            _, _, audited = run_all(with_prefilter(config, threshold=threshold, audit_every=1), 0)
+            stats = audited.stats()
+            rows.append((f"{threshold:g}", seconds, products, timed.stats()['fetches_avoided'],
+                         stats['recall_lost'], stats['audit_fetches']))
+
+    print(f"{len(QUERIES)} queries x {len(COUNTRIES)} countries, {args.fetch_ms:g} ms per fetch")
+    print(f"{'threshold':>9} {'time':>8} {'products':>9} {'fetches avoided':>16} {'recall lost':>12} "
+          f"{'audit fetches':>14}")
+    for threshold, seconds, products, avoided, lost, audit_fetches in rows:
+        print(f"{threshold:>9} {seconds:7.2f}s {products:>9} {'-' if avoided is None else avoided:>16} "
+              f"{'-' if lost is None else lost:>12} {'-' if audit_fetches is None else audit_fetches:>14}")
+
+
+if __name__ == "__main__":
+    main()
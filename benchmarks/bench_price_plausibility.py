@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark: price plausibility over a mixed-currency batch.
+
+Listings of many canonical products in USD, GBP and INR, with a few
+accessory-priced listings mixed in. Compares the grouped median/MAD pass with
+a per-product loop over np.median and reports how many accessories were
+caught.
+
+Usage:
+    python benchmarks/bench_price_plausibility.py --sizes 10000 100000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.validator.plausibility import PricePlausibility
+
+
+CURRENCIES = [('USD', 1.0), ('GBP', 0.79), ('INR', 83.0)]
+
+
+def make_listings(count, listings_per_product=8, accessory_rate=0.02, seed=5):
+    """Build listings (price_minor set, as after extraction) plus the accessory mask."""
+    rng = random.Random(seed)
+    products = max(1, count // listings_per_product)
+    base_prices = [rng.uniform(300, 1800) for _ in range(products)]
+    listings, accessory = [], []
+    for i in range(count):
+        product = rng.randrange(products)
+        currency, rate = CURRENCIES[i % len(CURRENCIES)]
+        is_accessory = rng.random() < accessory_rate
+        price = base_prices[product] * (0.01 if is_accessory else rng.uniform(0.93, 1.07)) * rate
+        listings.append({"productName": f"Product {product}", "price_minor": int(price * 100),
+                         "currency": currency, "canonical_id": f"cp_{product}"})
+        accessory.append(is_accessory)
+    return listings, np.asarray(accessory)
+
+
+def loop_medians(fx, listings):
+    """Reference: one np.median call per product."""
+    base = fx.to_base(np.array([listing["price_minor"] / 100 for listing in listings]),
+                      [listing["currency"] for listing in listings])
+    groups = {}
+    for listing, value in zip(listings, base):
+        groups.setdefault(listing["canonical_id"], []).append(value)
+    return {key: float(np.median(values)) for key, values in groups.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark vectorized price plausibility.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000],
+                        help="Batch sizes (listings) to benchmark")
+    args = parser.parse_args()
+
+    print(f"{'listings':>9}  {'assess':>10}  {'loop medians':>13}  {'accessories':>12}  {'caught':>7}  {'false flags':>12}")
+    for size in args.sizes:
+        listings, accessory = make_listings(size)
+        checker = PricePlausibility()
+
+        start = time.perf_counter()
+        result = checker.assess(listings, category="Smartphone")
+        vectorized = time.perf_counter() - start
+
+        start = time.perf_counter()
+        loop_medians(checker.fx, listings)
+        loop = time.perf_counter() - start
+
+        caught = int((result.outlier & accessory).sum())
+        false_flags = int((result.outlier & ~accessory).sum())
+        print(f"{size:>9}  {vectorized * 1000:7.1f} ms  {loop * 1000:10.1f} ms  {int(accessory.sum()):>12}  "
+              f"{caught:>7}  {false_flags:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-product validate/dedup/rank vs the columnar ProductBatch path.
+
+Usage:
+    python benchmarks/bench_product_batch.py --count 100000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.deduplicator.interface import Deduplicator
+from src.extractor.price_parser import PriceParser
+from src.models.product_batch import ProductBatch
+from src.ranker.interface import Ranker
+from src.validator.interface import Validator
+
+
+CONFIG_PATH = os.path.join(os.path.dirname(__file__), '..', 'config', 'phase1_config.yaml')
+QUERY = {"brand": "Apple", "model": "iPhone 16 Pro", "storage": "128GB"}
+SITES = ['https://amazon.com', 'https://bestbuy.com', 'https://walmart.com', 'https://apple.com']
+
+
+def make_products(count):
+    """Build extracted products with duplicates and some non-matching rows."""
+    parser = PriceParser()
+    names = ["Apple iPhone 16 Pro 128GB", "Apple iPhone 16 Pro 256GB", "Samsung Galaxy S24"]
+    return [
+        parser.attach({
+            "productName": f"{names[i % 3]} #{i % 2000}",
+            "price": str(900 + i % 300),
+            "currency": "USD",
+            "link": f"{SITES[i % 4]}/p/{i}",
+            "site": SITES[i % 4]
+        })
+        for i in range(count)
+    ]
+
+
+def run_list(products, validator, deduplicator, ranker):
+    valid = [p for p in products if validator.validate(QUERY, p)]
+    return ranker.rank(deduplicator.deduplicate(valid))
+
+
+def run_batch(products, validator, deduplicator, ranker):
+    batch = ProductBatch.from_products(products)
+    batch = batch.take(validator.validate_batch(QUERY, batch))
+    return ranker.rank_batch(deduplicator.deduplicate_batch(batch)).records
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-product vs columnar stages.")
+    parser.add_argument('--count', type=int, default=100000, help="Number of products")
+    args = parser.parse_args()
+
+    products = make_products(args.count)
+    stages = (Validator(CONFIG_PATH), Deduplicator(CONFIG_PATH), Ranker(CONFIG_PATH))
+    print(f"Products: {args.count}")
+
+    results = {}
+    for label, fn in (("list", run_list), ("batch", run_batch)):
+        start = time.perf_counter()
+        results[label] = fn(products, *stages)
+        elapsed = time.perf_counter() - start
+        print(f"{label:<6} kept={len(results[label]):>7}  {elapsed * 1000:9.1f} ms")
+
+    print(f"identical: {results['list'] == results['batch']}")
+
+
+if __name__ == "__main__":
+    main()
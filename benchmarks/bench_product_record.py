@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Benchmark: a dict copy per stage vs one shared dict record per product.
+
+Simulates the extract → validate → dedup → rank → output path at catalog
+scale and reports time per stage and peak memory (tracemalloc) for both
+paths. Runs of the two paths alternate and the best time per stage is kept,
+so both see the same machine load. Both paths leave their input records
+unchanged: ranking annotates copies of the ranked records, as RealRanker
+does.
+
+Usage:
+    python benchmarks/bench_product_record.py --count 100000 --repeat 7
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.extractor.price_parser import PriceParser, price_amount
+
+
+SITES = ['amazon.com', 'bestbuy.com', 'walmart.com', 'apple.com']
+
+STAGES = ('extract', 'validate', 'dedup', 'rank', 'output')
+
+
+def make_raw(count):
+    """Build raw extracted rows (what mock_extracts holds)."""
+    return [
+        {
+            "productName": f"Apple iPhone 16 Pro 128GB #{i % 5000}",
+            "price": str(900 + i % 300),
+            "currency": "USD",
+            "link": f"https://{SITES[i % len(SITES)]}/p/{i}"
+        }
+        for i in range(count)
+    ]
+
+
+def copy_stages(parser):
+    """Copying path: copy per stage and rebuild dicts for ranking."""
+    def dedup(valid):
+        seen, unique = set(), []
+        for p in valid:
+            key = f"{p.get('productName', '')}_{p.get('price', '')}_{p.get('currency', '')}"
+            if key not in seen:
+                seen.add(key)
+                unique.append(p.copy())
+        return unique
+
+    return {
+        'extract': lambda raw: [parser.attach(row.copy()) for row in raw],
+        'validate': lambda extracted: [p for p in extracted if (price_amount(p) or 0) > 0],
+        'dedup': dedup,
+        'rank': lambda unique: [{**p, 'ranking_rank': i + 1}
+                                for i, p in enumerate(sorted(unique, key=price_amount))],
+        'output': lambda ranked: ranked,
+    }
+
+
+def shared_stages(parser):
+    """Shared path: one record per row, passed through; the ranked page is copied to annotate it."""
+    def dedup(valid):
+        seen, unique = set(), []
+        for p in valid:
+            key = (p.get('productName'), p.get('price'), p.get('currency'))
+            if key not in seen:
+                seen.add(key)
+                unique.append(p)
+        return unique
+
+    return {
+        'extract': lambda raw: [parser.attach(row.copy()) for row in raw],
+        'validate': lambda extracted: [p for p in extracted if (price_amount(p) or 0) > 0],
+        'dedup': dedup,
+        'rank': lambda unique: [{**p, 'ranking_rank': i + 1}
+                                for i, p in enumerate(sorted(unique, key=price_amount))],
+        'output': lambda ranked: ranked,
+    }
+
+
+def run(stages, raw, timings=None):
+    """Run the stages in order, adding each stage's seconds to `timings`."""
+    data = raw
+    for stage in STAGES:
+        start = time.perf_counter()
+        data = stages[stage](data)
+        if timings is not None:
+            timings[stage] = min(timings.get(stage, float('inf')), time.perf_counter() - start)
+    return data
+
+
+def peak_memory(stages, raw):
+    """Peak traced memory of one run, in bytes."""
+    tracemalloc.start()
+    run(stages, raw)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-stage copies vs shared records.")
+    parser.add_argument('--count', type=int, default=100000, help="Number of products")
+    parser.add_argument('--repeat', type=int, default=7, help="Runs per path; the best time per stage is kept")
+    args = parser.parse_args()
+
+    raw = make_raw(args.count)
+    price_parser = PriceParser()
+    print(f"Products: {args.count}, best of {args.repeat} (ms per stage, peak MB)")
+    paths = {'copied': copy_stages(price_parser), 'shared': shared_stages(price_parser)}
+    timings = {label: {} for label in paths}
+    outputs = {}
+    for _ in range(args.repeat):
+        for label, stages in paths.items():
+            outputs[label] = run(stages, raw, timings[label])
+
+    print(f"{'records':<8} {'kept':>8} " + ' '.join(f"{stage:>8}" for stage in STAGES)
+          + f" {'total':>8} {'peak':>8}")
+    for label, stages in paths.items():
+        stage_ms = ' '.join(f"{timings[label][stage] * 1000:8.1f}" for stage in STAGES)
+        print(f"{label:<8} {len(outputs[label]):>8} {stage_ms} {sum(timings[label].values()) * 1000:8.1f} "
+              f"{peak_memory(stages, raw) / 1e6:8.1f}")
+
+
+if __name__ == "__main__":
+    main()
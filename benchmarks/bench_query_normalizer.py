@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark: RealQueryNormalizer over a synthetic query log.
+
+Builds a log of mixed-case, partly glued ("iphone16pro"), multi-language
+queries across smartphones, laptops and sports items and reports the
+throughput of a plain normalize_query loop, of the same log with a share of
+misspelt product words (spelling correction), and of the QueryNormalizer
+facade's normalize_many (deduplicated, cached, optionally across processes).
+
+Usage:
+    python benchmarks/bench_query_normalizer.py --queries 100000 --workers 4 --typo-rate 0.2
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.query_normalizer.interface import QueryNormalizer
+from src.query_normalizer.real_normalizer import RealQueryNormalizer
+
+
+PRODUCTS = [
+    "iPhone 16 Pro Max", "iPhone 16 Pro", "iphone 16", "iPhone 15 Plus", "iphone15pro",
+    "Samsung Galaxy S24 Ultra", "galaxy s24", "Galaxy S23", "Google Pixel 8 Pro", "pixel 8",
+    "MacBook Pro", "macbook air", "Dell XPS 15", "Lenovo ThinkPad X1", "Surface Laptop", "HP Pavilion",
+    "Asus Zenbook", "Acer Predator", "Nike Air Max 270", "air force 1", "Adidas UltraBoost",
+    "Puma Suede", "stan smith", "OnePlus 12", "Xiaomi Redmi Note 13", "Huawei Mate 60", "Huawei P60",
+    "Sony WH-1000XM5", "random gadget",
+]
+EXTRAS = [
+    "128GB", "256 GB", "1TB", "512gb", "16GB RAM", "8 gb memory", "M3 Pro", "intel i7", "ryzen 7",
+    "Natural Titanium", "space grey", "Black", "noir", "weiß", "azul", "rose", "silver",
+    "6.1 inch", "14-inch", "US 10", "size 9", "EU 42", "running", "basketball", "trail",
+    "unlocked", "smartphone", "laptop", "shoes", "mobile", "new", "deal", "cheap",
+]
+
+
+def make_query_log(count, seed=7):
+    """Build `count` queries (with repeats, like a real log)."""
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(count):
+        words = [rng.choice(PRODUCTS)] + rng.sample(EXTRAS, rng.randint(0, 3))
+        rng.shuffle(words[1:])
+        query = " ".join(words)
+        style = rng.randrange(4)
+        if style == 1:
+            query = query.lower()
+        elif style == 2:
+            query = query.upper()
+        elif style == 3:
+            query = query.replace(" ", ", ", 1)
+        queries.append(query)
+    return queries
+
+
+def add_typos(queries, rate, seed=11):
+    """Swap two adjacent letters of the longest word in a `rate` share of queries."""
+    rng = random.Random(seed)
+    noisy = []
+    for query in queries:
+        words = query.split(" ")
+        longest = max(range(len(words)), key=lambda i: len(words[i]))
+        word = words[longest]
+        if len(word) >= 5 and word.isalpha() and rng.random() < rate:
+            i = rng.randrange(1, len(word) - 2)
+            words[longest] = word[:i] + word[i + 1] + word[i] + word[i + 2:]
+        noisy.append(" ".join(words))
+    return noisy
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark RealQueryNormalizer throughput.")
+    parser.add_argument('--queries', type=int, default=100000, help="Queries in the log")
+    parser.add_argument('--workers', type=int, default=1, help="Worker processes for normalize_many")
+    parser.add_argument('--typo-rate', type=float, default=0.2, help="Share of queries given a typo")
+    args = parser.parse_args()
+
+    queries = make_query_log(args.queries)
+    normalizer = RealQueryNormalizer()
+    rows = []
+
+    start = time.perf_counter()
+    clean = [normalizer.normalize_query(query) for query in queries]
+    rows.append(("normalize_query loop", time.perf_counter() - start))
+
+    noisy = add_typos(queries, args.typo_rate)
+    start = time.perf_counter()
+    corrected = [normalizer.normalize_query(query) for query in noisy]
+    rows.append((f"with {args.typo_rate:.0%} typos", time.perf_counter() - start))
+    uncorrected = RealQueryNormalizer(correct_spelling=False)
+    typos = [i for i, (query, noisy_query) in enumerate(zip(queries, noisy)) if query != noisy_query]
+    lost = sum(uncorrected.normalize_query(noisy[i])['model'] != clean[i]['model'] for i in typos)
+    still_lost = sum(corrected[i]['model'] != clean[i]['model'] for i in typos)
+
+    facade = QueryNormalizer({'modules': {'query_normalizer': {'use_mock': False}}})
+    start = time.perf_counter()
+    facade.normalize_many(queries, workers=args.workers)
+    rows.append((f"normalize_many ({args.workers} proc)", time.perf_counter() - start))
+    info = facade.cache_info()
+
+    print(f"{'method':<24}  {'queries':>9}  {'total':>10}  {'per query':>10}  {'queries/s':>10}")
+    for name, elapsed in rows:
+        print(f"{name:<24}  {len(queries):>9}  {elapsed:7.2f} s  {elapsed / len(queries) * 1e6:7.1f} us  "
+              f"{len(queries) / elapsed:10.0f}")
+    print(f"typo queries: {len(typos)}, model lost without correction: {lost}, with correction: {still_lost}")
+    print(f"distinct queries normalized: {info['misses']}, reused: {info['hits']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-product factor scoring vs the vectorized ScoringEngine.
+
+Scores and orders 10 → 1M products. The per-product path (one RankingScore
+object per factor per product, then a Python sort) is skipped above
+--scalar-max to keep the run short.
+
+Usage:
+    python benchmarks/bench_ranking.py --max 1000000 --scalar-max 100000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.extractor.price_parser import PriceParser
+from src.models.product_batch import ProductBatch
+from src.ranker.real_ranker import RealRanker
+
+
+SITES = ['amazon.com', 'bestbuy.com', 'walmart.com', 'apple.com', 'target.com']
+
+
+def make_products(count):
+    """Build extracted products spread over a few vendors."""
+    parser = PriceParser()
+    return [
+        parser.attach({
+            "productName": f"Apple iPhone 16 Pro 128GB #{i % 5000}",
+            "price": str(800 + (i * 7919) % 900),
+            "currency": "USD",
+            "link": f"https://{SITES[i % len(SITES)]}/p/{i}",
+            "site": SITES[i % len(SITES)]
+        })
+        for i in range(count)
+    ]
+
+
+def run_scalar(ranker, products):
+    """Previous path: score each product on its own, then sort."""
+    scored = []
+    for product in products:
+        factor_scores = ranker._calculate_factor_scores(product)
+        scored.append((ranker._calculate_total_score(factor_scores), product))
+    scored.sort(key=lambda item: item[0], reverse=True)
+    return scored
+
+
+def run_engine(ranker, batch):
+    """Vectorized path: factor matrix, matrix-vector product, argsort."""
+    engine = ranker.scoring_engine
+    engine.score(batch)
+    return engine.rank_order(batch.scores)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-product vs vectorized ranking.")
+    parser.add_argument('--max', type=int, default=1000000, help="Largest batch size")
+    parser.add_argument('--scalar-max', type=int, default=100000, help="Largest size for the per-product path")
+    args = parser.parse_args()
+
+    ranker = RealRanker()
+    products = make_products(args.max)
+
+    print(f"{'products':>10}  {'per-product':>12}  {'batch build':>12}  {'engine':>10}")
+    count = 10
+    while count <= args.max:
+        subset = products[:count]
+
+        scalar = "skipped"
+        if count <= args.scalar_max:
+            start = time.perf_counter()
+            run_scalar(ranker, subset)
+            scalar = f"{(time.perf_counter() - start) * 1000:.1f} ms"
+
+        start = time.perf_counter()
+        batch = ProductBatch.from_products(subset)
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        run_engine(ranker, batch)
+        engine = time.perf_counter() - start
+
+        print(f"{count:>10}  {scalar:>12}  {build * 1000:9.1f} ms  {engine * 1000:7.2f} ms")
+        count *= 10
+
+
+if __name__ == "__main__":
+    main()
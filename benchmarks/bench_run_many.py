@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Orchestrator.run_many against a loop over Orchestrator.run.
+
+Runs the same synthetic requests (from the benchmark query log, spread over
+four countries) both ways on fresh orchestrators and reports the wall time
+and the work run_many shared per stage. Mock page fetches are local file
+reads, so `--fetch-ms` adds a simulated network latency to each fetch to
+show the effect of fetching the union once, `--concurrency` pages at a time.
+
+Usage:
+    python benchmarks/bench_run_many.py --requests 1000 --fetch-ms 5
+"""
+import argparse
+import contextlib
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(ROOT)
+
+from benchmarks.bench_batch import COUNTRIES
+from benchmarks.bench_query_normalizer import make_query_log
+from src.config.loader import load_config
+from src.orchestrator.interface import Orchestrator
+
+
+class SlowScraper:
+    """Scraper that waits `delay` seconds per fetch, like a network round trip."""
+
+    def __init__(self, scraper, delay):
+        self.scraper = scraper
+        self.delay = delay
+
+    def fetch_html(self, url_entry):
+        time.sleep(self.delay)
+        return self.scraper.fetch_html(url_entry)
+
+
+def make_orchestrator(config, delay):
+    orchestrator = Orchestrator(config)
+    orchestrator.scraper = SlowScraper(orchestrator.scraper, delay)
+    return orchestrator
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Orchestrator.run_many.")
+    parser.add_argument('--requests', type=int, default=1000, help="Requests")
+    parser.add_argument('--fetch-ms', type=float, default=5.0, help="Simulated latency per page fetch")
+    parser.add_argument('--concurrency', type=int, default=8, help="Fetches in flight for run_many")
+    args = parser.parse_args()
+
+    # Mock HTML paths in the config are relative to the repository root
+    os.chdir(ROOT)
+    config = load_config(os.path.join('config', 'phase1_config.yaml'))
+    requests = [{"query": query, "country": COUNTRIES[index % len(COUNTRIES)]}
+                for index, query in enumerate(make_query_log(args.requests))]
+    delay = args.fetch_ms / 1000
+
+    with open(os.devnull, 'w') as quiet, contextlib.redirect_stdout(quiet):
+        orchestrator = make_orchestrator(config, delay)
+        start = time.perf_counter()
+        for request in requests:
+            try:
+                orchestrator.run(request)
+            except Exception:
+                pass
+        loop = time.perf_counter() - start
+
+        orchestrator = make_orchestrator(config, delay)
+        start = time.perf_counter()
+        orchestrator.run_many(requests, max_concurrency=args.concurrency, return_exceptions=True)
+        many = time.perf_counter() - start
+
+    print(f"{args.requests} requests, {args.fetch_ms:g} ms per fetch")
+    print(f"  loop over run()            {loop:7.2f} s")
+    print(f"  run_many, {args.concurrency} concurrent      {many:7.2f} s  ({loop / many:.1f}x)")
+    print(f"{'stage':<14} {'calls':>8} {'computed':>9} {'shared':>8}")
+    for stage, counts in orchestrator.run_many_stats.items():
+        print(f"{stage:<14} {counts['calls']:>8} {counts['computed']:>9} {counts['shared']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Benchmark: semantic validation with the local hashed n-gram engine.
+
+Scores one query against batches of product names, cold (every name
+vectorized) and warm (vectors cached), and compares with scoring the
+names one at a time.
+
+Usage:
+    python benchmarks/bench_semantic_similarity.py --sizes 1000 10000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmarks.bench_near_duplicate import make_listings
+from src.validator.similarity import NgramSimilarity
+
+
+QUERY = "Apple Model7 128GB Silver"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark hashed n-gram similarity scoring.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000],
+                        help="Batch sizes (product names) to benchmark")
+    args = parser.parse_args()
+
+    print(f"{'names':>8}  {'cold batch':>11}  {'warm batch':>11}  {'warm per-name':>14}  {'per name (warm)':>16}")
+    for size in args.sizes:
+        listings, _ = make_listings(size)
+        names = [listing['productName'] for listing in listings]
+        engine = NgramSimilarity()
+
+        start = time.perf_counter()
+        engine.scores(QUERY, names)
+        cold = time.perf_counter() - start
+
+        start = time.perf_counter()
+        engine.scores(QUERY, names)
+        warm = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for name in names:
+            engine.score(QUERY, name)
+        one_by_one = time.perf_counter() - start
+
+        print(f"{size:>8}  {cold * 1000:8.1f} ms  {warm * 1000:8.1f} ms  {one_by_one * 1000:11.1f} ms  "
+              f"{warm / size * 1e6:13.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cold-start wall time of the CLI.
+
+Runs `python main.py` as a fresh process several times per scenario and
+reports the fastest and median wall time:
+
+- the bare interpreter, as the floor
+- a pipeline query parsing the YAML config (snapshots disabled)
+- the same query loading the config snapshot
+- the `complete` subcommand, which only builds the query normalizer
+- the same query forwarded to a warm `main.py serve` (started by the
+  benchmark on the configured port, after the other scenarios)
+
+Usage:
+    python benchmarks/bench_startup.py --runs 5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(ROOT)
+
+from src.config.loader import DISABLE_ENV, load_config
+
+
+QUERY = [sys.executable, 'main.py', '--query', 'iPhone 16 Pro, 128GB', '--country', 'US']
+
+
+def wall_times(command, runs, env=None):
+    """Wall time of `runs` fresh runs of a command, in seconds."""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CLI cold-start time.")
+    parser.add_argument('--runs', type=int, default=5, help="Runs per scenario")
+    args = parser.parse_args()
+
+    # Make sure the snapshot exists, as after any earlier run
+    load_config(os.path.join(ROOT, 'config', 'phase1_config.yaml'))
+    no_snapshot = dict(os.environ, **{DISABLE_ENV: '1'})
+    scenarios = [
+        ("python -c pass", [sys.executable, '-c', 'pass'], None),
+        ("query, YAML parsed", QUERY, no_snapshot),
+        ("query, config snapshot", QUERY, None),
+        ("complete iph", [sys.executable, 'main.py', 'complete', 'iph'], None),
+    ]
+
+    print(f"{'scenario':<24}  {'fastest':>9}  {'median':>9}")
+    for name, command, env in scenarios:
+        report(name, wall_times(command + ['--local'] if command is QUERY else command, args.runs, env))
+
+    # The server prints its banner once its modules are built
+    server = subprocess.Popen([sys.executable, 'main.py', 'serve'], cwd=ROOT,
+                              stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    try:
+        server.stdout.readline()
+        report("query, via serve", wall_times(QUERY, args.runs))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def report(name, times):
+    """Print one scenario's row."""
+    print(f"{name:<24}  {min(times) * 1000:6.0f} ms  {statistics.median(times) * 1000:6.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,28 +17,142 @@ except ImportError:
     import argparse
     USE_TYPER = False
 
-from src.orchestrator.interface import Orchestrator
-
-def run_pipeline(user_input):
+def run_pipeline(user_input, limit: Optional[int] = None, cursor: Optional[str] = None, local: bool = False):
     """
     Run the orchestrator pipeline and print results as pretty JSON.
+    With a limit or cursor, prints one page: {"results": [...], "next_cursor": ...}.
+    The request is forwarded to a running `main.py serve` started from the same
+    config, unless local is set.
+    """
+    from src.config.loader import load_config
+    config = load_config(CONFIG_PATH)
+    if not local:
+        from src.orchestrator.client import forward_run, server_settings
+        settings = server_settings(config)
+        if settings['forward']:
+            results = forward_run(user_input, limit=limit, cursor=cursor,
+                                  address=(settings['host'], settings['port']),
+                                  connect_timeout=settings['connect_timeout'],
+                                  request_timeout=settings['request_timeout'], config=config)
+            if results is not None:
+                print(json.dumps(results, indent=2, ensure_ascii=False))
+                return
+    # Imported here so that --help and other subcommands start without the pipeline
+    from src.orchestrator.interface import Orchestrator
+    orchestrator = Orchestrator(config)
+    if limit is None and cursor is None:
+        results = orchestrator.run(user_input)
+    else:
+        results = orchestrator.run_page(user_input, limit=limit, cursor=cursor)
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+
+def run_complete(prefix: str, k: int = 5, query_log: Optional[str] = None):
+    """
+    Print the top-k autocomplete suggestions for a prefix as pretty JSON.
+    A query log (one query per line, or JSON lines with 'query') overrides the configured one.
+    """
+    from src.query_normalizer.interface import QueryNormalizer
+    normalizer = QueryNormalizer(CONFIG_PATH)
+    if query_log:
+        normalizer.autocomplete_config = dict(normalizer.autocomplete_config, query_log=query_log)
+    print(json.dumps(normalizer.complete(prefix, k), indent=2, ensure_ascii=False))
+
+def run_serve(host: Optional[str] = None, port: Optional[int] = None, workers: Optional[int] = None,
+              verbose: bool = False):
+    """
+    Serve the pipeline on localhost HTTP until interrupted.
+    Unset options come from the config's `server` section. Pipeline progress
+    output is discarded unless verbose is set.
+    """
+    from src.config.loader import load_config
+    from src.orchestrator.client import server_settings
+    from src.orchestrator.server import PipelineServer
+    config = load_config(CONFIG_PATH)
+    settings = server_settings(config)
+    host = host or settings['host']
+    port = settings['port'] if port is None else port
+    workers = workers or settings['workers']
+    try:
+        server = PipelineServer(config, host=host, port=port, workers=workers)
+    except OSError as e:
+        print(f"❌ Cannot listen on {host}:{port}: {e}", file=sys.stderr)
+        sys.exit(1)
+    server.pool.warm()
+    print(f"🛰️  Serving the pipeline on http://{host}:{server.server_address[1]} "
+          f"with {workers} workers (Ctrl+C to stop)", flush=True)
+    if not verbose:
+        # Line-buffered: a block-buffered text file written from many threads can queue writes without bound
+        sys.stdout = open(os.devnull, 'w', buffering=1)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+def run_batch(input_file: str, output: Optional[str] = None, workers: Optional[int] = None,
+              verbose: bool = False):
     """
-    orchestrator = Orchestrator(CONFIG_PATH)
-    results = orchestrator.run(user_input)
+    Run a JSONL file of requests ('-' for stdin) and write one JSONL result line
+    per request as each completes, to `output` or stdout. A summary of the work
+    shared across requests goes to stderr. Pipeline progress output is discarded
+    unless verbose is set (it then goes to stderr).
+    """
+    import time
+    from src.config.loader import load_config
+    from src.orchestrator.batch import BatchRunner, read_requests
+    runner = BatchRunner.from_config(load_config(CONFIG_PATH), workers=workers)
+    source = sys.stdin if input_file == '-' else open(input_file, 'r', encoding='utf-8')
+    sink = open(output, 'w', encoding='utf-8') if output else sys.stdout
+    progress = sys.stdout
+    # Line-buffered: a block-buffered text file written from many threads can queue writes without bound
+    sys.stdout = sys.stderr if verbose else open(os.devnull, 'w', buffering=1)
+    start = time.perf_counter()
+    try:
+        for record in runner.run(read_requests(source)):
+            sink.write(json.dumps(record, ensure_ascii=False) + '\n')
+            sink.flush()
+    finally:
+        sys.stdout = progress
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+    stats = runner.stats()
+    shared = ', '.join(f"{stage} {counts['computed']}/{counts['calls']}"
+                       for stage, counts in stats['shared'].items())
+    print(f"✅ {stats['completed']} requests done, {stats['failed']} failed in "
+          f"{time.perf_counter() - start:.1f}s (computed/calls: {shared})", file=sys.stderr)
+
+def run_compare(query: str, countries: str, currency: Optional[str] = None, limit: Optional[int] = None):
+    """
+    Compare a query across countries (comma-separated codes) and print one
+    ranking, with prices converted to `currency` (default: the FX base), as pretty JSON.
+    """
+    from src.config.loader import load_config
+    from src.orchestrator.interface import Orchestrator
+    codes = [code.strip().upper() for code in countries.split(',') if code.strip()]
+    results = Orchestrator(load_config(CONFIG_PATH)).compare(query, codes, currency=currency, limit=limit)
     print(json.dumps(results, indent=2, ensure_ascii=False))
 
 if USE_TYPER:
     app = typer.Typer(help="Price Intelligence CLI - Run the full mock pipeline.")
 
-    @app.command()
+    @app.callback(invoke_without_command=True)
     def main(
+        ctx: typer.Context,
         query: str = typer.Option(None, help="Product search query, e.g. 'iPhone 16 Pro, 128GB'"),
         country: str = typer.Option(None, help="Country code, e.g. 'US'"),
-        input_file: str = typer.Option(None, help="Path to JSON file with input (keys: 'query', 'country')")
+        input_file: str = typer.Option(None, help="Path to JSON file with input (keys: 'query', 'country')"),
+        limit: Optional[int] = typer.Option(None, help="Only return the top N results (one page)"),
+        cursor: Optional[str] = typer.Option(None, help="Cursor from a previous page's next_cursor"),
+        local: bool = typer.Option(False, help="Run in this process even if `serve` is running")
     ):
         """
         Run the price intelligence pipeline with CLI or file input.
         """
+        if ctx.invoked_subcommand is not None:
+            return
         if input_file:
             if not os.path.exists(input_file):
                 typer.echo(f"❌ Input file not found: {input_file}", err=True)
@@ -54,7 +168,65 @@ if USE_TYPER:
                 typer.echo("❌ Must provide both --query and --country, or --input_file", err=True)
                 raise typer.Exit(1)
             user_input = {"query": query, "country": country}
-        run_pipeline(user_input)
+        try:
+            run_pipeline(user_input, limit=limit, cursor=cursor, local=local)
+        except (ValueError, RuntimeError) as e:
+            typer.echo(f"❌ {e}", err=True)
+            raise typer.Exit(1)
+
+    @app.command()
+    def complete(
+        prefix: str = typer.Argument(..., help="Partly typed query, e.g. 'iph'"),
+        k: int = typer.Option(5, help="Number of suggestions"),
+        query_log: Optional[str] = typer.Option(None, help="Query log for popularity (overrides config)")
+    ):
+        """
+        Suggest completions for a partly typed query.
+        """
+        run_complete(prefix, k=k, query_log=query_log)
+
+    @app.command()
+    def serve(
+        host: Optional[str] = typer.Option(None, help="Interface to listen on (default from config)"),
+        port: Optional[int] = typer.Option(None, help="Port to listen on (default from config)"),
+        workers: Optional[int] = typer.Option(None, help="Requests run at once (default from config)"),
+        verbose: bool = typer.Option(False, help="Print pipeline progress for each request")
+    ):
+        """
+        Keep the pipeline warm in a long-lived server that --query forwards to.
+        """
+        run_serve(host=host, port=port, workers=workers, verbose=verbose)
+
+    @app.command()
+    def batch(
+        input_file: str = typer.Argument(..., help="JSONL file of requests ({'query', 'country', 'limit'?}), '-' for stdin"),
+        output: Optional[str] = typer.Option(None, help="JSONL file for the results (default stdout)"),
+        workers: Optional[int] = typer.Option(None, help="Requests run at once (default from config)"),
+        verbose: bool = typer.Option(False, help="Print pipeline progress to stderr")
+    ):
+        """
+        Run a JSONL file of requests, writing one result line per request as it completes.
+        """
+        if input_file != '-' and not os.path.exists(input_file):
+            typer.echo(f"❌ Input file not found: {input_file}", err=True)
+            raise typer.Exit(1)
+        run_batch(input_file, output=output, workers=workers, verbose=verbose)
+
+    @app.command()
+    def compare(
+        query: str = typer.Argument(..., help="Product search query, e.g. 'iPhone 16 Pro, 128GB'"),
+        countries: str = typer.Option("US,UK,DE,IN", help="Comma-separated country codes"),
+        currency: Optional[str] = typer.Option(None, help="Currency to compare in (default: the FX base)"),
+        limit: Optional[int] = typer.Option(None, help="Only return the top N results")
+    ):
+        """
+        Compare a product across countries in one ranking, in one currency.
+        """
+        try:
+            run_compare(query, countries, currency=currency, limit=limit)
+        except ValueError as e:
+            typer.echo(f"❌ {e}", err=True)
+            raise typer.Exit(1)
 
     if __name__ == "__main__":
         app()
@@ -68,8 +240,51 @@ else:
         parser.add_argument('--query', type=str, help="Product search query, e.g. 'iPhone 16 Pro, 128GB'")
         parser.add_argument('--country', type=str, help="Country code, e.g. 'US'")
         parser.add_argument('--input_file', type=str, help="Path to JSON file with input (keys: 'query', 'country')")
+        parser.add_argument('--limit', type=int, help="Only return the top N results (one page)")
+        parser.add_argument('--cursor', type=str, help="Cursor from a previous page's next_cursor")
+        parser.add_argument('--local', action='store_true', help="Run in this process even if `serve` is running")
+        subparsers = parser.add_subparsers(dest='command')
+        complete_parser = subparsers.add_parser('complete', help="Suggest completions for a partly typed query")
+        complete_parser.add_argument('prefix', type=str, help="Partly typed query, e.g. 'iph'")
+        complete_parser.add_argument('--k', type=int, default=5, help="Number of suggestions")
+        complete_parser.add_argument('--query_log', type=str, help="Query log for popularity (overrides config)")
+        serve_parser = subparsers.add_parser('serve', help="Keep the pipeline warm in a long-lived server that --query forwards to")
+        serve_parser.add_argument('--host', type=str, help="Interface to listen on (default from config)")
+        serve_parser.add_argument('--port', type=int, help="Port to listen on (default from config)")
+        serve_parser.add_argument('--workers', type=int, help="Requests run at once (default from config)")
+        serve_parser.add_argument('--verbose', action='store_true', help="Print pipeline progress for each request")
+        batch_parser = subparsers.add_parser('batch', help="Run a JSONL file of requests, writing one result line per request as it completes")
+        batch_parser.add_argument('input_file', type=str, help="JSONL file of requests ({'query', 'country', 'limit'?}), '-' for stdin")
+        batch_parser.add_argument('--output', type=str, help="JSONL file for the results (default stdout)")
+        batch_parser.add_argument('--workers', type=int, help="Requests run at once (default from config)")
+        batch_parser.add_argument('--verbose', action='store_true', help="Print pipeline progress to stderr")
+        compare_parser = subparsers.add_parser('compare', help="Compare a product across countries in one ranking, in one currency")
+        compare_parser.add_argument('query', type=str, help="Product search query, e.g. 'iPhone 16 Pro, 128GB'")
+        compare_parser.add_argument('--countries', type=str, default="US,UK,DE,IN", help="Comma-separated country codes")
+        compare_parser.add_argument('--currency', type=str, help="Currency to compare in (default: the FX base)")
+        compare_parser.add_argument('--limit', type=int, help="Only return the top N results")
         args = parser.parse_args()
 
+        if args.command == 'complete':
+            run_complete(args.prefix, k=args.k, query_log=args.query_log)
+            return
+        if args.command == 'serve':
+            run_serve(host=args.host, port=args.port, workers=args.workers, verbose=args.verbose)
+            return
+        if args.command == 'batch':
+            if args.input_file != '-' and not os.path.exists(args.input_file):
+                print(f"❌ Input file not found: {args.input_file}", file=sys.stderr)
+                sys.exit(1)
+            run_batch(args.input_file, output=args.output, workers=args.workers, verbose=args.verbose)
+            return
+        if args.command == 'compare':
+            try:
+                run_compare(args.query, args.countries, currency=args.currency, limit=args.limit)
+            except ValueError as e:
+                print(f"❌ {e}", file=sys.stderr)
+                sys.exit(1)
+            return
+
         if args.input_file:
             if not os.path.exists(args.input_file):
                 print(f"❌ Input file not found: {args.input_file}", file=sys.stderr)
@@ -85,7 +300,11 @@ else:
                 print("❌ Must provide both --query and --country, or --input_file", file=sys.stderr)
                 sys.exit(1)
             user_input = {"query": args.query, "country": args.country}
-        run_pipeline(user_input)
+        try:
+            run_pipeline(user_input, limit=args.limit, cursor=args.cursor, local=args.local)
+        except (ValueError, RuntimeError) as e:
+            print(f"❌ {e}", file=sys.stderr)
+            sys.exit(1)
 
     if __name__ == "__main__":
         main() 
\ No newline at end of file
@@ -4,11 +4,12 @@ Provides distributed caching functionality using Redis for the price intelligenc
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Union
 import json
 import hashlib
 import time
 from datetime import datetime, timedelta
+from src.scraper.canonical_url import create_url_canonicalizer
 
 
 class CacheInterface(ABC):
@@ -153,10 +154,17 @@ class RedisCache(CacheInterface):
 class MockCache(CacheInterface):
     """Mock cache implementation for testing and development."""
     
-    def __init__(self, ttl_default: int = 3600):
-        """Initialize mock cache."""
+    def __init__(self, ttl_default: int = 3600, max_entries: Optional[int] = None):
+        """
+        Initialize mock cache.
+        
+        Args:
+            ttl_default: Default time-to-live in seconds
+            max_entries: Most entries kept (the oldest set is evicted first), or None for no limit
+        """
         self.cache = {}
         self.ttl_default = ttl_default
+        self.max_entries = max_entries
         self.expiry_times = {}
     
     def get(self, key: str) -> Optional[Any]:
@@ -166,8 +174,9 @@ class MockCache(CacheInterface):
         
         # Check if expired
         if key in self.expiry_times and time.time() > self.expiry_times[key]:
-            del self.cache[key]
-            del self.expiry_times[key]
+            # pop(): another thread sharing the cache may have expired it already
+            self.cache.pop(key, None)
+            self.expiry_times.pop(key, None)
             return None
         
         return self.cache[key]
@@ -175,9 +184,16 @@ class MockCache(CacheInterface):
     def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
         """Store value in cache with optional TTL."""
         try:
+            # Re-inserting moves the key to the end of the eviction order
+            self.cache.pop(key, None)
             self.cache[key] = value
             ttl = ttl or self.ttl_default
             self.expiry_times[key] = time.time() + ttl
+            if self.max_entries is not None:
+                while len(self.cache) > self.max_entries:
+                    oldest = next(iter(self.cache))
+                    self.cache.pop(oldest, None)
+                    self.expiry_times.pop(oldest, None)
             return True
         except Exception:
             return False
@@ -200,8 +216,9 @@ class MockCache(CacheInterface):
         
         # Check if expired
         if key in self.expiry_times and time.time() > self.expiry_times[key]:
-            del self.cache[key]
-            del self.expiry_times[key]
+            # pop(): another thread sharing the cache may have expired it already
+            self.cache.pop(key, None)
+            self.expiry_times.pop(key, None)
             return False
         
         return True
@@ -222,15 +239,18 @@ class CacheManager:
     Provides caching for query results, site data, and extracted products.
     """
     
-    def __init__(self, cache_impl: CacheInterface):
+    def __init__(self, cache_impl: CacheInterface, canonicalize_url: Optional[Callable[[str], str]] = None):
         """
         Initialize cache manager.
         
         Args:
             cache_impl: Cache implementation (Redis or Mock)
+            canonicalize_url: Maps product URLs to the canonical URL that keys
+                product data, so equivalent URLs share an entry (None: URLs as given)
         """
         self.cache = cache_impl
         self.prefix = "priceiq"
+        self.canonicalize_url = canonicalize_url
     
     def _generate_key(self, *args) -> str:
         """Generate cache key from arguments."""
@@ -276,6 +296,44 @@ class CacheManager:
             return cached_data.get('results')
         return None
     
+    def cache_ranking_candidates(self, query: str, country: str, products: List[Dict],
+                                 ttl: int = 1800) -> bool:
+        """
+        Cache the deduplicated, not yet ranked products of a query so that
+        later result pages can be ranked without rerunning the pipeline.
+        
+        Args:
+            query: Product query
+            country: Country code
+            products: Deduplicated products in pipeline order
+            ttl: Time to live in seconds (30 minutes default)
+        
+        Returns:
+            bool: Success status
+        """
+        key = self._generate_key("ranking_candidates", query, country)
+        return self.cache.set(key, {
+            'products': products,
+            'timestamp': datetime.now().isoformat()
+        }, ttl)
+    
+    def get_cached_ranking_candidates(self, query: str, country: str) -> Optional[List[Dict]]:
+        """
+        Get cached ranking candidates.
+        
+        Args:
+            query: Product query
+            country: Country code
+        
+        Returns:
+            Optional[List[Dict]]: Cached products or None
+        """
+        key = self._generate_key("ranking_candidates", query, country)
+        cached_data = self.cache.get(key)
+        if cached_data:
+            return cached_data.get('products')
+        return None
+    
     def cache_site_data(self, site: str, category: str, country: str, 
                        data: Dict, ttl: int = 3600) -> bool:
         """
@@ -323,13 +381,15 @@ class CacheManager:
         Cache extracted product data.
         
         Args:
-            url: Product URL
+            url: Product URL (keyed by its canonical form)
             product_data: Extracted product data
             ttl: Time to live in seconds (2 hours default)
         
         Returns:
             bool: Success status
         """
+        if self.canonicalize_url is not None:
+            url = self.canonicalize_url(url)
         key = self._generate_key("product_data", url)
         return self.cache.set(key, {
             'product_data': product_data,
@@ -342,11 +402,13 @@ class CacheManager:
         Get cached product data.
         
         Args:
-            url: Product URL
+            url: Product URL (keyed by its canonical form)
         
         Returns:
             Optional[Dict]: Cached product data or None
         """
+        if self.canonicalize_url is not None:
+            url = self.canonicalize_url(url)
         key = self._generate_key("product_data", url)
         cached_data = self.cache.get(key)
         if cached_data:
@@ -397,6 +459,11 @@ class CacheManager:
         key = self._generate_key("query_results", query, country)
         return self.cache.delete(key)
     
+    def invalidate_ranking_candidates(self, query: str, country: str) -> bool:
+        """Invalidate cached ranking candidates (paged results)."""
+        key = self._generate_key("ranking_candidates", query, country)
+        return self.cache.delete(key)
+    
     def invalidate_site_cache(self, site: str, category: str, country: str) -> bool:
         """Invalidate cached site data."""
         key = self._generate_key("site_data", site, category, country)
@@ -444,7 +511,7 @@ def create_cache_manager(config: Dict) -> CacheManager:
     
     if use_mock:
         ttl_default = cache_config.get('ttl_default', 3600)
-        cache_impl = MockCache(ttl_default=ttl_default)
+        cache_impl = MockCache(ttl_default=ttl_default, max_entries=cache_config.get('max_entries'))
     else:
         redis_config = cache_config.get('redis', {})
         cache_impl = RedisCache(
@@ -455,4 +522,4 @@ def create_cache_manager(config: Dict) -> CacheManager:
             ttl_default=redis_config.get('ttl_default', 3600)
         )
     
-    return CacheManager(cache_impl) 
\ No newline at end of file
+    return CacheManager(cache_impl, canonicalize_url=create_url_canonicalizer(config).canonicalize)
@@ -0,0 +1,120 @@
+"""
+Config Loader
+Loads YAML config files through compiled snapshots.
+
+PyYAML's pure-Python loader takes a large share of CLI startup on the
+1300-line pipeline config. The first load of a file parses it and stores the
+result as a pickle next to it, in `__pycache__/` like compiled bytecode. Later
+loads read the file, hash its bytes and unpickle the snapshot for that hash.
+Snapshots are keyed on the content hash rather than the mtime, so an edit
+within the mtime resolution, or a checkout that resets mtimes, is never
+served stale. Every call returns a fresh object that callers may modify.
+"""
+
+import hashlib
+import os
+import pickle
+from typing import Any, Dict, Tuple
+
+
+SNAPSHOT_DIR = '__pycache__'
+# Set to any non-empty value to always parse the YAML (e.g. while debugging the loader)
+DISABLE_ENV = 'PRICEIQ_NO_CONFIG_SNAPSHOT'
+
+# Pickled configs already loaded by this process, by (absolute path, content hash)
+_loaded: Dict[Tuple[str, str], bytes] = {}
+
+
+def snapshot_path(path: str, digest: str) -> str:
+    """
+    Snapshot file of a config file's content.
+
+    Args:
+        path: YAML config file
+        digest: Hash of the file's bytes
+
+    Returns:
+        str: `<dir>/__pycache__/<name>.<digest>.pickle`
+    """
+    directory, name = os.path.split(os.path.abspath(path))
+    return os.path.join(directory, SNAPSHOT_DIR, f"{name}.{digest}.pickle")
+
+
+def load_config(path: str, snapshot: bool = True) -> Any:
+    """
+    Load a YAML config file.
+
+    Args:
+        path: YAML config file
+        snapshot: Use (and write) the compiled snapshot
+
+    Returns:
+        Any: Parsed config
+
+    Raises:
+        OSError: If the file cannot be read
+        yaml.YAMLError: If the file is not valid YAML
+    """
+    with open(path, 'rb') as handle:
+        raw = handle.read()
+    if not snapshot or os.environ.get(DISABLE_ENV):
+        return _parse(raw)
+
+    digest = hashlib.blake2b(raw, digest_size=16).hexdigest()
+    key = (os.path.abspath(path), digest)
+    blob = _loaded.get(key)
+    if blob is None:
+        blob = _read_snapshot(snapshot_path(path, digest))
+    if blob is not None:
+        try:
+            config = pickle.loads(blob)
+            _loaded[key] = blob
+            return config
+        except Exception:
+            pass
+
+    config = _parse(raw)
+    blob = pickle.dumps(config, protocol=pickle.HIGHEST_PROTOCOL)
+    _loaded[key] = blob
+    _write_snapshot(path, snapshot_path(path, digest), blob)
+    return config
+
+
+def _parse(raw: bytes) -> Any:
+    """Parse YAML; PyYAML is only imported when a file actually has to be parsed."""
+    import yaml
+    return yaml.safe_load(raw)
+
+
+def _read_snapshot(location: str) -> Any:
+    """Bytes of a snapshot file, or None if there is none."""
+    try:
+        with open(location, 'rb') as handle:
+            return handle.read()
+    except OSError:
+        return None
+
+
+def _write_snapshot(path: str, location: str, blob: bytes) -> None:
+    """
+    Store a snapshot atomically and drop the file's older snapshots.
+
+    Failures (e.g. a read-only checkout) are ignored: the config then keeps
+    being parsed from YAML.
+    """
+    # Only needed when a snapshot is (re)written, so not imported at startup
+    import glob
+    import tempfile
+    directory = os.path.dirname(location)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        handle, temporary = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(handle, 'wb') as output:
+            output.write(blob)
+        os.replace(temporary, location)
+        name = os.path.basename(os.path.abspath(path))
+        for stale in glob.glob(os.path.join(directory, glob.escape(name) + '.*.pickle')):
+            if stale != location:
+                os.remove(stale)
+    except OSError:
+        pass
@@ -0,0 +1,388 @@
+"""
+Persistent catalog of canonical products for incremental deduplication.
+
+The catalog is a local SQLite database that remembers, across runs:
+- every product name seen, with its token set and MinHash signature,
+- every blocking key (see identity.py) and
+- the LSH band buckets of every name signature (see near_duplicate.py),
+each pointing at a canonical product id.
+
+New listings are matched against it with indexed lookups (exact name, then
+blocking keys, then LSH buckets confirmed by token-set Jaccard), so a run
+costs O(new listings) instead of re-clustering history. A canonical id is
+never reassigned once stored, so ids stay stable across queries and days.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.deduplicator.identity import CANONICAL_ID_FIELD, IdentityResolver, key_order, merge_labels
+from src.deduplicator.near_duplicate import NearDuplicateEngine
+from src.models.product_batch import ProductBatch
+
+
+# Host parameters per IN (...) lookup, below SQLite's default limit
+_LOOKUP_CHUNK = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS settings (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS products (
+    canonical_id TEXT PRIMARY KEY,
+    display_name TEXT,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    listing_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS names (
+    name_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    canonical_id TEXT NOT NULL,
+    tokens TEXT NOT NULL,
+    signature BLOB
+);
+CREATE TABLE IF NOT EXISTS blocking_keys (
+    key TEXT PRIMARY KEY,
+    canonical_id TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS lsh_buckets (
+    bucket INTEGER NOT NULL,
+    name_id INTEGER NOT NULL,
+    PRIMARY KEY (bucket, name_id)
+) WITHOUT ROWID;
+"""
+
+
+def _chunks(values: Sequence, size: int = _LOOKUP_CHUNK) -> Iterable[Sequence]:
+    """Yield consecutive slices of at most `size` values."""
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+class CanonicalCatalog:
+    """
+    CanonicalCatalog matches listings to canonical products remembered across runs.
+
+    Names, blocking keys and LSH buckets all map to a canonical id, so
+    matching a listing is a handful of indexed lookups however large the
+    catalog grows. The connection is shared by threads and every access
+    to it holds one lock, so concurrent assign() calls never race to create
+    the same product twice.
+    """
+
+    def __init__(self, path: str = ':memory:', engine: Optional[NearDuplicateEngine] = None,
+                 resolver: Optional[IdentityResolver] = None):
+        """
+        Open (or create) a catalog.
+
+        Args:
+            path: SQLite database file, or ':memory:' for a throwaway catalog
+            engine: MinHash/LSH settings for name matching (defaults to NearDuplicateEngine())
+            resolver: Blocking-key builder (defaults to IdentityResolver())
+
+        Raises:
+            ValueError: If the catalog was built with different MinHash/LSH settings
+        """
+        self.path = path
+        self.engine = engine or NearDuplicateEngine()
+        self.resolver = resolver or IdentityResolver()
+        self.last_run: Dict[str, int] = {'listings': 0, 'names_known': 0, 'matched': 0, 'new_products': 0}
+
+        if path != ':memory:':
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        if path != ':memory:':
+            self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.executescript(_SCHEMA)
+        self._check_settings()
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict], engine: Optional[NearDuplicateEngine] = None,
+                    resolver: Optional[IdentityResolver] = None) -> Optional['CanonicalCatalog']:
+        """
+        Open a catalog from a `catalog` config section.
+
+        Args:
+            config: Section with enabled/path keys, or None
+            engine: MinHash/LSH settings to use
+            resolver: Blocking-key builder to use
+
+        Returns:
+            Optional[CanonicalCatalog]: Catalog, or None if disabled or not configured
+        """
+        if not config or not config.get('enabled', True):
+            return None
+        return cls(config.get('path', ':memory:'), engine=engine, resolver=resolver)
+
+    def _check_settings(self) -> None:
+        """Store the signature settings on first use; refuse to mix settings later."""
+        settings = {
+            'num_perm': str(self.engine.num_perm),
+            'bands': str(self.engine.bands),
+            'seed': str(self.engine.seed),
+        }
+        with self.connection:
+            stored = dict(self.connection.execute('SELECT name, value FROM settings'))
+            if not stored:
+                self.connection.executemany('INSERT INTO settings (name, value) VALUES (?, ?)',
+                                            settings.items())
+                return
+        if stored != settings:
+            raise ValueError(f"Catalog {self.path} was built with MinHash settings {stored}, "
+                             f"not {settings}")
+
+    def assign(self, products: Sequence[Mapping]) -> List[str]:
+        """
+        Canonical product id of every listing, adding new products to the catalog.
+
+        Listings are first grouped among themselves (near-duplicate names and
+        shared blocking keys). A group takes the id of the catalog product it
+        matches, preferring an exact name match, then a blocking key, then a
+        near-duplicate name; a group matching nothing becomes a new product.
+
+        Args:
+            products: Product records
+
+        Returns:
+            List[str]: Canonical id per listing, in input order
+        """
+        count = len(products)
+        if not count:
+            with self._lock:
+                self.last_run = {'listings': 0, 'names_known': 0, 'matched': 0, 'new_products': 0}
+            return []
+
+        batch = ProductBatch.from_products(products)
+        new_ids, listing_keys = self.resolver.resolve_keys(batch.records)
+        labels = merge_labels(self.engine.cluster(batch), new_ids)
+        with self._lock:
+            return self._assign(batch, new_ids, listing_keys, labels)
+
+    def _assign(self, batch: ProductBatch, new_ids: List[str], listing_keys: List[List[str]],
+                labels: np.ndarray) -> List[str]:
+        """Match grouped listings against the catalog and store the run (caller holds the lock)."""
+        self.last_run = {'listings': len(batch), 'names_known': 0, 'matched': 0, 'new_products': 0}
+        names = batch.name_vocab
+        known_names = self._lookup('SELECT name, canonical_id FROM names WHERE name IN ({})', names)
+        self.last_run['names_known'] = len(known_names)
+        unknown = [code for code, name in enumerate(names) if name not in known_names]
+
+        token_ids, token_offsets = batch.name_token_ids, batch.name_token_offsets
+        token_hashes = self.engine.token_hashes(batch.token_vocab)
+        signatures, has_tokens = self.engine.signatures(token_ids, token_offsets, token_hashes)
+        token_sets = [
+            frozenset(batch.token_vocab[t] for t in token_ids[token_offsets[code]:token_offsets[code + 1]].tolist())
+            for code in range(len(names))
+        ]
+        similar = self._similar_names(unknown, signatures, has_tokens, token_sets)
+
+        distinct_keys = sorted({key for keys in listing_keys for key in keys})
+        known_keys = self._lookup('SELECT key, canonical_id FROM blocking_keys WHERE key IN ({})', distinct_keys)
+
+        # Pick one canonical id per group
+        group_choice: Dict[int, Tuple[Tuple, str]] = {}
+        name_codes = batch.name.tolist()
+        for row, label in enumerate(labels.tolist()):
+            candidates = []
+            name = names[name_codes[row]]
+            if name in known_names:
+                candidates.append(((0, name), known_names[name]))
+            for key in listing_keys[row]:
+                if key in known_keys:
+                    candidates.append(((1,) + key_order(key), known_keys[key]))
+            if name_codes[row] in similar:
+                similarity, matched_id = similar[name_codes[row]]
+                candidates.append(((2, -similarity, matched_id), matched_id))
+            if not candidates:
+                candidates.append(((3, new_ids[row]), new_ids[row]))
+            best = min(candidates)
+            if label not in group_choice or best < group_choice[label]:
+                group_choice[label] = best
+
+        ids = [group_choice[label][1] for label in labels.tolist()]
+        self._store(batch, ids, listing_keys, known_names, signatures, has_tokens, token_sets)
+        self.last_run['matched'] = sum(1 for choice, _ in group_choice.values() if choice[0] < 3)
+        self.last_run['new_products'] = len(group_choice) - self.last_run['matched']
+        return ids
+
+    def annotate(self, products: Sequence[Mapping]) -> Sequence[Mapping]:
+        """
+        Set `canonical_id` on every listing (in place) via assign().
+
+        Args:
+            products: Product records
+
+        Returns:
+            Sequence[Mapping]: The same records
+        """
+        for product, canonical_id in zip(products, self.assign(products)):
+            product[CANONICAL_ID_FIELD] = canonical_id
+        return products
+
+    def lookup_name(self, name: str) -> Optional[str]:
+        """
+        Canonical id stored for an exact product name, without changing the catalog.
+
+        Args:
+            name: Product name
+
+        Returns:
+            Optional[str]: Canonical id, or None if the name is unknown
+        """
+        with self._lock:
+            row = self.connection.execute('SELECT canonical_id FROM names WHERE name = ?', (name,)).fetchone()
+        return row[0] if row else None
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Catalog size and the outcome of the last assign() call.
+
+        Returns:
+            Dict[str, Any]: Row counts per table plus 'last_run'
+        """
+        with self._lock:
+            execute = self.connection.execute
+            return {
+                'products': execute('SELECT COUNT(*) FROM products').fetchone()[0],
+                'names': execute('SELECT COUNT(*) FROM names').fetchone()[0],
+                'blocking_keys': execute('SELECT COUNT(*) FROM blocking_keys').fetchone()[0],
+                'last_run': dict(self.last_run),
+            }
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self.connection.close()
+
+    def _lookup(self, query: str, values: Sequence[str]) -> Dict[str, str]:
+        """
+        Run a two-column IN (...) lookup in chunks.
+
+        Args:
+            query: SQL with one '{}' placeholder for the parameter list
+            values: Values to look up
+
+        Returns:
+            Dict[str, str]: First column → second column for the rows found
+        """
+        found = {}
+        for chunk in _chunks(list(values)):
+            placeholders = ','.join('?' * len(chunk))
+            found.update(self.connection.execute(query.format(placeholders), chunk))
+        return found
+
+    def _similar_names(self, codes: List[int], signatures: np.ndarray, has_tokens: np.ndarray,
+                       token_sets: List[frozenset]) -> Dict[int, Tuple[float, str]]:
+        """
+        Match unknown names to stored near-duplicate names via LSH buckets.
+
+        Args:
+            codes: name_vocab codes of the names not in the catalog
+            signatures: MinHash signature per name_vocab entry
+            has_tokens: Mask of names with at least one token
+            token_sets: Token set per name_vocab entry
+
+        Returns:
+            Dict[int, Tuple[float, str]]: name code → (Jaccard similarity, canonical id)
+                of the most similar stored name at or above the threshold
+        """
+        codes = [code for code in codes if has_tokens[code]]
+        if not codes:
+            return {}
+
+        buckets = self.engine.band_keys(signatures[codes]).view(np.int64)
+        bucket_owners: Dict[int, List[int]] = {}
+        for code, row in zip(codes, buckets.tolist()):
+            for bucket in row:
+                bucket_owners.setdefault(bucket, []).append(code)
+
+        candidates: Dict[int, set] = {}
+        for chunk in _chunks(list(bucket_owners)):
+            placeholders = ','.join('?' * len(chunk))
+            for bucket, name_id in self.connection.execute(
+                    f'SELECT bucket, name_id FROM lsh_buckets WHERE bucket IN ({placeholders})', chunk):
+                for code in bucket_owners[bucket]:
+                    candidates.setdefault(code, set()).add(name_id)
+        if not candidates:
+            return {}
+
+        name_ids = sorted({name_id for ids in candidates.values() for name_id in ids})
+        stored = {}
+        for chunk in _chunks(name_ids):
+            placeholders = ','.join('?' * len(chunk))
+            for name_id, canonical_id, tokens in self.connection.execute(
+                    f'SELECT name_id, canonical_id, tokens FROM names WHERE name_id IN ({placeholders})', chunk):
+                stored[name_id] = (frozenset(tokens.split(' ')), canonical_id)
+
+        threshold = self.engine.threshold
+        similar = {}
+        for code, ids in candidates.items():
+            mine = token_sets[code]
+            best = None
+            for name_id in ids:
+                theirs, canonical_id = stored[name_id]
+                shared = len(mine & theirs)
+                similarity = shared / (len(mine) + len(theirs) - shared)
+                if similarity >= threshold and (best is None or (-similarity, canonical_id) < (-best[0], best[1])):
+                    best = (similarity, canonical_id)
+            if best is not None:
+                similar[code] = best
+        return similar
+
+    def _store(self, batch: ProductBatch, ids: List[str], listing_keys: List[List[str]],
+               known_names: Dict[str, str], signatures: np.ndarray, has_tokens: np.ndarray,
+               token_sets: List[frozenset]) -> None:
+        """
+        Record the run: new products, new names with their LSH buckets, new keys.
+
+        Existing mappings are never overwritten, which keeps ids stable.
+        """
+        now = time.time()
+        names = batch.name_vocab
+        name_codes = batch.name.tolist()
+
+        listing_counts: Dict[str, int] = {}
+        display_names: Dict[str, str] = {}
+        name_ids_by_code: Dict[int, str] = {}
+        key_rows = {}
+        for row, canonical_id in enumerate(ids):
+            listing_counts[canonical_id] = listing_counts.get(canonical_id, 0) + 1
+            display_names.setdefault(canonical_id, names[name_codes[row]])
+            name_ids_by_code.setdefault(name_codes[row], canonical_id)
+            for key in listing_keys[row]:
+                key_rows.setdefault(key, canonical_id)
+
+        new_codes = [code for code in sorted(name_ids_by_code) if names[code] not in known_names]
+        with self.connection:
+            execute = self.connection.execute
+            for canonical_id, listings in listing_counts.items():
+                execute('INSERT INTO products (canonical_id, display_name, first_seen, last_seen, listing_count) '
+                        'VALUES (?, ?, ?, ?, ?) ON CONFLICT(canonical_id) DO UPDATE SET '
+                        'last_seen = excluded.last_seen, listing_count = listing_count + excluded.listing_count',
+                        (canonical_id, display_names[canonical_id], now, now, listings))
+
+            self.connection.executemany(
+                'INSERT OR IGNORE INTO blocking_keys (key, canonical_id) VALUES (?, ?)', key_rows.items())
+
+            if new_codes:
+                buckets = self.engine.band_keys(signatures[new_codes]).view(np.int64).tolist()
+                for code, code_buckets in zip(new_codes, buckets):
+                    cursor = execute(
+                        'INSERT OR IGNORE INTO names (name, canonical_id, tokens, signature) VALUES (?, ?, ?, ?)',
+                        (names[code], name_ids_by_code[code], ' '.join(sorted(token_sets[code])),
+                         signatures[code].tobytes()))
+                    if cursor.rowcount and has_tokens[code]:
+                        self.connection.executemany(
+                            'INSERT OR IGNORE INTO lsh_buckets (bucket, name_id) VALUES (?, ?)',
+                            ((bucket, cursor.lastrowid) for bucket in code_buckets))
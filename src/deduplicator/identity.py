@@ -0,0 +1,363 @@
+"""
+Cross-site product identity resolution with blocking keys.
+
+Every listing gets one or more blocking keys:
+- strong identifiers found on the page or in the link (GTIN/EAN/UPC, ASIN,
+  brand-scoped MPN), and
+- an attribute key built from the normalized name (brand, model, storage,
+  colour, size, plus RAM/processor for laptops), or a token-set key of the
+  name when brand or model cannot be recognized.
+
+Listings sharing any key are grouped with union-find, using dict lookups
+only (no pairwise comparison), and each group gets a canonical product id
+derived from its best-ranked key (attributes first, then identifiers). The
+id only depends on the group's keys, so the same product gets the same id
+on every run and on every site.
+"""
+
+import hashlib
+import re
+from collections.abc import Mapping
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.deduplicator.near_duplicate import UnionFind
+from src.models.product_batch import ProductBatch
+from src.query_normalizer.real_normalizer import RealQueryNormalizer
+
+
+CANONICAL_ID_FIELD = 'canonical_id'
+
+# Product fields that may carry a page identifier, by identifier kind
+_GTIN_FIELDS = ('gtin', 'gtin8', 'gtin12', 'gtin13', 'gtin14', 'ean', 'upc')
+_ASIN_FIELDS = ('asin',)
+_MPN_FIELDS = ('mpn',)
+
+# Normalized attributes that make up the attribute key
+ATTRIBUTE_FIELDS = ('brand', 'model', 'storage', 'color', 'size', 'ram', 'processor')
+
+# Lower rank wins when picking the key a group's canonical id is derived from.
+# Attribute keys come first: every site has a name, while ASINs and GTINs only
+# appear on some, so a listing keeps its id whether or not such listings are present
+_KEY_RANK = {'attrs': 0, 'gtin': 1, 'asin': 2, 'mpn': 3, 'name': 4}
+
+_ASIN_LINK_PATTERN = re.compile(r'/(?:dp|gp/product|gp/aw/d)/([A-Z0-9]{10})(?:[/?#]|$)', re.IGNORECASE)
+_ASIN_PATTERN = re.compile(r'^[A-Z0-9]{10}$')
+_NAME_TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+
+def normalize_gtin(value: Any) -> Optional[str]:
+    """
+    Normalize a GTIN-8/12/13/14 (EAN, UPC) to 14 digits.
+
+    Args:
+        value: Raw identifier
+
+    Returns:
+        Optional[str]: 14-digit GTIN, or None if it is not a valid GTIN
+            (wrong length or check digit)
+    """
+    digits = re.sub(r'[\s-]', '', str(value))
+    if not digits.isdigit() or len(digits) not in (8, 12, 13, 14):
+        return None
+    digits = digits.zfill(14)
+    body = [int(d) for d in digits[:-1]]
+    # Weights alternate 3, 1, ... from the digit next to the check digit
+    total = sum(d * (3 if i % 2 == 0 else 1) for i, d in enumerate(reversed(body)))
+    if (10 - total % 10) % 10 != int(digits[-1]):
+        return None
+    return digits
+
+
+def normalize_asin(value: Any) -> Optional[str]:
+    """
+    Normalize an Amazon ASIN.
+
+    Args:
+        value: Raw identifier
+
+    Returns:
+        Optional[str]: Upper-case 10-character ASIN, or None if malformed
+    """
+    asin = str(value).strip().upper()
+    return asin if _ASIN_PATTERN.match(asin) else None
+
+
+def normalize_mpn(value: Any) -> Optional[str]:
+    """
+    Normalize a manufacturer part number (upper case, separators dropped).
+
+    Args:
+        value: Raw identifier
+
+    Returns:
+        Optional[str]: Normalized MPN, or None if empty
+    """
+    mpn = re.sub(r'[\s\-_./]', '', str(value)).upper()
+    return mpn or None
+
+
+def canonical_id_for_key(key: str) -> str:
+    """
+    Canonical product id for a blocking key.
+
+    Args:
+        key: Blocking key, e.g. "gtin:00195949773386"
+
+    Returns:
+        str: Id of the form "cp_<16 hex digits>"
+    """
+    return 'cp_' + hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+
+class IdentityResolver:
+    """
+    IdentityResolver assigns a stable canonical product id to every listing.
+
+    Listings of the same product on different sites (or under slightly
+    different names) share an id, so comparing them is a dict lookup.
+    """
+
+    def __init__(self, normalizer: Optional[RealQueryNormalizer] = None,
+                 use_identifiers: bool = True, cache_size: int = 100000):
+        """
+        Initialize the resolver.
+
+        Args:
+            normalizer: Attribute extractor for product names (RealQueryNormalizer by default)
+            use_identifiers: Whether GTIN/ASIN/MPN keys are used
+            cache_size: Maximum number of product names whose attributes are cached
+        """
+        self.normalizer = normalizer or RealQueryNormalizer()
+        self.use_identifiers = use_identifiers
+        self.cache_size = cache_size
+        self._attribute_cache: Dict[str, Dict[str, Optional[str]]] = {}
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict]) -> Optional['IdentityResolver']:
+        """
+        Build a resolver from an `identity` config section.
+
+        Args:
+            config: Section with enabled/use_identifiers keys, or None
+
+        Returns:
+            Optional[IdentityResolver]: Resolver, or None if disabled or not configured
+        """
+        if not config or not config.get('enabled', True):
+            return None
+        return cls(use_identifiers=config.get('use_identifiers', True))
+
+    def attributes(self, name: str) -> Dict[str, Optional[str]]:
+        """
+        Normalized identity attributes of a product name (cached per name).
+
+        Args:
+            name: Product name
+
+        Returns:
+            Dict[str, Optional[str]]: Value per ATTRIBUTE_FIELDS entry
+        """
+        cached = self._attribute_cache.get(name)
+        if cached is not None:
+            return cached
+
+        normalized = self.normalizer.normalize_query(name)
+        attributes = {field: normalized.get(field) for field in ATTRIBUTE_FIELDS}
+        # Phones and laptops report screen size, sports items report shoe size
+        attributes['size'] = normalized.get('size') or normalized.get('screen_size')
+
+        if len(self._attribute_cache) >= self.cache_size:
+            self._attribute_cache.clear()
+        self._attribute_cache[name] = attributes
+        return attributes
+
+    def identifiers(self, product: Mapping) -> Dict[str, str]:
+        """
+        Page identifiers of a listing, from product fields or its link.
+
+        Args:
+            product: Product record
+
+        Returns:
+            Dict[str, str]: Normalized identifier per kind ('gtin', 'asin', 'mpn')
+        """
+        found = {}
+        for kind, fields, normalize in (('gtin', _GTIN_FIELDS, normalize_gtin),
+                                        ('asin', _ASIN_FIELDS, normalize_asin),
+                                        ('mpn', _MPN_FIELDS, normalize_mpn)):
+            for field in fields:
+                value = product.get(field)
+                if value:
+                    normalized = normalize(value)
+                    if normalized:
+                        found[kind] = normalized
+                        break
+
+        if 'asin' not in found:
+            match = _ASIN_LINK_PATTERN.search(str(product.get('link') or ''))
+            if match:
+                found['asin'] = match.group(1).upper()
+        return found
+
+    def blocking_keys(self, product: Mapping) -> List[str]:
+        """
+        Blocking keys of a listing; listings sharing a key are the same product.
+
+        Args:
+            product: Product record
+
+        Returns:
+            List[str]: Keys of the form "<kind>:<value>"
+        """
+        name = str(product.get('productName') or '')
+        attributes = self.attributes(name)
+        brand = (attributes['brand'] or '').lower()
+
+        keys = []
+        if self.use_identifiers:
+            for kind, value in self.identifiers(product).items():
+                if kind == 'mpn':
+                    # Part numbers are only unique within a brand
+                    if not brand:
+                        continue
+                    value = f"{brand}|{value}"
+                keys.append(f"{kind}:{value}")
+
+        if attributes['brand'] and attributes['model']:
+            keys.append('attrs:' + '|'.join((attributes[field] or '').lower() for field in ATTRIBUTE_FIELDS))
+        elif not keys:
+            tokens = sorted(set(_NAME_TOKEN_PATTERN.findall(name.lower())))
+            keys.append('name:' + ' '.join(tokens))
+        return keys
+
+    def resolve(self, products: Sequence[Mapping]) -> List[str]:
+        """
+        Canonical product id of every listing.
+
+        Args:
+            products: Product records
+
+        Returns:
+            List[str]: Canonical id per listing, in input order
+        """
+        return self.resolve_keys(products)[0]
+
+    def resolve_keys(self, products: Sequence[Mapping]) -> Tuple[List[str], List[List[str]]]:
+        """
+        Canonical product id and blocking keys of every listing.
+
+        Args:
+            products: Product records
+
+        Returns:
+            Tuple of (canonical id per listing, blocking keys per listing)
+        """
+        count = len(products)
+        if not count:
+            return [], []
+
+        # Map every key to the first listing that has it; later listings
+        # with the same key are linked to that one
+        key_owner: Dict[str, int] = {}
+        listing_keys: List[List[str]] = []
+        left, right = [], []
+        for row, product in enumerate(products):
+            keys = self.blocking_keys(product)
+            listing_keys.append(keys)
+            for key in keys:
+                owner = key_owner.setdefault(key, row)
+                if owner != row:
+                    left.append(owner)
+                    right.append(row)
+
+        union_find = UnionFind(count)
+        union_find.union_pairs(np.array(left, dtype=np.int64), np.array(right, dtype=np.int64))
+        roots = union_find.roots().tolist()
+
+        # A group's id comes from its best-ranked key (ties broken by value),
+        # so it does not depend on listing order
+        best_key: Dict[int, str] = {}
+        for root, keys in zip(roots, listing_keys):
+            for key in keys:
+                current = best_key.get(root)
+                if current is None or key_order(key) < key_order(current):
+                    best_key[root] = key
+
+        ids = {root: canonical_id_for_key(key) for root, key in best_key.items()}
+        return [ids[root] for root in roots], listing_keys
+
+    def resolve_batch(self, batch: ProductBatch) -> np.ndarray:
+        """
+        Canonical product ids of a columnar batch.
+
+        Args:
+            batch: Listings in columnar form
+
+        Returns:
+            np.ndarray: Canonical id per row (object array of str)
+        """
+        return np.array(self.resolve(batch.records), dtype=object)
+
+    def annotate(self, products: Sequence[Mapping]) -> Sequence[Mapping]:
+        """
+        Set `canonical_id` on every listing (in place).
+
+        Args:
+            products: Product records
+
+        Returns:
+            Sequence[Mapping]: The same records
+        """
+        for product, canonical_id in zip(products, self.resolve(products)):
+            product[CANONICAL_ID_FIELD] = canonical_id
+        return products
+
+    def index(self, products: Sequence[Mapping]) -> Dict[str, List[int]]:
+        """
+        Group listings by canonical product id.
+
+        Args:
+            products: Product records
+
+        Returns:
+            Dict[str, List[int]]: Listing positions per canonical id, in input order
+        """
+        groups: Dict[str, List[int]] = {}
+        for row, canonical_id in enumerate(self.resolve(products)):
+            groups.setdefault(canonical_id, []).append(row)
+        return groups
+
+
+def key_order(key: str) -> Tuple[int, str]:
+    """
+    Sort key for blocking keys: best-ranked kind first, then by value.
+
+    Args:
+        key: Blocking key
+
+    Returns:
+        Tuple[int, str]: (kind rank, key)
+    """
+    kind = key.split(':', 1)[0]
+    return _KEY_RANK.get(kind, len(_KEY_RANK)), key
+
+
+def merge_labels(*labelings: np.ndarray) -> np.ndarray:
+    """
+    Combine row labelings: rows sharing a label in any labeling end up together.
+
+    Args:
+        labelings: Integer (or hashable) label per row, all the same length
+
+    Returns:
+        np.ndarray: Combined label per row (the smallest row index of its group)
+    """
+    count = len(labelings[0])
+    union_find = UnionFind(count)
+    rows = np.arange(count, dtype=np.int64)
+    for labels in labelings:
+        _, first, inverse = np.unique(np.asarray(labels), return_index=True, return_inverse=True)
+        union_find.union_pairs(rows, first[inverse.reshape(-1)])
+    return union_find.roots()
@@ -5,7 +5,13 @@ Removes duplicate product entries based on similarity matching.
 
 from abc import ABC, abstractmethod
 from typing import List, Dict, Any
-import yaml
+import numpy as np
+from src.models.fingerprint import FixtureIndex
+from src.models.product_batch import ProductBatch
+from src.deduplicator.near_duplicate import NearDuplicateEngine
+from src.deduplicator.identity import IdentityResolver, merge_labels
+from src.deduplicator.catalog import CanonicalCatalog
+from src.config.loader import load_config
 
 
 class DeduplicatorInterface(ABC):
@@ -34,8 +40,7 @@ class MockDeduplicator(DeduplicatorInterface):
     def deduplicate_products(self, products: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Mock implementation that returns predefined deduplicated data."""
         try:
-            with open(self.mock_data_path, 'r') as f:
-                mock_data = yaml.safe_load(f)
+            mock_data = load_config(self.mock_data_path)
                 
             return mock_data.get('deduplicated_products', [])
                 
@@ -47,14 +52,33 @@ class MockDeduplicator(DeduplicatorInterface):
 class RealDeduplicator(DeduplicatorInterface):
     """Real implementation of deduplicator."""
     
+    def __init__(self, config: Dict[str, Any] = None):
+        """
+        Initialize with an optional `near_duplicates` config section.
+        
+        Args:
+            config: Deduplicator config (module section)
+        """
+        self.config = config or {}
+        self.engine = (NearDuplicateEngine.from_config(self.config.get('near_duplicates', {}))
+                       or NearDuplicateEngine())
+        self.identity = (IdentityResolver.from_config(self.config.get('identity', {}))
+                         or IdentityResolver())
+    
     def deduplicate_products(self, products: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Real implementation for product deduplication.
-        This would use fuzzy matching, ML models, etc.
+        Drops listings whose name is a near-duplicate of an earlier listing
+        (MinHash/LSH, see near_duplicate.py) or that resolve to the same
+        canonical product (see identity.py), with the same price and currency.
         """
-        # TODO: Implement real deduplication logic
-        # For now, return products as-is
-        return products 
+        if len(products) < 2:
+            return list(products)
+        
+        batch = ProductBatch.from_products(products)
+        labels = merge_labels(self.engine.cluster(batch), self.identity.resolve(batch.records))
+        keep = first_occurrences(labels, batch.raw_price, batch.currency)
+        return [products[i] for i in keep.tolist()]
 
 
 class Deduplicator:
@@ -71,13 +95,28 @@ class Deduplicator:
             config (dict or str): Config dict or path to YAML config file.
         """
         if isinstance(config, str):
-            with open(config, 'r') as f:
-                self.config = yaml.safe_load(f)
+            self.config = load_config(config)
         else:
             self.config = config
             
         self.use_mock = self.config.get('modules', {}).get('deduplicator', {}).get('use_mock', True)
         self.mock_results = self.config.get('modules', {}).get('deduplicator', {}).get('mock_deduplicated_results', {})
+        # Fixture inputs indexed by order-independent fingerprint
+        self.mock_index = FixtureIndex(self.mock_results)
+        self.near_duplicates = NearDuplicateEngine.from_config(
+            self.config.get('modules', {}).get('deduplicator', {}).get('near_duplicates')
+        )
+        self.identity = IdentityResolver.from_config(
+            self.config.get('modules', {}).get('deduplicator', {}).get('identity')
+        )
+        # A persistent catalog keeps canonical ids stable across queries and runs
+        self.catalog = CanonicalCatalog.from_config(
+            self.config.get('modules', {}).get('deduplicator', {}).get('catalog'),
+            engine=self.near_duplicates,
+            resolver=self.identity
+        )
+        if self.catalog is not None and self.identity is None:
+            self.identity = self.catalog.resolver
     
     def deduplicate(self, products: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
@@ -87,42 +126,91 @@ class Deduplicator:
             products (List[Dict[str, Any]]): List of validated product entries
             
         Returns:
-            List[Dict[str, Any]]: Deduplicated list of products
+            List[Dict[str, Any]]: Deduplicated list of products (copies carrying
+                `canonical_id` when identities are resolved; the input is left unchanged)
             
         Raises:
             NotImplementedError: If use_mock is False (real deduplication not implemented)
         """
         if self.use_mock:
             # Check if input matches mock input pattern
-            mock_input = self.mock_results.get('input_products', [])
-            if self._lists_match(products, mock_input):
-                return self.mock_results.get('output_products', []).copy()
+            outputs = self.mock_index.lookup(products)
+            if outputs is not None:
+                if self.identity is not None:
+                    return self._annotated(outputs)
+                return outputs.copy()
             else:
                 # If no exact match, perform basic deduplication
-                return self._basic_deduplicate(products)
+                return self._basic_deduplicate(self._annotated(products))
         else:
             # TODO: Real implementation would use semantic embeddings or ML
             raise NotImplementedError("Real deduplication not implemented yet")
     
-    def _lists_match(self, list1: List[Dict[str, Any]], list2: List[Dict[str, Any]]) -> bool:
+    def deduplicate_batch(self, batch: ProductBatch) -> ProductBatch:
         """
-        Check if two lists of products match (for mock input validation).
+        Remove duplicate products from a columnar batch.
+        Gives the same products, in the same order, as deduplicate().
         
         Args:
-            list1: First list of products
-            list2: Second list of products
+            batch (ProductBatch): Validated products in columnar form
             
         Returns:
-            bool: True if lists match, False otherwise
+            ProductBatch: Deduplicated batch
+            
+        Raises:
+            NotImplementedError: If use_mock is False (real deduplication not implemented)
         """
-        if len(list1) != len(list2):
-            return False
+        if not self.use_mock:
+            raise NotImplementedError("Real deduplication not implemented yet")
         
-        # Sort both lists by product name for comparison
-        sorted1 = sorted(list1, key=lambda x: x.get('productName', ''))
-        sorted2 = sorted(list2, key=lambda x: x.get('productName', ''))
+        outputs = self.mock_index.lookup(batch.records)
+        if outputs is not None:
+            return ProductBatch.from_products(self._annotated(outputs))
         
-        return sorted1 == sorted2
+        records = self._annotated(batch.records)
+        if records is not batch.records:
+            batch = batch.with_records(records)
+        return batch.take(self._basic_deduplicate_indices(batch))
+    
+    def _annotated(self, products: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Copies of the products carrying canonical_id, from the catalog if one is configured.
+        
+        Args:
+            products (List[Dict[str, Any]]): Products to annotate (left unchanged)
+            
+        Returns:
+            List[Dict[str, Any]]: Annotated copies, or the products themselves
+                when no identity resolver is configured
+        """
+        if self.identity is None:
+            return products
+        # Copy first: the products belong to the caller (fixtures, cached pages)
+        products = [dict(product) for product in products]
+        if self.catalog is not None:
+            self.catalog.annotate(products)
+        else:
+            self.identity.annotate(products)
+        return products
+    
+    def _basic_deduplicate_indices(self, batch: ProductBatch) -> np.ndarray:
+        """
+        Column-wise version of _basic_deduplicate.
+        
+        Args:
+            batch (ProductBatch): Products in columnar form
+            
+        Returns:
+            np.ndarray: Row indices of the first occurrence of each
+                (name, price, currency) key, in input order
+        """
+        # Near-duplicate names share a cluster label and count as the same name
+        names = batch.name if self.near_duplicates is None or len(batch) < 2 else self.near_duplicates.cluster(batch)
+        if self.identity is not None and len(batch) > 1:
+            # Listings resolved to the same canonical product also count as the same name
+            canonical_ids = [record.get('canonical_id') or f"#{row}" for row, record in enumerate(batch.records)]
+            names = merge_labels(names, canonical_ids)
+        return first_occurrences(names, batch.raw_price, batch.currency)
     
     def _basic_deduplicate(self, products: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
@@ -134,6 +222,10 @@ class Deduplicator:
         Returns:
             List[Dict[str, Any]]: Deduplicated list
         """
+        if (self.near_duplicates is not None or self.identity is not None) and len(products) > 1:
+            batch = ProductBatch.from_products(products)
+            return [products[i] for i in self._basic_deduplicate_indices(batch).tolist()]
+        
         seen = set()
         unique_products = []
         
@@ -145,4 +237,21 @@ class Deduplicator:
                 seen.add(product_key)
                 unique_products.append(product)
         
-        return unique_products 
\ No newline at end of file
+        return unique_products
+
+
+def first_occurrences(*columns: np.ndarray) -> np.ndarray:
+    """
+    Row indices of the first occurrence of each distinct key, in input order.
+    
+    Args:
+        columns: Integer key columns of equal length
+        
+    Returns:
+        np.ndarray: Sorted row indices
+    """
+    if not len(columns[0]):
+        return np.zeros(0, dtype=np.int64)
+    keys = np.stack(columns, axis=1)
+    _, first = np.unique(keys, axis=0, return_index=True)
+    return np.sort(first)
@@ -0,0 +1,361 @@
+"""
+Near-duplicate detection for product listings.
+
+MinHash signatures over product name tokens are bucketed with LSH banding,
+so only listings that share a band become candidate pairs (roughly linear
+in the number of listings instead of all n² pairs). Candidates are confirmed
+with an exact token-set Jaccard check and grouped with union-find.
+
+Signatures are computed once per distinct product name, since crawls repeat
+the same names across many listings.
+"""
+
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.models.product_batch import ProductBatch
+
+
+# Multiply-shift hashing: odd 64-bit multipliers, uint64 arithmetic wraps,
+# the high 32 bits are the hash
+_SHIFT_32 = np.uint64(32)
+_EMPTY = np.uint32(0xFFFFFFFF)
+_GOLDEN_64 = np.uint64(0x9E3779B97F4A7C15)
+
+
+def _sorted_unique(values: np.ndarray) -> np.ndarray:
+    """Sorted distinct values of an integer array (sort-based, faster than np.unique here)."""
+    values = np.sort(values)
+    if not len(values):
+        return values
+    return values[np.r_[True, values[1:] != values[:-1]]]
+
+
+class UnionFind:
+    """
+    Union-find over integer ids 0..n-1 with batched unions.
+
+    Unions are applied a whole pair array at a time: each round hooks the
+    larger root of every pair under the smaller one, then compresses paths
+    by pointer jumping until every id points at its root.
+    """
+
+    def __init__(self, size: int):
+        """
+        Initialize with every id in its own set.
+
+        Args:
+            size: Number of ids
+        """
+        self.parent = np.arange(size, dtype=np.int64)
+
+    def union_pairs(self, left: np.ndarray, right: np.ndarray) -> None:
+        """
+        Merge the sets of left[k] and right[k] for every k.
+
+        Args:
+            left: First ids of the pairs
+            right: Second ids of the pairs
+        """
+        left = np.asarray(left, dtype=np.int64)
+        right = np.asarray(right, dtype=np.int64)
+        while len(left):
+            root_left = self.parent[left]
+            root_right = self.parent[right]
+            low = np.minimum(root_left, root_right)
+            high = np.maximum(root_left, root_right)
+            pending = low != high
+            if not pending.any():
+                break
+            np.minimum.at(self.parent, high[pending], low[pending])
+            self._compress()
+            left, right = left[pending], right[pending]
+
+    def roots(self) -> np.ndarray:
+        """
+        Root id of every element (the smallest id in its set).
+
+        Returns:
+            np.ndarray: Root per id
+        """
+        self._compress()
+        return self.parent
+
+    def _compress(self) -> None:
+        """Point every id directly at its root."""
+        while True:
+            grandparent = self.parent[self.parent]
+            if np.array_equal(grandparent, self.parent):
+                return
+            self.parent = grandparent
+
+
+class NearDuplicateEngine:
+    """
+    NearDuplicateEngine clusters listings whose product names are near-duplicates.
+
+    Two names are near-duplicates when the Jaccard similarity of their
+    lowercase token sets is at least `threshold`, e.g.
+    "Apple iPhone 16 Pro 128GB - Silver" and "Apple iPhone 16 Pro, 128GB, Silver".
+    """
+
+    def __init__(self, threshold: float = 0.9, num_perm: int = 64, bands: int = 8,
+                 seed: int = 1, chunk_size: int = 20000):
+        """
+        Initialize the engine.
+
+        Args:
+            threshold: Minimum token-set Jaccard similarity to merge two names
+            num_perm: Number of MinHash permutations (signature length)
+            bands: Number of LSH bands; num_perm must be divisible by it
+            seed: Seed for the hash permutations (fixed so runs are reproducible)
+            chunk_size: Names per signature chunk, bounds peak memory
+        """
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError(f"threshold must be in (0, 1], got {threshold}")
+
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows_per_band = num_perm // bands
+        self.seed = seed
+        self.chunk_size = chunk_size
+
+        rng = np.random.default_rng(seed)
+        self._multipliers = rng.integers(1, 2 ** 63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._offsets = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+        self._band_multipliers = rng.integers(1, 2 ** 63, size=self.rows_per_band, dtype=np.uint64) | np.uint64(1)
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict]) -> Optional['NearDuplicateEngine']:
+        """
+        Build an engine from a `near_duplicates` config section.
+
+        Args:
+            config: Section with enabled/threshold/num_perm/bands keys, or None
+
+        Returns:
+            Optional[NearDuplicateEngine]: Engine, or None if disabled or not configured
+        """
+        if not config or not config.get('enabled', True):
+            return None
+        return cls(
+            threshold=config.get('threshold', 0.9),
+            num_perm=config.get('num_perm', 64),
+            bands=config.get('bands', 8)
+        )
+
+    def cluster(self, batch: ProductBatch) -> np.ndarray:
+        """
+        Assign every listing in a batch to a near-duplicate cluster.
+
+        Args:
+            batch: Listings in columnar form
+
+        Returns:
+            np.ndarray: Cluster label per row; rows with near-duplicate
+                names share a label
+        """
+        return self.cluster_names(batch)[batch.name]
+
+    def cluster_names(self, batch: ProductBatch) -> np.ndarray:
+        """
+        Cluster the distinct names of a batch.
+
+        Args:
+            batch: Listings in columnar form
+
+        Returns:
+            np.ndarray: Cluster label per name_vocab entry
+        """
+        name_count = len(batch.name_vocab)
+        union_find = UnionFind(name_count)
+        if name_count < 2:
+            return union_find.roots()
+
+        token_ids, token_offsets = batch.name_token_ids, batch.name_token_offsets
+        token_hashes = self.token_hashes(batch.token_vocab)
+        signatures, has_tokens = self.signatures(token_ids, token_offsets, token_hashes)
+        left, right = self.candidate_pairs(signatures, has_tokens)
+        confirmed = self.confirm(left, right, token_ids, token_offsets, token_hashes)
+        union_find.union_pairs(left[confirmed], right[confirmed])
+        return union_find.roots()
+
+    def token_hashes(self, token_vocab: List[str]) -> np.ndarray:
+        """
+        Hash every distinct token once.
+
+        Args:
+            token_vocab: Token strings by id
+
+        Returns:
+            np.ndarray: uint64 hash per token id (32 significant bits)
+        """
+        return np.fromiter((zlib.crc32(token.encode('utf-8')) for token in token_vocab),
+                           dtype=np.uint64, count=len(token_vocab))
+
+    def signatures(self, token_ids: np.ndarray, token_offsets: np.ndarray,
+                   token_hashes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        MinHash signature of each token set.
+
+        Args:
+            token_ids: CSR token ids
+            token_offsets: CSR offsets; set i is token_ids[offsets[i]:offsets[i + 1]]
+            token_hashes: Hash per token id, from token_hashes()
+
+        Returns:
+            Tuple of ((n, num_perm) uint32 signatures, bool mask of non-empty sets)
+        """
+        count = len(token_offsets) - 1
+        signatures = np.full((count, self.num_perm), _EMPTY, dtype=np.uint32)
+        lengths = np.diff(token_offsets)
+        has_tokens = lengths > 0
+        if not len(token_hashes):
+            return signatures, has_tokens
+
+        # Apply all permutations to each distinct token once
+        permuted = ((token_hashes[:, None] * self._multipliers + self._offsets) >> _SHIFT_32).astype(np.uint32)
+
+        for start in range(0, count, self.chunk_size):
+            stop = min(start + self.chunk_size, count)
+            rows = np.flatnonzero(has_tokens[start:stop]) + start
+            if not len(rows):
+                continue
+            begin, end = token_offsets[start], token_offsets[stop]
+            values = permuted[token_ids[begin:end]]
+            signatures[rows] = np.minimum.reduceat(values, token_offsets[rows] - begin, axis=0)
+
+        return signatures, has_tokens
+
+    def candidate_pairs(self, signatures: np.ndarray, valid: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find candidate pairs with LSH banding.
+
+        Sets whose signatures agree on every row of at least one band land in
+        the same bucket. Within a bucket, consecutive members are paired, which
+        is enough for union-find to connect the whole bucket.
+
+        Args:
+            signatures: MinHash signatures
+            valid: Mask of sets that take part (non-empty)
+
+        Returns:
+            Tuple of (left ids, right ids) with left < right, without repeats
+        """
+        ids = np.flatnonzero(valid)
+        if len(ids) < 2:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty
+
+        band_keys = self.band_keys(signatures[ids])
+        pairs = []
+        for band in range(self.bands):
+            keys = band_keys[:, band]
+            order = np.argsort(keys, kind='stable')
+            sorted_keys = keys[order]
+            same = np.flatnonzero(sorted_keys[1:] == sorted_keys[:-1])
+            if len(same):
+                first, second = ids[order[same]], ids[order[same + 1]]
+                pairs.append(np.minimum(first, second) * len(signatures) + np.maximum(first, second))
+
+        if not pairs:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty
+        packed = _sorted_unique(np.concatenate(pairs))
+        return packed // len(signatures), packed % len(signatures)
+
+    def band_keys(self, signatures: np.ndarray) -> np.ndarray:
+        """
+        LSH bucket key of every signature in every band.
+
+        Keys include the band number, so a key identifies one bucket of one
+        band and keys can be stored or looked up without the band.
+
+        Args:
+            signatures: MinHash signatures
+
+        Returns:
+            np.ndarray: (n, bands) uint64 bucket keys
+        """
+        keys = np.empty((len(signatures), self.bands), dtype=np.uint64)
+        for band in range(self.bands):
+            columns = signatures[:, band * self.rows_per_band:(band + 1) * self.rows_per_band]
+            keys[:, band] = (columns.astype(np.uint64) * self._band_multipliers).sum(axis=1, dtype=np.uint64)
+        # Array arithmetic wraps silently (scalar uint64 arithmetic warns)
+        keys += np.arange(self.bands, dtype=np.uint64) * _GOLDEN_64
+        return keys
+
+    def confirm(self, left: np.ndarray, right: np.ndarray, token_ids: np.ndarray,
+                token_offsets: np.ndarray, token_hashes: np.ndarray) -> np.ndarray:
+        """
+        Keep candidate pairs whose exact token-set Jaccard meets the threshold.
+
+        Pairs with identical token sets (equal order-independent set hashes)
+        are accepted without building sets; only the rest are compared
+        token by token.
+
+        Args:
+            left: First ids of the pairs
+            right: Second ids of the pairs
+            token_ids: CSR token ids of the sets
+            token_offsets: CSR offsets of the sets
+            token_hashes: Hash per token id
+
+        Returns:
+            np.ndarray: Boolean mask of confirmed pairs
+        """
+        set_hashes = self._set_hashes(token_ids, token_offsets, token_hashes)
+        confirmed = set_hashes[left] == set_hashes[right]
+
+        rest = np.flatnonzero(~confirmed)
+        if len(rest):
+            flat = token_ids.tolist()
+            bounds = token_offsets.tolist()
+            sets: Dict[int, frozenset] = {}
+
+            def token_set(i: int) -> frozenset:
+                if i not in sets:
+                    sets[i] = frozenset(flat[bounds[i]:bounds[i + 1]])
+                return sets[i]
+
+            threshold = self.threshold
+            for k, i, j in zip(rest.tolist(), left[rest].tolist(), right[rest].tolist()):
+                a, b = token_set(i), token_set(j)
+                shared = len(a & b)
+                confirmed[k] = shared >= threshold * (len(a) + len(b) - shared)
+        return confirmed
+
+    def _set_hashes(self, token_ids: np.ndarray, token_offsets: np.ndarray,
+                    token_hashes: np.ndarray) -> np.ndarray:
+        """
+        Order-independent 64-bit hash of each token set (sum of mixed token hashes).
+
+        Args:
+            token_ids: CSR token ids
+            token_offsets: CSR offsets
+            token_hashes: Hash per token id
+
+        Returns:
+            np.ndarray: uint64 hash per set (0 for empty sets)
+        """
+        count = len(token_offsets) - 1
+        hashes = np.zeros(count, dtype=np.uint64)
+        if not len(token_ids):
+            return hashes
+
+        # Repeated tokens within a name count once
+        vocab_size = np.int64(len(token_hashes))
+        owners = np.repeat(np.arange(count, dtype=np.int64), np.diff(token_offsets))
+        unique_keys = _sorted_unique(owners * vocab_size + token_ids)
+        owners, tokens = unique_keys // vocab_size, unique_keys % vocab_size
+
+        mixed = token_hashes[tokens] * _GOLDEN_64
+        mixed ^= mixed >> np.uint64(29)
+        starts = np.flatnonzero(np.r_[True, owners[1:] != owners[:-1]])
+        hashes[owners[starts]] = np.add.reduceat(mixed, starts)
+        return hashes
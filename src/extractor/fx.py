@@ -0,0 +1,150 @@
+"""
+FX Rates
+Converts prices between currencies with a locally cached rate table, so price
+checks and cross-country comparisons never call a rate service per product.
+"""
+
+import json
+import os
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+import yaml
+
+
+# Reference rates in units per USD. Refresh them by pointing `fx.path` at a
+# JSON/YAML file with the same layout ({"base": ..., "as_of": ..., "rates": {...}})
+DEFAULT_FX_RATES = {
+    'USD': 1.0,
+    'EUR': 0.92,
+    'GBP': 0.79,
+    'INR': 83.0,
+    'JPY': 150.0,
+    'CAD': 1.36,
+    'AUD': 1.52,
+    'CHF': 0.88,
+}
+DEFAULT_FX_AS_OF = '2024-09-01'
+
+
+class FxTable:
+    """
+    FxTable holds rates in units of each currency per one unit of `base`.
+
+    Conversions of many prices are a single gather-and-multiply over the
+    distinct currencies; unknown currencies convert to NaN.
+    """
+
+    def __init__(self, rates: Optional[Dict[str, float]] = None, base: str = 'USD',
+                 as_of: Optional[str] = None):
+        """
+        Initialize the table.
+
+        Args:
+            rates: Units of each currency per one `base` unit
+            base: Currency the rates are quoted against
+            as_of: Date the rates were taken, for reporting
+
+        Raises:
+            ValueError: If a rate is not positive or the base rate is not 1
+        """
+        self.base = base
+        self.rates = dict(DEFAULT_FX_RATES if rates is None else rates)
+        self.rates.setdefault(base, 1.0)
+        self.as_of = as_of if rates is not None else (as_of or DEFAULT_FX_AS_OF)
+        for currency, rate in self.rates.items():
+            if not rate or rate <= 0:
+                raise ValueError(f"FX rate for {currency} must be positive, got {rate}")
+        if self.rates[base] != 1.0:
+            raise ValueError(f"FX rate of the base currency {base} must be 1, got {self.rates[base]}")
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]]) -> 'FxTable':
+        """
+        Build a table from an `fx` config section.
+
+        The file at `path` (if it exists) wins over inline `rates`, which win
+        over the built-in reference rates.
+
+        Args:
+            config: Section with base/rates/as_of/path keys, or None
+
+        Returns:
+            FxTable: Rate table
+        """
+        config = config or {}
+        path = config.get('path')
+        if path and os.path.exists(path):
+            return cls.load(path)
+        if config.get('rates'):
+            return cls(config['rates'], base=config.get('base', 'USD'), as_of=config.get('as_of'))
+        return cls(base=config.get('base', 'USD'))
+
+    @classmethod
+    def load(cls, path: str) -> 'FxTable':
+        """
+        Load a rate table from a JSON or YAML file.
+
+        Args:
+            path: File with base/as_of/rates keys
+
+        Returns:
+            FxTable: Rate table
+        """
+        with open(path, 'r', encoding='utf-8') as handle:
+            data = json.load(handle) if path.endswith('.json') else yaml.safe_load(handle)
+        return cls(data['rates'], base=data.get('base', 'USD'), as_of=data.get('as_of'))
+
+    def save(self, path: str) -> None:
+        """
+        Write the table as JSON (the local cache other runs load from).
+
+        Args:
+            path: Destination file
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as handle:
+            json.dump({'base': self.base, 'as_of': self.as_of, 'rates': self.rates}, handle, indent=2, sort_keys=True)
+
+    def rate(self, currency: str) -> Optional[float]:
+        """Units of `currency` per one base unit, or None if unknown."""
+        return self.rates.get(currency)
+
+    def convert(self, amount: float, currency: str, target: Optional[str] = None) -> Optional[float]:
+        """
+        Convert one amount.
+
+        Args:
+            amount: Amount in `currency`
+            currency: ISO code of the amount
+            target: ISO code to convert to (default: base)
+
+        Returns:
+            Optional[float]: Converted amount, or None if a rate is unknown
+        """
+        source_rate = self.rates.get(currency)
+        target_rate = self.rates.get(target or self.base)
+        if amount is None or source_rate is None or target_rate is None:
+            return None
+        return amount / source_rate * target_rate
+
+    def to_base(self, amounts: np.ndarray, currencies: Iterable[str]) -> np.ndarray:
+        """
+        Convert many amounts to the base currency.
+
+        Args:
+            amounts: float64 amounts (NaN for unparseable prices)
+            currencies: ISO code per amount
+
+        Returns:
+            np.ndarray: float64 amounts in base units (NaN where the rate is unknown)
+        """
+        index: Dict[str, int] = {}
+        codes = np.fromiter((index.setdefault(currency, len(index)) for currency in currencies),
+                            dtype=np.int64, count=len(amounts))
+        inverse = np.array([1.0 / self.rates[c] if c in self.rates else np.nan for c in index], dtype=np.float64)
+        if not len(index):
+            return np.zeros(0, dtype=np.float64)
+        return np.asarray(amounts, dtype=np.float64) * inverse[codes]
@@ -5,7 +5,8 @@ Extracts product data (name, price, etc.) from HTML content.
 
 from abc import ABC, abstractmethod
 from typing import Optional, Dict, Any
-import yaml
+from .price_parser import PriceParser
+from src.config.loader import load_config
 
 
 class ExtractorInterface(ABC):
@@ -42,8 +43,7 @@ class MockExtractor(ExtractorInterface):
             mock_file = os.path.join(self.mock_data_path, f"{site_name}_iphone.yaml")
             
             if os.path.exists(mock_file):
-                with open(mock_file, 'r') as f:
-                    return yaml.safe_load(f)
+                return load_config(mock_file)
             else:
                 # Return basic mock data
                 return {
@@ -87,13 +87,13 @@ class Extractor:
             config (dict or str): Config dict or path to YAML config file.
         """
         if isinstance(config, str):
-            with open(config, 'r') as f:
-                self.config = yaml.safe_load(f)
+            self.config = load_config(config)
         else:
             self.config = config
             
         self.use_mock = self.config.get('modules', {}).get('extractor', {}).get('use_mock', True)
         self.mock_extracts = self.config.get('modules', {}).get('extractor', {}).get('mock_extracts', {})
+        self.price_parser = PriceParser(self.config)
     
     def extract(self, html: str, url: str) -> Dict[str, Any]:
         """
@@ -105,6 +105,7 @@ class Extractor:
             
         Returns:
             Dict[str, Any]: Structured product data including name, price, currency, link
+                and the typed price in minor units (`price_minor`)
             
         Raises:
             NotImplementedError: If use_mock is False (real extraction not implemented)
@@ -113,14 +114,17 @@ class Extractor:
         if self.use_mock:
             if url not in self.mock_extracts:
                 # Return default structure if URL not found
-                return {
+                product = {
                     "productName": "Unknown Product",
                     "price": "0",
                     "currency": "USD",
                     "link": url
                 }
+            else:
+                product = self.mock_extracts[url].copy()
             
-            return self.mock_extracts[url].copy()
+            # Parse the raw price once so downstream stages never re-parse it
+            return self.price_parser.attach(product, url=url)
         else:
             # TODO: Real implementation would use HTML parsing, LLM, etc.
             raise NotImplementedError("Real extraction not implemented yet") 
\ No newline at end of file
@@ -0,0 +1,392 @@
+"""
+Price Parser
+Parses locale-formatted price strings into integer minor units plus an ISO currency code.
+"""
+
+import math
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+# Currency symbols and textual markers, longest first so "US$" wins over "$"
+CURRENCY_SYMBOLS = [
+    ('US$', 'USD'),
+    ('Rs.', 'INR'),
+    ('Rs', 'INR'),
+    ('₹', 'INR'),
+    ('€', 'EUR'),
+    ('£', 'GBP'),
+    ('¥', 'JPY'),
+    ('$', 'USD'),
+]
+
+ISO_CURRENCIES = {'USD', 'INR', 'EUR', 'GBP', 'JPY', 'CAD', 'AUD', 'CHF'}
+
+# Number of minor-unit digits per currency (ISO 4217); anything not listed uses 2
+CURRENCY_EXPONENTS = {'JPY': 0}
+
+
+@dataclass(frozen=True)
+class PriceLocale:
+    """Number formatting conventions for a country."""
+    decimal_sep: str
+    group_sep: str
+    currency: str
+
+
+DEFAULT_LOCALES = {
+    'US': PriceLocale(decimal_sep='.', group_sep=',', currency='USD'),
+    'UK': PriceLocale(decimal_sep='.', group_sep=',', currency='GBP'),
+    'IN': PriceLocale(decimal_sep='.', group_sep=',', currency='INR'),
+    'DE': PriceLocale(decimal_sep=',', group_sep='.', currency='EUR'),
+}
+
+# Country-code top-level domains that identify a locale on their own
+TLD_COUNTRIES = {
+    'co.uk': 'UK',
+    'uk': 'UK',
+    'de': 'DE',
+    'in': 'IN',
+}
+
+# Default locale for a currency (a symbol in the price, else the hint) when
+# neither country nor site is known
+CURRENCY_COUNTRIES = {
+    'USD': 'US',
+    'GBP': 'UK',
+    'EUR': 'DE',
+    'INR': 'IN',
+}
+
+_NUMBER_PATTERN = re.compile(r"[0-9][0-9.,'\s  ]*")
+_ISO_PATTERN = re.compile(r'\b([A-Z]{3})\b')
+_THIN_SEPARATORS = str.maketrans('', '', " '  ")
+
+
+@dataclass(frozen=True)
+class ParsedPrice:
+    """Typed price: integer minor units (e.g. cents) and ISO 4217 currency code."""
+    amount_minor: Optional[int]
+    currency: str
+
+    @property
+    def amount(self) -> Optional[float]:
+        """Price in major units (e.g. dollars), or None if unparseable."""
+        if self.amount_minor is None:
+            return None
+        return self.amount_minor / (10 ** currency_exponent(self.currency))
+
+
+def currency_exponent(currency: str) -> int:
+    """Return the number of minor-unit digits for a currency."""
+    return CURRENCY_EXPONENTS.get(currency, 2)
+
+
+class PriceParser:
+    """
+    PriceParser turns raw price strings such as "₹89,999", "1.099,00 €" or
+    "£1,049.00" into integer minor units and an ISO currency code.
+
+    The locale is resolved per call from (in order) the explicit country, the
+    site (configured site lists, then country-code TLD), the currency symbol
+    found in the price ("1.099 €" is German) and the currency hint.
+    """
+
+    def __init__(self, config: Dict[str, Any] = None):
+        """
+        Initialize PriceParser with an optional platform config dict.
+
+        Args:
+            config: Platform config; the `countries` section maps sites and
+                currencies to countries, and `modules.extractor.price_locales`
+                may override separators per country.
+        """
+        self.config = config or {}
+        self.locales = dict(DEFAULT_LOCALES)
+        self.site_countries = {}
+
+        for country, country_config in self.config.get('countries', {}).items():
+            base = self.locales.get(country, DEFAULT_LOCALES['US'])
+            self.locales[country] = PriceLocale(
+                decimal_sep=base.decimal_sep,
+                group_sep=base.group_sep,
+                currency=country_config.get('currency', base.currency)
+            )
+            for site in country_config.get('sites', []):
+                self.site_countries[site.lower()] = country
+
+        overrides = self.config.get('modules', {}).get('extractor', {}).get('price_locales', {})
+        for country, override in overrides.items():
+            base = self.locales.get(country, DEFAULT_LOCALES['US'])
+            self.locales[country] = PriceLocale(
+                decimal_sep=override.get('decimal_sep', base.decimal_sep),
+                group_sep=override.get('group_sep', base.group_sep),
+                currency=override.get('currency', base.currency)
+            )
+
+    def resolve_locale(self, country: str = None, site: str = None, currency: str = None) -> PriceLocale:
+        """
+        Pick the formatting locale for a price.
+
+        Args:
+            country: Country code (e.g. "US", "DE"), if known
+            site: Site domain or product URL, if known
+            currency: ISO currency hint, if known
+
+        Returns:
+            PriceLocale: Locale to interpret separators with
+        """
+        return self._known_locale(country, site) or self._currency_locale(currency)
+
+    def _known_locale(self, country: Optional[str], site: Optional[str]) -> Optional[PriceLocale]:
+        """Locale of the explicit country or the site, or None if neither is known."""
+        if country and country in self.locales:
+            return self.locales[country]
+        site_country = self._site_country(site)
+        return self.locales[site_country] if site_country else None
+
+    def _currency_locale(self, currency: Optional[str]) -> PriceLocale:
+        """Default locale for a currency (US for unknown currencies)."""
+        return self.locales[CURRENCY_COUNTRIES.get(currency, 'US')]
+
+    def parse(self, raw: Any, country: str = None, site: str = None, currency: str = None) -> ParsedPrice:
+        """
+        Parse a single raw price string.
+
+        Args:
+            raw: Raw price as shown on the page (str, int or float)
+            country: Country code, if known
+            site: Site domain or product URL, if known
+            currency: ISO currency hint, if known
+
+        Returns:
+            ParsedPrice: Minor units (None if unparseable) and ISO currency
+        """
+        if currency in ISO_CURRENCIES and type(raw) is str and raw.isascii() and raw.isdigit():
+            # Plain digits with a known currency need no locale resolution
+            return ParsedPrice(int(raw) * 10 ** currency_exponent(currency), currency)
+
+        locale = self._known_locale(country, site)
+        number, detected = self._canonicalize(raw, locale, currency)
+        code = detected or (currency if currency in ISO_CURRENCIES else (locale or self.locales['US']).currency)
+        if number is None:
+            return ParsedPrice(None, code)
+        return ParsedPrice(int(round(float(number) * 10 ** currency_exponent(code))), code)
+
+    def parse_many(self, raws: Iterable[Any], country: str = None, site: str = None,
+                   currency: str = None) -> List[ParsedPrice]:
+        """
+        Parse a batch of raw price strings sharing one country/site context.
+
+        Args:
+            raws: Raw prices
+            country: Country code, if known
+            site: Site domain or product URL, if known
+            currency: ISO currency hint, if known
+
+        Returns:
+            List[ParsedPrice]: One parsed price per input, in order
+        """
+        minor, valid, currencies = self.parse_many_arrays(raws, country=country, site=site, currency=currency)
+        return [
+            ParsedPrice(int(amount) if ok else None, code)
+            for amount, ok, code in zip(minor.tolist(), valid.tolist(), currencies)
+        ]
+
+    def parse_many_arrays(self, raws: Iterable[Any], country: str = None, site: str = None,
+                          currency: str = None) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+        """
+        Parse a batch of raw prices into NumPy columns.
+
+        Separator handling is done per string (plain digit strings take a fast
+        path); the numeric conversion and scaling to minor units is a single
+        vectorized pass over the batch.
+
+        Args:
+            raws: Raw prices
+            country: Country code, if known
+            site: Site domain or product URL, if known
+            currency: ISO currency hint, if known
+
+        Returns:
+            Tuple of (int64 minor units, bool validity mask, ISO currency per item)
+        """
+        locale = self._known_locale(country, site)
+        default_currency = currency if currency in ISO_CURRENCIES else (locale or self.locales['US']).currency
+
+        canonical = []
+        currencies = []
+        for raw in raws:
+            number, detected = self._canonicalize(raw, locale, currency)
+            canonical.append(number)
+            currencies.append(detected or default_currency)
+
+        valid = np.fromiter((number is not None for number in canonical), dtype=bool, count=len(canonical))
+        values = np.zeros(len(canonical), dtype=np.float64)
+        if valid.any():
+            values[valid] = np.asarray([number for number in canonical if number is not None], dtype=np.float64)
+
+        scale = np.fromiter((10 ** currency_exponent(code) for code in currencies), dtype=np.float64, count=len(currencies))
+        minor = np.rint(values * scale).astype(np.int64)
+        return minor, valid, currencies
+
+    def attach(self, product: Dict[str, Any], url: str = None, country: str = None) -> Dict[str, Any]:
+        """
+        Parse a product's raw `price` once and store the typed result on it.
+
+        Sets `price_minor` (int, or None if unparseable) and normalizes
+        `currency` to an ISO code. The raw `price` string is left untouched.
+
+        Args:
+            product: Extracted product dict (modified in place)
+            url: Product URL, used to resolve the site locale
+            country: Country code, if known
+
+        Returns:
+            Dict[str, Any]: The same product
+        """
+        hint = product.get('currency')
+        iso_hint = hint if hint in ISO_CURRENCIES else None
+        parsed = self.parse(product.get('price', ''), country=country, site=url or product.get('link'),
+                            currency=iso_hint)
+        product['price_minor'] = parsed.amount_minor
+        product['currency'] = iso_hint or parsed.currency
+        return product
+
+    def _site_country(self, site: Optional[str]) -> Optional[str]:
+        """Map a site domain or URL to a configured country."""
+        if not site:
+            return None
+        host = site.split('/')[2] if '://' in site else site
+        host = host.lower().split(':')[0]
+        if host.startswith('www.'):
+            host = host[4:]
+
+        if host in self.site_countries:
+            return self.site_countries[host]
+
+        for suffix, suffix_country in TLD_COUNTRIES.items():
+            if host.endswith('.' + suffix) and suffix_country in self.locales:
+                return suffix_country
+        return None
+
+    def _canonicalize(self, raw: Any, locale: Optional[PriceLocale],
+                      currency: str = None) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Reduce a raw price to a plain decimal string such as "1099.00".
+
+        Args:
+            raw: Raw price
+            locale: Country or site locale, or None to use the detected currency's (else the hint's)
+            currency: ISO currency hint, if known
+
+        Returns:
+            Tuple of (canonical number or None, detected ISO currency or None)
+        """
+        if raw is None:
+            return None, None
+        if isinstance(raw, (int, float)) and not isinstance(raw, bool):
+            # NaN and infinities have no minor-unit value
+            return (repr(raw) if math.isfinite(raw) else None), None
+
+        text = str(raw).strip()
+        if text.isascii() and text.isdigit():
+            return text, None
+
+        detected = None
+        for symbol, code in CURRENCY_SYMBOLS:
+            if symbol in text:
+                detected = code
+                break
+        if detected is None:
+            for code in _ISO_PATTERN.findall(text):
+                if code in ISO_CURRENCIES:
+                    detected = code
+                    break
+
+        match = _NUMBER_PATTERN.search(text)
+        if not match:
+            return None, detected
+        if locale is None:
+            locale = self._currency_locale(detected or currency)
+
+        number = match.group(0).translate(_THIN_SEPARATORS).rstrip('.,')
+        if not number:
+            return None, detected
+        # A minus (or Unicode minus) before the digits, e.g. "-999" or "-$999", keeps its sign
+        sign = '-' if any(mark in text[:match.start()] for mark in '-−') else ''
+
+        last_dot = number.rfind('.')
+        last_comma = number.rfind(',')
+        if last_dot >= 0 and last_comma >= 0:
+            # Both present: whichever comes last is the decimal separator
+            decimal_sep = '.' if last_dot > last_comma else ','
+        elif last_dot >= 0 or last_comma >= 0:
+            sep = '.' if last_dot >= 0 else ','
+            digits_after = len(number) - number.rfind(sep) - 1
+            if number.count(sep) > 1:
+                decimal_sep = None
+            elif sep == locale.decimal_sep:
+                decimal_sep = sep
+            else:
+                # A lone non-locale separator is grouping only if it groups thousands
+                decimal_sep = None if digits_after == 3 else sep
+        else:
+            decimal_sep = None
+
+        if decimal_sep is None:
+            return sign + number.replace('.', '').replace(',', ''), detected
+
+        group_sep = ',' if decimal_sep == '.' else '.'
+        integer_part, _, fraction = number.rpartition(decimal_sep)
+        integer_part = integer_part.replace(group_sep, '')
+        if not integer_part.isdigit() or not fraction.isdigit():
+            return None, detected
+        return f"{sign}{integer_part}.{fraction}", detected
+
+
+_default_parser = PriceParser()
+
+
+def price_amount(product: Dict[str, Any]) -> Optional[float]:
+    """
+    Return a product's price in major units as a float.
+
+    Uses the typed `price_minor` attached at extraction time when present and
+    only falls back to parsing the raw `price` string otherwise.
+
+    Args:
+        product: Product dict
+
+    Returns:
+        Optional[float]: Price, or None if it cannot be parsed
+    """
+    return price_with_currency(product)[0]
+
+
+def price_with_currency(product: Dict[str, Any]) -> Tuple[Optional[float], str]:
+    """
+    Return a product's price in major units together with its ISO currency.
+
+    Same resolution as price_amount(); the currency is the product's own
+    code, or the one detected in the raw price string (e.g. "₹" -> INR).
+
+    Args:
+        product: Product dict
+
+    Returns:
+        Tuple[Optional[float], str]: Price (None if unparseable) and currency
+    """
+    minor = product.get('price_minor')
+    currency = product.get('currency', 'USD')
+    if minor is not None:
+        return minor / (10 ** CURRENCY_EXPONENTS.get(currency, 2)), currency
+    parsed = _default_parser.parse(
+        product.get('price', ''),
+        site=product.get('link'),
+        currency=currency if currency in ISO_CURRENCIES else None
+    )
+    return parsed.amount, parsed.currency
@@ -19,6 +19,8 @@ from typing import Optional, Dict, Any, List
 from dataclasses import dataclass
 import re
 from enum import Enum
+from .price_parser import PriceParser
+from src.llm.client import shared_client
 
 
 class ExtractionMethod(Enum):
@@ -74,7 +76,8 @@ class RealExtractor:
         self.config = config or {}
         self.site_templates = {}
         self.ml_models = {}
-        self.llm_client = None
+        self.llm_client = shared_client(self.config.get('llm'))
+        self.price_parser = PriceParser(self.config)
         self._load_site_templates()
         self._initialize_ml_models()
         
@@ -325,20 +328,24 @@ class RealExtractor:
         Returns:
             Dictionary with value, confidence, and raw_matches
         """
-        # TODO: Implement LLM-based extraction
-        # if not self.llm_client:
-        #     return {"value": None, "confidence": 0, "raw_matches": []}
-        # 
-        # prompt = f"Extract the {field} from this HTML product page: {html[:2000]}"
-        # response = self.llm_client.generate(prompt)
-        # 
-        # return {
-        #     "value": response.text,
-        #     "confidence": response.confidence,
-        #     "raw_matches": [response.text]
-        # }
+        if not self.llm_client:
+            return {"value": None, "confidence": 0, "raw_matches": []}
         
-        return {"value": None, "confidence": 0, "raw_matches": []}
+        prompt = (f"Extract the {field} from this HTML product page. "
+                  f"Answer with the value only, or 'none'.\n{html[:2000]}")
+        try:
+            response = self.llm_client.generate(prompt)
+        except Exception:
+            return {"value": None, "confidence": 0, "raw_matches": []}
+        
+        value = response.text.strip()
+        if not value or value.lower() == 'none':
+            return {"value": None, "confidence": 0, "raw_matches": []}
+        return {
+            "value": value,
+            "confidence": 0.7,
+            "raw_matches": [value]
+        }
     
     def _extract_with_ml_model(self, html: str, field: str) -> Dict[str, Any]:
         """
@@ -394,7 +401,8 @@ class RealExtractor:
             if not normalized.get(field):
                 normalized[field] = self._get_fallback_value(field, url)
         
-        return normalized
+        # Attach typed price (minor units + ISO currency) once, at extraction time
+        return self.price_parser.attach(normalized, url=url)
     
     def _normalize_price(self, price: str) -> str:
         """
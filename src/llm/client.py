@@ -0,0 +1,445 @@
+"""
+Shared LLM client: micro-batching, prompt-hash cache, concurrency limit and
+token budget.
+
+The validator, extractor and normalizer each ask for one completion per item.
+LLMClient collects the prompts that arrive within a short window (or until
+`max_batch_size` are waiting) and sends them to the model server as one
+request. Repeated prompts are answered from a cache keyed by a hash of the
+prompt content, identical prompts already in flight share one result, at most
+`max_concurrency` requests are outstanding, and no request is sent once the
+token budget is spent.
+
+Model server protocol (HTTPBackend), one JSON POST per batch:
+    request:  {"model": ..., "prompts": [...], "max_tokens": ...}
+    response: {"completions": [{"text": ..., "prompt_tokens": ..., "completion_tokens": ...}, ...]}
+Other providers plug in as an LLMBackend.
+"""
+
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+import urllib.request
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.models.fingerprint import mapping_hash
+
+
+@dataclass(frozen=True)
+class LLMResponse:
+    """One completion returned by the model server."""
+    text: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached: bool = False
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+
+class LLMBudgetExceeded(Exception):
+    """Exception raised when a request would overrun the token budget."""
+    pass
+
+
+class LLMBackend(ABC):
+    """Abstract interface for model servers."""
+
+    @abstractmethod
+    def complete(self, prompts: List[str], max_tokens: int) -> List[LLMResponse]:
+        """Complete a batch of prompts; one response per prompt, in order."""
+        pass
+
+
+class HTTPBackend(LLMBackend):
+    """Model server reached over HTTP with the batch JSON protocol above."""
+
+    def __init__(self, endpoint: str, model: str = "default", timeout: float = 30.0,
+                 api_key_env: Optional[str] = None):
+        """
+        Initialize the backend.
+
+        Args:
+            endpoint: URL the batch requests are POSTed to
+            model: Model name sent with every request
+            timeout: Request timeout in seconds
+            api_key_env: Environment variable holding a bearer token, if any
+        """
+        self.endpoint = endpoint
+        self.model = model
+        self.timeout = timeout
+        self.api_key_env = api_key_env
+
+    def complete(self, prompts: List[str], max_tokens: int) -> List[LLMResponse]:
+        """
+        POST one batch and parse the completions.
+
+        Args:
+            prompts: Prompts to complete
+            max_tokens: Completion length limit per prompt
+
+        Returns:
+            List[LLMResponse]: One response per prompt
+
+        Raises:
+            ValueError: If the server returns a different number of completions
+        """
+        body = json.dumps({'model': self.model, 'prompts': prompts, 'max_tokens': max_tokens}).encode('utf-8')
+        headers = {'Content-Type': 'application/json'}
+        api_key = os.environ.get(self.api_key_env) if self.api_key_env else None
+        if api_key:
+            headers['Authorization'] = f"Bearer {api_key}"
+
+        request = urllib.request.Request(self.endpoint, data=body, headers=headers, method='POST')
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            payload = json.loads(response.read().decode('utf-8'))
+
+        completions = payload.get('completions', [])
+        if len(completions) != len(prompts):
+            raise ValueError(f"Model server returned {len(completions)} completions for {len(prompts)} prompts")
+        return [LLMResponse(text=str(c.get('text', '')),
+                            prompt_tokens=int(c.get('prompt_tokens', 0)),
+                            completion_tokens=int(c.get('completion_tokens', 0)))
+                for c in completions]
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough token count of a text (about four characters per token).
+
+    Args:
+        text: Prompt text
+
+    Returns:
+        int: Estimated tokens
+    """
+    return math.ceil(len(text) / 4)
+
+
+class TokenBudget:
+    """
+    Thread-safe token budget.
+
+    Each request reserves its estimated cost (prompt estimate plus
+    max_tokens per prompt) before it is sent, and settles to the actual
+    usage reported by the server once it returns.
+    """
+
+    def __init__(self, limit: Optional[int] = None):
+        """
+        Initialize the budget.
+
+        Args:
+            limit: Total tokens allowed, or None for no limit
+        """
+        self.limit = limit
+        self.used = 0
+        self.reserved = 0
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: int) -> None:
+        """
+        Reserve tokens for a request.
+
+        Raises:
+            LLMBudgetExceeded: If the reservation would overrun the limit
+        """
+        with self._lock:
+            if self.limit is not None and self.used + self.reserved + tokens > self.limit:
+                raise LLMBudgetExceeded(
+                    f"Token budget exceeded: {self.used} used, {self.reserved} reserved, "
+                    f"{tokens} requested, limit {self.limit}")
+            self.reserved += tokens
+
+    def settle(self, reserved: int, used: int) -> None:
+        """Release a reservation and record the tokens actually used."""
+        with self._lock:
+            self.reserved -= reserved
+            self.used += used
+
+    @property
+    def remaining(self) -> Optional[int]:
+        if self.limit is None:
+            return None
+        return max(self.limit - self.used - self.reserved, 0)
+
+
+class LLMClient:
+    """
+    LLMClient batches, caches and rate-limits completions for all callers.
+
+    submit() returns a Future and is safe to call from many threads;
+    generate() and generate_many() wait for the results.
+    """
+
+    def __init__(self, backend: LLMBackend, batch_window_ms: float = 20.0, max_batch_size: int = 16,
+                 max_concurrency: int = 4, token_budget: Optional[int] = None, cache_size: int = 10000,
+                 max_tokens: int = 256):
+        """
+        Initialize the client.
+
+        Args:
+            backend: Model server to send batches to
+            batch_window_ms: How long the first waiting prompt waits for others
+            max_batch_size: Most prompts per request; a full batch is sent at once
+            max_concurrency: Most requests in flight
+            token_budget: Total tokens allowed, or None for no limit
+            cache_size: Most responses kept in the prompt-hash cache
+            max_tokens: Completion length limit per prompt
+        """
+        if max_batch_size < 1 or max_concurrency < 1:
+            raise ValueError("max_batch_size and max_concurrency must be at least 1")
+        self.backend = backend
+        self.batch_window = batch_window_ms / 1000.0
+        self.max_batch_size = max_batch_size
+        self.max_concurrency = max_concurrency
+        self.max_tokens = max_tokens
+        self.cache_size = cache_size
+        self.budget = TokenBudget(token_budget)
+
+        self._cache: 'OrderedDict[str, LLMResponse]' = OrderedDict()
+        self._in_flight: Dict[str, Future] = {}
+        self._pending: List[Tuple[str, str, Future]] = []
+        self._condition = threading.Condition()
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix='llm')
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._dispatcher: Optional[threading.Thread] = None
+        self._closed = False
+        self._stats = {'requests': 0, 'cache_hits': 0, 'coalesced': 0, 'batches': 0,
+                       'prompts_sent': 0, 'errors': 0}
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]]) -> Optional['LLMClient']:
+        """
+        Build a client from an `llm` config section.
+
+        Args:
+            config: Section with enabled/endpoint/model/batch_window_ms/
+                max_batch_size/max_concurrency/token_budget/cache_size/
+                max_tokens/timeout/api_key_env keys, or None
+
+        Returns:
+            Optional[LLMClient]: Client, or None if disabled or not configured
+        """
+        if not config or not config.get('enabled', True) or not config.get('endpoint'):
+            return None
+        backend = HTTPBackend(config['endpoint'], model=config.get('model', 'default'),
+                              timeout=config.get('timeout', 30.0), api_key_env=config.get('api_key_env'))
+        return cls(backend,
+                   batch_window_ms=config.get('batch_window_ms', 20.0),
+                   max_batch_size=config.get('max_batch_size', 16),
+                   max_concurrency=config.get('max_concurrency', 4),
+                   token_budget=config.get('token_budget'),
+                   cache_size=config.get('cache_size', 10000),
+                   max_tokens=config.get('max_tokens', 256))
+
+    def prompt_key(self, prompt: str) -> str:
+        """
+        Cache key of a prompt: hash of the prompt content and completion settings.
+
+        Args:
+            prompt: Prompt text
+
+        Returns:
+            str: Hex digest
+        """
+        content = f"{self.max_tokens}\x00{prompt}".encode('utf-8')
+        return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+    def submit(self, prompt: str) -> Future:
+        """
+        Queue a prompt for the next batch.
+
+        Args:
+            prompt: Prompt text
+
+        Returns:
+            Future: Resolves to an LLMResponse, or raises LLMBudgetExceeded
+                or the backend's error
+        """
+        key = self.prompt_key(prompt)
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("LLMClient is closed")
+            self._stats['requests'] += 1
+
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._stats['cache_hits'] += 1
+                self._cache.move_to_end(key)
+                future = Future()
+                future.set_result(replace(cached, cached=True))
+                return future
+
+            shared = self._in_flight.get(key)
+            if shared is not None:
+                self._stats['coalesced'] += 1
+                return shared
+
+            future = Future()
+            self._in_flight[key] = future
+            self._pending.append((key, prompt, future))
+            if self._dispatcher is None:
+                self._dispatcher = threading.Thread(target=self._dispatch_loop, name='llm-batcher', daemon=True)
+                self._dispatcher.start()
+            self._condition.notify()
+            return future
+
+    def generate(self, prompt: str) -> LLMResponse:
+        """
+        Complete one prompt (batched with whatever else arrives in the window).
+
+        Args:
+            prompt: Prompt text
+
+        Returns:
+            LLMResponse: Completion
+        """
+        return self.submit(prompt).result()
+
+    def generate_many(self, prompts: List[str]) -> List[LLMResponse]:
+        """
+        Complete many prompts; they are queued together so they share batches.
+
+        Args:
+            prompts: Prompt texts (repeats are sent once)
+
+        Returns:
+            List[LLMResponse]: One completion per prompt, in order
+        """
+        futures = [self.submit(prompt) for prompt in prompts]
+        return [future.result() for future in futures]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Client statistics.
+
+        Returns:
+            dict: requests, cache_hits, coalesced (shared with an in-flight
+                prompt), batches, prompts_sent, errors, tokens_used,
+                budget_remaining and cache_size
+        """
+        with self._condition:
+            stats = dict(self._stats)
+            stats['cache_size'] = len(self._cache)
+        stats['tokens_used'] = self.budget.used
+        stats['budget_remaining'] = self.budget.remaining
+        return stats
+
+    def close(self) -> None:
+        """Send whatever is queued, then stop the batcher and the workers."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        if self._dispatcher is not None:
+            self._dispatcher.join()
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> 'LLMClient':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _dispatch_loop(self) -> None:
+        """Cut the pending queue into batches and hand them to the workers."""
+        while True:
+            # Wait for a free worker first: while every worker is busy,
+            # prompts keep queueing and the next batch comes out fuller
+            self._slots.acquire()
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if not self._pending:
+                    self._slots.release()
+                    return
+                # The oldest waiting prompt waits at most one window for company
+                deadline = time.monotonic() + self.batch_window
+                while len(self._pending) < self.max_batch_size and not self._closed:
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    self._condition.wait(timeout)
+                batch = self._pending[:self.max_batch_size]
+                del self._pending[:self.max_batch_size]
+            self._executor.submit(self._send, batch)
+
+    def _send(self, batch: List[Tuple[str, str, Future]]) -> None:
+        """Send one batch, resolve its futures and free the worker slot."""
+        try:
+            self._send_batch(batch)
+        finally:
+            self._slots.release()
+
+    def _send_batch(self, batch: List[Tuple[str, str, Future]]) -> None:
+        """Send one batch and resolve its futures."""
+        prompts = [prompt for _, prompt, _ in batch]
+        estimate = sum(estimate_tokens(prompt) + self.max_tokens for prompt in prompts)
+        try:
+            self.budget.reserve(estimate)
+        except LLMBudgetExceeded as error:
+            self._fail(batch, error)
+            return
+
+        try:
+            responses = self.backend.complete(prompts, self.max_tokens)
+        except Exception as error:
+            self.budget.settle(estimate, 0)
+            self._fail(batch, error)
+            return
+
+        self.budget.settle(estimate, sum(response.total_tokens for response in responses))
+        with self._condition:
+            self._stats['batches'] += 1
+            self._stats['prompts_sent'] += len(batch)
+            for (key, _, _), response in zip(batch, responses):
+                self._cache[key] = response
+                self._cache.move_to_end(key)
+                self._in_flight.pop(key, None)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        for (_, _, future), response in zip(batch, responses):
+            future.set_result(response)
+
+    def _fail(self, batch: List[Tuple[str, str, Future]], error: Exception) -> None:
+        """Resolve a batch's futures with an error; nothing is cached."""
+        with self._condition:
+            self._stats['errors'] += 1
+            for key, _, _ in batch:
+                self._in_flight.pop(key, None)
+        for _, _, future in batch:
+            future.set_exception(error)
+
+
+_shared_clients: Dict[str, LLMClient] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_client(config: Optional[Dict[str, Any]]) -> Optional[LLMClient]:
+    """
+    One client per distinct `llm` config section, shared by every module.
+
+    Modules built from the same section share batches, cache and budget.
+
+    Args:
+        config: `llm` config section, or None
+
+    Returns:
+        Optional[LLMClient]: Shared client, or None if disabled or not configured
+    """
+    if not config or not config.get('enabled', True) or not config.get('endpoint'):
+        return None
+    key = mapping_hash(config)
+    with _shared_lock:
+        client = _shared_clients.get(key)
+        if client is None:
+            client = _shared_clients[key] = LLMClient.from_config(config)
+        return client
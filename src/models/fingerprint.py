@@ -0,0 +1,116 @@
+"""
+Order-independent fingerprints of product lists, and mock fixtures indexed by them.
+
+A list fingerprint is (length, sum of per-product hashes mod 2**64). Summing
+makes it independent of order while still telling {a, a, b} from {a, b, b},
+which an XOR would not. Products are hashed on their source fields only
+(see source_view), so pipeline-derived fields never affect a match.
+
+Finding the fixture for a list is then O(n) hashing plus one dict lookup,
+however many fixtures are configured.
+"""
+
+import hashlib
+import json
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from src.models.product import source_view
+
+
+_MASK_64 = (1 << 64) - 1
+
+Fingerprint = Tuple[int, int]
+
+
+def mapping_hash(mapping: Mapping) -> int:
+    """
+    64-bit hash of a mapping's canonical JSON form (keys sorted).
+
+    Args:
+        mapping: Dict of JSON-like values (e.g. a normalized query)
+
+    Returns:
+        int: Hash that is equal for mappings with equal keys and values
+    """
+    canonical = json.dumps(mapping, sort_keys=True, separators=(',', ':'), default=str)
+    return int.from_bytes(hashlib.blake2b(canonical.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def product_hash(record: Mapping) -> int:
+    """
+    64-bit hash of a product's source fields.
+
+    Args:
+        record: Product dict
+
+    Returns:
+        int: Hash that is equal for records with equal source fields
+    """
+    return mapping_hash(source_view(record))
+
+
+def list_fingerprint(records: Iterable[Mapping]) -> Fingerprint:
+    """
+    Order-independent fingerprint of a list of products.
+
+    Args:
+        records: Product dicts
+
+    Returns:
+        Fingerprint: (number of products, sum of product hashes mod 2**64)
+    """
+    count = 0
+    total = 0
+    for record in records:
+        count += 1
+        total += product_hash(record)
+    return count, total & _MASK_64
+
+
+class FixtureIndex:
+    """
+    FixtureIndex maps mock input lists to their configured outputs by fingerprint.
+
+    Accepts one case ({'input_products': [...], 'output_products': [...]})
+    or a list of cases. When two cases have the same input, the first wins.
+    """
+
+    def __init__(self, cases: Union[Dict[str, Any], List[Dict[str, Any]], None],
+                 input_key: str = 'input_products', output_key: str = 'output_products'):
+        """
+        Index fixture cases.
+
+        Args:
+            cases: One case dict, a list of case dicts, or None
+            input_key: Key of the input product list in each case
+            output_key: Key of the output in each case
+        """
+        if not cases:
+            cases = []
+        elif isinstance(cases, Mapping):
+            cases = [cases]
+
+        self._outputs: Dict[Fingerprint, Any] = {}
+        for case in cases:
+            fingerprint = list_fingerprint(case.get(input_key, []))
+            self._outputs.setdefault(fingerprint, case.get(output_key, []))
+        # Lists whose length no fixture has are rejected without hashing
+        self._lengths = {count for count, _ in self._outputs}
+
+    def lookup(self, products: List[Mapping]) -> Optional[Any]:
+        """
+        Output of the fixture whose input matches the products in any order.
+
+        Args:
+            products: Product dicts
+
+        Returns:
+            Optional[Any]: Configured output (not copied), or None if no fixture matches
+        """
+        if len(products) not in self._lengths:
+            return None
+        return self._outputs.get(list_fingerprint(products))
+
+    def __len__(self) -> int:
+        return len(self._outputs)
@@ -0,0 +1,26 @@
+"""
+Product records shared by the pipeline stages.
+Records are plain dicts that flow through extract → validate → dedup → rank
+without per-stage copies; only the ranker copies the page it annotates.
+"""
+
+from typing import Any, Dict, Mapping
+
+
+# Fields computed by the pipeline itself rather than read from a page.
+# Mock fixtures are written against source fields only, so these are
+# ignored when matching a product against a fixture.
+DERIVED_FIELDS = frozenset({'price_minor', 'canonical_id', 'ranking_score', 'ranking_rank', 'ranking_metadata'})
+
+
+def source_view(record: Mapping) -> Dict[str, Any]:
+    """
+    Return a record's source fields, dropping pipeline-derived ones.
+
+    Args:
+        record: Product mapping
+
+    Returns:
+        Dict[str, Any]: Copy without DERIVED_FIELDS
+    """
+    return {key: value for key, value in record.items() if key not in DERIVED_FIELDS}
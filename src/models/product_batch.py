@@ -0,0 +1,214 @@
+"""
+Columnar product batch.
+Holds a batch of product dicts as NumPy columns so validate/dedup/rank can
+operate on whole columns instead of looping over products in Python.
+"""
+
+import copy
+import re
+from typing import Any, Dict, Iterable, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+from src.extractor.price_parser import price_amount
+
+
+_TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+
+def intern_strings(values: Iterable[str]) -> Tuple[np.ndarray, List[str]]:
+    """
+    Intern a sequence of strings into integer codes.
+
+    Args:
+        values: Strings to intern
+
+    Returns:
+        Tuple of (int32 codes, vocabulary where vocab[code] is the string)
+    """
+    index: Dict[str, int] = {}
+    codes = [index.setdefault(value, len(index)) for value in values]
+    return np.asarray(codes, dtype=np.int32), list(index)
+
+
+def _text(value: Any) -> str:
+    """Return a product field as a string ('' when absent)."""
+    return '' if value is None else str(value)
+
+
+def _gather_rows(ids: np.ndarray, offsets: np.ndarray, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Select rows from a CSR-encoded ragged array.
+
+    Args:
+        ids: Flat values
+        offsets: Row boundaries; row i is ids[offsets[i]:offsets[i + 1]]
+        rows: Row indices to select, in output order
+
+    Returns:
+        Tuple of (flat values, offsets) for the selected rows
+    """
+    starts = offsets[rows]
+    lengths = offsets[rows + 1] - starts
+    new_offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=new_offsets[1:])
+    if not new_offsets[-1]:
+        return np.zeros(0, dtype=ids.dtype), new_offsets
+    gather = np.repeat(starts - new_offsets[:-1], lengths) + np.arange(new_offsets[-1])
+    return ids[gather], new_offsets
+
+
+class ProductBatch:
+    """
+    ProductBatch is a column store over a list of product dicts.
+
+    Columns:
+        price:        float64 price in major units (NaN if unparseable)
+        scores:       float64 per-product score (filled by rankers)
+        site/currency/name/raw_price: int32 codes into the matching *_vocab list
+        names_lower:  lowercased product names (NumPy unicode array)
+        token_ids/token_offsets: CSR layout of interned lowercase name tokens;
+                      tokens of row i are token_ids[token_offsets[i]:token_offsets[i + 1]]
+        name_token_ids/name_token_offsets: the same per distinct name (name_vocab entry),
+                      shared by every batch derived with take()
+    """
+
+    def __init__(self, records: List[Dict[str, Any]], price: np.ndarray, scores: np.ndarray,
+                 site: np.ndarray, site_vocab: List[str],
+                 currency: np.ndarray, currency_vocab: List[str],
+                 name: np.ndarray, name_vocab: List[str],
+                 raw_price: np.ndarray, raw_price_vocab: List[str],
+                 names_lower: np.ndarray,
+                 token_ids: np.ndarray, token_offsets: np.ndarray, token_vocab: List[str],
+                 name_token_ids: np.ndarray, name_token_offsets: np.ndarray):
+        self.records = records
+        self.price = price
+        self.scores = scores
+        self.site = site
+        self.site_vocab = site_vocab
+        self.currency = currency
+        self.currency_vocab = currency_vocab
+        self.name = name
+        self.name_vocab = name_vocab
+        self.raw_price = raw_price
+        self.raw_price_vocab = raw_price_vocab
+        self.names_lower = names_lower
+        self.token_ids = token_ids
+        self.token_offsets = token_offsets
+        self.token_vocab = token_vocab
+        self.name_token_ids = name_token_ids
+        self.name_token_offsets = name_token_offsets
+
+    @classmethod
+    def from_products(cls, products: Sequence[Mapping]) -> 'ProductBatch':
+        """
+        Build a batch from product dicts.
+
+        Args:
+            products: Products in pipeline order
+
+        Returns:
+            ProductBatch: Columnar view over the same records
+        """
+        records = list(products)
+
+        prices = [price_amount(record) for record in records]
+        price = np.asarray([np.nan if value is None else value for value in prices], dtype=np.float64)
+
+        site, site_vocab = intern_strings(_text(record.get('site')) for record in records)
+        currency, currency_vocab = intern_strings(_text(record.get('currency')) for record in records)
+        name, name_vocab = intern_strings(_text(record.get('productName')) for record in records)
+        raw_price, raw_price_vocab = intern_strings(_text(record.get('price')) for record in records)
+
+        # Lowercase and tokenize each distinct name once, then gather per row
+        lowered = [value.lower() for value in name_vocab]
+        names_lower = np.asarray(lowered, dtype=str)[name] if lowered else np.zeros(0, dtype='<U1')
+
+        token_index: Dict[str, int] = {}
+        vocab_tokens: List[int] = []
+        vocab_offsets = [0]
+        for value in lowered:
+            vocab_tokens.extend(token_index.setdefault(token, len(token_index)) for token in _TOKEN_PATTERN.findall(value))
+            vocab_offsets.append(len(vocab_tokens))
+        name_token_ids = np.asarray(vocab_tokens, dtype=np.int32)
+        name_token_offsets = np.asarray(vocab_offsets, dtype=np.int64)
+        token_ids, token_offsets = _gather_rows(name_token_ids, name_token_offsets, name)
+
+        return cls(
+            records=records,
+            price=price,
+            scores=np.zeros(len(records), dtype=np.float64),
+            site=site, site_vocab=site_vocab,
+            currency=currency, currency_vocab=currency_vocab,
+            name=name, name_vocab=name_vocab,
+            raw_price=raw_price, raw_price_vocab=raw_price_vocab,
+            names_lower=names_lower,
+            token_ids=token_ids,
+            token_offsets=token_offsets,
+            token_vocab=list(token_index),
+            name_token_ids=name_token_ids,
+            name_token_offsets=name_token_offsets
+        )
+
+    def take(self, indices: np.ndarray) -> 'ProductBatch':
+        """
+        Select rows by integer indices or boolean mask, in the given order.
+
+        Args:
+            indices: Integer index array or boolean mask
+
+        Returns:
+            ProductBatch: New batch sharing vocabularies with this one
+        """
+        indices = np.asarray(indices)
+        if indices.dtype == bool:
+            indices = np.flatnonzero(indices)
+        indices = indices.astype(np.int64, copy=False)
+
+        token_ids, token_offsets = _gather_rows(self.token_ids, self.token_offsets, indices)
+
+        return ProductBatch(
+            records=[self.records[i] for i in indices.tolist()],
+            price=self.price[indices],
+            scores=self.scores[indices],
+            site=self.site[indices], site_vocab=self.site_vocab,
+            currency=self.currency[indices], currency_vocab=self.currency_vocab,
+            name=self.name[indices], name_vocab=self.name_vocab,
+            raw_price=self.raw_price[indices], raw_price_vocab=self.raw_price_vocab,
+            names_lower=self.names_lower[indices],
+            token_ids=token_ids,
+            token_offsets=token_offsets,
+            token_vocab=self.token_vocab,
+            name_token_ids=self.name_token_ids,
+            name_token_offsets=self.name_token_offsets
+        )
+
+    def with_records(self, records: List[Dict[str, Any]]) -> 'ProductBatch':
+        """
+        The same columns over replacement records (e.g. annotated copies of this batch's).
+
+        Args:
+            records: One record per row, in batch order
+
+        Returns:
+            ProductBatch: New batch sharing every column with this one
+        """
+        if len(records) != len(self.records):
+            raise ValueError(f"Expected {len(self.records)} records, got {len(records)}")
+        batch = copy.copy(self)
+        batch.records = list(records)
+        return batch
+
+    def tokens(self, row: int) -> np.ndarray:
+        """Return the interned token ids of one row's product name."""
+        return self.token_ids[self.token_offsets[row]:self.token_offsets[row + 1]]
+
+    def to_products(self) -> List[Dict[str, Any]]:
+        """Return the row records in batch order."""
+        return list(self.records)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __repr__(self) -> str:
+        return f"ProductBatch({len(self)} products)"
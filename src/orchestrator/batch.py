@@ -0,0 +1,280 @@
+"""
+Batch mode.
+
+`main.py batch` streams a JSONL file of requests through an OrchestratorPool
+and writes one JSONL result line per request as each one completes (so
+lines come out in completion order; each carries its input line number).
+
+Memory stays flat however long the input is: requests are read lazily, at
+most `2 * workers` are in flight, and everything kept across requests is
+bounded (the shared-work memo and the result cache).
+
+Work that overlapping requests have in common is done once. Normalization,
+site selection and page fetches go through a SharedWork memo: a call already
+done returns the stored result, and a call another worker is still running
+waits for that worker instead of repeating it. Identical requests are also
+answered from the pool's shared result cache.
+"""
+
+import copy
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, Tuple
+
+from src.orchestrator.client import DEFAULT_WORKERS
+from src.orchestrator.pool import OrchestratorPool
+
+
+def batch_settings(config: Dict) -> Dict[str, Any]:
+    """
+    The `batch` section of a config with defaults filled in.
+
+    Args:
+        config: Pipeline config
+
+    Returns:
+        Dict[str, Any]: workers, shared_entries, result_cache_entries
+    """
+    settings = {'workers': DEFAULT_WORKERS, 'shared_entries': 2048, 'result_cache_entries': 1024}
+    settings.update(config.get('batch') or {})
+    return settings
+
+
+def read_requests(lines: Iterable[str]) -> Iterator[Tuple[int, Any]]:
+    """
+    Parse JSONL request lines lazily.
+
+    Args:
+        lines: Input lines, e.g. an open file
+
+    Yields:
+        Tuple[int, Any]: (line number, request dict), or (line number, ValueError) for a bad line
+    """
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            yield number, ValueError(f"Invalid JSON: {e}")
+            continue
+        if not isinstance(request, dict) or not request.get('query'):
+            yield number, ValueError("A request needs a 'query'")
+            continue
+        yield number, request
+
+
+class SharedWork:
+    """
+    SharedWork runs each distinct call once for all threads.
+
+    Results are kept in one bounded LRU, keyed by stage and call key. A caller whose call is
+    already running in another thread waits for that result. Failures are
+    not stored: waiting callers get the exception, later callers retry.
+    """
+
+    def __init__(self, max_entries: int = 2048):
+        """
+        Initialize an empty memo.
+
+        Args:
+            max_entries: Most results kept (across all stages)
+        """
+        self.max_entries = max_entries
+        self._done: OrderedDict = OrderedDict()
+        self._running: Dict[Tuple[str, Hashable], Future] = {}
+        self._calls: Dict[str, int] = {}
+        self._computed: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def call(self, stage: str, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Result of `compute()` for a key, computed at most once while it is kept.
+
+        Args:
+            stage: Kind of work (e.g. 'fetch'); keys are only compared within a stage
+            key: Identity of the call's inputs
+            compute: Produces the result
+
+        Returns:
+            Any: The (possibly shared) result
+        """
+        entry = (stage, key)
+        with self._lock:
+            self._calls[stage] = self._calls.get(stage, 0) + 1
+            if entry in self._done:
+                self._done.move_to_end(entry)
+                return self._done[entry]
+            future = self._running.get(entry)
+            owner = future is None
+            if owner:
+                future = self._running[entry] = Future()
+                self._computed[stage] = self._computed.get(stage, 0) + 1
+        if not owner:
+            return future.result()
+        try:
+            value = compute()
+        except BaseException as e:
+            with self._lock:
+                del self._running[entry]
+            future.set_exception(e)
+            # The traceback holds this frame: drop the future so that it does not form a cycle
+            del future
+            raise
+        with self._lock:
+            del self._running[entry]
+            self._done[entry] = value
+            if len(self._done) > self.max_entries:
+                self._done.popitem(last=False)
+        future.set_result(value)
+        return value
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Per stage: calls made, calls computed, and calls shared (answered without computing)."""
+        with self._lock:
+            return {stage: {'calls': calls, 'computed': self._computed.get(stage, 0),
+                            'shared': calls - self._computed.get(stage, 0)}
+                    for stage, calls in self._calls.items()}
+
+
+class _SharedModule:
+    """Pipeline module whose calls go through a SharedWork; other attributes pass through."""
+
+    def __init__(self, module, work: SharedWork):
+        self._module = module
+        self._work = work
+
+    def __getattr__(self, name):
+        return getattr(self._module, name)
+
+
+class _SharedNormalizer(_SharedModule):
+    def normalize(self, query: str, country: str = "US") -> Dict[str, Any]:
+        normalized = self._work.call('normalize', (query, country),
+                                     lambda: self._module.normalize(query, country))
+        return copy.deepcopy(normalized)
+
+
+class _SharedSiteSelector(_SharedModule):
+    def select_sources(self, country: str, category: str = None):
+        return list(self._work.call('select_sites', (country, category),
+                                    lambda: self._module.select_sources(country, category)))
+
+
+class _SharedScraper(_SharedModule):
+    def fetch_html(self, url_entry: Dict[str, Any]) -> str:
+        key = (url_entry.get('url'), url_entry.get('html_file'))
+        return self._work.call('fetch', key, lambda: self._module.fetch_html(url_entry))
+
+
+def share_work(orchestrator, work: SharedWork) -> None:
+    """
+    Route an orchestrator's normalization, site selection and page fetches through a SharedWork.
+
+    Args:
+        orchestrator: Orchestrator whose modules are wrapped in place
+        work: Memo shared with the other orchestrators
+    """
+    orchestrator.query_normalizer = _SharedNormalizer(orchestrator.query_normalizer, work)
+    orchestrator.site_selector = _SharedSiteSelector(orchestrator.site_selector, work)
+    orchestrator.scraper = _SharedScraper(orchestrator.scraper, work)
+
+
+class BatchRunner:
+    """
+    BatchRunner streams requests through an OrchestratorPool with shared work.
+    """
+
+    def __init__(self, config: Dict, workers: int = DEFAULT_WORKERS, shared_entries: int = 2048,
+                 result_cache_entries: int = 1024):
+        """
+        Build the pool.
+
+        Args:
+            config: Pipeline config
+            workers: Requests run at once
+            shared_entries: Results kept by the shared-work memo
+            result_cache_entries: Entries kept by the result cache (unless the config sets a limit)
+        """
+        modules = config.get('modules', {})
+        cache_config = modules.get('cache', {})
+        if cache_config.get('max_entries') is None:
+            cache_config = dict(cache_config, max_entries=result_cache_entries)
+            config = dict(config, modules=dict(modules, cache=cache_config))
+        self.workers = workers
+        self.pool = OrchestratorPool(config, workers)
+        self.work = SharedWork(shared_entries)
+        for orchestrator in self.pool.orchestrators:
+            share_work(orchestrator, self.work)
+        self.completed = 0
+        self.failed = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Dict, workers: int = None) -> 'BatchRunner':
+        """
+        Build a runner from the config's `batch` section.
+
+        Args:
+            config: Pipeline config
+            workers: Overrides the configured worker count
+
+        Returns:
+            BatchRunner: Runner
+        """
+        settings = batch_settings(config)
+        return cls(config, workers=workers or settings['workers'], shared_entries=settings['shared_entries'],
+                   result_cache_entries=settings['result_cache_entries'])
+
+    def run(self, requests: Iterable[Tuple[int, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        Run requests, yielding each result as it completes.
+
+        Args:
+            requests: (line number, request dict or ValueError), as from read_requests()
+
+        Yields:
+            Dict[str, Any]: {'line', 'query', 'country', ...request fields, 'results'} or
+            {'line', ..., 'error'}
+        """
+        window = 2 * self.workers
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='batch') as executor:
+            pending = set()
+            for number, request in requests:
+                pending.add(executor.submit(self._run_one, number, request))
+                if len(pending) >= window:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
+    def stats(self) -> Dict[str, Any]:
+        """Requests completed and failed, and the shared-work counts per stage."""
+        return {'completed': self.completed, 'failed': self.failed, 'shared': self.work.stats()}
+
+    def _run_one(self, number: int, request: Any) -> Dict[str, Any]:
+        """Run one request; failures become an 'error' line rather than stopping the batch."""
+        if isinstance(request, Exception):
+            record = {'line': number, 'error': str(request)}
+        else:
+            record = {'line': number, **request, 'country': request.get('country', 'US')}
+            user_input = {'query': request['query'], 'country': record['country']}
+            try:
+                with self.pool.acquire() as orchestrator:
+                    record['results'] = orchestrator.run(user_input, limit=request.get('limit'))
+            except ValueError as e:
+                record['error'] = str(e)
+            except Exception as e:
+                record['error'] = f"{type(e).__name__}: {e}"
+        with self._lock:
+            if 'error' in record:
+                self.failed += 1
+            else:
+                self.completed += 1
+        return record
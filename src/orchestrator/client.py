@@ -0,0 +1,123 @@
+"""
+Pipeline server client.
+
+`main.py --query` uses forward_run() to hand its request to a running
+`main.py serve` (see `server.py`). The client speaks just enough HTTP/1.1
+over a plain socket for that one request: `http.client` would import the
+email and ssl packages, which costs more than the forwarded query itself.
+
+Each request carries a hash of the caller's config. A server started from a
+different config (another CONFIG_PATH, or edits made since it started)
+answers 409, and forward_run() returns None so the caller runs in-process.
+"""
+
+import json
+import socket
+from typing import Any, Dict, Optional, Tuple
+
+from src.models.fingerprint import mapping_hash
+
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+DEFAULT_WORKERS = 4
+
+
+def server_settings(config: Dict) -> Dict[str, Any]:
+    """
+    The `server` section of a config with defaults filled in.
+
+    Args:
+        config: Pipeline config
+
+    Returns:
+        Dict[str, Any]: host, port, workers, forward, connect_timeout, request_timeout
+    """
+    settings = {
+        'host': DEFAULT_HOST,
+        'port': DEFAULT_PORT,
+        'workers': DEFAULT_WORKERS,
+        'forward': True,
+        'connect_timeout': 0.2,
+        'request_timeout': 300,
+    }
+    settings.update(config.get('server') or {})
+    return settings
+
+
+def config_hash(config: Dict) -> int:
+    """
+    Hash of a pipeline config, equal for configs with equal keys and values.
+
+    Args:
+        config: Pipeline config
+
+    Returns:
+        int: 64-bit hash sent with forwarded requests
+    """
+    return mapping_hash(config)
+
+
+def forward_run(user_input: Dict[str, Any], limit: Optional[int] = None, cursor: Optional[str] = None,
+                address: Tuple[str, int] = (DEFAULT_HOST, DEFAULT_PORT), connect_timeout: float = 0.2,
+                request_timeout: float = 300, config: Optional[Dict] = None) -> Optional[Any]:
+    """
+    Send a pipeline request to a running server.
+
+    Args:
+        user_input: {'query', 'country'}
+        limit: Page size, as for Orchestrator.run_page
+        cursor: Cursor from a previous page
+        address: Server (host, port)
+        connect_timeout: How long to wait for the connection
+        request_timeout: How long to wait for the result
+        config: The caller's config; the server only runs the request if its own config is equal
+
+    Returns:
+        Optional[Any]: The result, or None if no pipeline server is listening or
+        it runs a different config
+
+    Raises:
+        ValueError: If the server rejected the request (e.g. a malformed cursor)
+        RuntimeError: If the run failed on the server
+    """
+    try:
+        connection = socket.create_connection(address, timeout=connect_timeout)
+    except OSError:
+        return None
+    request = {'query': user_input.get('query', ''), 'country': user_input.get('country', 'US'),
+               'limit': limit, 'cursor': cursor,
+               'config_hash': config_hash(config) if config is not None else None}
+    body = json.dumps(request).encode('utf-8')
+    head = (f"POST /run HTTP/1.1\r\nHost: {address[0]}:{address[1]}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+            f"Connection: close\r\n\r\n").encode('ascii')
+    chunks = []
+    try:
+        with connection:
+            connection.settimeout(request_timeout)
+            connection.sendall(head + body)
+            while True:
+                chunk = connection.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+    except socket.timeout:
+        raise RuntimeError(f"Pipeline server did not answer within {request_timeout}s")
+    except OSError:
+        return None
+    status_line, _, payload = b''.join(chunks).partition(b'\r\n\r\n')
+    try:
+        status = int(status_line.split(None, 2)[1])
+        payload = json.loads(payload)
+        error = payload.get('error') if status != 200 else None
+    except (IndexError, ValueError, AttributeError):
+        # Something other than a pipeline server is listening on this port
+        return None
+    if status == 409:
+        return None
+    if status == 400:
+        raise ValueError(error)
+    if status != 200:
+        raise RuntimeError(f"Pipeline server error: {error}")
+    return payload
@@ -2,25 +2,65 @@
 Orchestrator module interface.
 Coordinates the entire price intelligence pipeline, calling individual modules in sequence.
 """
-import yaml
-from typing import Dict, List, Any
-from src.query_normalizer.interface import QueryNormalizer
-from src.site_selector.interface import SiteSelector
-from src.search_agent.interface import SearchAgent
-from src.scraper.interface import Scraper
-from src.extractor.interface import Extractor
-from src.validator.interface import Validator
-from src.deduplicator.interface import Deduplicator
-from src.ranker.interface import Ranker
-from src.cache.interface import create_cache_manager
+import importlib
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Any, Optional, Tuple
+from src.config.loader import load_config
+
+
+class _Module:
+    """
+    Pipeline module built from the orchestrator's config on first access.
+    
+    The module's package is only imported then, so a run that ends early
+    (a cached result) or only needs one module (autocomplete) neither imports
+    nor builds the others. The built module is stored on the instance, which
+    also lets callers replace it by plain assignment. Construction holds a
+    lock and re-checks the instance, so threads racing on first access
+    build the module once and all get the same one.
+    """
+    
+    def __init__(self, module: str, factory: str):
+        self.module = module
+        self.factory = factory
+        self.name = factory
+        self._lock = threading.Lock()
+    
+    def __set_name__(self, owner, name):
+        self.name = name
+    
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        with self._lock:
+            if self.name in instance.__dict__:
+                return instance.__dict__[self.name]
+            factory = getattr(importlib.import_module(self.module), self.factory)
+            value = instance.__dict__[self.name] = factory(instance.config)
+        return value
 
 
 class Orchestrator:
     """
     Orchestrator coordinates the price intelligence pipeline.
     Loads configuration, calls individual modules, and returns final results.
+    Modules are constructed lazily, on first use.
     """
     
+    query_normalizer = _Module('src.query_normalizer.interface', 'QueryNormalizer')
+    site_selector = _Module('src.site_selector.interface', 'SiteSelector')
+    search_agent = _Module('src.search_agent.interface', 'SearchAgent')
+    relevance_filter = _Module('src.search_agent.prefilter', 'create_relevance_filter')
+    scraper = _Module('src.scraper.interface', 'Scraper')
+    url_canonicalizer = _Module('src.scraper.canonical_url', 'create_url_canonicalizer')
+    extractor = _Module('src.extractor.interface', 'Extractor')
+    validator = _Module('src.validator.interface', 'Validator')
+    deduplicator = _Module('src.deduplicator.interface', 'Deduplicator')
+    ranker = _Module('src.ranker.interface', 'Ranker')
+    cache_manager = _Module('src.cache.interface', 'create_cache_manager')
+    
     def __init__(self, config):
         """
         Initialize Orchestrator with config dict or YAML path.
@@ -29,33 +69,28 @@ class Orchestrator:
             config (dict or str): Config dict or path to YAML config file.
         """
         if isinstance(config, str):
-            with open(config, 'r') as f:
-                self.config = yaml.safe_load(f)
+            self.config = load_config(config)
         else:
             self.config = config
-            
-        # Initialize all modules based on config
-        self.query_normalizer = QueryNormalizer(self.config)
-        self.site_selector = SiteSelector(self.config)
-        self.search_agent = SearchAgent(self.config)
-        self.scraper = Scraper(self.config)
-        self.extractor = Extractor(self.config)
-        self.validator = Validator(self.config)
-        self.deduplicator = Deduplicator(self.config)
-        self.ranker = Ranker(self.config)
-        # Initialize cache manager
-        self.cache_manager = create_cache_manager(self.config)
-        
-    def run(self, user_input: dict) -> List[Dict[str, Any]]:
+        # Work shared by the last run_many(), per stage
+        self.run_many_stats: Dict[str, Dict[str, int]] = {}
+        
+    def run(self, user_input: dict, limit: Optional[int] = None,
+            cursor: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Run the complete price intelligence pipeline.
         
         Args:
             user_input (dict): User input containing 'country' and 'query' keys.
+            limit (Optional[int]): Only return the top `limit` products.
+            cursor (Optional[str]): Cursor from run_page() to continue after.
             
         Returns:
             List[Dict[str, Any]]: List of ranked product results with price information.
         """
+        if limit is not None or cursor is not None:
+            return self.run_page(user_input, limit, cursor)['results']
+        
         # Extract input parameters
         country = user_input.get('country', 'US')
         query = user_input.get('query', '')
@@ -68,59 +103,7 @@ class Orchestrator:
             print(f"⚡ Returning cached results for: {query} in {country}")
             return cached_results
         
-        # Step 1: Normalize the query
-        print("📝 Step 1: Normalizing query...")
-        normalized_data = self.query_normalizer.normalize(query)
-        print(f"   Normalized: {normalized_data}")
-        
-        # Step 2: Select websites based on country and category
-        print("🌐 Step 2: Selecting websites...")
-        category = normalized_data.get('category', 'Smartphone')
-        site_list = self.site_selector.select_sources(country, category)
-        print(f"   Selected sites: {site_list}")
-        
-        # Step 3: Search each site
-        print("🔍 Step 3: Searching sites...")
-        search_results = self.search_agent.search(normalized_data, site_list)
-        print(f"   Found {len(search_results)} search results")
-        
-        # Step 4: Fetch HTML for each search result
-        print("📄 Step 4: Fetching HTML content...")
-        html_contents = []
-        for result in search_results:
-            url = result['url']
-            html_file = result.get('html_file', '')
-            site = result.get('site', '')
-            html_content = self.scraper.fetch_html({'url': url, 'html_file': html_file})
-            html_contents.append({
-                'url': url,
-                'html': html_content,
-                'site': site
-            })
-        print(f"   Fetched {len(html_contents)} HTML contents")
-        
-        # Step 5: Extract product data from HTML
-        print("🔧 Step 5: Extracting product data...")
-        extracted_products = []
-        for html_item in html_contents:
-            extracted_data = self.extractor.extract(html_item['html'], html_item['url'])
-            if extracted_data:
-                extracted_products.append(extracted_data)
-        print(f"   Extracted {len(extracted_products)} products")
-        
-        # Step 6: Validate products against query
-        print("✅ Step 6: Validating products...")
-        valid_products = []
-        for product in extracted_products:
-            is_valid = self.validator.validate(normalized_data, product)
-            if is_valid:
-                valid_products.append(product)
-        print(f"   Validated {len(valid_products)} products")
-        
-        # Step 7: Deduplicate products
-        print("🔄 Step 7: Deduplicating products...")
-        deduped_products = self.deduplicator.deduplicate(valid_products)
-        print(f"   Deduplicated: {len(valid_products)} → {len(deduped_products)} products")
+        deduped_products = self._collect_candidates(query, country)
         
         # Step 8: Rank products by best value
         print("🏆 Step 8: Ranking products...")
@@ -133,6 +116,430 @@ class Orchestrator:
         print(f"✅ Pipeline complete! Returning {len(ranked_products)} ranked products")
         return ranked_products
     
+    def run_page(self, user_input: dict, limit: Optional[int] = None,
+                 cursor: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Run the pipeline and return one page of the ranking.
+        
+        The deduplicated products are cached per query, so following
+        `next_cursor` only selects the next top-k instead of rerunning
+        the pipeline or fully re-ranking.
+        
+        Args:
+            user_input (dict): User input containing 'country' and 'query' keys.
+            limit (Optional[int]): Page size (None for all remaining products).
+            cursor (Optional[str]): `next_cursor` from the previous page.
+            
+        Returns:
+            Dict[str, Any]: {'results': ranked page, 'next_cursor': str or None}
+            
+        Raises:
+            ValueError: If the cursor is malformed or limit is negative
+        """
+        country = user_input.get('country', 'US')
+        query = user_input.get('query', '')
+        
+        # Reject a bad cursor before doing any work
+        if cursor:
+            from src.ranker.pagination import decode_cursor
+            decode_cursor(cursor)
+        
+        print(f"🚀 Starting price intelligence pipeline for: {query} in {country} (limit={limit})")
+        
+        candidates = self.cache_manager.get_cached_ranking_candidates(query, country)
+        if candidates is not None:
+            print(f"⚡ Using cached ranking candidates for: {query} in {country}")
+        else:
+            candidates = self._collect_candidates(query, country)
+            self.cache_manager.cache_ranking_candidates(query, country, candidates)
+        
+        # Step 8: Select the requested page of the ranking
+        print("🏆 Step 8: Ranking products...")
+        page = self.ranker.rank_page(candidates, limit, cursor)
+        results = page['results']
+        print(f"   Ranked page of {len(results)} products")
+        
+        print(f"✅ Pipeline complete! Returning {len(results)} ranked products")
+        return {'results': results, 'next_cursor': page['next_cursor']}
+    
+    def _collect_candidates(self, query: str, country: str) -> List[Dict[str, Any]]:
+        """
+        Run pipeline steps 1-7 and return the deduplicated, unranked products.
+        
+        Steps 4-7 run as a run_many() plan of one request, so run() and
+        run_many() share a single implementation.
+        
+        Args:
+            query (str): Raw user query
+            country (str): Country code
+            
+        Returns:
+            List[Dict[str, Any]]: Deduplicated products in pipeline order
+        """
+        # Step 1: Normalize the query
+        print("📝 Step 1: Normalizing query...")
+        normalized_data = self.query_normalizer.normalize(query, country)
+        print(f"   Normalized: {normalized_data}")
+        
+        # Steps 2-3: Select websites for the country and category, then search them
+        print("🔍 Steps 2-3: Selecting websites and searching...")
+        counts = self._new_counts()
+        search_results, audits = self._search_country(normalized_data, country, counts, {}, {})
+        print(f"   Found {len(search_results)} search results to fetch")
+        
+        # Steps 4-7: Fetch, extract, validate and deduplicate
+        outcome = self._collect_planned({country: (normalized_data, search_results, audits)}, None, counts)[country]
+        if isinstance(outcome, Exception):
+            raise outcome
+        print(f"   Deduplicated to {len(outcome)} products")
+        return outcome
+    
+    def run_many(self, requests: List[dict], max_concurrency: Optional[int] = None,
+                 return_exceptions: bool = False) -> List[Any]:
+        """
+        Run the pipeline for many requests, doing work they share only once.
+        
+        All requests are planned together: identical requests, site selections
+        and searches run once; the union of (site, URL) page fetches is
+        fetched once, `max_concurrency` pages at a time; and identical
+        extraction inputs (URL and HTML) are extracted once. Steps 6-8 then
+        run per request on its own copies of the extracted products, so the
+        results equal those of calling run() on each request.
+        `run_many_stats` then holds, per stage, the calls a loop over run()
+        would make, the calls computed and the calls shared.
+        
+        Args:
+            requests (List[dict]): User inputs, as for run()
+            max_concurrency (Optional[int]): Most page fetches at once
+                (default `orchestrator.max_concurrency` in the config, 8)
+            return_exceptions (bool): Put a failed request's exception in its
+                place in the results instead of raising it
+            
+        Returns:
+            List[Any]: Ranked results (or exceptions) per request, in request order
+        """
+        counts = self._new_counts()
+        keys = [(request.get('query', ''), request.get('country', 'US')) for request in requests]
+        print(f"🚀 Starting price intelligence pipeline for {len(keys)} requests")
+        outcomes: Dict[Tuple[str, str], Any] = {}
+        counts['requests'][0] = len(keys)
+        for query, country in dict.fromkeys(keys):
+            cached_results = self.cache_manager.get_cached_query_results(query, country)
+            if cached_results is not None:
+                outcomes[(query, country)] = cached_results
+        pending = [key for key in dict.fromkeys(keys) if key not in outcomes]
+        counts['requests'][1] = len(pending)
+        
+        # Steps 1-3: normalize, select sites and search, per distinct request
+        print(f"🔍 Steps 1-3: Planning {len(pending)} distinct requests...")
+        site_lists, searches, plans = {}, {}, {}
+        for query, country in pending:
+            try:
+                normalized_data = self.query_normalizer.normalize(query, country)
+                plans[(query, country)] = (normalized_data,) + self._search_country(
+                    normalized_data, country, counts, site_lists, searches)
+            except Exception as e:
+                outcomes[(query, country)] = e
+        
+        # Steps 4-7 for all plans together, then Step 8 per request
+        for key, candidates in self._collect_planned(plans, max_concurrency, counts).items():
+            if isinstance(candidates, Exception):
+                outcomes[key] = candidates
+                continue
+            try:
+                ranked_products = self.ranker.rank(candidates)
+            except Exception as e:
+                outcomes[key] = e
+                continue
+            self.cache_manager.cache_query_results(key[0], key[1], ranked_products)
+            outcomes[key] = ranked_products
+        
+        self.run_many_stats = self._stats(counts)
+        results = [outcomes[key] for key in keys]
+        if not return_exceptions:
+            for result in results:
+                if isinstance(result, Exception):
+                    raise result
+        print(f"✅ Pipeline complete for {len(keys)} requests "
+              f"({counts['fetch'][1]}/{counts['fetch'][0]} pages fetched, "
+              f"{counts['extract'][1]}/{counts['extract'][0]} extracted)")
+        return results
+    
+    def compare(self, query: str, countries: List[str], currency: Optional[str] = None,
+                limit: Optional[int] = None, max_concurrency: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Compare one product across markets in a single ranking.
+        
+        Normalization, site selection and search run for all countries
+        concurrently (the query is normalized per country, as normalization
+        depends on the market; the normalizer's LRU shares repeats), and
+        their page fetches are fetched together as in run_many(), so the
+        latency follows the slowest country rather than the sum. Each country's products are validated,
+        deduplicated and ranked as in run(); prices are then converted with
+        the locally cached FX table (config `fx`) and merged into one
+        ranking, cheapest first. Products whose price cannot be converted
+        come last.
+        
+        Args:
+            query (str): Raw user query
+            countries (List[str]): Country codes, e.g. ['US', 'IN', 'UK', 'DE']
+            currency (Optional[str]): Currency to compare in (default: the FX table's base)
+            limit (Optional[int]): Only return the top `limit` products
+            max_concurrency (Optional[int]): Most page fetches at once
+            
+        Returns:
+            Dict[str, Any]: {'query', 'currency', 'fx_as_of', 'results', 'countries'}, where
+                each result adds 'country', 'converted_price' and 'converted_currency',
+                and 'countries' maps each country to {'products': n} or {'error': message}
+            
+        Raises:
+            ValueError: If no country is given or the currency has no FX rate
+            Exception: The first country's error if every country failed
+        """
+        from src.extractor.fx import FxTable
+        from src.extractor.price_parser import price_with_currency
+        
+        countries = list(dict.fromkeys(countries))
+        if not countries:
+            raise ValueError("Compare needs at least one country")
+        fx = FxTable.from_config(self.config.get('fx'))
+        currency = currency or fx.base
+        if fx.rate(currency) is None:
+            raise ValueError(f"No FX rate for {currency}")
+        
+        print(f"🚀 Comparing {query} across {', '.join(countries)} in {currency}")
+        counts = self._new_counts()
+        
+        def plan_country(country: str) -> Tuple[Tuple[Dict[str, Any], List, List], Dict[str, List[int]]]:
+            """Steps 1-3 for one country, with its own stage counts (merged below)."""
+            country_counts = self._new_counts()
+            normalized_data = self.query_normalizer.normalize(query, country)
+            return (normalized_data,) + self._search_country(normalized_data, country, country_counts,
+                                                             {}, {}), country_counts
+        
+        # Steps 1-3 per country concurrently; threads share no mutable state
+        searched, errors = {}, {}
+        with ThreadPoolExecutor(max_workers=len(countries)) as executor:
+            futures = {executor.submit(plan_country, country): country for country in countries}
+            for future in as_completed(futures):
+                country = futures[future]
+                try:
+                    searched[country], country_counts = future.result()
+                except Exception as e:
+                    errors[country] = e
+                    continue
+                for stage, (calls, computed) in country_counts.items():
+                    counts[stage][0] += calls
+                    counts[stage][1] += computed
+        plans = {country: searched[country] for country in countries if country in searched}
+        
+        # Steps 4-7 for all countries together, Step 8 per country, then one merged ranking
+        outcomes = self._collect_planned(plans, max_concurrency, counts)
+        merged, report = [], {}
+        for country in countries:
+            try:
+                if country in errors:
+                    raise errors[country]
+                if isinstance(outcomes[country], Exception):
+                    raise outcomes[country]
+                ranked_products = self.ranker.rank(outcomes[country])
+            except Exception as e:
+                errors[country] = e
+                report[country] = {'error': str(e)}
+                continue
+            report[country] = {'products': len(ranked_products)}
+            for product in ranked_products:
+                amount, product_currency = price_with_currency(product)
+                converted = fx.convert(amount, product_currency, currency)
+                merged.append(dict(product, country=country,
+                                   converted_price=None if converted is None else round(converted, 2),
+                                   converted_currency=currency))
+        if not any('products' in entry for entry in report.values()):
+            raise errors[countries[0]]
+        
+        # Stable sort: ties keep country order and each country's own ranking
+        merged.sort(key=lambda product: (product['converted_price'] is None, product['converted_price'] or 0.0))
+        self.run_many_stats = self._stats(counts)
+        print(f"✅ Comparison complete! {len(merged)} products from {len(countries)} countries")
+        return {
+            'query': query,
+            'currency': currency,
+            'fx_as_of': fx.as_of,
+            'results': merged[:limit] if limit is not None else merged,
+            'countries': report,
+        }
+    
+    def _extract_and_cache(self, html: str, url: str) -> Optional[Dict[str, Any]]:
+        """Step 5 for one page, storing the product in the product-data cache."""
+        product = self.extractor.extract(html, url)
+        if product:
+            # The cache keeps its own copy; stages annotate the pipeline record
+            self.cache_manager.cache_product_data(url, dict(product))
+        return product
+    
+    @staticmethod
+    def _new_counts() -> Dict[str, List[int]]:
+        """[calls, computed] per stage of run_many() / compare()."""
+        return {stage: [0, 0] for stage in ('requests', 'select_sites', 'search', 'fetch', 'extract', 'audit_fetch')}
+    
+    @staticmethod
+    def _stats(counts: Dict[str, List[int]]) -> Dict[str, Dict[str, int]]:
+        """run_many_stats from stage counts."""
+        return {stage: {'calls': calls, 'computed': computed, 'shared': calls - computed}
+                for stage, (calls, computed) in counts.items()}
+    
+    @staticmethod
+    def _shared(counts: Dict[str, List[int]], stage: str, memo: Dict, key: Any, compute) -> Any:
+        """Result of `compute()` for `key`, computed once per memo; counted under `stage`."""
+        counts[stage][0] += 1
+        if key not in memo:
+            counts[stage][1] += 1
+            memo[key] = compute()
+        return memo[key]
+    
+    def _search_country(self, normalized_data: Dict[str, Any], country: str, counts: Dict[str, List[int]],
+                        site_lists: Dict, searches: Dict) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Steps 2-3 for one country, sharing site lists and searches through the memos; (results, audits)."""
+        category = normalized_data.get('category', 'Smartphone')
+        site_list = self._shared(counts, 'select_sites', site_lists, (country, category),
+                                 lambda: self.site_selector.select_sources(country, category))
+        search_key = (json.dumps(normalized_data, sort_keys=True, default=str), tuple(site_list))
+        search_results = self._shared(counts, 'search', searches, search_key,
+                                      lambda: self.search_agent.search(normalized_data, site_list))
+        kept, audits = self._prefilter(normalized_data, search_results)
+        return self._collapse_urls(kept), self._collapse_urls(audits)
+    
+    def _collapse_urls(self, search_results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Canonicalize search result URLs and keep the first result per canonical URL, before Step 4.
+        
+        Args:
+            search_results (List[Dict[str, Any]]): Results to fetch
+            
+        Returns:
+            List[Dict[str, Any]]: Results with distinct canonical URLs, in order
+        """
+        from src.scraper.canonical_url import collapse_duplicates
+        collapsed = collapse_duplicates(search_results, self.url_canonicalizer)
+        if len(collapsed) < len(search_results):
+            print(f"   Collapsed {len(search_results)} search results to {len(collapsed)} distinct URLs")
+        return collapsed
+    
+    def _prefilter(self, normalized_data: Dict[str, Any],
+                   search_results: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Drop search results the relevance filter scores below its threshold, before Step 4.
+        
+        Args:
+            normalized_data (Dict[str, Any]): Normalized query
+            search_results (List[Dict[str, Any]]): Results from Step 3
+            
+        Returns:
+            Tuple[List, List]: (results to fetch, dropped results due for an audit)
+        """
+        kept, dropped = self.relevance_filter.split(normalized_data, search_results)
+        if dropped:
+            print(f"   Pre-filter dropped {len(dropped)} of {len(search_results)} search results")
+        return kept, self.relevance_filter.audit_sample(dropped)
+    
+    def _collect_planned(self, plans: Dict[Any, Tuple[Dict[str, Any], List[Dict[str, Any]], List[Dict[str, Any]]]],
+                         max_concurrency: Optional[int], counts: Dict[str, List[int]]) -> Dict[Any, Any]:
+        """
+        Run Steps 4-7 for planned searches, fetching and extracting shared pages once.
+        
+        Dropped results due for a relevance-filter audit go through the same
+        product-data cache, page fetches and extractions; a page only an
+        audit needs is counted under 'audit_fetch', not 'fetch'.
+        
+        Args:
+            plans: Key -> (normalized query, search results, results to audit)
+            max_concurrency: Most page fetches at once (None for the configured default)
+            counts: Stage counts to update
+            
+        Returns:
+            Dict[Any, Any]: Key -> deduplicated products, or the exception that failed it
+        """
+        if max_concurrency is None:
+            max_concurrency = (self.config.get('orchestrator') or {}).get('max_concurrency', 8)
+        
+        cached = {}
+        
+        def page_key(result: Dict[str, Any]) -> Optional[Tuple[str, str, str]]:
+            """Fetch key of a result's page, or None if its product is in the product-data cache."""
+            url = result['url']
+            if url not in cached:
+                product_data = self.cache_manager.get_cached_product_data(url)
+                cached[url] = None if product_data is None else dict(product_data)
+            return None if cached[url] is not None else (result.get('site', ''), url, result.get('html_file', ''))
+        
+        # Step 4: fetch the union of pages not in the product-data cache once
+        pages_to_fetch = {}
+        for _, search_results, _ in plans.values():
+            for result in search_results:
+                fetch_key = page_key(result)
+                if fetch_key is not None:
+                    counts['fetch'][0] += 1
+                    pages_to_fetch.setdefault(fetch_key, {'url': result['url'], 'html_file': fetch_key[2]})
+        counts['fetch'][1] += len(pages_to_fetch)
+        # Audits share those fetches; pages only they need are fetched alongside
+        audit_pages = set()
+        for _, _, audits in plans.values():
+            for result in audits:
+                fetch_key = page_key(result)
+                if fetch_key is not None:
+                    counts['audit_fetch'][0] += 1
+                    if fetch_key not in pages_to_fetch:
+                        audit_pages.add(fetch_key)
+                        pages_to_fetch[fetch_key] = {'url': result['url'], 'html_file': fetch_key[2]}
+        counts['audit_fetch'][1] += len(audit_pages)
+        audit_note = f", {len(audit_pages)} for audits" if audit_pages else ""
+        print(f"📄 Step 4: Fetching {len(pages_to_fetch)} distinct pages ({counts['fetch'][0]} requested{audit_note})...")
+        fetch_html = self.scraper.fetch_html
+        with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(pages_to_fetch)))) as executor:
+            futures = {fetch_key: executor.submit(fetch_html, url_entry)
+                       for fetch_key, url_entry in pages_to_fetch.items()}
+        pages = {fetch_key: future.exception() or future.result() for fetch_key, future in futures.items()}
+        extracted = {}
+        
+        def product_for(result: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            """Step 5 for one result: its cached product, or its page extracted once."""
+            product = cached[result['url']]
+            if product is None:
+                html = pages[page_key(result)]
+                if isinstance(html, Exception):
+                    raise html
+                product = self._shared(counts, 'extract', extracted, (result['url'], html),
+                                       lambda: self._extract_and_cache(html, result['url']))
+            return product
+        
+        # Steps 5-7 per plan, extracting each distinct page once
+        print("🔧 Steps 5-7: Extracting, validating and deduplicating...")
+        outcomes = {}
+        for key, (normalized_data, search_results, audits) in plans.items():
+            try:
+                products = []
+                for result in search_results:
+                    product = product_for(result)
+                    if product:
+                        products.append(product)
+                verdicts = self.validator.validate_many(normalized_data, products)
+                valid_products = [product for product, is_valid in zip(products, verdicts) if is_valid]
+                outcomes[key] = self.deduplicator.deduplicate(valid_products)
+            except Exception as e:
+                outcomes[key] = e
+            for result in audits:
+                # The first audit of a page fetched only for audits is charged the fetch
+                fetch_key = page_key(result)
+                fetched = fetch_key in audit_pages
+                audit_pages.discard(fetch_key)
+                try:
+                    product = product_for(result)
+                    valid = bool(product) and self.validator.validate(normalized_data, product)
+                except Exception:
+                    continue  # an audit that cannot fetch says nothing about recall
+                self.relevance_filter.record_audit(valid, fetched)
+        return outcomes
+    
     def describe_flow(self) -> str:
         """
         Describe the pipeline flow for documentation and debugging.
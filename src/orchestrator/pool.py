@@ -0,0 +1,60 @@
+"""
+Orchestrator pool.
+
+Runs pipeline requests concurrently on several orchestrators, for the server
+(`server.py`) and batch mode (`batch.py`). Each orchestrator serves one
+request at a time, since the modules keep unsynchronized per-instance state
+(LRU caches, counters); all of them share one cache manager, so a query
+cached by one orchestrator is answered by every other.
+"""
+
+import queue
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+from src.orchestrator.client import DEFAULT_WORKERS
+from src.orchestrator.interface import Orchestrator
+
+
+class OrchestratorPool:
+    """
+    OrchestratorPool lends warm orchestrators to one request at a time.
+    """
+
+    def __init__(self, config: Dict, size: int = DEFAULT_WORKERS):
+        """
+        Build the orchestrators; they share the first one's cache manager.
+
+        Args:
+            config: Pipeline config
+            size: Orchestrators, i.e. requests run at once
+
+        Raises:
+            ValueError: If size is below 1
+        """
+        if size < 1:
+            raise ValueError("An orchestrator pool needs at least one worker")
+        self.size = size
+        self.orchestrators = [Orchestrator(config) for _ in range(size)]
+        self.cache_manager = self.orchestrators[0].cache_manager
+        for orchestrator in self.orchestrators[1:]:
+            orchestrator.cache_manager = self.cache_manager
+        self._idle: queue.Queue = queue.Queue()
+        for orchestrator in self.orchestrators:
+            self._idle.put(orchestrator)
+
+    def warm(self) -> None:
+        """Build every orchestrator's modules now rather than on the first requests."""
+        for orchestrator in self.orchestrators:
+            for name, value in vars(Orchestrator).items():
+                if hasattr(value, 'factory'):
+                    getattr(orchestrator, name)
+
+    @contextmanager
+    def acquire(self) -> Iterator[Orchestrator]:
+        """Borrow an idle orchestrator, waiting for one if all are busy."""
+        orchestrator = self._idle.get()
+        try:
+            yield orchestrator
+        finally:
+            self._idle.put(orchestrator)
@@ -0,0 +1,134 @@
+"""
+Pipeline server.
+
+`main.py serve` keeps the pipeline warm in one long-lived process on a
+localhost HTTP port: the config, the imported modules, the normalizer
+tables and the result cache all outlive a single query. `main.py --query`
+then forwards its request to the server when one is listening (see
+`client.py`), and runs the pipeline in-process otherwise.
+
+Requests run concurrently on an OrchestratorPool (`pool.py`), whose
+orchestrators share one result cache.
+
+Endpoints:
+    GET  /health  {'status': 'ok', 'pid', 'workers', 'requests', 'uptime_seconds'}
+    POST /run     {'query', 'country', 'limit'?, 'cursor'?, 'config_hash'} -> the result `main.py` prints
+                  (400 {'error'} for a bad request, 409 {'error'} if config_hash is not
+                  this server's, 500 {'error'} if the run failed)
+"""
+
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict
+
+from src.orchestrator.client import DEFAULT_HOST, DEFAULT_PORT, DEFAULT_WORKERS, config_hash
+from src.orchestrator.pool import OrchestratorPool
+
+
+class PipelineServer(ThreadingHTTPServer):
+    """
+    PipelineServer answers pipeline runs over HTTP from an OrchestratorPool.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, config: Dict, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                 workers: int = DEFAULT_WORKERS):
+        """
+        Bind the server and build its orchestrators.
+
+        Args:
+            config: Pipeline config
+            host: Interface to listen on (localhost by default; there is no authentication)
+            port: Port to listen on (0 picks a free one; see `server_address`)
+            workers: Requests run at once
+        """
+        self.config_hash = config_hash(config)
+        self.pool = OrchestratorPool(config, workers)
+        self.started = time.time()
+        self.requests = 0
+        self._lock = threading.Lock()
+        super().__init__((host, port), _PipelineHandler)
+
+    def health(self) -> Dict[str, Any]:
+        """Server status for GET /health."""
+        return {
+            'status': 'ok',
+            'pid': os.getpid(),
+            'workers': self.pool.size,
+            'requests': self.requests,
+            'uptime_seconds': round(time.time() - self.started, 3),
+        }
+
+    def run(self, request: Dict[str, Any]) -> Any:
+        """
+        Run one pipeline request on an idle orchestrator.
+
+        Args:
+            request: {'query', 'country', 'limit'?, 'cursor'?}
+
+        Returns:
+            Any: Ranked results, or {'results', 'next_cursor'} with a limit or cursor
+
+        Raises:
+            ValueError: If the request is malformed
+        """
+        if not isinstance(request, dict) or not request.get('query'):
+            raise ValueError("A request needs a 'query'")
+        limit = request.get('limit')
+        cursor = request.get('cursor')
+        if limit is not None and not isinstance(limit, int):
+            raise ValueError("'limit' must be an integer")
+        user_input = {'query': request['query'], 'country': request.get('country', 'US')}
+        with self._lock:
+            self.requests += 1
+        with self.pool.acquire() as orchestrator:
+            if limit is None and cursor is None:
+                return orchestrator.run(user_input)
+            return orchestrator.run_page(user_input, limit=limit, cursor=cursor)
+
+
+class _PipelineHandler(BaseHTTPRequestHandler):
+    """HTTP front end of PipelineServer."""
+
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are separate writes; with Nagle the body waits for the client's delayed ACK
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._reply(200, self.server.health())
+        else:
+            self._reply(404, {'error': f"Unknown path: {self.path}"})
+
+    def do_POST(self):
+        if self.path != '/run':
+            self._reply(404, {'error': f"Unknown path: {self.path}"})
+            return
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+            request = json.loads(self.rfile.read(length) or b'{}')
+            if isinstance(request, dict) and request.get('config_hash') != self.server.config_hash:
+                self._reply(409, {'error': "The server runs a different config"})
+                return
+            result = self.server.run(request)
+        except ValueError as e:
+            self._reply(400, {'error': str(e)})
+        except Exception as e:
+            self._reply(500, {'error': f"{type(e).__name__}: {e}"})
+        else:
+            self._reply(200, result)
+
+    def _reply(self, status: int, payload: Any) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """Requests are not logged per line; see GET /health for counts."""
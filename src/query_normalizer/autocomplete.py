@@ -0,0 +1,176 @@
+"""
+Query autocomplete over the normalizer's vocabulary and the query log.
+
+Completions are kept in a sorted-array prefix index: the folded completion
+keys in one sorted list, so the keys starting with a prefix are one bisect
+range. Narrow ranges are ranked directly; wide ranges (short prefixes such as
+"i") get their top-k list cached on first use. Popularity counts only grow,
+so a cached list stays exact when a count changes: the changed completion is
+re-inserted into the lists of its prefixes and the list is cut back to k.
+"""
+
+import bisect
+import heapq
+import json
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+
+def fold_query(query: str) -> str:
+    """Completion key of a query: lowercased, commas and whitespace runs collapsed."""
+    return ' '.join(query.replace(',', ' ').lower().split())
+
+
+def read_query_log(path: str) -> Iterator[str]:
+    """
+    Queries of a query log: one query per line, or JSON lines with a `query` key.
+
+    Args:
+        path: Log file
+
+    Yields:
+        str: Query text
+    """
+    with open(path, 'r', encoding='utf-8') as handle:
+        for line in handle:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith('{'):
+                line = json.loads(line).get('query') or ''
+            if line:
+                yield line
+
+
+class Autocomplete:
+    """
+    Autocomplete returns the most popular completions of a prefix.
+
+    Completions rank by popularity, then shorter first, then alphabetically.
+    Each completion is shown in the form it was first added with (a canonical
+    name such as "iPhone 16 Pro" for vocabulary entries).
+    """
+
+    def __init__(self, top_k: int = 10, scan_limit: int = 64):
+        """
+        Initialize an empty index.
+
+        Args:
+            top_k: Completions kept per cached prefix (largest k served from cache)
+            scan_limit: Widest key range ranked directly instead of cached
+        """
+        self.top_k = top_k
+        self.scan_limit = scan_limit
+        self.keys: List[str] = []
+        self.counts: Dict[str, int] = {}
+        self.display: Dict[str, str] = {}
+        self._top: Dict[str, List[Tuple[int, int, str]]] = {}
+
+    @classmethod
+    def from_normalizer(cls, normalizer, queries: Iterable[str] = (), top_k: int = 10) -> 'Autocomplete':
+        """
+        Build an index from a normalizer's canonical names and a query log.
+
+        Args:
+            normalizer: RealQueryNormalizer whose brand/model names seed the index
+            queries: Logged queries, counted for popularity
+            top_k: Completions kept per cached prefix
+
+        Returns:
+            Autocomplete: Populated index
+        """
+        index = cls(top_k=top_k)
+        for name in normalizer.canonical_names():
+            index.add(name, count=0)
+        index.add_many(queries)
+        return index
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def add(self, query: str, count: int = 1) -> None:
+        """
+        Add a query or count more uses of it.
+
+        Args:
+            query: Query text
+            count: Uses to add (0 registers a completion without popularity)
+        """
+        key = fold_query(query)
+        if not key:
+            return
+        if key not in self.counts:
+            bisect.insort(self.keys, key)
+            self.counts[key] = 0
+            self.display[key] = ' '.join(query.replace(',', ' ').split())
+        self.counts[key] += count
+        self._promote(key)
+
+    def add_many(self, queries: Iterable[str]) -> None:
+        """
+        Count a batch of queries (e.g. a query log).
+
+        New completions are merged with one sort; cached prefix lists are
+        then dropped and rebuilt on demand.
+
+        Args:
+            queries: Query texts
+        """
+        counts = Counter()
+        first_seen: Dict[str, str] = {}
+        for query in queries:
+            key = fold_query(query)
+            if key:
+                counts[key] += 1
+                first_seen.setdefault(key, query)
+        new_keys = [key for key in counts if key not in self.counts]
+        for key in new_keys:
+            self.counts[key] = 0
+            self.display[key] = ' '.join(first_seen[key].replace(',', ' ').split())
+        for key, count in counts.items():
+            self.counts[key] += count
+        if new_keys:
+            self.keys = sorted(self.keys + new_keys)
+            self._top.clear()
+        else:
+            for key in counts:
+                self._promote(key)
+
+    def complete(self, prefix: str, k: int = 5) -> List[Dict[str, object]]:
+        """
+        Top completions of a prefix.
+
+        Args:
+            prefix: Text typed so far
+            k: Completions to return
+
+        Returns:
+            List[Dict[str, object]]: {'query', 'count'} per completion, best first
+        """
+        prefix = ' '.join(prefix.replace(',', ' ').lower().split()) + (' ' if prefix[-1:].isspace() else '')
+        if not prefix.strip():
+            return []
+        top = self._top.get(prefix)
+        if top is None or k > self.top_k:
+            low = bisect.bisect_left(self.keys, prefix)
+            high = bisect.bisect_left(self.keys, prefix + '\U0010ffff', low)
+            ranked = heapq.nsmallest(max(k, self.top_k), (self._rank(key) for key in self.keys[low:high]))
+            if high - low > self.scan_limit:
+                self._top[prefix] = ranked[:self.top_k]
+            top = ranked
+        return [{'query': self.display[key], 'count': self.counts[key]} for _, _, key in top[:k]]
+
+    def _promote(self, key: str) -> None:
+        """Re-rank a completion whose count grew in the cached lists of its prefixes."""
+        entry = self._rank(key)
+        for end in range(1, len(key) + 1):
+            top = self._top.get(key[:end])
+            if top is None:
+                continue
+            top[:] = [item for item in top if item[2] != key]
+            bisect.insort(top, entry)
+            del top[self.top_k:]
+
+    def _rank(self, key: str) -> Tuple[int, int, str]:
+        """Sort key of a completion: most used, then shortest, then alphabetical."""
+        return (-self.counts[key], len(key), key)
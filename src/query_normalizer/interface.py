@@ -3,10 +3,38 @@ Query Normalizer Interface
 Normalizes product queries for consistent processing across modules.
 """
 
+import os
+import threading
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
-import yaml
-from .real_normalizer import RealQueryNormalizer
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+from .autocomplete import Autocomplete, fold_query, read_query_log
+from src.config.loader import load_config
+
+
+# Normalizer of a normalize_many worker process, built once per process
+_worker_normalizer = None
+
+
+def __getattr__(name: str):
+    """Import RealQueryNormalizer (which compiles its pattern tables) only when asked for."""
+    if name == 'RealQueryNormalizer':
+        from .real_normalizer import RealQueryNormalizer
+        return RealQueryNormalizer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _init_worker() -> None:
+    """Build the worker process's normalizer (and its pattern automaton) once."""
+    from .real_normalizer import RealQueryNormalizer
+    global _worker_normalizer
+    _worker_normalizer = RealQueryNormalizer()
+
+
+def _normalize_chunk(chunk: Tuple[List[str], str]) -> List[Dict[str, Any]]:
+    """Normalize one chunk of queries in a worker process."""
+    queries, country = chunk
+    return [_worker_normalizer.normalize_query(query, country) for query in queries]
 
 
 class QueryNormalizerInterface(ABC):
@@ -36,8 +64,7 @@ class MockQueryNormalizer(QueryNormalizerInterface):
     def normalize_query(self, query: str, country: str) -> Dict[str, Any]:
         """Mock implementation that returns predefined normalized data."""
         try:
-            with open(self.mock_data_path, 'r') as f:
-                mock_data = yaml.safe_load(f)
+            mock_data = load_config(self.mock_data_path)
                 
             if query in mock_data.get('queries', {}):
                 return mock_data['queries'][query]
@@ -69,6 +96,12 @@ class QueryNormalizer:
     """
     QueryNormalizer normalizes product queries for downstream modules.
     In mock mode, returns predefined output from config.
+    
+    Real normalizations are memoized in a bounded LRU keyed on the query with
+    case and whitespace folded (see cache_key) and the country, so retyped
+    queries and UI reruns skip the pattern scan. Only the `normalized` field
+    is per call; it always reflects the query as given. The LRU and its
+    counters are guarded by a lock, so one normalizer can serve threads.
     """
     def __init__(self, config):
         """
@@ -77,40 +110,185 @@ class QueryNormalizer:
             config (dict or str): Config dict or path to YAML config file.
         """
         if isinstance(config, str):
-            with open(config, 'r') as f:
-                self.config = yaml.safe_load(f)
+            self.config = load_config(config)
         else:
             self.config = config
         self.use_mock = self.config.get('modules', {}).get('query_normalizer', {}).get('use_mock', True)
         self.mock_outputs = self.config.get('modules', {}).get('query_normalizer', {}).get('mock_outputs', {})
+        self.cache_size = self.config.get('modules', {}).get('query_normalizer', {}).get('cache_size', 10000)
+        self._cache: 'OrderedDict[Tuple[str, str], Dict[str, Any]]' = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._lock = threading.Lock()
+        self.autocomplete_config = self.config.get('modules', {}).get('query_normalizer', {}).get('autocomplete', {}) or {}
+        self.autocomplete: Optional[Autocomplete] = None
         
         # Initialize real normalizer if not using mock
         if not self.use_mock:
+            from .real_normalizer import RealQueryNormalizer
             self.real_normalizer = RealQueryNormalizer()
 
-    def normalize(self, query: str) -> dict:
+    @staticmethod
+    def cache_key(query: str, country: str = "US") -> Tuple[str, str]:
+        """
+        Cache key of a query: lowercased, commas and whitespace runs collapsed.
+        
+        lower() rather than casefold(): the patterns see the lowercased query,
+        and casefold() would merge spellings they tell apart ('weiß'/'weiss').
+        
+        Args:
+            query (str): Raw product query string.
+            country (str): Country code.
+        Returns:
+            tuple: (folded query, country)
+        """
+        return fold_query(query), country
+
+    def normalize(self, query: str, country: str = "US") -> dict:
         """
         Normalize a product query string.
         In mock mode, returns mock output from config based on query content.
         Args:
             query (str): Raw product query string.
+            country (str): Country code.
         Returns:
             dict: Normalized product info.
         """
+        if self.autocomplete is not None:
+            self.autocomplete.add(query)
         if self.use_mock:
-            # Determine category based on query content
-            query_lower = query.lower()
-            if 'macbook' in query_lower or 'laptop' in query_lower:
-                return self.mock_outputs.get('laptop', {}).copy()
-            elif 'iphone' in query_lower or 'smartphone' in query_lower or 'phone' in query_lower:
-                return self.mock_outputs.get('smartphone', {}).copy()
-            elif 'nike' in query_lower or 'air max' in query_lower or 'sports' in query_lower or 'shoes' in query_lower or 'running' in query_lower:
-                return self.mock_outputs.get('sports', {}).copy()
-            elif 'samsung' in query_lower or 'galaxy' in query_lower:
-                return self.mock_outputs.get('samsung', {}).copy()
+            return self._normalize_mock(query)
+        key = self.cache_key(query, country)
+        with self._lock:
+            result = self._cache.get(key)
+            if result is not None:
+                self.cache_hits += 1
+                self._cache.move_to_end(key)
             else:
-                # Default to smartphone for backward compatibility
-                return self.mock_outputs.get('smartphone', {}).copy()
+                self.cache_misses += 1
+        if result is None:
+            result = self.real_normalizer.normalize_query(query, country=country)
+            with self._lock:
+                self._store(key, result)
+        return self._for_query(result, query)
+
+    def normalize_many(self, queries: Sequence[str], country: str = "US", workers: int = 1,
+                       chunk_size: int = 2000) -> List[dict]:
+        """
+        Normalize a batch of queries, e.g. an offline query log.
+        
+        Each distinct cache key is normalized once, cached keys are not
+        normalized at all, and the rest can be spread over worker processes
+        that each build their normalizer once.
+        
+        Args:
+            queries (Sequence[str]): Raw product query strings.
+            country (str): Country code for all queries.
+            workers (int): Worker processes (1 normalizes in this process).
+            chunk_size (int): Queries sent to a worker at a time.
+        Returns:
+            list: Normalized product info per query, in input order.
+        """
+        if self.autocomplete is not None:
+            self.autocomplete.add_many(queries)
+        if self.use_mock:
+            return [self._normalize_mock(query) for query in queries]
+        
+        keys = [self.cache_key(query, country) for query in queries]
+        found: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        pending: List[Tuple[Tuple[str, str], str]] = []
+        with self._lock:
+            for key, query in zip(keys, queries):
+                if key in found:
+                    self.cache_hits += 1
+                    continue
+                result = self._cache.get(key)
+                if result is not None:
+                    self.cache_hits += 1
+                    self._cache.move_to_end(key)
+                else:
+                    self.cache_misses += 1
+                    pending.append((key, query))
+                found[key] = result
+        
+        pending_queries = [query for _, query in pending]
+        if workers > 1 and len(pending_queries) > chunk_size:
+            chunks = [(pending_queries[start:start + chunk_size], country)
+                      for start in range(0, len(pending_queries), chunk_size)]
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+                computed = [result for chunk in executor.map(_normalize_chunk, chunks) for result in chunk]
+        else:
+            computed = [self.real_normalizer.normalize_query(query, country=country) for query in pending_queries]
+        with self._lock:
+            for (key, _), result in zip(pending, computed):
+                found[key] = result
+                self._store(key, result)
+        
+        return [self._for_query(found[key], query) for key, query in zip(keys, queries)]
+
+    def complete(self, prefix: str, k: int = 5) -> List[dict]:
+        """
+        Autocomplete a partly typed query.
+        
+        The index is built on first use from the real normalizer's brand/model
+        names and the configured query log (`autocomplete.query_log`); from
+        then on every normalized query counts towards popularity.
+        Args:
+            prefix (str): Text typed so far.
+            k (int): Completions to return.
+        Returns:
+            list: {'query', 'count'} per completion, most popular first.
+        """
+        if self.autocomplete is None:
+            log_path = self.autocomplete_config.get('query_log')
+            queries = read_query_log(log_path) if log_path and os.path.exists(log_path) else ()
+            if self.use_mock:
+                from .real_normalizer import RealQueryNormalizer
+                normalizer = RealQueryNormalizer()
+            else:
+                normalizer = self.real_normalizer
+            self.autocomplete = Autocomplete.from_normalizer(normalizer, queries,
+                                                             top_k=self.autocomplete_config.get('top_k', 10))
+        return self.autocomplete.complete(prefix, k)
+
+    def cache_info(self) -> dict:
+        """
+        Normalization cache statistics.
+        Returns:
+            dict: hits, misses, current size and maximum size
+        """
+        with self._lock:
+            return {'hits': self.cache_hits, 'misses': self.cache_misses,
+                    'size': len(self._cache), 'max_size': self.cache_size}
+
+    def _store(self, key: Tuple[str, str], result: Dict[str, Any]) -> None:
+        """Add a result to the LRU, evicting the least recently used entries (caller holds the lock)."""
+        if self.cache_size <= 0:
+            return
+        self._cache[key] = result
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _for_query(self, result: Dict[str, Any], query: str) -> dict:
+        """Copy of a cached result with the `normalized` field of this query."""
+        result = dict(result)
+        result['normalized'] = type(self.real_normalizer).clean_query(query)
+        return result
+
+    def _normalize_mock(self, query: str) -> dict:
+        """Mock output from config based on query content."""
+        # Determine category based on query content
+        query_lower = query.lower()
+        if 'macbook' in query_lower or 'laptop' in query_lower:
+            return self.mock_outputs.get('laptop', {}).copy()
+        elif 'iphone' in query_lower or 'smartphone' in query_lower or 'phone' in query_lower:
+            return self.mock_outputs.get('smartphone', {}).copy()
+        elif 'nike' in query_lower or 'air max' in query_lower or 'sports' in query_lower or 'shoes' in query_lower or 'running' in query_lower:
+            return self.mock_outputs.get('sports', {}).copy()
+        elif 'samsung' in query_lower or 'galaxy' in query_lower:
+            return self.mock_outputs.get('samsung', {}).copy()
         else:
-            # Use real implementation
-            return self.real_normalizer.normalize_query(query, country="US") 
\ No newline at end of file
+            # Default to smartphone for backward compatibility
+            return self.mock_outputs.get('smartphone', {}).copy()
@@ -0,0 +1,205 @@
+"""
+Keyword automaton for the normalizer's pattern tables.
+
+Every table entry is a `\\b...\\b` pattern, mostly an alternation of plain
+words. A plain word matches exactly when some maximal `\\w+` run (token) of
+the query equals it, so all plain words of all tables go into one dict from
+token to the entries it hits. The query is tokenized once and each token is
+one dict lookup, whatever the size of the tables.
+
+The remaining alternatives (multi-word, digits, optional parts) are compiled
+once each. They are gated by their literal prefix, which has to start one of
+the query's tokens, so their regex only runs on queries that can match.
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+
+_TOKEN_PATTERN = re.compile(r'\w+')
+_WORD = re.compile(r'\w+')
+_OUTER_GROUP = re.compile(r'^\\b\((?P<body>[^()]*)\)\\b$')
+_OPTIONAL_LEAD = re.compile(r'^\((?P<lead>\w+)(?:\\s[*+])?\)\?(?P<rest>.*)$')
+# Characters `re.IGNORECASE` matches to an ASCII letter that lower() leaves alone
+_RE_CASE_FOLDS = str.maketrans({'ſ': 's', 'ı': 'i'})
+
+# Table entries: (label, pattern); tables: (name, entries)
+Entries = Tuple[Tuple[Hashable, str], ...]
+Tables = Tuple[Tuple[str, Entries], ...]
+
+
+def _alternatives(pattern: str) -> List[str]:
+    """Split `\\b(a|b|c)\\b` into its alternatives; anything else is one alternative."""
+    outer = _OUTER_GROUP.match(pattern)
+    if outer:
+        return outer.group('body').split('|')
+    if pattern.startswith(r'\b') and pattern.endswith(r'\b'):
+        return [pattern[2:-2]]
+    return [pattern]
+
+
+def _literal_prefix(alternative: str) -> str:
+    """Leading word characters that every match of an alternative starts with."""
+    prefix = []
+    for index, char in enumerate(alternative):
+        if not (char.isalnum() or char == '_'):
+            break
+        following = alternative[index + 1:index + 2]
+        if following in ('*', '?', '{'):
+            break
+        prefix.append(char)
+    return ''.join(prefix)
+
+
+def _gates(alternative: str) -> List[str]:
+    """
+    Prefixes of which one must start a query token for the alternative to match.
+
+    An empty list means the alternative cannot be gated and always runs.
+    """
+    optional = _OPTIONAL_LEAD.match(alternative)
+    if optional:
+        rest = _literal_prefix(optional.group('rest'))
+        return [optional.group('lead'), rest] if rest else []
+    prefix = _literal_prefix(alternative)
+    return [prefix] if prefix else []
+
+
+class PatternScan:
+    """Hits of one query against every table of a KeywordAutomaton."""
+
+    __slots__ = ('automaton', 'text', 'hits')
+
+    def __init__(self, automaton: 'KeywordAutomaton', text: str, hits: Dict[str, set]):
+        self.automaton = automaton
+        self.text = text
+        self.hits = hits
+
+    def first(self, table: str) -> Optional[Hashable]:
+        """
+        Label of the earliest entry of a table that matches anywhere.
+
+        Args:
+            table: Table name
+
+        Returns:
+            Optional[Hashable]: Entry label, or None if nothing matched
+        """
+        hits = self.hits.get(table)
+        if not hits:
+            return None
+        return self.automaton.labels[table][min(hits)]
+
+    def counts(self, table: str) -> Dict[Hashable, int]:
+        """
+        Non-overlapping match count per label, summed over the label's entries.
+
+        Args:
+            table: Table name
+
+        Returns:
+            Dict[Hashable, int]: Count per label in table order (0 if no match)
+        """
+        labels = self.automaton.labels[table]
+        counts = dict.fromkeys(labels, 0)
+        for entry in self.hits.get(table, ()):
+            counts[labels[entry]] += len(self.automaton.entry_patterns[table][entry].findall(self.text))
+        return counts
+
+
+class KeywordAutomaton:
+    """
+    KeywordAutomaton matches all pattern tables against a query in one scan.
+
+    An entry matches when any of its alternatives matches, as with the
+    original `re.search(pattern, query, re.IGNORECASE)` on a lowercased query.
+    """
+
+    def __init__(self, tables: Tables):
+        """
+        Compile the tables.
+
+        Args:
+            tables: (name, ((label, pattern), ...)) pairs; entry order is priority order
+        """
+        self.labels: Dict[str, List[Hashable]] = {}
+        self.entry_patterns: Dict[str, List[re.Pattern]] = {}
+        self.words: Dict[str, List[Tuple[str, int]]] = {}
+        self.gated: Dict[str, List[Tuple[str, str, int, re.Pattern]]] = {}
+        self.ungated: List[Tuple[str, int, re.Pattern]] = []
+
+        for name, entries in tables:
+            self.labels[name] = [label for label, _ in entries]
+            self.entry_patterns[name] = [re.compile(pattern, re.IGNORECASE) for _, pattern in entries]
+            for entry, (_, pattern) in enumerate(entries):
+                for alternative in _alternatives(pattern):
+                    if _WORD.fullmatch(alternative):
+                        self.words.setdefault(alternative.lower(), []).append((name, entry))
+                        continue
+                    compiled = re.compile(rf'\b(?:{alternative})\b', re.IGNORECASE)
+                    gates = _gates(alternative)
+                    if not gates:
+                        self.ungated.append((name, entry, compiled))
+                    for gate in gates:
+                        gate = gate.lower()
+                        self.gated.setdefault(gate[0], []).append((gate, name, entry, compiled))
+
+    def scan(self, text: str) -> PatternScan:
+        """
+        Match every table against a lowercased query.
+
+        Args:
+            text: Lowercased query
+
+        Returns:
+            PatternScan: Entries hit per table
+        """
+        hits: Dict[str, set] = {}
+        tokens = _TOKEN_PATTERN.findall(text if text.isascii() else text.translate(_RE_CASE_FOLDS))
+        words = self.words
+        for token in tokens:
+            for name, entry in words.get(token, ()):
+                hits.setdefault(name, set()).add(entry)
+
+        tried = set()
+        gated = self.gated
+        for token in tokens:
+            for gate, name, entry, compiled in gated.get(token[0], ()):
+                key = (name, entry, compiled)
+                if key in tried or not token.startswith(gate):
+                    continue
+                tried.add(key)
+                if entry not in hits.get(name, ()) and compiled.search(text):
+                    hits.setdefault(name, set()).add(entry)
+        for name, entry, compiled in self.ungated:
+            if entry not in hits.get(name, ()) and compiled.search(text):
+                hits.setdefault(name, set()).add(entry)
+        return PatternScan(self, text, hits)
+
+
+@lru_cache(maxsize=32)
+def compile_automaton(tables: Tables) -> KeywordAutomaton:
+    """
+    Build (once per distinct set of tables) the automaton for the tables.
+
+    Args:
+        tables: Hashable tables, see KeywordAutomaton
+
+    Returns:
+        KeywordAutomaton: Shared compiled automaton
+    """
+    return KeywordAutomaton(tables)
+
+
+def freeze_tables(tables: Sequence[Tuple[str, Sequence[Tuple[Hashable, str]]]]) -> Tables:
+    """
+    Hashable form of pattern tables, for compile_automaton.
+
+    Args:
+        tables: (name, [(label, pattern), ...]) pairs
+
+    Returns:
+        Tables: Same content as nested tuples
+    """
+    return tuple((name, tuple((label, pattern) for label, pattern in entries)) for name, entries in tables)
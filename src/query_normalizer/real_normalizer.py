@@ -13,11 +13,29 @@ To activate:
 2. Swap the logic in interface.py to call real_normalizer instead of returning mocks.
 """
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from dataclasses import dataclass
+import json
 import re
 from enum import Enum
 
+from src.query_normalizer.patterns import PatternScan, compile_automaton, freeze_tables
+from src.query_normalizer.spelling import build_corrector, pattern_words
+
+
+# Attribute patterns with numbers, compiled once
+_SCREEN_SIZE_PATTERNS = [
+    re.compile(r'\b(\d+\.?\d*)\s*(inch|inches|in|"|'')\b', re.IGNORECASE),
+    re.compile(r'\b(\d+\.?\d*)-inch\b', re.IGNORECASE)
+]
+_RAM_PATTERN = re.compile(r'\b(\d+)\s*(gb|mb)\s*(ram|memory|mem)?\b', re.IGNORECASE)
+_SIZE_PATTERNS = [
+    re.compile(r'\b(us|eu|uk)\s*(\d+\.?\d*)\b', re.IGNORECASE),
+    re.compile(r'\bsize\s*(\d+\.?\d*)\b', re.IGNORECASE),
+    re.compile(r'\b(\d+\.?\d*)\s*(us|eu|uk)\b', re.IGNORECASE),
+    re.compile(r'\b(\d+\.?\d*)\b(?=\s*(size|shoe|foot))', re.IGNORECASE),
+]
+
 
 class NormalizationMethod(Enum):
     """Methods available for query normalization."""
@@ -53,8 +71,17 @@ class RealQueryNormalizer:
     - Context-aware normalization based on country/region
     """
     
-    def __init__(self):
-        """Initialize the real query normalizer with pattern definitions."""
+    def __init__(self, llm_client=None, correct_spelling: bool = True):
+        """
+        Initialize the real query normalizer with pattern definitions.
+        
+        Args:
+            llm_client: Shared LLMClient (src/llm/client.py) used to fill in
+                brand/model the patterns miss, or None for patterns only
+            correct_spelling: Correct misspelt brand/model words when the
+                patterns miss brand or model
+        """
+        self.llm_client = llm_client
         # Brand patterns (case-insensitive)
         self.brand_patterns = {
             'Apple': r'\b(apple|iphone|macbook|ipad|imac)\b',
@@ -134,6 +161,117 @@ class RealQueryNormalizer:
                 r'\b(basketball|tennis|football|soccer)\b'
             ]
         }
+        
+        # Colour patterns; order matters: more specific patterns first
+        self.color_patterns = [
+            ('Natural Titanium', r'\b(natural\s*titanium|titanium)\b'),
+            ('Space Gray', r'\b(space\s*gray|space\s*grey)\b'),
+            ('Midnight', r'\b(midnight|noir)\b'),
+            ('Black', r'\b(black|noir|schwarz|negro)\b'),
+            ('White', r'\b(white|blanc|weiß|blanco)\b'),
+            ('Silver', r'\b(silver|argent|silber|plata)\b'),
+            ('Gold', r'\b(gold|or|dorado)\b'),
+            ('Blue', r'\b(blue|bleu|blau|azul|navy)\b'),
+            ('Red', r'\b(red|rouge|rot|rojo|crimson)\b'),
+            ('Green', r'\b(green|vert|grün|verde)\b'),
+            ('Purple', r'\b(purple|violet|lila|morado)\b'),
+            ('Pink', r'\b(pink|rose|rosa)\b'),
+            ('Gray', r'\b(gray|grey|gris|grau)\b'),
+        ]
+        
+        self.processor_patterns = {
+            'M3 Pro': r'\bm3\s*pro\b',
+            'M3 Max': r'\bm3\s*max\b',
+            'M3': r'\bm3\b',
+            'M2 Pro': r'\bm2\s*pro\b',
+            'M2 Max': r'\bm2\s*max\b',
+            'M2': r'\bm2\b',
+            'M1 Pro': r'\bm1\s*pro\b',
+            'M1 Max': r'\bm1\s*max\b',
+            'M1': r'\bm1\b',
+            'Intel i9': r'\b(intel\s*)?i9\b',
+            'Intel i7': r'\b(intel\s*)?i7\b',
+            'Intel i5': r'\b(intel\s*)?i5\b',
+            'Intel i3': r'\b(intel\s*)?i3\b',
+            'AMD Ryzen 9': r'\b(amd\s*)?ryzen\s*9\b',
+            'AMD Ryzen 7': r'\b(amd\s*)?ryzen\s*7\b',
+            'AMD Ryzen 5': r'\b(amd\s*)?ryzen\s*5\b'
+        }
+        
+        self.type_patterns = {
+            'Running Shoes': r'\b(running|run|runner|jogging)\b',
+            'Basketball Shoes': r'\b(basketball|basket|court)\b',
+            'Tennis Shoes': r'\b(tennis|court)\b',
+            'Football Cleats': r'\b(football|cleats|soccer)\b',
+            'Casual Shoes': r'\b(casual|lifestyle|everyday)\b',
+            'Training Shoes': r'\b(training|trainer|cross)\b',
+            'Hiking Boots': r'\b(hiking|hike|outdoor|trail)\b'
+        }
+        
+        # Sports type when no type word is present, based on the model
+        self.default_type_patterns = {
+            'Running Shoes': r'\b(air\s*max|air\s*force)\b'
+        }
+        
+        self.automaton = compile_automaton(freeze_tables(self._pattern_tables()))
+        self.spelling = build_corrector(*self._spelling_vocabulary()) if correct_spelling else None
+    
+    def _pattern_tables(self) -> List[Tuple[str, List[Tuple[Any, str]]]]:
+        """
+        All keyword tables, in priority order within each table.
+        
+        They are compiled once (per distinct content) into a KeywordAutomaton,
+        so a query is scanned once for every attribute instead of running
+        one re.search per pattern.
+        """
+        return [
+            ('brand', list(self.brand_patterns.items())),
+            ('model:Smartphone', list(self.smartphone_models.items())),
+            ('model:Laptop', list(self.laptop_models.items())),
+            ('model:Sports', list(self.sports_models.items())),
+            ('category', [(category, pattern) for category, patterns in self.category_patterns.items()
+                          for pattern in patterns]),
+            ('color', list(self.color_patterns)),
+            ('processor', list(self.processor_patterns.items())),
+            ('type', list(self.type_patterns.items())),
+            ('default_type', list(self.default_type_patterns.items())),
+        ]
+    
+    def canonical_names(self) -> List[str]:
+        """
+        Canonical names the normalizer resolves: brands, models, and
+        "Brand Model" where the model name does not start with the brand.
+        
+        Returns:
+            List[str]: Names in table order, without duplicates
+        """
+        names = list(self.brand_patterns)
+        for models in (self.smartphone_models, self.laptop_models, self.sports_models):
+            for model in models:
+                brand = self.automaton.scan(model.lower()).first('brand')
+                if brand and not model.lower().startswith(brand.lower()):
+                    names.append(f"{brand} {model}")
+                names.append(model)
+        return list(dict.fromkeys(names))
+    
+    def _spelling_vocabulary(self) -> Tuple[Tuple[str, ...], Tuple[str, ...], Tuple[str, ...]]:
+        """
+        Correction targets, known words and short targets for the spelling corrector.
+        
+        Targets are the brand/model words long enough to be corrected
+        towards ('galaxy', 'thinkpad'; not 'mate'); short targets are the
+        short one-word brand names, which swapped letters are corrected
+        towards ('nike', 'xps'; not 'air' of 'air max'); every word of every
+        table counts as correctly spelt.
+        """
+        tables = dict(self._pattern_tables())
+        min_length = 5
+        targets = [word for name in ('brand', 'model:Smartphone', 'model:Laptop', 'model:Sports')
+                   for _, pattern in tables[name] for word in pattern_words(pattern) if len(word) >= min_length]
+        brands = [words[0] for _, pattern in tables['brand'] for alternative in pattern.split('|')
+                  for words in [pattern_words(alternative)] if len(words) == 1 and 3 <= len(words[0]) < min_length]
+        known = [word for entries in tables.values() for _, pattern in entries for word in pattern_words(pattern)]
+        return tuple(dict.fromkeys(targets)), tuple(sorted(set(known))), tuple(dict.fromkeys(brands))
     
     def normalize_query(self, query: str, country: str = "US") -> Dict[str, Any]:
         """
@@ -146,16 +284,32 @@ class RealQueryNormalizer:
         Returns:
             Dict containing normalized query and category-specific attributes
         """
-        normalized_query = query.strip().replace(',', ' ').replace('  ', ' ')
+        normalized_query = self.clean_query(query)
         query_lower = normalized_query.lower()
         
+        # One scan of the query against every keyword table
+        scan = self.automaton.scan(query_lower)
+        
         # Extract category first
-        category = self._extract_category(query_lower)
+        category = self._extract_category(query_lower, scan)
         
         # Extract common attributes
-        brand = self._extract_brand(query_lower)
-        model = self._extract_model(query_lower, category)
+        brand = self._extract_brand(query_lower, scan)
+        model = self._extract_model(query_lower, category, scan)
+        
+        # Retry with misspelt brand/model words corrected
+        corrections = []
+        if self.spelling and (brand is None or model is None):
+            corrected, corrections = self.spelling.correct(query_lower)
+            if corrections:
+                query_lower = corrected
+                scan = self.automaton.scan(query_lower)
+                category = self._extract_category(query_lower, scan)
+                brand = self._extract_brand(query_lower, scan)
+                model = self._extract_model(query_lower, category, scan)
         storage = self._extract_storage(query_lower)
+        if self.llm_client and (brand is None or model is None):
+            brand, model = self._extract_with_llm(normalized_query, brand, model)
         
         # Build base attributes
         base_attrs = {
@@ -169,7 +323,7 @@ class RealQueryNormalizer:
         if category == 'Smartphone':
             base_attrs.update({
                 'storage': storage,
-                'color': self._extract_color(query_lower),
+                'color': self._extract_color(query_lower, scan),
                 'screen_size': self._extract_screen_size(query_lower)
             })
         elif category == 'Laptop':
@@ -177,40 +331,58 @@ class RealQueryNormalizer:
                 'storage': storage,
                 'ram': self._extract_ram(query_lower),
                 'screen_size': self._extract_screen_size(query_lower),
-                'processor': self._extract_processor(query_lower)
+                'processor': self._extract_processor(query_lower, scan)
             })
         elif category == 'Sports':
             base_attrs.update({
                 'size': self._extract_size(query_lower),
-                'color': self._extract_color(query_lower),
-                'type': self._extract_type(query_lower)
+                'color': self._extract_color(query_lower, scan),
+                'type': self._extract_type(query_lower, scan)
             })
         
+        if corrections:
+            base_attrs['corrections'] = corrections
+        
         return base_attrs
     
-    def _extract_brand(self, query: str) -> Optional[str]:
+    @staticmethod
+    def clean_query(query: str) -> str:
+        """The `normalized` form of a query: trimmed, commas to spaces."""
+        return query.strip().replace(',', ' ').replace('  ', ' ')
+    
+    def _extract_with_llm(self, query: str, brand: Optional[str],
+                          model: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Ask the LLM for the brand/model the patterns missed.
+        
+        Args:
+            query: Normalized query
+            brand: Brand found by the patterns, if any
+            model: Model found by the patterns, if any
+            
+        Returns:
+            Tuple of brand and model; pattern results are kept and the
+            originals are returned if the LLM call or its JSON fails
+        """
+        prompt = (f"Product query: {query}\n"
+                  'Reply with JSON only: {"brand": <brand or null>, "model": <model or null>}')
+        try:
+            answer = json.loads(self.llm_client.generate(prompt).text)
+        except Exception:
+            return brand, model
+        if not isinstance(answer, dict):
+            return brand, model
+        return brand or answer.get('brand') or None, model or answer.get('model') or None
+    
+    def _extract_brand(self, query: str, scan: Optional[PatternScan] = None) -> Optional[str]:
         """Extract brand from query using regex patterns."""
-        for brand, pattern in self.brand_patterns.items():
-            if re.search(pattern, query, re.IGNORECASE):
-                return brand
-        return None
+        return (scan or self.automaton.scan(query)).first('brand')
     
-    def _extract_model(self, query: str, category: str) -> Optional[str]:
+    def _extract_model(self, query: str, category: str, scan: Optional[PatternScan] = None) -> Optional[str]:
         """Extract model from query based on category."""
-        model_dict = {}
-        
-        if category == 'Smartphone':
-            model_dict = self.smartphone_models
-        elif category == 'Laptop':
-            model_dict = self.laptop_models
-        elif category == 'Sports':
-            model_dict = self.sports_models
-        
-        for model, pattern in model_dict.items():
-            if re.search(pattern, query, re.IGNORECASE):
-                return model
-        
-        return None
+        if category not in ('Smartphone', 'Laptop', 'Sports'):
+            return None
+        return (scan or self.automaton.scan(query)).first(f'model:{category}')
     
     def _extract_storage(self, query: str) -> Optional[str]:
         """Extract storage capacity from query using regex."""
@@ -255,16 +427,9 @@ class RealQueryNormalizer:
         
         return None
     
-    def _extract_category(self, query: str) -> str:
+    def _extract_category(self, query: str, scan: Optional[PatternScan] = None) -> str:
         """Extract product category from query using pattern matching."""
-        category_scores = {}
-        
-        for category, patterns in self.category_patterns.items():
-            score = 0
-            for pattern in patterns:
-                matches = len(re.findall(pattern, query, re.IGNORECASE))
-                score += matches
-            category_scores[category] = score
+        category_scores = (scan or self.automaton.scan(query)).counts('category')
         
         # Return category with highest score, default to Smartphone
         if category_scores:
@@ -274,41 +439,15 @@ class RealQueryNormalizer:
         
         return 'Smartphone'  # Default fallback
     
-    def _extract_color(self, query: str) -> Optional[str]:
+    def _extract_color(self, query: str, scan: Optional[PatternScan] = None) -> Optional[str]:
         """Extract color from query using common color patterns."""
-        # Order matters: more specific patterns first
-        color_patterns = [
-            ('Natural Titanium', r'\b(natural\s*titanium|titanium)\b'),
-            ('Space Gray', r'\b(space\s*gray|space\s*grey)\b'),
-            ('Midnight', r'\b(midnight|noir)\b'),
-            ('Black', r'\b(black|noir|schwarz|negro)\b'),
-            ('White', r'\b(white|blanc|weiß|blanco)\b'),
-            ('Silver', r'\b(silver|argent|silber|plata)\b'),
-            ('Gold', r'\b(gold|or|dorado)\b'),
-            ('Blue', r'\b(blue|bleu|blau|azul|navy)\b'),
-            ('Red', r'\b(red|rouge|rot|rojo|crimson)\b'),
-            ('Green', r'\b(green|vert|grün|verde)\b'),
-            ('Purple', r'\b(purple|violet|lila|morado)\b'),
-            ('Pink', r'\b(pink|rose|rosa)\b'),
-            ('Gray', r'\b(gray|grey|gris|grau)\b'),
-        ]
-        
-        for color, pattern in color_patterns:
-            if re.search(pattern, query, re.IGNORECASE):
-                return color
-        
-        return None
+        return (scan or self.automaton.scan(query)).first('color')
     
     def _extract_screen_size(self, query: str) -> Optional[str]:
         """Extract screen size from query."""
-        # Pattern for screen sizes like "6.1 inch", "14-inch", "15.6""
-        screen_patterns = [
-            r'\b(\d+\.?\d*)\s*(inch|inches|in|"|'')\b',
-            r'\b(\d+\.?\d*)-inch\b'
-        ]
-        
-        for pattern in screen_patterns:
-            match = re.search(pattern, query, re.IGNORECASE)
+        # Pattern for screen sizes like "6.1 inch", "14-inch", "15.6\""
+        for pattern in _SCREEN_SIZE_PATTERNS:
+            match = pattern.search(query)
             if match:
                 size = match.group(1)
                 return f"{size} inch"
@@ -318,12 +457,7 @@ class RealQueryNormalizer:
     def _extract_ram(self, query: str) -> Optional[str]:
         """Extract RAM from query for laptops."""
         # Pattern for RAM like "8GB RAM", "16 GB", "32gb"
-        ram_pattern = re.compile(
-            r'\b(\d+)\s*(gb|mb)\s*(ram|memory|mem)?\b', 
-            re.IGNORECASE
-        )
-        
-        match = ram_pattern.search(query)
+        match = _RAM_PATTERN.search(query)
         if match:
             amount, unit = match.groups()[:2]
             unit = unit.upper()
@@ -331,45 +465,15 @@ class RealQueryNormalizer:
         
         return None
     
-    def _extract_processor(self, query: str) -> Optional[str]:
+    def _extract_processor(self, query: str, scan: Optional[PatternScan] = None) -> Optional[str]:
         """Extract processor from query for laptops."""
-        processor_patterns = {
-            'M3 Pro': r'\bm3\s*pro\b',
-            'M3 Max': r'\bm3\s*max\b',
-            'M3': r'\bm3\b',
-            'M2 Pro': r'\bm2\s*pro\b',
-            'M2 Max': r'\bm2\s*max\b',
-            'M2': r'\bm2\b',
-            'M1 Pro': r'\bm1\s*pro\b',
-            'M1 Max': r'\bm1\s*max\b',
-            'M1': r'\bm1\b',
-            'Intel i9': r'\b(intel\s*)?i9\b',
-            'Intel i7': r'\b(intel\s*)?i7\b',
-            'Intel i5': r'\b(intel\s*)?i5\b',
-            'Intel i3': r'\b(intel\s*)?i3\b',
-            'AMD Ryzen 9': r'\b(amd\s*)?ryzen\s*9\b',
-            'AMD Ryzen 7': r'\b(amd\s*)?ryzen\s*7\b',
-            'AMD Ryzen 5': r'\b(amd\s*)?ryzen\s*5\b'
-        }
-        
-        for processor, pattern in processor_patterns.items():
-            if re.search(pattern, query, re.IGNORECASE):
-                return processor
-        
-        return None
+        return (scan or self.automaton.scan(query)).first('processor')
     
     def _extract_size(self, query: str) -> Optional[str]:
         """Extract size from query for sports items."""
         # Pattern for sizes like "US 10", "EU 42", "UK 8.5", "10.5", "Size 9"
-        size_patterns = [
-            r'\b(us|eu|uk)\s*(\d+\.?\d*)\b',
-            r'\bsize\s*(\d+\.?\d*)\b',
-            r'\b(\d+\.?\d*)\s*(us|eu|uk)\b',
-            r'\b(\d+\.?\d*)\b(?=\s*(size|shoe|foot))'
-        ]
-        
-        for pattern in size_patterns:
-            match = re.search(pattern, query, re.IGNORECASE)
+        for pattern in _SIZE_PATTERNS:
+            match = pattern.search(query)
             if match:
                 if len(match.groups()) == 2:
                     region, size = match.groups()
@@ -380,27 +484,12 @@ class RealQueryNormalizer:
         
         return None
     
-    def _extract_type(self, query: str) -> Optional[str]:
+    def _extract_type(self, query: str, scan: Optional[PatternScan] = None) -> Optional[str]:
         """Extract type from query for sports items."""
-        type_patterns = {
-            'Running Shoes': r'\b(running|run|runner|jogging)\b',
-            'Basketball Shoes': r'\b(basketball|basket|court)\b',
-            'Tennis Shoes': r'\b(tennis|court)\b',
-            'Football Cleats': r'\b(football|cleats|soccer)\b',
-            'Casual Shoes': r'\b(casual|lifestyle|everyday)\b',
-            'Training Shoes': r'\b(training|trainer|cross)\b',
-            'Hiking Boots': r'\b(hiking|hike|outdoor|trail)\b'
-        }
-        
-        for type_name, pattern in type_patterns.items():
-            if re.search(pattern, query, re.IGNORECASE):
-                return type_name
+        scan = scan or self.automaton.scan(query)
         
         # Default based on brand/model
-        if re.search(r'\b(air\s*max|air\s*force)\b', query, re.IGNORECASE):
-            return 'Running Shoes'
-        
-        return None
+        return scan.first('type') or scan.first('default_type')
 
 
 # Example usage for future implementation:
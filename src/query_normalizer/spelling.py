@@ -0,0 +1,186 @@
+"""
+Spelling correction for brand and model words.
+
+A SymSpell-style symmetric-delete index over the normalizer's vocabulary:
+every vocabulary word is stored under each string obtained by deleting up to
+`max_distance` of its characters. A misspelt word is looked up under its own
+deletes, which finds every vocabulary word within that many edits without
+comparing against the whole vocabulary; candidates are then verified with the
+optimal string alignment distance (a transposition counts as one edit).
+
+Only alphabetic runs that are not already known words are corrected, so digits
+and glued model numbers ("iphnoe16pro") keep their place.
+"""
+
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+
+_ALPHA_RUN = re.compile(r'[^\W\d_]+')
+_REGEX_ESCAPE = re.compile(r'\\[a-zA-Z]')
+
+
+def pattern_words(pattern: str) -> List[str]:
+    """
+    Literal words of a pattern (`\\biphone\\s*16\\s*pro\\b` -> iphone, pro).
+
+    Args:
+        pattern: Regex of a normalizer table
+
+    Returns:
+        List[str]: Lowercased alphabetic runs outside escapes like \\s and \\b
+    """
+    return _ALPHA_RUN.findall(_REGEX_ESCAPE.sub(' ', pattern.lower()))
+
+
+def _deletes(word: str, depth: int) -> Set[str]:
+    """The word and every string obtained by deleting up to `depth` characters."""
+    found = {word}
+    frontier = {word}
+    for _ in range(depth):
+        frontier = {candidate[:i] + candidate[i + 1:] for candidate in frontier for i in range(len(candidate))}
+        found |= frontier
+    return found
+
+
+def osa_distance(first: str, second: str) -> int:
+    """
+    Optimal string alignment distance: insertions, deletions, substitutions
+    and adjacent transpositions each cost one edit.
+
+    Args:
+        first: One string
+        second: Other string
+
+    Returns:
+        int: Edit distance
+    """
+    previous_row = None
+    row = list(range(len(second) + 1))
+    for i in range(1, len(first) + 1):
+        before, previous_row, row = previous_row, row, [i] + [0] * len(second)
+        for j in range(1, len(second) + 1):
+            cost = first[i - 1] != second[j - 1]
+            row[j] = min(previous_row[j] + 1, row[j - 1] + 1, previous_row[j - 1] + cost)
+            if (i > 1 and j > 1 and first[i - 1] == second[j - 2] and first[i - 2] == second[j - 1]):
+                row[j] = min(row[j], before[j - 2] + 1)
+    return row[len(second)]
+
+
+class SpellingCorrector:
+    """
+    SpellingCorrector maps misspelt words to the closest vocabulary word.
+
+    Words of `min_length` or more are corrected towards vocabulary words of
+    that length; from `long_length` on they may be `max_distance` edits
+    away, below it one edit. Shorter words of `swap_length` or more are
+    corrected only towards the `short_targets` (short brand words) and only
+    by swapping two adjacent letters ('nkie' -> 'nike', 'xsp' -> 'xps'):
+    too many ordinary short words are one edit from a brand ('bike', 'sell').
+    Ties go to the word listed first in the vocabulary.
+    """
+
+    def __init__(self, vocabulary: Sequence[str], known: Iterable[str] = (), max_distance: int = 2,
+                 min_length: int = 5, long_length: int = 8, short_targets: Iterable[str] = (),
+                 swap_length: int = 3):
+        """
+        Build the delete index.
+
+        Args:
+            vocabulary: Correction targets, in priority order
+            known: Further correctly spelt words that are left alone
+            max_distance: Most edits corrected for long words
+            min_length: Shortest word corrected towards any vocabulary word
+            long_length: Shortest word allowed `max_distance` edits
+            short_targets: Words (short brands) that shorter words are corrected towards
+            swap_length: Shortest word corrected by an adjacent swap towards `short_targets`
+        """
+        self.max_distance = max_distance
+        self.min_length = min_length
+        self.long_length = long_length
+        self.swap_length = swap_length
+        self.short_targets = {word.lower() for word in short_targets}
+        self.rank: Dict[str, int] = {}
+        for word in list(vocabulary) + list(short_targets):
+            self.rank.setdefault(word.lower(), len(self.rank))
+        self.known = set(self.rank) | {word.lower() for word in known}
+        self.index: Dict[str, List[str]] = {}
+        for word in self.rank:
+            for deleted in _deletes(word, max_distance):
+                self.index.setdefault(deleted, []).append(word)
+
+    def lookup(self, word: str) -> Optional[Tuple[str, int]]:
+        """
+        Closest vocabulary word for an unknown word.
+
+        Args:
+            word: Lowercased word
+
+        Returns:
+            Optional[Tuple[str, int]]: (vocabulary word, edit distance), or None
+                if the word is known, too short or nothing is close enough
+        """
+        short = len(word) < self.min_length
+        if len(word) < (self.swap_length if self.short_targets else self.min_length) or word in self.known:
+            return None
+        allowed = self.max_distance if len(word) >= self.long_length else min(1, self.max_distance)
+        best = None
+        seen = set()
+        for deleted in _deletes(word, allowed):
+            for candidate in self.index.get(deleted, ()):
+                if candidate in seen or abs(len(candidate) - len(word)) > allowed:
+                    continue
+                seen.add(candidate)
+                if not ((candidate in self.short_targets) if short else len(candidate) >= self.min_length):
+                    continue
+                if short and (len(candidate) != len(word) or sorted(candidate) != sorted(word)):
+                    continue
+                distance = osa_distance(word, candidate)
+                if distance <= allowed and (best is None or (distance, self.rank[candidate]) < best[1:]):
+                    best = (candidate, distance, self.rank[candidate])
+        return (best[0], best[1]) if best else None
+
+    def correct(self, text: str) -> Tuple[str, List[Dict[str, Any]]]:
+        """
+        Correct every unknown alphabetic run of a lowercased query.
+
+        Args:
+            text: Lowercased query
+
+        Returns:
+            Tuple[str, List[Dict[str, Any]]]: Corrected text and one
+                {'original', 'corrected', 'distance'} entry per correction
+        """
+        corrections = []
+        pieces = []
+        last = 0
+        for match in _ALPHA_RUN.finditer(text):
+            found = self.lookup(match.group())
+            if found is None:
+                continue
+            pieces.append(text[last:match.start()])
+            pieces.append(found[0])
+            last = match.end()
+            corrections.append({'original': match.group(), 'corrected': found[0], 'distance': found[1]})
+        if not corrections:
+            return text, corrections
+        pieces.append(text[last:])
+        return ''.join(pieces), corrections
+
+
+@lru_cache(maxsize=32)
+def build_corrector(vocabulary: Tuple[str, ...], known: Tuple[str, ...] = (),
+                    short_targets: Tuple[str, ...] = ()) -> SpellingCorrector:
+    """
+    Build (once per distinct vocabulary) the corrector for a vocabulary.
+
+    Args:
+        vocabulary: Correction targets, in priority order
+        known: Further correctly spelt words
+        short_targets: Short brand words that short typos are corrected towards
+
+    Returns:
+        SpellingCorrector: Shared corrector
+    """
+    return SpellingCorrector(vocabulary, known, short_targets=short_targets)
@@ -4,8 +4,13 @@ Ranks products by price and other factors for optimal presentation.
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
-import yaml
+from typing import List, Dict, Any, Optional
+import numpy as np
+from src.extractor.price_parser import price_amount
+from src.models.fingerprint import FixtureIndex
+from src.models.product_batch import ProductBatch
+from src.ranker.pagination import select_page
+from src.config.loader import load_config
 
 
 class RankerInterface(ABC):
@@ -34,8 +39,7 @@ class MockRanker(RankerInterface):
     def rank_products(self, products: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Mock implementation that returns predefined ranked data."""
         try:
-            with open(self.mock_data_path, 'r') as f:
-                mock_data = yaml.safe_load(f)
+            mock_data = load_config(self.mock_data_path)
                 
             return mock_data.get('ranked_results', [])
                 
@@ -71,20 +75,24 @@ class Ranker:
             config (dict or str): Config dict or path to YAML config file.
         """
         if isinstance(config, str):
-            with open(config, 'r') as f:
-                self.config = yaml.safe_load(f)
+            self.config = load_config(config)
         else:
             self.config = config
             
         self.use_mock = self.config.get('modules', {}).get('ranker', {}).get('use_mock', True)
         self.mock_results = self.config.get('modules', {}).get('ranker', {}).get('mock_ranked_results', {})
+        # Fixture inputs indexed by order-independent fingerprint
+        self.mock_index = FixtureIndex(self.mock_results)
     
-    def rank(self, products: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def rank(self, products: List[Dict[str, Any]], limit: Optional[int] = None,
+             cursor: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Rank products by best value criteria.
         
         Args:
             products (List[Dict[str, Any]]): List of deduplicated product entries
+            limit (Optional[int]): Only return the top `limit` products
+            cursor (Optional[str]): Cursor from rank_page() to continue after
             
         Returns:
             List[Dict[str, Any]]: Ranked list of products (best value first)
@@ -92,11 +100,14 @@ class Ranker:
         Raises:
             NotImplementedError: If use_mock is False (real ranking not implemented)
         """
+        if limit is not None or cursor is not None:
+            return self.rank_page(products, limit, cursor)['results']
+        
         if self.use_mock:
             # Check if input matches mock input pattern
-            mock_input = self.mock_results.get('input_products', [])
-            if self._lists_match(products, mock_input):
-                return self.mock_results.get('output_products', []).copy()
+            mock_output = self.mock_index.lookup(products)
+            if mock_output is not None:
+                return mock_output.copy()
             else:
                 # If no exact match, perform basic price-based ranking
                 return self._basic_rank(products)
@@ -104,25 +115,69 @@ class Ranker:
             # TODO: Real implementation would use multi-factor scoring
             raise NotImplementedError("Real ranking not implemented yet")
     
-    def _lists_match(self, list1: List[Dict[str, Any]], list2: List[Dict[str, Any]]) -> bool:
+    def rank_page(self, products: List[Dict[str, Any]], limit: Optional[int] = None,
+                  cursor: Optional[str] = None) -> Dict[str, Any]:
         """
-        Check if two lists of products match (for mock input validation).
+        Return one page of the ranking without sorting every product.
+        
+        The top `limit` products after `cursor` are picked with a heap in
+        O(n log k). Pages are stable: given the same products, following
+        `next_cursor` walks the same order rank() returns.
         
         Args:
-            list1: First list of products
-            list2: Second list of products
+            products (List[Dict[str, Any]]): List of deduplicated product entries
+            limit (Optional[int]): Page size (None for all remaining products)
+            cursor (Optional[str]): `next_cursor` of the previous page
             
         Returns:
-            bool: True if lists match, False otherwise
+            Dict[str, Any]: {'results': ranked page, 'next_cursor': str or None}
+            
+        Raises:
+            NotImplementedError: If use_mock is False (real ranking not implemented)
+            ValueError: If the cursor is malformed or limit is negative
         """
-        if len(list1) != len(list2):
-            return False
+        if not self.use_mock:
+            raise NotImplementedError("Real ranking not implemented yet")
         
-        # Sort both lists by product name for comparison
-        sorted1 = sorted(list1, key=lambda x: x.get('productName', ''))
-        sorted2 = sorted(list2, key=lambda x: x.get('productName', ''))
+        mock_output = self.mock_index.lookup(products)
+        if mock_output is not None:
+            # Fixture order is the ranking
+            candidates = mock_output
+            sort_keys = [(float(i), i) for i in range(len(candidates))]
+        else:
+            candidates = products
+            sort_keys = [(self._price_key(product), i) for i, product in enumerate(products)]
         
-        return sorted1 == sorted2
+        page = select_page(sort_keys, limit, cursor)
+        return {
+            'results': [candidates[i] for i in page['indices']],
+            'next_cursor': page['next_cursor']
+        }
+    
+    def rank_batch(self, batch: ProductBatch) -> ProductBatch:
+        """
+        Rank a columnar batch of products.
+        Gives the same order as rank().
+        
+        Args:
+            batch (ProductBatch): Deduplicated products in columnar form
+            
+        Returns:
+            ProductBatch: Batch reordered best value first
+            
+        Raises:
+            NotImplementedError: If use_mock is False (real ranking not implemented)
+        """
+        if not self.use_mock:
+            raise NotImplementedError("Real ranking not implemented yet")
+        
+        mock_output = self.mock_index.lookup(batch.records)
+        if mock_output is not None:
+            return ProductBatch.from_products(mock_output)
+        
+        # Stable sort keeps input order for equal prices, invalid prices last
+        price_key = np.where(np.isnan(batch.price), np.inf, batch.price)
+        return batch.take(np.argsort(price_key, kind='stable'))
     
     def _basic_rank(self, products: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
@@ -137,18 +192,26 @@ class Ranker:
         if not products:
             return []
         
-        # Convert price strings to floats for comparison
-        def get_price(product):
-            try:
-                return float(product.get('price', '0'))
-            except (ValueError, TypeError):
-                return float('inf')  # Put invalid prices at the end
-        
         # Sort by price (ascending - lowest price first)
-        ranked_products = sorted(products, key=get_price)
+        ranked_products = sorted(products, key=self._price_key)
         
         return ranked_products
     
+    def _price_key(self, product: Dict[str, Any]) -> float:
+        """
+        Ranking key for basic price ranking, using the typed price attached at extraction time.
+        
+        Args:
+            product (Dict[str, Any]): Product to rank
+            
+        Returns:
+            float: Price, or infinity to put invalid prices at the end
+        """
+        price = price_amount(product)
+        if price is None:
+            return float('inf')
+        return price
+    
     def _calculate_score(self, product: Dict[str, Any]) -> float:
         """
         Calculate a composite score for a product (for future real implementation).
@@ -169,7 +232,7 @@ class Ranker:
         # - Return policy
         # - Warranty coverage
         
-        base_price = float(product.get('price', '0'))
+        base_price = price_amount(product) or 0.0
         if base_price <= 0:
             return 0.0
         
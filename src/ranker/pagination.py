@@ -0,0 +1,156 @@
+"""
+Top-k selection and pagination cursors for ranking.
+
+Rankings are paged by sort key rather than by offset: every product gets a
+unique, totally ordered key (its ranking key plus its input position), a page
+is the k smallest keys after the cursor, and the cursor is the key of the
+last product served. Serving a page is a heap selection over the candidates,
+O(n log k), never a full sort.
+"""
+
+import base64
+import heapq
+import json
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+SortKey = Tuple[Any, ...]
+
+
+def encode_cursor(sort_key: SortKey, rank: int) -> str:
+    """
+    Encode the position after one served product as an opaque cursor.
+
+    Args:
+        sort_key: Sort key of the last product served
+        rank: 1-based rank of that product
+
+    Returns:
+        str: URL-safe cursor string
+    """
+    payload = json.dumps({'key': list(sort_key), 'rank': rank}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[SortKey, int]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Cursor string
+
+    Returns:
+        Tuple of (sort key of the last product served, its rank)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        sort_key = tuple(payload['key'])
+        rank = int(payload['rank'])
+        if not sort_key or not all(isinstance(value, (int, float)) for value in sort_key):
+            raise ValueError("cursor sort key must be numeric")
+    except (ValueError, TypeError, KeyError, AttributeError) as e:
+        raise ValueError(f"Invalid pagination cursor: {cursor!r}") from e
+    return sort_key, rank
+
+
+def select_page(sort_keys: Sequence[SortKey], limit: Optional[int] = None,
+                cursor: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Select one page of positions, best (smallest key) first.
+
+    Args:
+        sort_keys: One unique sort key per candidate
+        limit: Page size (None for everything after the cursor)
+        cursor: Cursor from the previous page, or None for the first page
+
+    Returns:
+        Dict with 'indices' (positions into sort_keys, in rank order),
+        'first_rank' (rank of the first selected item) and
+        'next_cursor' (None when this is the last page)
+
+    Raises:
+        ValueError: If limit is negative or the cursor is malformed
+    """
+    if limit is not None and limit < 0:
+        raise ValueError(f"limit must be non-negative, got {limit}")
+
+    last_rank = 0
+    if cursor:
+        after, last_rank = decode_cursor(cursor)
+        candidates = [i for i, key in enumerate(sort_keys) if key > after]
+    else:
+        candidates = range(len(sort_keys))
+
+    if limit is None or limit >= len(candidates):
+        indices = sorted(candidates, key=sort_keys.__getitem__)
+    else:
+        indices = heapq.nsmallest(limit, candidates, key=sort_keys.__getitem__)
+
+    next_cursor = None
+    if indices and len(indices) < len(candidates):
+        next_cursor = encode_cursor(sort_keys[indices[-1]], last_rank + len(indices))
+
+    return {'indices': indices, 'first_rank': last_rank + 1, 'next_cursor': next_cursor}
+
+
+def select_page_array(primary: np.ndarray, limit: Optional[int] = None,
+                      cursor: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Vectorized select_page for keys of the form (primary[i], i).
+
+    Uses a partition instead of a heap: O(n) to find the page plus
+    O(k log k) to order it.
+
+    Args:
+        primary: Primary sort key per candidate (smaller ranks first)
+        limit: Page size (None for everything after the cursor)
+        cursor: Cursor from the previous page, or None for the first page
+
+    Returns:
+        Dict with 'indices' (np.ndarray of positions in rank order),
+        'first_rank' and 'next_cursor', as in select_page
+
+    Raises:
+        ValueError: If limit is negative or the cursor is malformed
+    """
+    if limit is not None and limit < 0:
+        raise ValueError(f"limit must be non-negative, got {limit}")
+
+    ordinals = np.arange(len(primary))
+    last_rank = 0
+    if cursor:
+        after, last_rank = decode_cursor(cursor)
+        if len(after) != 2:
+            raise ValueError(f"Invalid pagination cursor: {cursor!r}")
+        after_value, after_ordinal = after
+        mask = (primary > after_value) | ((primary == after_value) & (ordinals > after_ordinal))
+        candidates = np.flatnonzero(mask)
+    else:
+        candidates = ordinals
+
+    values = primary[candidates]
+    if limit is None or limit >= len(candidates):
+        indices = candidates[np.argsort(values, kind='stable')]
+    elif limit == 0:
+        indices = candidates[:0]
+    else:
+        # Everything strictly below the k-th value is in; ties at the
+        # boundary are taken in input order so pages stay stable
+        kth = np.partition(values, limit - 1)[limit - 1]
+        below = candidates[values < kth]
+        tied = candidates[values == kth][:limit - len(below)]
+        selected = np.concatenate([below, tied])
+        indices = selected[np.lexsort((selected, primary[selected]))]
+
+    next_cursor = None
+    if len(indices) and len(indices) < len(candidates):
+        last = int(indices[-1])
+        next_cursor = encode_cursor((float(primary[last]), last), last_rank + len(indices))
+
+    return {'indices': indices, 'first_rank': last_rank + 1, 'next_cursor': next_cursor}
@@ -20,6 +20,11 @@ from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 from enum import Enum
 import math
+import numpy as np
+from src.extractor.price_parser import price_amount
+from src.models.product_batch import ProductBatch
+from src.ranker.pagination import decode_cursor, select_page_array
+from src.ranker.scoring_engine import MOCK_FACTOR_SCORES, ScoringEngine
 
 
 class RankingFactor(Enum):
@@ -84,53 +89,108 @@ class RealRanker:
         self.geographic_data = {}
         self._initialize_components()
         
-    def rank_products(self, products: List[Dict[str, Any]], user_context: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+    def rank_products(self, products: List[Dict[str, Any]], user_context: Dict[str, Any] = None,
+                      explain: Optional[bool] = None, limit: Optional[int] = None,
+                      cursor: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Rank products using comprehensive scoring algorithms.
         
         Args:
             products: List of products to rank
             user_context: User context for personalization
+            explain: Attach a per-factor `ranking_metadata` breakdown to each
+                product (defaults to the `explain` config setting)
+            limit: Only rank and return the top `limit` products
+            cursor: `next_cursor` from rank_page() to continue after
             
         Returns:
-            Ranked list of products
+            Ranked list of product dicts carrying `ranking_score` and
+            `ranking_rank` (plus `ranking_metadata` when explaining); these are
+            copies, the caller's products are left unchanged
         """
-        try:
-            # Calculate scores for each product
-            ranked_products = []
+        return self.rank_page(products, user_context, explain, limit, cursor)['results']
+    
+    def rank_page(self, products: List[Dict[str, Any]], user_context: Dict[str, Any] = None,
+                  explain: Optional[bool] = None, limit: Optional[int] = None,
+                  cursor: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Rank one page of products.
+        
+        All products are scored (vectorized) into the batch's score column,
+        but only the requested page is selected (partition, not a full sort)
+        and copied to carry its annotations, so the input is never mutated.
+        
+        Args:
+            products: List of products to rank
+            user_context: User context for personalization
+            explain: Attach `ranking_metadata` to the returned products
+            limit: Page size (None for all remaining products)
+            cursor: `next_cursor` of the previous page
             
-            for product in products:
-                # Calculate individual factor scores
-                factor_scores = self._calculate_factor_scores(product, user_context)
-                
-                # Calculate total score using weighted combination
-                total_score = self._calculate_total_score(factor_scores)
-                
-                # Create ranked product object
-                ranked_product = RankedProduct(
-                    product=product,
-                    total_score=total_score,
-                    factor_scores=factor_scores,
-                    rank=0,  # Will be set after sorting
-                    ranking_metadata=self._generate_ranking_metadata(product, factor_scores)
-                )
-                
-                ranked_products.append(ranked_product)
+        Returns:
+            Dict with 'results' (ranked page) and 'next_cursor' (None on the last page)
+            
+        Raises:
+            ValueError: If the cursor is malformed or limit is negative
+        """
+        if cursor:
+            decode_cursor(cursor)
+        
+        try:
+            # Score the whole batch at once; scores stay in the batch's column
+            batch = ProductBatch.from_products(products)
+            matrix = self.scoring_engine.score(batch, user_context)
+            page = select_page_array(-batch.scores, limit, cursor)
             
-            # Sort by total score (descending)
-            ranked_products.sort(key=lambda x: x.total_score, reverse=True)
+            if explain is None:
+                explain = self.explain
             
-            # Assign ranks
-            for i, ranked_product in enumerate(ranked_products):
-                ranked_product.rank = i + 1
+            ranked = []
+            scores = batch.scores.tolist()
+            for rank, row in enumerate(page['indices'].tolist(), start=page['first_rank']):
+                record = batch.records[row].copy()
+                record['ranking_score'] = scores[row]
+                record['ranking_rank'] = rank
+                if explain:
+                    factor_scores = self._factor_scores_from_row(record, matrix[row])
+                    record['ranking_metadata'] = self._generate_ranking_metadata(record, factor_scores)
+                ranked.append(record)
             
-            # Convert back to dictionary format
-            return [self._convert_to_dict(rp) for rp in ranked_products]
+            return {'results': ranked, 'next_cursor': page['next_cursor']}
             
         except Exception as e:
             # Log error and return basic price-based ranking
             print(f"Ranking failed: {e}")
-            return self._fallback_ranking(products)
+            fallback = self._fallback_ranking(products)
+            return {'results': fallback if limit is None else fallback[:limit], 'next_cursor': None}
+    
+    def rank_batch(self, batch: ProductBatch, user_context: Dict[str, Any] = None) -> ProductBatch:
+        """
+        Rank a columnar batch without touching individual records.
+        
+        Args:
+            batch: Products in columnar form
+            user_context: User context for personalization
+            
+        Returns:
+            ProductBatch reordered best score first, with the `scores` column filled
+        """
+        self.scoring_engine.score(batch, user_context)
+        return batch.take(self.scoring_engine.rank_order(batch.scores))
+    
+    def _factor_scores_from_row(self, product: Dict[str, Any], row) -> Dict[RankingFactor, RankingScore]:
+        """
+        Rebuild RankingScore objects for one product from its factor matrix row.
+        
+        Args:
+            product: Product the row belongs to
+            row: Factor scores in ScoringEngine.factors order
+            
+        Returns:
+            Dictionary of factor scores
+        """
+        scores = {factor: float(score) for factor, score in zip(self.scoring_engine.factors, row)}
+        return self._build_factor_scores(product, scores)
     
     def _calculate_factor_scores(self, product: Dict[str, Any], user_context: Dict[str, Any] = None) -> Dict[RankingFactor, RankingScore]:
         """
@@ -143,61 +203,45 @@ class RealRanker:
         Returns:
             Dictionary of factor scores
         """
-        factor_scores = {}
-        
-        # Price score (lower price = higher score)
-        price_score = self._calculate_price_score(product)
-        factor_scores[RankingFactor.PRICE] = RankingScore(
-            factor=RankingFactor.PRICE,
-            score=price_score,
-            weight=0.3,
-            metadata={'price': product.get('price', '0')}
-        )
-        
-        # Vendor trust score
-        vendor_score = self._calculate_vendor_trust_score(product)
-        factor_scores[RankingFactor.VENDOR_TRUST] = RankingScore(
-            factor=RankingFactor.VENDOR_TRUST,
-            score=vendor_score,
-            weight=0.2,
-            metadata={'vendor': product.get('site', 'unknown')}
-        )
-        
-        # Delivery speed score
-        delivery_score = self._calculate_delivery_score(product, user_context)
-        factor_scores[RankingFactor.DELIVERY_SPEED] = RankingScore(
-            factor=RankingFactor.DELIVERY_SPEED,
-            score=delivery_score,
-            weight=0.15,
-            metadata={'delivery_days': 3}
-        )
-        
-        # Availability score
-        availability_score = self._calculate_availability_score(product)
-        factor_scores[RankingFactor.AVAILABILITY] = RankingScore(
-            factor=RankingFactor.AVAILABILITY,
-            score=availability_score,
-            weight=0.1,
-            metadata={'in_stock': True}
-        )
+        scores = {
+            RankingFactor.PRICE.value: self._calculate_price_score(product),
+            RankingFactor.VENDOR_TRUST.value: self._calculate_vendor_trust_score(product),
+            RankingFactor.DELIVERY_SPEED.value: self._calculate_delivery_score(product, user_context),
+            RankingFactor.AVAILABILITY.value: self._calculate_availability_score(product),
+            RankingFactor.USER_RATINGS.value: self._calculate_ratings_score(product),
+            RankingFactor.PRICE_HISTORY.value: self._calculate_price_history_score(product),
+        }
+        return self._build_factor_scores(product, scores)
+    
+    def _build_factor_scores(self, product: Dict[str, Any], scores: Dict[str, float]) -> Dict[RankingFactor, RankingScore]:
+        """
+        Wrap raw factor scores in RankingScore objects with their weights and metadata.
         
-        # User ratings score
-        ratings_score = self._calculate_ratings_score(product)
-        factor_scores[RankingFactor.USER_RATINGS] = RankingScore(
-            factor=RankingFactor.USER_RATINGS,
-            score=ratings_score,
-            weight=0.15,
-            metadata={'rating': 4.5, 'review_count': 1000}
-        )
+        Args:
+            product: Product being scored
+            scores: Factor score keyed by RankingFactor value
+            
+        Returns:
+            Dictionary of factor scores
+        """
+        metadata = {
+            RankingFactor.PRICE: {'price': product.get('price', '0')},
+            RankingFactor.VENDOR_TRUST: {'vendor': product.get('site', 'unknown')},
+            RankingFactor.DELIVERY_SPEED: {'delivery_days': 3},
+            RankingFactor.AVAILABILITY: {'in_stock': True},
+            RankingFactor.USER_RATINGS: {'rating': 4.5, 'review_count': 1000},
+            RankingFactor.PRICE_HISTORY: {'price_trend': 'stable'},
+        }
+        weights = dict(zip(self.scoring_engine.factors, self.scoring_engine.weights.tolist()))
         
-        # Price history score
-        history_score = self._calculate_price_history_score(product)
-        factor_scores[RankingFactor.PRICE_HISTORY] = RankingScore(
-            factor=RankingFactor.PRICE_HISTORY,
-            score=history_score,
-            weight=0.1,
-            metadata={'price_trend': 'stable'}
-        )
+        factor_scores = {}
+        for factor, factor_metadata in metadata.items():
+            factor_scores[factor] = RankingScore(
+                factor=factor,
+                score=scores[factor.value],
+                weight=weights[factor.value],
+                metadata=factor_metadata
+            )
         
         return factor_scores
     
@@ -230,14 +274,11 @@ class RealRanker:
         # except (ValueError, TypeError):
         #     return 0.0
         
-        try:
-            price = float(product.get('price', '0'))
-            if price <= 0:
-                return 0.0
-            # Simple inverse scoring (lower price = higher score)
-            return max(0.0, min(1.0, 1000.0 / price))
-        except (ValueError, TypeError):
+        price = price_amount(product)
+        if price is None or price <= 0:
             return 0.0
+        # Simple inverse scoring (lower price = higher score)
+        return max(0.0, min(1.0, 1000.0 / price))
     
     def _calculate_vendor_trust_score(self, product: Dict[str, Any]) -> float:
         """
@@ -266,16 +307,8 @@ class RealRanker:
         # 
         # return max(0.0, min(1.0, total_score))
         
-        # Mock vendor trust scores
-        vendor_trust_scores = {
-            'amazon.com': 0.9,
-            'bestbuy.com': 0.8,
-            'apple.com': 0.95,
-            'walmart.com': 0.7
-        }
-        
         vendor = product.get('site', 'unknown')
-        return vendor_trust_scores.get(vendor, 0.5)
+        return self.scoring_engine.vendor_trust(vendor)
     
     def _calculate_delivery_score(self, product: Dict[str, Any], user_context: Dict[str, Any] = None) -> float:
         """
@@ -308,7 +341,7 @@ class RealRanker:
         # 
         # return 0.5  # Default score
         
-        return 0.8  # Mock delivery score
+        return MOCK_FACTOR_SCORES[RankingFactor.DELIVERY_SPEED.value]
     
     def _calculate_availability_score(self, product: Dict[str, Any]) -> float:
         """
@@ -336,7 +369,7 @@ class RealRanker:
         # else:
         #     return 0.0
         
-        return 0.9  # Mock availability score
+        return MOCK_FACTOR_SCORES[RankingFactor.AVAILABILITY.value]
     
     def _calculate_ratings_score(self, product: Dict[str, Any]) -> float:
         """
@@ -362,7 +395,7 @@ class RealRanker:
         # # Combine rating and confidence
         # return rating_score * (0.7 + 0.3 * review_confidence)
         
-        return 0.85  # Mock ratings score
+        return MOCK_FACTOR_SCORES[RankingFactor.USER_RATINGS.value]
     
     def _calculate_price_history_score(self, product: Dict[str, Any]) -> float:
         """
@@ -403,7 +436,7 @@ class RealRanker:
         # else:  # Above average
         #     return 0.3
         
-        return 0.7  # Mock price history score
+        return MOCK_FACTOR_SCORES[RankingFactor.PRICE_HISTORY.value]
     
     def _calculate_total_score(self, factor_scores: Dict[RankingFactor, RankingScore]) -> float:
         """
@@ -415,18 +448,9 @@ class RealRanker:
         Returns:
             Total weighted score
         """
-        total_score = 0.0
-        total_weight = 0.0
-        
-        for factor, score_obj in factor_scores.items():
-            total_score += score_obj.score * score_obj.weight
-            total_weight += score_obj.weight
-        
-        # Normalize by total weight
-        if total_weight > 0:
-            return total_score / total_weight
-        else:
-            return 0.0
+        engine = self.scoring_engine
+        row = np.array([factor_scores[RankingFactor(factor)].score for factor in engine.factors])
+        return float(engine.total_scores(row))
     
     def _generate_ranking_metadata(self, product: Dict[str, Any], factor_scores: Dict[RankingFactor, RankingScore]) -> Dict[str, Any]:
         """
@@ -455,23 +479,6 @@ class RealRanker:
         
         return metadata
     
-    def _convert_to_dict(self, ranked_product: RankedProduct) -> Dict[str, Any]:
-        """
-        Convert RankedProduct to dictionary format.
-        
-        Args:
-            ranked_product: RankedProduct object
-            
-        Returns:
-            Dictionary representation
-        """
-        return {
-            **ranked_product.product,
-            'ranking_score': ranked_product.total_score,
-            'ranking_rank': ranked_product.rank,
-            'ranking_metadata': ranked_product.ranking_metadata
-        }
-    
     def _fallback_ranking(self, products: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Fallback to basic price-based ranking.
@@ -483,10 +490,8 @@ class RealRanker:
             Price-sorted products
         """
         def get_price(product):
-            try:
-                return float(product.get('price', '0'))
-            except (ValueError, TypeError):
-                return float('inf')
+            price = price_amount(product)
+            return float('inf') if price is None else price
         
         sorted_products = sorted(products, key=get_price)
         return sorted_products
@@ -505,21 +510,31 @@ class RealRanker:
         """
         Initialize ranking components (ML model, databases).
         """
-        # TODO: Initialize ML model, vendor database, price history database
+        # TODO: Initialize ML model, price history database
         self.vendor_database = {
             'amazon.com': {
+                'trust': 0.9,
                 'reputation': 0.9,
                 'return_rate': 0.05,
                 'satisfaction': 0.85,
                 'years': 25
             },
             'bestbuy.com': {
+                'trust': 0.8,
                 'reputation': 0.8,
                 'return_rate': 0.08,
                 'satisfaction': 0.8,
                 'years': 35
+            },
+            'apple.com': {
+                'trust': 0.95
+            },
+            'walmart.com': {
+                'trust': 0.7
             }
         }
+        self.explain = self.config.get('explain', False)
+        self.scoring_engine = ScoringEngine(self.vendor_database, self.config.get('weights'))
 
 
 # Example usage for future implementation:
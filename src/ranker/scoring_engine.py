@@ -0,0 +1,164 @@
+"""
+Vectorized scoring engine for RealRanker.
+Computes every ranking factor for a whole ProductBatch as NumPy columns and
+combines them with a single weighted matrix-vector product.
+"""
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from src.models.product_batch import ProductBatch
+
+
+# Factor weights, keyed by RankingFactor value, in matrix column order
+DEFAULT_WEIGHTS = {
+    'price': 0.3,
+    'vendor_trust': 0.2,
+    'delivery_speed': 0.15,
+    'availability': 0.1,
+    'user_ratings': 0.15,
+    'price_history': 0.1,
+}
+
+# Scores used until delivery, stock, ratings and price history data is wired in
+MOCK_FACTOR_SCORES = {
+    'delivery_speed': 0.8,
+    'availability': 0.9,
+    'user_ratings': 0.85,
+    'price_history': 0.7,
+}
+
+DEFAULT_VENDOR_TRUST = 0.5
+
+
+class ScoringEngine:
+    """
+    ScoringEngine scores a batch of products on all ranking factors at once.
+
+    The factor matrix has one row per product and one column per factor
+    (see `factors`); total scores are `matrix @ weights` with the weights
+    normalized to sum to 1.
+    """
+
+    def __init__(self, vendor_database: Optional[Dict[str, Dict[str, Any]]] = None,
+                 weights: Optional[Dict[str, float]] = None):
+        """
+        Initialize the scoring engine.
+
+        Args:
+            vendor_database: Vendor records keyed by site; `trust` is the vendor trust score
+            weights: Optional per-factor weight overrides keyed by factor name
+        """
+        self.vendor_database = vendor_database if vendor_database is not None else {}
+        merged = {**DEFAULT_WEIGHTS, **(weights or {})}
+        unknown = set(merged) - set(DEFAULT_WEIGHTS)
+        if unknown:
+            raise ValueError(f"Unknown ranking factors: {sorted(unknown)}")
+
+        self.factors: List[str] = list(DEFAULT_WEIGHTS)
+        self.weights = np.array([merged[factor] for factor in self.factors], dtype=np.float64)
+        total_weight = self.weights.sum()
+        self.normalized_weights = self.weights / total_weight if total_weight > 0 else self.weights * 0.0
+
+    def vendor_trust(self, site: str) -> float:
+        """
+        Look up the trust score of one vendor.
+
+        Args:
+            site: Vendor site as found on the product
+
+        Returns:
+            float: Trust score (0-1)
+        """
+        return self.vendor_database.get(site, {}).get('trust', DEFAULT_VENDOR_TRUST)
+
+    def factor_matrix(self, batch: ProductBatch, user_context: Dict[str, Any] = None) -> np.ndarray:
+        """
+        Compute all factor scores for a batch.
+
+        Args:
+            batch: Products in columnar form
+            user_context: User context for personalization (not used yet)
+
+        Returns:
+            np.ndarray: (len(batch), len(factors)) matrix of scores in [0, 1]
+        """
+        matrix = np.empty((len(batch), len(self.factors)), dtype=np.float64)
+        for column, factor in enumerate(self.factors):
+            if factor == 'price':
+                matrix[:, column] = self.price_scores(batch.price)
+            elif factor == 'vendor_trust':
+                matrix[:, column] = self.vendor_trust_scores(batch)
+            else:
+                matrix[:, column] = MOCK_FACTOR_SCORES[factor]
+        return matrix
+
+    def price_scores(self, prices: np.ndarray) -> np.ndarray:
+        """
+        Price score (lower price = higher score); unparseable or non-positive prices score 0.
+
+        Args:
+            prices: Prices in major units (NaN if unknown)
+
+        Returns:
+            np.ndarray: Price scores (0-1)
+        """
+        positive = prices > 0
+        scores = np.zeros(len(prices), dtype=np.float64)
+        np.divide(1000.0, prices, out=scores, where=positive)
+        return np.clip(scores, 0.0, 1.0)
+
+    def vendor_trust_scores(self, batch: ProductBatch) -> np.ndarray:
+        """
+        Vendor trust scores, looked up once per distinct site.
+
+        Args:
+            batch: Products in columnar form
+
+        Returns:
+            np.ndarray: Vendor trust scores (0-1)
+        """
+        if not len(batch):
+            return np.zeros(0, dtype=np.float64)
+        table = np.array([self.vendor_trust(site) for site in batch.site_vocab], dtype=np.float64)
+        return table[batch.site]
+
+    def total_scores(self, matrix: np.ndarray) -> np.ndarray:
+        """
+        Combine factor scores into one score per product.
+
+        Args:
+            matrix: Factor matrix from factor_matrix()
+
+        Returns:
+            np.ndarray: Weighted total scores
+        """
+        return matrix @ self.normalized_weights
+
+    def score(self, batch: ProductBatch, user_context: Dict[str, Any] = None) -> np.ndarray:
+        """
+        Score a batch and store the totals in its `scores` column.
+
+        Args:
+            batch: Products in columnar form
+            user_context: User context for personalization
+
+        Returns:
+            np.ndarray: The factor matrix (kept for explanations)
+        """
+        matrix = self.factor_matrix(batch, user_context)
+        batch.scores = self.total_scores(matrix)
+        return matrix
+
+    def rank_order(self, scores: np.ndarray) -> np.ndarray:
+        """
+        Row order for best score first, keeping input order among ties.
+
+        Args:
+            scores: Total scores
+
+        Returns:
+            np.ndarray: Row indices
+        """
+        return np.argsort(-scores, kind='stable')
@@ -0,0 +1,229 @@
+"""
+URL canonicalization for product pages.
+
+Search paths reach the same product page through different URLs: tracking
+parameters (utm_*, gclid, ref, ...), fragments, mobile or `www.` hosts,
+trailing slashes, default ports, reordered query strings, and on some sites
+decorated paths (Amazon's `/<slug>/dp/<ASIN>/ref=...`). Canonicalizing
+collapses them to one URL, so a page is fetched, extracted and cached once.
+
+Rules are general plus per site. A site rule can strip more parameters,
+keep only listed parameters, map hosts (e.g. `m.flipkart.com` ->
+`flipkart.com`) and rewrite paths with regular expressions.
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+
+# Parameters that only track where a visit came from
+DEFAULT_STRIP_PARAMS = ('utm_*', 'gclid', 'fbclid', 'msclkid', 'dclid', 'yclid', 'mc_cid', 'mc_eid',
+                        '_ga', 'ref', 'ref_', 'referrer', 'source', 'campaign', 'affid', 'aff_id')
+
+# Host prefixes of mobile or alternative front ends of the same site
+DEFAULT_HOST_PREFIXES = ('www.', 'm.', 'mobile.', 'amp.')
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+# Built-in per-site rules; the config's `sites` entries are merged over them
+DEFAULT_SITE_RULES = {
+    'amazon': {
+        'strip_params': ['tag', 'psc', 'th', 'smid', 'pd_rd_*', 'pf_rd_*', 'qid', 'sr', 'keywords', 'crid', 'sprefix'],
+        'path_rewrites': [[r'^.*?/(?:dp|gp/product)/([A-Z0-9]{10}).*$', r'/dp/\1']],
+    },
+    'flipkart.com': {
+        'keep_params': ['pid'],
+    },
+    'bestbuy.com': {
+        'keep_params': ['skuId'],
+    },
+    'ebay': {
+        'strip_params': ['hash', '_trkparms', '_trksid', 'amdata', 'epid'],
+    },
+}
+
+
+class UrlCanonicalizer:
+    """
+    UrlCanonicalizer maps equivalent product URLs to one canonical URL.
+
+    Scheme and host are lowercased, mobile/`www.` host prefixes and default
+    ports dropped, the fragment and trailing slash removed, tracking
+    parameters stripped and the rest sorted. A site rule applies when its
+    key is the host, a parent domain of it, or its first label (so
+    'amazon' covers amazon.com, amazon.co.uk and amazon.de). Results are
+    memoized in a bounded LRU (thread-safe), as the same URLs recur across queries.
+    """
+
+    def __init__(self, strip_params: Optional[Sequence[str]] = None,
+                 host_prefixes: Optional[Sequence[str]] = None,
+                 sites: Optional[Dict[str, Dict[str, Any]]] = None, cache_size: int = 10000):
+        """
+        Compile the rules.
+
+        Args:
+            strip_params: Parameters dropped on every site ('name' or 'prefix*')
+            host_prefixes: Host prefixes dropped (mobile, www)
+            sites: Site -> rule with strip_params/keep_params/hosts/path_rewrites keys
+            cache_size: Most canonical URLs memoized
+        """
+        self.strip_params = self._param_matcher(DEFAULT_STRIP_PARAMS if strip_params is None else strip_params)
+        self.host_prefixes = tuple(DEFAULT_HOST_PREFIXES if host_prefixes is None else host_prefixes)
+        self.sites = {site.lower(): self._compile_rule(rule)
+                      for site, rule in dict(DEFAULT_SITE_RULES, **(sites or {})).items()}
+        self.cache_size = cache_size
+        self._cache: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]]) -> 'UrlCanonicalizer':
+        """
+        Build a canonicalizer from a `canonical_urls` config section.
+
+        Args:
+            config: Section with strip_params/host_prefixes/sites/cache_size keys, or None
+
+        Returns:
+            UrlCanonicalizer: Canonicalizer with built-in rules for missing keys
+        """
+        config = config or {}
+        return cls(strip_params=config.get('strip_params'), host_prefixes=config.get('host_prefixes'),
+                   sites=config.get('sites'), cache_size=config.get('cache_size', 10000))
+
+    @staticmethod
+    def _param_matcher(patterns: Sequence[str]) -> Tuple[frozenset, Tuple[str, ...]]:
+        """Exact names and prefixes (from 'prefix*') of parameter patterns, lowercased."""
+        patterns = [pattern.lower() for pattern in patterns]
+        return (frozenset(pattern for pattern in patterns if not pattern.endswith('*')),
+                tuple(pattern[:-1] for pattern in patterns if pattern.endswith('*')))
+
+    @classmethod
+    def _compile_rule(cls, rule: Dict[str, Any]) -> Dict[str, Any]:
+        keep = rule.get('keep_params')
+        return {
+            'strip': cls._param_matcher(rule.get('strip_params') or []),
+            'keep': None if keep is None else frozenset(name.lower() for name in keep),
+            'hosts': {alias.lower(): host.lower() for alias, host in (rule.get('hosts') or {}).items()},
+            'path_rewrites': [(re.compile(pattern), replacement)
+                              for pattern, replacement in rule.get('path_rewrites') or []],
+        }
+
+    @staticmethod
+    def _matches(name: str, matcher: Tuple[frozenset, Tuple[str, ...]]) -> bool:
+        names, prefixes = matcher
+        return name in names or name.startswith(prefixes)
+
+    def site_rule(self, host: str) -> Optional[Dict[str, Any]]:
+        """
+        Compiled rule for a (canonical) host.
+
+        Args:
+            host: Lowercased host without mobile/www prefix
+
+        Returns:
+            Optional[Dict[str, Any]]: The host's rule, its closest parent domain's, or its brand's; None if none
+        """
+        labels = host.split('.')
+        for start in range(len(labels) - 1):
+            rule = self.sites.get('.'.join(labels[start:]))
+            if rule is not None:
+                return rule
+        return self.sites.get(labels[0])
+
+    def canonicalize(self, url: str) -> str:
+        """
+        Canonical form of a URL.
+
+        Args:
+            url: Product page URL
+
+        Returns:
+            str: Canonical URL (unparseable or non-HTTP URLs come back unchanged)
+        """
+        with self._lock:
+            canonical = self._cache.get(url)
+            if canonical is not None:
+                self._cache.move_to_end(url)
+                return canonical
+        canonical = self._canonicalize(url)
+        with self._lock:
+            self._cache[url] = canonical
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return canonical
+
+    def _canonicalize(self, url: str) -> str:
+        try:
+            parts = urlsplit(url.strip())
+            port = parts.port
+        except ValueError:
+            return url
+        scheme = parts.scheme.lower()
+        if scheme not in DEFAULT_PORTS or not parts.hostname:
+            return url
+
+        host = parts.hostname.rstrip('.')
+        for prefix in self.host_prefixes:
+            if host.startswith(prefix) and host.count('.') > 1:
+                host = host[len(prefix):]
+                break
+        rule = self.site_rule(host)
+        if rule is not None:
+            host = rule['hosts'].get(host, host)
+        netloc = host if port in (None, DEFAULT_PORTS[scheme]) else f"{host}:{port}"
+
+        path = re.sub(r'/{2,}', '/', parts.path) or '/'
+        if rule is not None:
+            for pattern, replacement in rule['path_rewrites']:
+                path = pattern.sub(replacement, path)
+        if len(path) > 1:
+            path = path.rstrip('/')
+
+        params: List[Tuple[str, str]] = []
+        for name, value in parse_qsl(parts.query, keep_blank_values=True):
+            lowered = name.lower()
+            if rule is not None and rule['keep'] is not None:
+                if lowered in rule['keep']:
+                    params.append((name, value))
+            elif not self._matches(lowered, self.strip_params) and not (
+                    rule is not None and self._matches(lowered, rule['strip'])):
+                params.append((name, value))
+        return urlunsplit((scheme, netloc, path, urlencode(sorted(params)), ''))
+
+
+def collapse_duplicates(search_results: List[Dict[str, Any]],
+                        canonicalizer: UrlCanonicalizer) -> List[Dict[str, Any]]:
+    """
+    Keep the first search result per canonical URL, with its URL canonicalized.
+
+    Args:
+        search_results: Results with a 'url' key
+        canonicalizer: URL rules
+
+    Returns:
+        List[Dict[str, Any]]: Results with distinct canonical URLs, in input order (new dicts)
+    """
+    seen = set()
+    collapsed = []
+    for result in search_results:
+        url = canonicalizer.canonicalize(result['url'])
+        if url not in seen:
+            seen.add(url)
+            collapsed.append(dict(result, url=url))
+    return collapsed
+
+
+def create_url_canonicalizer(config: Dict) -> UrlCanonicalizer:
+    """
+    Factory function to create the URL canonicalizer from a pipeline config.
+
+    Args:
+        config: Configuration dictionary (`modules.scraper.canonical_urls` is used)
+
+    Returns:
+        UrlCanonicalizer: Configured canonicalizer
+    """
+    return UrlCanonicalizer.from_config(config.get('modules', {}).get('scraper', {}).get('canonical_urls'))
@@ -5,7 +5,7 @@ Fetches HTML content from product pages for price extraction.
 
 from abc import ABC, abstractmethod
 from typing import Optional, Dict, Any
-import yaml
+from src.config.loader import load_config
 
 
 class ScraperInterface(ABC):
@@ -87,8 +87,7 @@ class Scraper:
             config (dict or str): Config dict or path to YAML config file.
         """
         if isinstance(config, str):
-            with open(config, 'r') as f:
-                self.config = yaml.safe_load(f)
+            self.config = load_config(config)
         else:
             self.config = config
             
@@ -5,7 +5,7 @@ Finds product URLs on e-commerce sites based on search queries.
 
 from abc import ABC, abstractmethod
 from typing import List, Dict, Any
-import yaml
+from src.config.loader import load_config
 
 
 class SearchAgentInterface(ABC):
@@ -35,8 +35,7 @@ class MockSearchAgent(SearchAgentInterface):
     def search_products(self, site: str, query: str) -> List[str]:
         """Mock implementation that returns predefined search results."""
         try:
-            with open(self.mock_data_path, 'r') as f:
-                mock_data = yaml.safe_load(f)
+            mock_data = load_config(self.mock_data_path)
                 
             search_data = mock_data.get('search_results', {})
             site_results = search_data.get(site, {})
@@ -74,8 +73,7 @@ class SearchAgent:
             config (dict or str): Config dict or path to YAML config file.
         """
         if isinstance(config, str):
-            with open(config, 'r') as f:
-                self.config = yaml.safe_load(f)
+            self.config = load_config(config)
         else:
             self.config = config
             
@@ -108,7 +106,8 @@ class SearchAgent:
                             results.append({
                                 "site": site,
                                 "url": result.get("url", ""),
-                                "html_file": result.get("html_file", "")
+                                "html_file": result.get("html_file", ""),
+                                **self._result_text(result)
                             })
                     elif isinstance(site_results, list):
                         # Legacy format - all results for site
@@ -116,10 +115,16 @@ class SearchAgent:
                             results.append({
                                 "site": site,
                                 "url": result.get("url", ""),
-                                "html_file": result.get("html_file", "")
+                                "html_file": result.get("html_file", ""),
+                                **self._result_text(result)
                             })
             return results
         else:
             # TODO: Real implementation would use LLM or site search APIs
             # For now, return empty list
-            return [] 
\ No newline at end of file
+            return [] 
+    
+    @staticmethod
+    def _result_text(result: Dict[str, Any]) -> Dict[str, str]:
+        """Title and snippet of a mock result, where given (the pre-fetch relevance filter scores them)."""
+        return {field: result[field] for field in ('title', 'snippet') if result.get(field)}
@@ -0,0 +1,166 @@
+"""
+Pre-fetch relevance filter for search results.
+
+Step 4 fetches every search result, and Step 6 only drops mismatches
+(accessories, other storage sizes, other models) after the fetch and
+extraction are paid for. This filter scores a result's title and snippet
+against the normalized query with the validator's QueryMatcher and drops
+results scoring below a threshold before anything is fetched.
+
+Results without a title or snippet cannot be judged and are always kept.
+With `audit_every: N`, every Nth dropped result is still fetched and
+validated by the orchestrator, through the same product-data cache and
+shared page fetches as Step 4, so the counters show the recall the
+threshold costs next to the fetches it saves. Pages fetched only for
+audits are counted apart, so they are not mistaken for fetches avoided.
+"""
+
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.validator.matcher import QueryMatcher
+
+
+# Search result fields scored against the query
+TEXT_FIELDS = ('title', 'snippet')
+
+
+class RelevanceFilter:
+    """
+    RelevanceFilter drops search results whose text does not match the query.
+
+    A result's score is the share of the query's brand, model and storage
+    terms found in its title and snippet; with threshold 1.0 a result is
+    kept exactly when validation would accept a product of that name.
+    Counters are thread-safe, so one filter can serve concurrent requests.
+    """
+
+    def __init__(self, threshold: float = 1.0, enabled: bool = True, audit_every: int = 0):
+        """
+        Initialize the filter.
+
+        Args:
+            threshold: Results scoring below this are dropped (0.0 keeps everything)
+            enabled: When False, every result is kept and nothing is counted
+            audit_every: Audit every Nth dropped result (0 never audits)
+        """
+        self.threshold = threshold
+        self.enabled = enabled
+        self.audit_every = audit_every
+        self._counts = dict.fromkeys(('results', 'unscored', 'kept', 'dropped', 'audited', 'audit_fetches',
+                                     'recall_lost'), 0)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]]) -> 'RelevanceFilter':
+        """
+        Build a filter from a `prefilter` config section.
+
+        Args:
+            config: Section with enabled/threshold/audit_every keys, or None
+
+        Returns:
+            RelevanceFilter: Filter with defaults for missing keys
+        """
+        config = config or {}
+        return cls(threshold=config.get('threshold', 1.0), enabled=config.get('enabled', True),
+                   audit_every=config.get('audit_every', 0))
+
+    @staticmethod
+    def result_text(result: Dict[str, Any]) -> str:
+        """Lowercased title and snippet of a search result ('' if it has neither)."""
+        return ' '.join(result[field] for field in TEXT_FIELDS if result.get(field)).lower()
+
+    def split(self, query_struct: Dict[str, Any],
+              search_results: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Split search results into those worth fetching and those dropped.
+
+        Args:
+            query_struct: Normalized query
+            search_results: Results from SearchAgent.search
+
+        Returns:
+            Tuple[List, List]: (kept results, dropped results), each in input order
+        """
+        if not self.enabled:
+            return list(search_results), []
+        matcher = QueryMatcher(query_struct)
+        kept, dropped = [], []
+        unscored = 0
+        for result in search_results:
+            text = self.result_text(result)
+            if not text:
+                unscored += 1
+                kept.append(result)
+            elif matcher.score_text(text) >= self.threshold:
+                kept.append(result)
+            else:
+                dropped.append(result)
+        with self._lock:
+            self._counts['results'] += len(search_results)
+            self._counts['unscored'] += unscored
+            self._counts['kept'] += len(kept)
+            self._counts['dropped'] += len(dropped)
+        return kept, dropped
+
+    def audit_sample(self, dropped: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Dropped results due for an audit (every `audit_every`th dropped result overall).
+
+        Args:
+            dropped: Results split() just dropped (already counted)
+
+        Returns:
+            List[Dict[str, Any]]: Results the caller should fetch and validate
+        """
+        if not self.audit_every or not dropped:
+            return []
+        with self._lock:
+            first = self._counts['dropped'] - len(dropped)
+        return [result for index, result in enumerate(dropped, first + 1) if index % self.audit_every == 0]
+
+    def record_audit(self, valid: bool, fetched: bool = True) -> None:
+        """
+        Count one audited result.
+
+        Args:
+            valid: Whether validation accepted it, i.e. whether dropping it lost recall
+            fetched: Whether its page was fetched for the audit (False if the product-data
+                cache or a Step 4 fetch already had it)
+        """
+        with self._lock:
+            self._counts['audited'] += 1
+            self._counts['audit_fetches'] += bool(fetched)
+            self._counts['recall_lost'] += bool(valid)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Filter counters.
+
+        Returns:
+            Dict[str, Any]: results, unscored, kept, dropped, audited, audit_fetches (pages
+                fetched for audits), fetches_avoided (dropped less audit_fetches),
+                recall_lost (audited results that validated) and estimated_recall_lost
+                (recall_lost scaled up to all dropped results)
+        """
+        with self._lock:
+            stats = dict(self._counts, threshold=self.threshold)
+        stats['fetches_avoided'] = stats['dropped'] - stats['audit_fetches']
+        audited = stats['audited']
+        stats['estimated_recall_lost'] = (round(stats['recall_lost'] * stats['dropped'] / audited, 1)
+                                          if audited else None)
+        return stats
+
+
+def create_relevance_filter(config: Dict) -> RelevanceFilter:
+    """
+    Factory function to create the relevance filter from a pipeline config.
+
+    Args:
+        config: Configuration dictionary (`modules.search_agent.prefilter` is used)
+
+    Returns:
+        RelevanceFilter: Configured filter
+    """
+    return RelevanceFilter.from_config(config.get('modules', {}).get('search_agent', {}).get('prefilter'))
@@ -5,7 +5,7 @@ Selects relevant e-commerce sites based on country and product category.
 
 from abc import ABC, abstractmethod
 from typing import List, Dict, Any
-import yaml
+from src.config.loader import load_config
 
 
 class SiteSelectorInterface(ABC):
@@ -35,8 +35,7 @@ class MockSiteSelector(SiteSelectorInterface):
     def select_sites(self, country: str, category: str = "default") -> List[str]:
         """Mock implementation that returns predefined site lists."""
         try:
-            with open(self.mock_data_path, 'r') as f:
-                mock_data = yaml.safe_load(f)
+            mock_data = load_config(self.mock_data_path)
                 
             sites_data = mock_data.get('sites', {})
             country_sites = sites_data.get(country, {})
@@ -84,8 +83,7 @@ class SiteSelector:
             config (dict or str): Config dict or path to YAML config file.
         """
         if isinstance(config, str):
-            with open(config, 'r') as f:
-                self.config = yaml.safe_load(f)
+            self.config = load_config(config)
         else:
             self.config = config
             
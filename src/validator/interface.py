@@ -4,8 +4,12 @@ Validates extracted product data for accuracy and completeness.
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
-import yaml
+from typing import List, Dict, Any, Mapping, Tuple
+import numpy as np
+from src.models.fingerprint import mapping_hash, product_hash
+from src.models.product_batch import ProductBatch
+from src.validator.matcher import QueryMatcher
+from src.config.loader import load_config
 
 
 class ValidatorInterface(ABC):
@@ -34,8 +38,7 @@ class MockValidator(ValidatorInterface):
     def validate_products(self, products: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Mock implementation that returns predefined validation results."""
         try:
-            with open(self.mock_data_path, 'r') as f:
-                mock_data = yaml.safe_load(f)
+            mock_data = load_config(self.mock_data_path)
                 
             return mock_data.get('validated_products', [])
                 
@@ -85,13 +88,19 @@ class Validator:
             config (dict or str): Config dict or path to YAML config file.
         """
         if isinstance(config, str):
-            with open(config, 'r') as f:
-                self.config = yaml.safe_load(f)
+            self.config = load_config(config)
         else:
             self.config = config
             
         self.use_mock = self.config.get('modules', {}).get('validator', {}).get('use_mock', True)
         self.mock_validations = self.config.get('modules', {}).get('validator', {}).get('mock_validations', [])
+        # Fixture cases indexed by (query hash, product hash), first case wins
+        self.mock_index: Dict[Tuple[int, int], bool] = {}
+        for validation_case in self.mock_validations or []:
+            key = (mapping_hash(validation_case.get('query') or {}),
+                   product_hash(validation_case.get('product') or {}))
+            self.mock_index.setdefault(key, validation_case.get('is_valid', False))
+        self.mock_queries = {query_key for query_key, _ in self.mock_index}
     
     def validate(self, query_struct: Dict[str, Any], product_data: Dict[str, Any]) -> bool:
         """
@@ -107,53 +116,97 @@ class Validator:
         Raises:
             NotImplementedError: If use_mock is False (real validation not implemented)
         """
-        if self.use_mock:
-            # Find matching validation case in config
-            for validation_case in self.mock_validations:
-                if (validation_case.get('query') == query_struct and 
-                    validation_case.get('product') == product_data):
-                    return validation_case.get('is_valid', False)
+        return self.validate_many(query_struct, [product_data])[0]
+    
+    def validate_many(self, query_struct: Dict[str, Any], products: List[Mapping]) -> List[bool]:
+        """
+        Validate many products against one query.
+        
+        The query is compiled once (QueryMatcher) and fixture cases are
+        found by hash, so a batch costs O(n) whatever the number of cases.
+        Gives the same answers as calling validate() for every product.
+        
+        Args:
+            query_struct (Dict[str, Any]): Canonicalized query from QueryNormalizer
+            products (List[Mapping]): Extracted products from Extractor
             
-            # If no exact match found, try partial matching
-            return self._partial_match(query_struct, product_data)
-        else:
+        Returns:
+            List[bool]: Validation result per product, in input order
+            
+        Raises:
+            NotImplementedError: If use_mock is False (real validation not implemented)
+        """
+        if not self.use_mock:
             # TODO: Real implementation would use LLM or rule-based validation
             raise NotImplementedError("Real validation not implemented yet")
+        
+        matcher = QueryMatcher(query_struct)
+        query_key = mapping_hash(query_struct)
+        if query_key not in self.mock_queries:
+            # No fixture case for this query: partial matching only
+            return [matcher.matches(product) for product in products]
+        
+        results = []
+        for product in products:
+            # Exact fixture case first, then partial matching
+            is_valid = self.mock_index.get((query_key, product_hash(product)))
+            results.append(matcher.matches(product) if is_valid is None else is_valid)
+        return results
     
-    def _partial_match(self, query_struct: Dict[str, Any], product_data: Dict[str, Any]) -> bool:
+    def validate_batch(self, query_struct: Dict[str, Any], batch: ProductBatch) -> np.ndarray:
         """
-        Perform partial matching when exact match not found in config.
+        Validate a whole batch of products against one query.
+        Gives the same answer as calling validate() for every row.
         
         Args:
-            query_struct (Dict[str, Any]): Query structure
-            product_data (Dict[str, Any]): Product data
+            query_struct (Dict[str, Any]): Canonicalized query from QueryNormalizer
+            batch (ProductBatch): Extracted products in columnar form
             
         Returns:
-            bool: True if partial match found, False otherwise
+            np.ndarray: Boolean mask, True where the product matches the query
+            
+        Raises:
+            NotImplementedError: If use_mock is False (real validation not implemented)
         """
-        # Check if brand and model are present in product name
-        brand = query_struct.get('brand', '').lower()
-        model = query_struct.get('model', '').lower()
-        product_name = product_data.get('productName', '').lower()
+        if not self.use_mock:
+            raise NotImplementedError("Real validation not implemented yet")
         
-        # Basic validation: brand and model should be in product name
-        if brand and brand not in product_name:
-            return False
+        valid = QueryMatcher(query_struct).mask(batch)
         
-        if model and model not in product_name:
-            return False
+        # Exact fixture cases override the partial match
+        query_key = mapping_hash(query_struct)
+        if query_key in self.mock_queries:
+            for row, record in enumerate(batch.records):
+                is_valid = self.mock_index.get((query_key, product_hash(record)))
+                if is_valid is not None:
+                    valid[row] = is_valid
         
-        # Check if storage matches (if specified)
-        storage = query_struct.get('storage', '')
-        if storage and storage.lower() not in product_name:
-            return False
+        return valid
+    
+    def _partial_match_batch(self, query_struct: Dict[str, Any], batch: ProductBatch) -> np.ndarray:
+        """
+        Column-wise version of _partial_match.
         
-        # Check if price is reasonable (not zero or negative)
-        try:
-            price = float(product_data.get('price', '0'))
-            if price <= 0:
-                return False
-        except (ValueError, TypeError):
-            return False
+        Args:
+            query_struct (Dict[str, Any]): Query structure
+            batch (ProductBatch): Products in columnar form
+            
+        Returns:
+            np.ndarray: Boolean mask of partial matches
+        """
+        return QueryMatcher(query_struct).mask(batch)
+    
+    def _partial_match(self, query_struct: Dict[str, Any], product_data: Dict[str, Any]) -> bool:
+        """
+        Perform partial matching when exact match not found in config.
+        Brand, model and storage must appear in the product name and the
+        price must be positive (see QueryMatcher).
         
-        return True 
\ No newline at end of file
+        Args:
+            query_struct (Dict[str, Any]): Query structure
+            product_data (Dict[str, Any]): Product data
+            
+        Returns:
+            bool: True if partial match found, False otherwise
+        """
+        return QueryMatcher(query_struct).matches(product_data)
@@ -0,0 +1,117 @@
+"""
+Precompiled query matcher for product validation.
+
+Everything that only depends on the query (lowercased brand/model/storage
+terms) is prepared once, so matching a product is a few substring checks
+on its lowercased name plus a numeric price check.
+"""
+
+from collections.abc import Mapping
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from src.extractor.price_parser import price_amount
+from src.models.product_batch import ProductBatch
+
+
+# Query fields that must appear in the product name
+MATCH_FIELDS = ('brand', 'model', 'storage')
+
+
+class QueryMatcher:
+    """
+    QueryMatcher checks products against one normalized query.
+
+    A product matches when its name contains every non-empty brand, model
+    and storage term of the query (case-insensitive) and it has a positive
+    price.
+    """
+
+    __slots__ = ('terms', 'min_price')
+
+    def __init__(self, query_struct: Dict[str, Any], min_price: float = 0.0):
+        """
+        Compile a query.
+
+        Args:
+            query_struct: Normalized query (brand/model/storage keys are used)
+            min_price: Prices must be strictly greater than this
+        """
+        self.terms: Tuple[str, ...] = tuple(
+            term for term in ((query_struct.get(field) or '').lower() for field in MATCH_FIELDS) if term
+        )
+        self.min_price = min_price
+
+    def matches_name(self, name_lower: str) -> bool:
+        """
+        Check whether a lowercased product name contains every query term.
+
+        Args:
+            name_lower: Lowercased product name
+
+        Returns:
+            bool: True if all terms occur in the name
+        """
+        for term in self.terms:
+            if term not in name_lower:
+                return False
+        return True
+
+    def score_text(self, text_lower: str) -> float:
+        """
+        Score a lowercased text (e.g. a search result title) by the share of query terms it contains.
+
+        Args:
+            text_lower: Lowercased text
+
+        Returns:
+            float: 0.0-1.0; 1.0 exactly when matches_name() would accept it (or the query has no terms)
+        """
+        if not self.terms:
+            return 1.0
+        return sum(term in text_lower for term in self.terms) / len(self.terms)
+
+    def matches_price(self, price: Optional[float]) -> bool:
+        """
+        Check whether a parsed price is plausible (present and above min_price).
+
+        Args:
+            price: Parsed price, or None if it could not be parsed
+
+        Returns:
+            bool: True if the price is acceptable
+        """
+        return price is not None and price > self.min_price
+
+    def matches(self, product: Mapping) -> bool:
+        """
+        Check a product against the query.
+
+        Args:
+            product: Product dict
+
+        Returns:
+            bool: True if the name contains every term and the price is positive
+        """
+        name = product.get('productName')
+        if not self.matches_name(name.lower() if isinstance(name, str) else ''):
+            return False
+        return self.matches_price(price_amount(product))
+
+    def mask(self, batch: ProductBatch) -> np.ndarray:
+        """
+        Match a whole batch column-wise.
+
+        Args:
+            batch: Products in columnar form
+
+        Returns:
+            np.ndarray: Boolean mask of matching rows
+        """
+        # NaN (unparseable) prices compare False
+        valid = batch.price > self.min_price
+        if len(batch):
+            for term in self.terms:
+                valid &= np.char.find(batch.names_lower, term) >= 0
+        return valid
@@ -0,0 +1,252 @@
+"""
+Price plausibility: category price bands and robust outliers per product.
+
+Prices are converted to one currency with the local FX table, checked
+against a per-category band, and compared with the other listings of the
+same canonical product using the median and the median absolute deviation
+(MAD). Grouped medians come from one lexsort over the batch, so the check is
+a fixed number of array passes however many products and groups there are.
+
+Bands are resolved once per (category, country); per-product statistics are
+cached per (category, country, canonical product), so a later batch with only
+one or two listings of a product is still checked against what earlier
+batches saw.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.deduplicator.identity import CANONICAL_ID_FIELD
+from src.extractor.fx import FxTable
+from src.extractor.price_parser import price_with_currency
+
+
+# Plausible price per category in the FX base currency (USD)
+DEFAULT_PRICE_RANGES = {
+    'smartphone': (200, 2000),
+    'laptop': (500, 5000),
+    'tablet': (200, 1500),
+    'default': (0, float('inf')),
+}
+
+# Scales the MAD to a standard deviation for normally distributed prices
+_MAD_SCALE = 0.6745
+
+
+@dataclass
+class PriceAssessment:
+    """Per-product plausibility arrays for one batch (all of equal length)."""
+    price: np.ndarray          # float64 price in the listing's currency (NaN if unparseable)
+    currency: List[str]        # ISO code per listing
+    base_price: np.ndarray     # float64 price in the FX base currency (NaN if not convertible)
+    in_band: np.ndarray        # bool, base price within the category band
+    median: np.ndarray         # float64 median base price of the listing's product (NaN if unknown)
+    robust_z: np.ndarray       # float64 robust z-score against that median (NaN if unknown)
+    outlier: np.ndarray        # bool, flagged against its product's listings
+    band: Tuple[float, float]  # category band in the base currency
+
+
+def group_medians(values: np.ndarray, groups: np.ndarray, count: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Median of values per group in one sort.
+
+    Args:
+        values: float64 values (no NaN)
+        groups: int group code per value, in [0, count)
+        count: Number of groups
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Median per group (NaN for empty
+            groups) and group sizes
+    """
+    sizes = np.bincount(groups, minlength=count)
+    medians = np.full(count, np.nan)
+    if not len(values):
+        return medians, sizes
+    ordered = values[np.lexsort((values, groups))]
+    starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+    present = sizes > 0
+    lower = (starts + (sizes - 1) // 2)[present]
+    upper = (starts + sizes // 2)[present]
+    medians[present] = (ordered[lower] + ordered[upper]) / 2
+    return medians, sizes
+
+
+class PricePlausibility:
+    """
+    PricePlausibility flags prices that are off for their category or for
+    their canonical product.
+
+    A listing is an outlier when its product has enough reference listings
+    (in the batch or cached) and its price is more than `z_threshold` robust
+    standard deviations from the product median, or outside
+    [min_ratio, max_ratio] times that median, which catches accessories
+    listed at a fraction of the product's price.
+    """
+
+    def __init__(self, fx: Optional[FxTable] = None, price_ranges: Optional[Dict[str, Sequence[float]]] = None,
+                 country_price_ranges: Optional[Dict[str, Dict[str, Sequence[float]]]] = None,
+                 z_threshold: float = 3.5, min_ratio: float = 0.3, max_ratio: float = 3.0,
+                 min_group_size: int = 3, mad_floor: float = 0.05, cache_size: int = 10000):
+        """
+        Initialize the checker.
+
+        Args:
+            fx: Rate table (defaults to the built-in reference rates)
+            price_ranges: Band per lowercased category in the FX base currency
+            country_price_ranges: Per-country band overrides, {country: {category: band}}
+            z_threshold: Robust z-score beyond which a price is an outlier
+            min_ratio: Lowest plausible price as a fraction of the product median
+            max_ratio: Highest plausible price as a multiple of the product median
+            min_group_size: Listings a product needs before its median is trusted
+            mad_floor: Smallest MAD used, as a fraction of the median
+            cache_size: Most (category, country, product) statistics kept
+        """
+        self.fx = fx or FxTable()
+        self.price_ranges = {key.lower(): tuple(value) for key, value in (price_ranges or DEFAULT_PRICE_RANGES).items()}
+        self.price_ranges.setdefault('default', DEFAULT_PRICE_RANGES['default'])
+        self.country_price_ranges = {
+            country: {key.lower(): tuple(value) for key, value in ranges.items()}
+            for country, ranges in (country_price_ranges or {}).items()
+        }
+        self.z_threshold = z_threshold
+        self.min_ratio = min_ratio
+        self.max_ratio = max_ratio
+        self.min_group_size = min_group_size
+        self.mad_floor = mad_floor
+        self.cache_size = cache_size
+        self._bands: Dict[Tuple[str, Optional[str]], Tuple[float, float]] = {}
+        self._group_stats: 'OrderedDict[Tuple[str, Optional[str], str], Tuple[float, float, int]]' = OrderedDict()
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]], fx: Optional[FxTable] = None) -> 'PricePlausibility':
+        """
+        Build a checker from a `price_plausibility` config section.
+
+        Args:
+            config: Section with price_ranges/country_price_ranges/z_threshold/
+                min_ratio/max_ratio/min_group_size/mad_floor/cache_size keys, or None
+            fx: Rate table to use
+
+        Returns:
+            PricePlausibility: Checker with defaults for missing keys
+        """
+        config = config or {}
+        return cls(
+            fx=fx,
+            price_ranges=config.get('price_ranges'),
+            country_price_ranges=config.get('country_price_ranges'),
+            z_threshold=config.get('z_threshold', 3.5),
+            min_ratio=config.get('min_ratio', 0.3),
+            max_ratio=config.get('max_ratio', 3.0),
+            min_group_size=config.get('min_group_size', 3),
+            mad_floor=config.get('mad_floor', 0.05),
+            cache_size=config.get('cache_size', 10000)
+        )
+
+    def band(self, category: Optional[str], country: Optional[str] = None) -> Tuple[float, float]:
+        """
+        Plausible price band for a category in a country (cached).
+
+        Args:
+            category: Product category (any case)
+            country: Country code, if known
+
+        Returns:
+            Tuple[float, float]: (low, high) in the FX base currency
+        """
+        key = ((category or 'default').lower(), country)
+        band = self._bands.get(key)
+        if band is None:
+            overrides = self.country_price_ranges.get(country, {})
+            band = overrides.get(key[0]) or self.price_ranges.get(key[0]) or self.price_ranges['default']
+            self._bands[key] = band = (float(band[0]), float(band[1]))
+        return band
+
+    def assess(self, products: Sequence[Mapping], category: Optional[str] = None,
+               country: Optional[str] = None) -> PriceAssessment:
+        """
+        Check a batch of listings.
+
+        Listings are grouped by canonical product id; listings without one
+        are treated as one product (the query's).
+
+        Args:
+            products: Product dicts or records
+            category: Query category
+            country: Query country, if known
+
+        Returns:
+            PriceAssessment: Per-listing arrays
+        """
+        parsed = [price_with_currency(product) for product in products]
+        price = np.array([np.nan if amount is None else amount for amount, _ in parsed], dtype=np.float64)
+        currency = [code for _, code in parsed]
+        base_price = self.fx.to_base(price, currency)
+        low, high = self.band(category, country)
+        known = ~np.isnan(base_price)
+        in_band = known & (base_price >= low) & (base_price <= high)
+
+        group_index: Dict[str, int] = {}
+        groups = np.fromiter(
+            (group_index.setdefault(product.get(CANONICAL_ID_FIELD) or '', len(group_index)) for product in products),
+            dtype=np.int64, count=len(products)
+        )
+        medians, sizes = group_medians(base_price[known], groups[known], len(group_index))
+        deviation = np.abs(base_price - medians[groups])
+        mads, _ = group_medians(deviation[known], groups[known], len(group_index))
+        medians, mads = self._use_cached_stats(list(group_index), medians, mads, sizes, category, country)
+
+        scale = np.maximum(mads, self.mad_floor * medians)[groups]
+        reference = medians[groups]
+        trusted = ~np.isnan(reference) & known
+        with np.errstate(divide='ignore', invalid='ignore'):
+            robust_z = np.where(trusted, _MAD_SCALE * (base_price - reference) / scale, np.nan)
+            ratio = np.where(trusted, base_price / reference, np.nan)
+        outlier = trusted & ((np.abs(robust_z) > self.z_threshold) | (ratio < self.min_ratio) | (ratio > self.max_ratio))
+
+        return PriceAssessment(price=price, currency=currency, base_price=base_price, in_band=in_band,
+                               median=reference, robust_z=robust_z, outlier=outlier, band=(low, high))
+
+    def _use_cached_stats(self, group_keys: List[str], medians: np.ndarray, mads: np.ndarray, sizes: np.ndarray,
+                          category: Optional[str], country: Optional[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Store the statistics of well-sampled products; fall back to stored
+        statistics (or none) for products with too few listings.
+
+        The anonymous group (listings without a canonical id) is never cached,
+        since it means a different product for every query.
+        """
+        category = (category or 'default').lower()
+        medians = medians.copy()
+        mads = mads.copy()
+        for group, key in enumerate(group_keys):
+            cache_key = (category, country, key)
+            if sizes[group] >= self.min_group_size and not np.isnan(medians[group]):
+                if key:
+                    cached = self._group_stats.get(cache_key)
+                    if cached is None or cached[2] <= sizes[group]:
+                        self._group_stats[cache_key] = (float(medians[group]), float(mads[group]), int(sizes[group]))
+                    self._group_stats.move_to_end(cache_key)
+                    if len(self._group_stats) > self.cache_size:
+                        self._group_stats.popitem(last=False)
+                continue
+            cached = self._group_stats.get(cache_key) if key else None
+            if cached is not None:
+                self._group_stats.move_to_end(cache_key)
+                medians[group], mads[group] = cached[0], cached[1]
+            else:
+                medians[group] = mads[group] = np.nan
+        return medians, mads
+
+    def cache_info(self) -> Dict[str, int]:
+        """
+        Cache sizes.
+
+        Returns:
+            dict: bands resolved and product statistics cached
+        """
+        return {'bands': len(self._bands), 'products': len(self._group_stats)}
@@ -15,11 +15,19 @@ To activate:
 2. Swap the logic in interface.py to call real_validator instead of returning mocks.
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass
 import re
 from enum import Enum
 
+import numpy as np
+
+from src.extractor.fx import FxTable
+from src.llm.client import shared_client
+from src.validator.matcher import MATCH_FIELDS
+from src.validator.plausibility import PricePlausibility
+from src.validator.similarity import NgramSimilarity, query_text
+
 
 class ValidationMethod(Enum):
     """Methods available for product validation."""
@@ -30,6 +38,32 @@ class ValidationMethod(Enum):
     LLM_VALIDATION = "llm_validation"
 
 
+# Cascade stage settings. Stages run cheapest-per-rejection first
+# (cost / reject_rate ascending). A stage ends the cascade with a reject when
+# its result is invalid with confidence below `reject_below` (or invalid at
+# all with `reject_on_fail`), or with an accept when its confidence is at
+# least `accept_above` and every stage so far passed. `weight` is the stage's
+# share of the combined score. A missing brand, model or storage term is a
+# definite mismatch (another storage size or model), so brand_model rejects
+# on any failure.
+DEFAULT_CASCADE_STAGES = {
+    'brand_model': {'cost': 1.0, 'reject_rate': 0.5, 'weight': 0.3, 'reject_below': 0.35, 'reject_on_fail': True},
+    'price_range': {'cost': 1.0, 'reject_rate': 0.1, 'weight': 0.2, 'reject_below': 0.25, 'accept_above': 0.8},
+    'semantic_similarity': {'cost': 20.0, 'reject_rate': 0.3, 'weight': 0.3, 'reject_below': 0.4,
+                            'accept_above': 0.9},
+    'llm': {'cost': 1000.0, 'reject_rate': 0.3, 'weight': 0.2},
+}
+
+# Combined score a product needs when the cascade runs to the end
+DEFAULT_ACCEPT_SCORE = 0.6
+
+# Minimum n-gram cosine similarity for the semantic stage to pass
+DEFAULT_SEMANTIC_THRESHOLD = 0.5
+
+_LLM_VERDICT = re.compile(r'\b(yes|no)\b', re.IGNORECASE)
+_LLM_CONFIDENCE = re.compile(r'\b(0(?:\.\d+)?|1(?:\.0+)?)\b')
+
+
 @dataclass
 class ValidationResult:
     """Result of product validation with confidence scoring."""
@@ -39,6 +73,15 @@ class ValidationResult:
     validation_details: Dict[str, Any]
 
 
+# Stage name → method reported on its results
+_STAGE_METHODS = {
+    'brand_model': ValidationMethod.BRAND_MODEL_RECOGNITION,
+    'price_range': ValidationMethod.PRICE_VALIDATION,
+    'semantic_similarity': ValidationMethod.SEMANTIC_SIMILARITY,
+    'llm': ValidationMethod.LLM_VALIDATION,
+}
+
+
 class RealValidator:
     """
     Real implementation of product validator using advanced validation techniques.
@@ -58,15 +101,92 @@ class RealValidator:
         Initialize the real validator with configuration.
         
         Args:
-            config: Validation configuration dictionary
+            config: Pipeline configuration dictionary (the layout of
+                config/phase1_config.yaml). `cascade` (overriding
+                DEFAULT_CASCADE_STAGES and DEFAULT_ACCEPT_SCORE), `semantic` and
+                `price_plausibility` are read from `modules.validator`; the
+                shared `llm` and `fx` sections from the top level
         """
         self.config = config or {}
+        self.settings = self.config.get('modules', {}).get('validator', {})
         self.llm_client = None
         self.ml_models = {}
         self.brand_database = {}
         self.price_ranges = {}
         self._initialize_components()
         
+        cascade = self.settings.get('cascade', {})
+        self.stage_settings = {name: dict(settings) for name, settings in DEFAULT_CASCADE_STAGES.items()}
+        for name, overrides in (cascade.get('stages') or {}).items():
+            if name not in self.stage_settings:
+                raise ValueError(f"Unknown validation stage: {name}")
+            self.stage_settings[name].update(overrides or {})
+        self.accept_score = cascade.get('accept_score', DEFAULT_ACCEPT_SCORE)
+        self.stage_order = self._order_stages(cascade.get('order'))
+        self.stage_functions = {
+            'brand_model': self._validate_brand_model,
+            'price_range': self._validate_price_range,
+            'semantic_similarity': self._validate_semantic_similarity,
+            'llm': self._validate_with_llm,
+        }
+        # Stages that score all undecided products in one call
+        self.batch_stage_functions = {
+            'price_range': self._validate_price_batch,
+            'semantic_similarity': self._validate_semantic_batch,
+            'llm': self._validate_llm_batch,
+        }
+        
+        semantic = self.settings.get('semantic', {})
+        self.similarity = NgramSimilarity.from_config(semantic)
+        self.semantic_threshold = semantic.get('threshold', DEFAULT_SEMANTIC_THRESHOLD)
+        self.reset_stats()
+    
+    def _order_stages(self, order: Optional[List[str]] = None) -> List[str]:
+        """
+        Stage order for the cascade.
+        
+        Args:
+            order: Explicit order from config, or None to order by
+                cost per expected rejection (cost / reject_rate)
+            
+        Returns:
+            List[str]: Stage names, first to run first
+        """
+        if order:
+            unknown = [name for name in order if name not in self.stage_settings]
+            if unknown:
+                raise ValueError(f"Unknown validation stages in cascade order: {unknown}")
+            return list(order)
+        
+        def cost_per_reject(name: str) -> float:
+            settings = self.stage_settings[name]
+            return settings['cost'] / max(settings.get('reject_rate', 0.0), 1e-6)
+        
+        return sorted(self.stage_settings, key=cost_per_reject)
+    
+    def reset_stats(self) -> None:
+        """Reset the per-stage run counters."""
+        self.stats = {
+            'products': 0,
+            'runs': {name: 0 for name in self.stage_order},
+            'early_rejects': {name: 0 for name in self.stage_order},
+            'early_accepts': {name: 0 for name in self.stage_order},
+            'completed': 0,
+        }
+    
+    def cascade_stats(self) -> Dict[str, Any]:
+        """
+        How often each stage ran and ended the cascade.
+        
+        Returns:
+            Dict[str, Any]: Counters plus 'run_rate' (runs / products) per stage
+        """
+        products = self.stats['products']
+        report = {key: dict(value) if isinstance(value, dict) else value for key, value in self.stats.items()}
+        report['run_rate'] = {name: (runs / products if products else 0.0)
+                              for name, runs in self.stats['runs'].items()}
+        return report
+        
     def validate_product(self, query_struct: Dict[str, Any], product_data: Dict[str, Any]) -> ValidationResult:
         """
         Validate if product data matches the query structure.
@@ -78,40 +198,118 @@ class RealValidator:
         Returns:
             ValidationResult with validation outcome and confidence
         """
-        try:
-            # Perform multiple validation methods
-            validation_results = []
-            
-            # Semantic similarity validation
-            semantic_result = self._validate_semantic_similarity(query_struct, product_data)
-            validation_results.append(semantic_result)
-            
-            # Brand and model recognition
-            brand_result = self._validate_brand_model(query_struct, product_data)
-            validation_results.append(brand_result)
-            
-            # Price validation
-            price_result = self._validate_price_range(query_struct, product_data)
-            validation_results.append(price_result)
+        return self.validate_products(query_struct, [product_data])[0]
+    
+    def validate_products(self, query_struct: Dict[str, Any],
+                          products: List[Dict[str, Any]]) -> List[ValidationResult]:
+        """
+        Validate products with the cost-ordered cascade.
+        
+        Stages run one at a time over every product still undecided, so an
+        expensive stage (embeddings, LLM) only sees products the cheap
+        stages could not settle, and sees them together.
+        
+        Args:
+            query_struct: Canonicalized query from QueryNormalizer
+            products: Extracted product data from Extractor
             
-            # LLM-based validation
-            llm_result = self._validate_with_llm(query_struct, product_data)
-            validation_results.append(llm_result)
+        Returns:
+            List[ValidationResult]: Result per product, in input order
+        """
+        results: List[Optional[ValidationResult]] = [None] * len(products)
+        stage_results: List[List[ValidationResult]] = [[] for _ in products]
+        pending = list(range(len(products)))
+        self.stats['products'] += len(products)
+        
+        for stage in self.stage_order:
+            if not pending:
+                break
+            settings = self.stage_settings[stage]
+            self.stats['runs'][stage] += len(pending)
+            stage_outcomes = self._run_stage(stage, query_struct, [products[index] for index in pending])
             
-            # Combine results using weighted scoring
-            final_result = self._combine_validation_results(validation_results)
+            still_pending = []
+            for index, result in zip(pending, stage_outcomes):
+                if isinstance(result, Exception):
+                    # Log error and reject the product
+                    e = result
+                    print(f"Validation failed: {e}")
+                    results[index] = ValidationResult(
+                        is_valid=False,
+                        confidence_score=0.0,
+                        validation_method=ValidationMethod.SEMANTIC_SIMILARITY,
+                        validation_details={"error": str(e), "stage": stage}
+                    )
+                    continue
+                
+                stage_results[index].append(result)
+                exit_kind = self._early_exit(settings, stage_results[index])
+                if exit_kind is None:
+                    still_pending.append(index)
+                    continue
+                
+                self.stats[f'early_{exit_kind}s'][stage] += 1
+                results[index] = self._combine_validation_results(
+                    stage_results[index], exit_kind=exit_kind, decided_by=result
+                )
+            pending = still_pending
+        
+        for index in pending:
+            self.stats['completed'] += 1
+            results[index] = self._combine_validation_results(stage_results[index])
+        return results
+    
+    def _run_stage(self, stage: str, query_struct: Dict[str, Any],
+                   products: List[Dict[str, Any]]) -> List[Any]:
+        """
+        Run one stage over products, in one call if the stage has a batch form.
+        
+        Args:
+            stage: Stage name
+            query_struct: Query structure
+            products: Products still undecided
             
-            return final_result
+        Returns:
+            List[Any]: ValidationResult, or the Exception raised, per product
+        """
+        batch_validate = self.batch_stage_functions.get(stage)
+        if batch_validate is not None:
+            try:
+                return batch_validate(query_struct, products)
+            except Exception:
+                # Fall back to one product at a time to isolate the failure
+                pass
+        
+        validate = self.stage_functions[stage]
+        outcomes = []
+        for product in products:
+            try:
+                outcomes.append(validate(query_struct, product))
+            except Exception as e:
+                outcomes.append(e)
+        return outcomes
+    
+    def _early_exit(self, settings: Dict[str, Any], stage_results: List[ValidationResult]) -> Optional[str]:
+        """
+        Decide whether the latest stage result ends the cascade for a product.
+        
+        Args:
+            settings: Settings of the stage that just ran
+            stage_results: Results so far for the product, latest last
             
-        except Exception as e:
-            # Log error and return default validation result
-            print(f"Validation failed: {e}")
-            return ValidationResult(
-                is_valid=False,
-                confidence_score=0.0,
-                validation_method=ValidationMethod.SEMANTIC_SIMILARITY,
-                validation_details={"error": str(e)}
-            )
+        Returns:
+            Optional[str]: 'reject', 'accept', or None to continue
+        """
+        latest = stage_results[-1]
+        reject_below = settings.get('reject_below')
+        if not latest.is_valid and (settings.get('reject_on_fail') or (
+                reject_below is not None and latest.confidence_score < reject_below)):
+            return 'reject'
+        accept_above = settings.get('accept_above')
+        if (accept_above is not None and latest.confidence_score >= accept_above
+                and all(result.is_valid for result in stage_results)):
+            return 'accept'
+        return None
     
     def _validate_semantic_similarity(self, query_struct: Dict[str, Any], product_data: Dict[str, Any]) -> ValidationResult:
         """
@@ -124,31 +322,34 @@ class RealValidator:
         Returns:
             ValidationResult with semantic similarity score
         """
-        # TODO: Implement semantic similarity validation
-        # from sentence_transformers import SentenceTransformer
-        # model = SentenceTransformer('all-MiniLM-L6-v2')
-        # 
-        # query_text = f"{query_struct.get('brand', '')} {query_struct.get('model', '')} {query_struct.get('storage', '')}"
-        # product_text = product_data.get('productName', '')
-        # 
-        # query_embedding = model.encode(query_text)
-        # product_embedding = model.encode(product_text)
-        # 
-        # similarity = cosine_similarity([query_embedding], [product_embedding])[0][0]
-        # 
-        # return ValidationResult(
-        #     is_valid=similarity > 0.7,
-        #     confidence_score=similarity,
-        #     validation_method=ValidationMethod.SEMANTIC_SIMILARITY,
-        #     validation_details={"similarity_score": similarity}
-        # )
+        return self._validate_semantic_batch(query_struct, [product_data])[0]
+    
+    def _validate_semantic_batch(self, query_struct: Dict[str, Any],
+                                 products: List[Dict[str, Any]]) -> List[ValidationResult]:
+        """
+        Semantic similarity for a batch of products with one sparse matrix product.
         
-        return ValidationResult(
-            is_valid=True,
-            confidence_score=0.8,
-            validation_method=ValidationMethod.SEMANTIC_SIMILARITY,
-            validation_details={"similarity_score": 0.8}
-        )
+        Uses the local hashed character n-gram TF-IDF engine (similarity.py),
+        so it needs no model download, GPU or network.
+        
+        Args:
+            query_struct: Query structure
+            products: Product data
+            
+        Returns:
+            List[ValidationResult]: Similarity result per product
+        """
+        names = [str(product.get('productName') or '') for product in products]
+        similarities = self.similarity.scores(query_text(query_struct), names).tolist()
+        return [
+            ValidationResult(
+                is_valid=similarity >= self.semantic_threshold,
+                confidence_score=round(similarity, 6),
+                validation_method=ValidationMethod.SEMANTIC_SIMILARITY,
+                validation_details={"similarity_score": round(similarity, 6)}
+            )
+            for similarity in similarities
+        ]
     
     def _validate_brand_model(self, query_struct: Dict[str, Any], product_data: Dict[str, Any]) -> ValidationResult:
         """
@@ -159,30 +360,22 @@ class RealValidator:
             product_data: Product data
             
         Returns:
-            ValidationResult with brand/model validation
-        """
-        # TODO: Implement brand and model recognition
-        # query_brand = query_struct.get('brand', '').lower()
-        # query_model = query_struct.get('model', '').lower()
-        # product_name = product_data.get('productName', '').lower()
-        # 
-        # brand_match = query_brand in product_name if query_brand else True
-        # model_match = query_model in product_name if query_model else True
-        # 
-        # confidence = 0.9 if brand_match and model_match else 0.3
-        # 
-        # return ValidationResult(
-        #     is_valid=brand_match and model_match,
-        #     confidence_score=confidence,
-        #     validation_method=ValidationMethod.BRAND_MODEL_RECOGNITION,
-        #     validation_details={"brand_match": brand_match, "model_match": model_match}
-        # )
+            ValidationResult with brand/model validation; confidence runs from
+            0.3 (no query term in the name) to 0.9 (all of them)
+        """
+        product_name = str(product_data.get('productName') or '').lower()
+        matches = {}
+        for field in MATCH_FIELDS:
+            term = (query_struct.get(field) or '').lower()
+            if term:
+                matches[f"{field}_match"] = term in product_name
         
+        fraction = sum(matches.values()) / len(matches) if matches else 1.0
         return ValidationResult(
-            is_valid=True,
-            confidence_score=0.9,
+            is_valid=all(matches.values()),
+            confidence_score=round(0.3 + 0.6 * fraction, 6),
             validation_method=ValidationMethod.BRAND_MODEL_RECOGNITION,
-            validation_details={"brand_match": True, "model_match": True}
+            validation_details=matches
         )
     
     def _validate_price_range(self, query_struct: Dict[str, Any], product_data: Dict[str, Any]) -> ValidationResult:
@@ -196,37 +389,73 @@ class RealValidator:
         Returns:
             ValidationResult with price validation
         """
-        # TODO: Implement price range validation
-        # try:
-        #     price = float(product_data.get('price', '0'))
-        #     category = query_struct.get('category', 'default')
-        #     
-        #     expected_range = self.price_ranges.get(category, (0, float('inf')))
-        #     min_price, max_price = expected_range
-        #     
-        #     is_valid = min_price <= price <= max_price
-        #     confidence = 0.8 if is_valid else 0.2
-        #     
-        #     return ValidationResult(
-        #         is_valid=is_valid,
-        #         confidence_score=confidence,
-        #         validation_method=ValidationMethod.PRICE_VALIDATION,
-        #         validation_details={"price": price, "expected_range": expected_range}
-        #     )
-        # except (ValueError, TypeError):
-        #     return ValidationResult(
-        #         is_valid=False,
-        #         confidence_score=0.0,
-        #         validation_method=ValidationMethod.PRICE_VALIDATION,
-        #         validation_details={"error": "Invalid price format"}
-        #     )
+        return self._validate_price_batch(query_struct, [product_data])[0]
+    
+    def _validate_price_batch(self, query_struct: Dict[str, Any],
+                              products: List[Dict[str, Any]]) -> List[ValidationResult]:
+        """
+        Validate prices in one vectorized pass.
         
-        return ValidationResult(
-            is_valid=True,
-            confidence_score=0.8,
-            validation_method=ValidationMethod.PRICE_VALIDATION,
-            validation_details={"price": 999, "expected_range": (500, 1500)}
+        Prices are converted to the FX base currency, checked against the
+        category band, and compared with the median of the same canonical
+        product (robust z-score on the MAD).
+        
+        Args:
+            query_struct: Query structure
+            products: Product data
+            
+        Returns:
+            List[ValidationResult]: Price verdict per product
+        """
+        assessment = self.price_plausibility.assess(
+            products, category=query_struct.get('category'), country=query_struct.get('country')
         )
+        results = []
+        for row in range(len(products)):
+            price = assessment.price[row]
+            if np.isnan(price):
+                results.append(ValidationResult(
+                    is_valid=False,
+                    confidence_score=0.0,
+                    validation_method=ValidationMethod.PRICE_VALIDATION,
+                    validation_details={"error": "Invalid price format"}
+                ))
+                continue
+            
+            details = {
+                "price": float(price),
+                "currency": assessment.currency[row],
+                "expected_range": assessment.band,
+            }
+            base_price = assessment.base_price[row]
+            if np.isnan(base_price):
+                # No FX rate for the currency: no opinion on the price
+                details["error"] = f"No FX rate for {assessment.currency[row]}"
+                results.append(ValidationResult(
+                    is_valid=True,
+                    confidence_score=0.5,
+                    validation_method=ValidationMethod.PRICE_VALIDATION,
+                    validation_details=details
+                ))
+                continue
+            
+            details["base_price"] = round(float(base_price), 2)
+            if not np.isnan(assessment.median[row]):
+                details["product_median"] = round(float(assessment.median[row]), 2)
+                details["robust_z"] = round(float(assessment.robust_z[row]), 3)
+            if assessment.outlier[row]:
+                details["outlier"] = True
+                is_valid, confidence = False, 0.1
+            else:
+                is_valid = bool(assessment.in_band[row])
+                confidence = 0.8 if is_valid else 0.2
+            results.append(ValidationResult(
+                is_valid=is_valid,
+                confidence_score=confidence,
+                validation_method=ValidationMethod.PRICE_VALIDATION,
+                validation_details=details
+            ))
+        return results
     
     def _validate_with_llm(self, query_struct: Dict[str, Any], product_data: Dict[str, Any]) -> ValidationResult:
         """
@@ -239,94 +468,139 @@ class RealValidator:
         Returns:
             ValidationResult with LLM validation
         """
-        # TODO: Implement LLM-based validation
-        # if not self.llm_client:
-        #     return ValidationResult(
-        #         is_valid=True,
-        #         confidence_score=0.5,
-        #         validation_method=ValidationMethod.LLM_VALIDATION,
-        #         validation_details={"error": "LLM client not available"}
-        #     )
-        # 
-        # prompt = f"""
-        # Query: {query_struct}
-        # Product: {product_data}
-        # 
-        # Does this product match the query? Answer with yes/no and confidence (0-1).
-        # """
-        # 
-        # response = self.llm_client.generate(prompt)
-        # # Parse response to extract validation result
-        # 
-        # return ValidationResult(
-        #     is_valid=response.is_match,
-        #     confidence_score=response.confidence,
-        #     validation_method=ValidationMethod.LLM_VALIDATION,
-        #     validation_details={"llm_response": response.text}
-        # )
+        return self._validate_llm_batch(query_struct, [product_data])[0]
+    
+    def _validate_llm_batch(self, query_struct: Dict[str, Any],
+                            products: List[Dict[str, Any]]) -> List[ValidationResult]:
+        """
+        Validate products with one LLM prompt each through the shared client.
         
-        return ValidationResult(
-            is_valid=True,
-            confidence_score=0.85,
-            validation_method=ValidationMethod.LLM_VALIDATION,
-            validation_details={"llm_response": "Mock LLM validation"}
+        All prompts are queued at once, so the client sends them in as few
+        requests as its batch size allows and answers repeats from its cache.
+        Without a client (no `llm` config section) every product gets the
+        mock verdict.
+        
+        Args:
+            query_struct: Query structure
+            products: Product data
+            
+        Returns:
+            List[ValidationResult]: LLM verdict per product
+        """
+        if not self.llm_client:
+            return [ValidationResult(
+                is_valid=True,
+                confidence_score=0.85,
+                validation_method=ValidationMethod.LLM_VALIDATION,
+                validation_details={"llm_response": "Mock LLM validation"}
+            ) for _ in products]
+        
+        futures = [self.llm_client.submit(self._llm_prompt(query_struct, product)) for product in products]
+        results = []
+        for future in futures:
+            try:
+                response = future.result()
+            except Exception as e:
+                # Budget exhausted or server unavailable: no opinion
+                results.append(ValidationResult(
+                    is_valid=True,
+                    confidence_score=0.5,
+                    validation_method=ValidationMethod.LLM_VALIDATION,
+                    validation_details={"error": str(e)}
+                ))
+                continue
+            is_match, confidence = self._parse_llm_verdict(response.text)
+            results.append(ValidationResult(
+                is_valid=is_match,
+                confidence_score=confidence,
+                validation_method=ValidationMethod.LLM_VALIDATION,
+                validation_details={"llm_response": response.text, "cached": response.cached}
+            ))
+        return results
+    
+    def _llm_prompt(self, query_struct: Dict[str, Any], product_data: Dict[str, Any]) -> str:
+        """
+        Prompt asking whether a product matches the query.
+        
+        Only the fields that decide the match go in, so products with the
+        same name and price share a cached answer.
+        """
+        return (
+            f"Query: {query_text(query_struct, MATCH_FIELDS)}\n"
+            f"Product: {product_data.get('productName', '')} "
+            f"({product_data.get('price', '')} {product_data.get('currency', '')})\n\n"
+            "Does this product match the query? Answer with yes/no and confidence (0-1)."
         )
     
-    def _combine_validation_results(self, results: List[ValidationResult]) -> ValidationResult:
+    def _parse_llm_verdict(self, text: str) -> Tuple[bool, float]:
         """
-        Combine multiple validation results using weighted scoring.
+        Parse a yes/no answer and optional confidence from an LLM response.
         
         Args:
-            results: List of validation results
+            text: Response text
+            
+        Returns:
+            Tuple[bool, float]: Match verdict and confidence; (True, 0.5)
+                when the response has no yes/no
+        """
+        verdict = _LLM_VERDICT.search(text)
+        if not verdict:
+            return True, 0.5
+        confidence = _LLM_CONFIDENCE.search(text[verdict.end():])
+        return verdict.group(1).lower() == 'yes', float(confidence.group(1)) if confidence else 0.8
+    
+    def _combine_validation_results(self, results: List[ValidationResult], exit_kind: Optional[str] = None,
+                                    decided_by: Optional[ValidationResult] = None) -> ValidationResult:
+        """
+        Combine the stage results of one product using weighted scoring.
+        
+        Args:
+            results: Results of the stages that ran, in run order
+            exit_kind: 'reject' or 'accept' if a stage ended the cascade early
+            decided_by: The stage result that ended the cascade early
             
         Returns:
             Combined validation result
         """
-        # TODO: Implement weighted combination logic
-        # weights = {
-        #     ValidationMethod.SEMANTIC_SIMILARITY: 0.3,
-        #     ValidationMethod.BRAND_MODEL_RECOGNITION: 0.3,
-        #     ValidationMethod.PRICE_VALIDATION: 0.2,
-        #     ValidationMethod.LLM_VALIDATION: 0.2
-        # }
-        # 
-        # total_score = 0
-        # total_weight = 0
-        # all_valid = True
-        # 
-        # for result in results:
-        #     weight = weights.get(result.validation_method, 0.1)
-        #     total_score += result.confidence_score * weight
-        #     total_weight += weight
-        #     all_valid = all_valid and result.is_valid
-        # 
-        # final_confidence = total_score / total_weight if total_weight > 0 else 0
-        # 
-        # return ValidationResult(
-        #     is_valid=all_valid and final_confidence > 0.6,
-        #     confidence_score=final_confidence,
-        #     validation_method=ValidationMethod.SEMANTIC_SIMILARITY,
-        #     validation_details={"combined_scores": {r.validation_method.value: r.confidence_score for r in results}}
-        # )
+        weights = {method: self.stage_settings[name]['weight'] for name, method in _STAGE_METHODS.items()}
+        total_score = 0.0
+        total_weight = 0.0
+        for result in results:
+            weight = weights.get(result.validation_method, 0.1)
+            total_score += result.confidence_score * weight
+            total_weight += weight
+        final_confidence = total_score / total_weight if total_weight > 0 else 0.0
+        
+        if exit_kind is not None:
+            is_valid = exit_kind == 'accept'
+            method = decided_by.validation_method
+        else:
+            # Every stage that ran must pass; a failed cheap stage is not outvoted by later ones
+            is_valid = (bool(results) and all(result.is_valid for result in results)
+                        and final_confidence >= self.accept_score)
+            method = results[-1].validation_method if results else ValidationMethod.SEMANTIC_SIMILARITY
         
         return ValidationResult(
-            is_valid=True,
-            confidence_score=0.85,
-            validation_method=ValidationMethod.SEMANTIC_SIMILARITY,
-            validation_details={"combined_scores": {"mock": 0.85}}
+            is_valid=is_valid,
+            confidence_score=round(final_confidence, 6),
+            validation_method=method,
+            validation_details={
+                "combined_scores": {r.validation_method.value: r.confidence_score for r in results},
+                "stages_run": [r.validation_method.value for r in results],
+                "exit": exit_kind or "complete",
+            }
         )
     
     def _initialize_components(self):
         """
         Initialize validation components (LLM, ML models, databases).
         """
-        # TODO: Initialize LLM client, ML models, and databases
-        self.price_ranges = {
-            "smartphone": (200, 2000),
-            "laptop": (500, 5000),
-            "tablet": (200, 1500),
-            "default": (0, float('inf'))
-        }
+        # TODO: Initialize ML models and databases
+        # `llm` and `fx` are shared with other modules, so they live at the top level
+        self.llm_client = shared_client(self.config.get('llm'))
+        self.fx = FxTable.from_config(self.config.get('fx'))
+        self.price_plausibility = PricePlausibility.from_config(self.settings.get('price_plausibility'), fx=self.fx)
+        self.price_ranges = self.price_plausibility.price_ranges
 
 
 # Example usage for future implementation:
@@ -348,5 +622,7 @@ product_data = {
 
 result = validator.validate_product(query_struct, product_data)
 print(f"Valid: {result.is_valid}, Confidence: {result.confidence_score}")
-# Output: Valid: True, Confidence: 0.85
+# Output: Valid: True, Confidence: 0.86 (accepted after brand/model and price)
+print(validator.cascade_stats()['run_rate'])
+# Output: {'brand_model': 1.0, 'price_range': 1.0, 'semantic_similarity': 0.0, 'llm': 0.0}
 """
@@ -0,0 +1,230 @@
+"""
+Offline semantic similarity for validation: hashed character n-gram TF-IDF.
+
+Names are lowercased, reduced to alphanumeric words and cut into character
+n-grams (word boundaries included), which are hashed into a fixed-size
+feature space. No model download, GPU or network is needed.
+
+Each distinct name is vectorized once and kept in an LRU cache as a sparse
+(feature ids, counts) pair. Scoring one query against a batch of names is a
+single sparse matrix-vector product (np.bincount over the batch's non-zeros),
+so the cost is proportional to the batch's total n-gram count.
+"""
+
+import re
+import zlib
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+_WORD_PATTERN = re.compile(r'[a-z0-9]+')
+
+SparseVector = Tuple[np.ndarray, np.ndarray]
+
+
+class NgramSimilarity:
+    """
+    NgramSimilarity scores product names against a query by cosine similarity
+    of hashed character n-gram TF-IDF vectors.
+
+    IDF comes from a corpus passed to fit(); without one, document
+    frequencies are taken from the batch being scored.
+    """
+
+    def __init__(self, ngram_sizes: Sequence[int] = (3, 4), dim: int = 2 ** 18,
+                 use_idf: bool = True, cache_size: int = 50000):
+        """
+        Initialize the engine.
+
+        Args:
+            ngram_sizes: Character n-gram lengths to extract
+            dim: Size of the hashed feature space
+            use_idf: Weight n-grams by inverse document frequency
+            cache_size: Maximum number of names whose vectors are cached
+        """
+        if not ngram_sizes or min(ngram_sizes) < 1:
+            raise ValueError(f"ngram_sizes must be positive, got {ngram_sizes}")
+        self.ngram_sizes = tuple(ngram_sizes)
+        self.dim = dim
+        self.use_idf = use_idf
+        self.cache_size = cache_size
+        self.idf: Optional[np.ndarray] = None
+        self._cache: 'OrderedDict[str, SparseVector]' = OrderedDict()
+        self._gram_ids: dict = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    @classmethod
+    def from_config(cls, config: Optional[dict]) -> 'NgramSimilarity':
+        """
+        Build an engine from a `semantic` config section.
+
+        Args:
+            config: Section with ngram_sizes/dim/use_idf/cache_size keys, or None
+
+        Returns:
+            NgramSimilarity: Engine with defaults for missing keys
+        """
+        config = config or {}
+        return cls(
+            ngram_sizes=tuple(config.get('ngram_sizes', (3, 4))),
+            dim=config.get('dim', 2 ** 18),
+            use_idf=config.get('use_idf', True),
+            cache_size=config.get('cache_size', 50000)
+        )
+
+    def vector(self, text: str) -> SparseVector:
+        """
+        Sparse term-frequency vector of a text (cached per text).
+
+        Args:
+            text: Product name or query
+
+        Returns:
+            SparseVector: (sorted unique feature ids, float32 counts)
+        """
+        cached = self._cache.get(text)
+        if cached is not None:
+            self.cache_hits += 1
+            self._cache.move_to_end(text)
+            return cached
+
+        self.cache_misses += 1
+        padded = ' ' + ' '.join(_WORD_PATTERN.findall(text.lower())) + ' '
+        grams = [padded[i:i + size] for size in self.ngram_sizes for i in range(len(padded) - size + 1)]
+        # n-grams repeat across names far more than names do, so their
+        # feature ids are memoized too (bounded like the vector cache)
+        gram_ids = self._gram_ids
+        if len(gram_ids) > 4 * self.cache_size:
+            gram_ids.clear()
+        features = []
+        for gram in grams:
+            feature = gram_ids.get(gram)
+            if feature is None:
+                feature = gram_ids[gram] = zlib.crc32(gram.encode('utf-8')) % self.dim
+            features.append(feature)
+        ids, counts = np.unique(np.array(features, dtype=np.int64), return_counts=True)
+        vector = (ids, counts.astype(np.float32))
+
+        self._cache[text] = vector
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return vector
+
+    def fit(self, corpus: Iterable[str]) -> 'NgramSimilarity':
+        """
+        Learn IDF weights from a corpus of product names.
+
+        Args:
+            corpus: Names (e.g. a catalog's product names)
+
+        Returns:
+            NgramSimilarity: self
+        """
+        document_frequency = np.zeros(self.dim, dtype=np.int64)
+        documents = 0
+        for text in corpus:
+            ids, _ = self.vector(text)
+            document_frequency[ids] += 1
+            documents += 1
+        self.idf = (np.log((1 + documents) / (1 + document_frequency)) + 1).astype(np.float32)
+        return self
+
+    def scores(self, query: str, names: Sequence[str]) -> np.ndarray:
+        """
+        Cosine similarity of a query to every name.
+
+        Args:
+            query: Query text
+            names: Product names (repeats are vectorized once)
+
+        Returns:
+            np.ndarray: float32 similarity in [0, 1] per name (0 for names
+                or queries without any n-gram)
+        """
+        if not len(names):
+            return np.zeros(0, dtype=np.float32)
+
+        distinct: dict = {}
+        codes = np.fromiter((distinct.setdefault(name, len(distinct)) for name in names),
+                            dtype=np.int64, count=len(names))
+        vectors = [self.vector(name) for name in distinct]
+        lengths = np.fromiter((len(ids) for ids, _ in vectors), dtype=np.int64, count=len(vectors))
+        rows = np.repeat(np.arange(len(vectors)), lengths)
+        ids = np.concatenate([ids for ids, _ in vectors]) if len(vectors) else np.zeros(0, dtype=np.int64)
+        weights = np.concatenate([tf for _, tf in vectors]) if len(vectors) else np.zeros(0, dtype=np.float32)
+        query_ids, query_weights = self.vector(query)
+
+        if self.use_idf:
+            idf_names, idf_query = self._idf(ids, query_ids, len(vectors))
+            weights = weights * idf_names
+            query_weights = query_weights * idf_query
+
+        # Sparse matrix-vector product: weight of each name feature times the
+        # query's weight for the same feature, summed per name
+        position = np.minimum(np.searchsorted(query_ids, ids), max(len(query_ids) - 1, 0))
+        shared = (query_ids[position] == ids) if len(query_ids) else np.zeros(len(ids), dtype=bool)
+        dots = np.bincount(rows[shared], weights=weights[shared] * query_weights[position[shared]],
+                           minlength=len(vectors))
+        norms = np.sqrt(np.bincount(rows, weights=weights * weights, minlength=len(vectors)))
+        query_norm = float(np.sqrt(np.dot(query_weights, query_weights)))
+
+        denominator = norms * query_norm
+        similarity = np.divide(dots, denominator, out=np.zeros(len(vectors)), where=denominator > 0)
+        return np.clip(similarity, 0.0, 1.0).astype(np.float32)[codes]
+
+    def score(self, query: str, name: str) -> float:
+        """
+        Cosine similarity of a query to one name.
+
+        Args:
+            query: Query text
+            name: Product name
+
+        Returns:
+            float: Similarity in [0, 1]
+        """
+        return float(self.scores(query, [name])[0])
+
+    def _idf(self, ids: np.ndarray, query_ids: np.ndarray, documents: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        IDF weights for the batch features and the query features.
+
+        Uses the fitted table if there is one, else document frequencies
+        among the batch names.
+        """
+        if self.idf is not None:
+            return self.idf[ids], self.idf[query_ids]
+
+        features, inverse, frequency = np.unique(ids, return_inverse=True, return_counts=True)
+        idf = (np.log((1 + documents) / (1 + frequency)) + 1).astype(np.float32)
+        position = np.minimum(np.searchsorted(features, query_ids), max(len(features) - 1, 0))
+        found = (features[position] == query_ids) if len(features) else np.zeros(len(query_ids), dtype=bool)
+        query_idf = np.where(found, idf[position] if len(features) else 0.0,
+                             np.float32(np.log(1 + documents) + 1)).astype(np.float32)
+        return idf[inverse.reshape(-1)], query_idf
+
+    def cache_info(self) -> dict:
+        """
+        Vector cache statistics.
+
+        Returns:
+            dict: hits, misses and current size
+        """
+        return {'hits': self.cache_hits, 'misses': self.cache_misses, 'size': len(self._cache)}
+
+
+def query_text(query_struct: dict, fields: List[str] = ('brand', 'model', 'storage')) -> str:
+    """
+    Text of a normalized query for similarity scoring.
+
+    Args:
+        query_struct: Normalized query
+        fields: Query fields to join
+
+    Returns:
+        str: Non-empty field values joined by spaces
+    """
+    return ' '.join(str(query_struct[field]) for field in fields if query_struct.get(field))
@@ -7,6 +7,7 @@ Provides a user-friendly web interface for searching and comparing product price
 import streamlit as st
 import pandas as pd
 from src.orchestrator.interface import Orchestrator
+from src.extractor.price_parser import price_amount
 import os
 from pathlib import Path
 
@@ -30,12 +31,11 @@ st.set_page_config(
 @st.cache_resource
 def get_orchestrator_cached(_use_mock_normalizer=True):
     """Initialize and cache the orchestrator with dynamic configuration."""
-    import yaml
+    from src.config.loader import load_config
     
-    # Load base configuration
+    # Load base configuration (a fresh copy, so the override below stays local)
     config_path = os.path.join("config", "phase1_config.yaml")
-    with open(config_path, 'r') as f:
-        config = yaml.safe_load(f)
+    config = load_config(config_path)
     
     # Override the query normalizer setting
     config['modules']['query_normalizer']['use_mock'] = _use_mock_normalizer
@@ -57,7 +57,7 @@ def create_clickable_link(url, text):
     """Create a clickable link for Streamlit."""
     return f"[{text}]({url})"
 
-def show_normalization_comparison(query, current_use_mock):
+def show_normalization_comparison(query, current_use_mock, country="US"):
     """Show comparison between mock and real query normalization."""
     with st.expander("🔍 Query Normalization Comparison", expanded=False):
         st.markdown("**Compare how different modes process your query:**")
@@ -68,8 +68,9 @@ def show_normalization_comparison(query, current_use_mock):
         mock_orchestrator = get_orchestrator_cached(True)
         real_orchestrator = get_orchestrator_cached(False)
         
-        mock_result = mock_orchestrator.query_normalizer.normalize(query)
-        real_result = real_orchestrator.query_normalizer.normalize(query)
+        # Memoized per (query, country): reruns and the pipeline run share results
+        mock_result = mock_orchestrator.query_normalizer.normalize(query, country)
+        real_result = real_orchestrator.query_normalizer.normalize(query, country)
         
         with col1:
             st.markdown("**🎭 Mock Mode Result**")
@@ -675,6 +676,13 @@ def show_price_search(example_choice=None):
             placeholder="e.g., iPhone 16 Pro, 128GB or MacBook Pro",
             help="Enter the product name, model, and any specifications"
         )
+        
+        # Suggest canonical queries (they are the ones most likely cached)
+        if query.strip():
+            suggestions = get_orchestrator_cached(st.session_state.get('use_mock_normalizer', True)) \
+                .query_normalizer.complete(query, 5)
+            if suggestions:
+                st.caption("💡 Suggestions: " + " · ".join(s['query'] for s in suggestions))
     
     with col2:
         country = st.selectbox(
@@ -708,7 +716,7 @@ def show_price_search(example_choice=None):
                 results = orchestrator.run({"query": query, "country": country})
                 
                 # Show query normalization comparison
-                show_normalization_comparison(query, use_mock_normalizer)
+                show_normalization_comparison(query, use_mock_normalizer, country)
                 
                 # Display results
                 if results:
@@ -760,7 +768,7 @@ def show_price_search(example_choice=None):
                     
                     # Additional insights
                     if len(results) > 1:
-                        prices = [float(p.get("price", 0)) for p in results]
+                        prices = [price_amount(p) or 0.0 for p in results]
                         min_price = min(prices)
                         max_price = max(prices)
                         price_diff = max_price - min_price
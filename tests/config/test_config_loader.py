@@ -0,0 +1,99 @@
+"""
+Tests for config loading through compiled snapshots.
+"""
+
+import sys
+import os
+import glob
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.config import loader
+from src.config.loader import DISABLE_ENV, load_config, snapshot_path
+
+
+class TestConfigLoader:
+    """Test class for load_config."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        loader._loaded.clear()
+        self.parses = 0
+        self.parse = loader._parse
+
+    def teardown_method(self):
+        """Restore the parser."""
+        loader._parse = self.parse
+
+    def count_parses(self):
+        def parse(raw):
+            self.parses += 1
+            return self.parse(raw)
+        loader._parse = parse
+
+    def write(self, path, text):
+        path.write_text(text, encoding='utf-8')
+        return str(path)
+
+    def test_snapshot_reused(self, tmp_path):
+        """The YAML is parsed once; later loads (and other processes) use the snapshot."""
+        path = self.write(tmp_path / "config.yaml", "modules:\n  ranker:\n    use_mock: true\n")
+        self.count_parses()
+        assert load_config(path) == {'modules': {'ranker': {'use_mock': True}}}
+        loader._loaded.clear()
+        assert load_config(path) == {'modules': {'ranker': {'use_mock': True}}}
+        assert self.parses == 1
+        assert len(glob.glob(str(tmp_path / "__pycache__" / "config.yaml.*.pickle"))) == 1
+
+    def test_edit_invalidates(self, tmp_path):
+        """A changed file is parsed again, even with the same mtime; old snapshots go."""
+        path = self.write(tmp_path / "config.yaml", "value: 1\n")
+        load_config(path)
+        stat = os.stat(path)
+        self.write(tmp_path / "config.yaml", "value: 2\n")
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        assert load_config(path) == {'value': 2}
+        assert len(glob.glob(str(tmp_path / "__pycache__" / "config.yaml.*.pickle"))) == 1
+
+    def test_fresh_objects(self, tmp_path):
+        """Changing a loaded config does not change the next load."""
+        path = self.write(tmp_path / "config.yaml", "modules:\n  query_normalizer:\n    use_mock: true\n")
+        load_config(path)['modules']['query_normalizer']['use_mock'] = False
+        assert load_config(path)['modules']['query_normalizer']['use_mock'] is True
+
+    def test_corrupt_snapshot(self, tmp_path):
+        """An unreadable snapshot falls back to parsing and is rewritten."""
+        path = self.write(tmp_path / "config.yaml", "value: 3\n")
+        load_config(path)
+        snapshot = glob.glob(str(tmp_path / "__pycache__" / "*.pickle"))[0]
+        with open(snapshot, 'wb') as handle:
+            handle.write(b"not a pickle")
+        loader._loaded.clear()
+        assert load_config(path) == {'value': 3}
+        loader._loaded.clear()
+        assert load_config(path) == {'value': 3}
+
+    def test_disabled(self, tmp_path, monkeypatch):
+        """With the environment switch set, the YAML is always parsed and nothing is written."""
+        monkeypatch.setenv(DISABLE_ENV, '1')
+        path = self.write(tmp_path / "config.yaml", "value: 4\n")
+        self.count_parses()
+        load_config(path)
+        load_config(path)
+        assert self.parses == 2
+        assert not os.path.exists(tmp_path / "__pycache__")
+
+    def test_errors(self, tmp_path):
+        """Missing files and invalid YAML raise as before."""
+        with pytest.raises(OSError):
+            load_config(str(tmp_path / "missing.yaml"))
+        import yaml
+        with pytest.raises(yaml.YAMLError):
+            load_config(self.write(tmp_path / "bad.yaml", "key: [unclosed\n"))
+
+    def test_snapshot_path(self):
+        """Snapshots sit in __pycache__ next to the config, named by content hash."""
+        assert snapshot_path("config/phase1_config.yaml", "ab12") == os.path.join(
+            os.path.abspath("config"), "__pycache__", "phase1_config.yaml.ab12.pickle")
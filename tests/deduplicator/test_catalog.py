@@ -0,0 +1,106 @@
+"""
+Tests for the persistent canonical catalog (incremental deduplication).
+"""
+
+import sys
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.deduplicator.catalog import CanonicalCatalog
+from src.deduplicator.interface import Deduplicator
+from src.deduplicator.near_duplicate import NearDuplicateEngine
+
+
+FIRST_RUN = [
+    {"productName": "Apple iPhone 16 Pro 128GB - Silver", "price": "999", "currency": "USD"},
+    {"productName": "Samsung Galaxy S24 256GB Black", "price": "799", "currency": "USD"},
+    {"productName": "Acme desk lamp with usb charger", "price": "25", "currency": "USD"},
+]
+
+SECOND_RUN = [
+    {"productName": "iPhone 16 Pro (128 GB) Silver by Apple", "price": "989", "currency": "USD"},
+    {"productName": "Acme desk lamp, with USB charger", "price": "24", "currency": "USD"},
+    {"productName": "Samsung Galaxy S24 256GB Black", "price": "779", "currency": "USD"},
+    {"productName": "Acme floor lamp", "price": "60", "currency": "USD"},
+]
+
+
+class TestCanonicalCatalog:
+    """Test class for CanonicalCatalog."""
+
+    def test_ids_stable_across_runs(self, tmp_path):
+        """Products seen in an earlier run keep their id after reopening the catalog."""
+        path = str(tmp_path / "catalog.sqlite")
+        catalog = CanonicalCatalog(path)
+        first = catalog.assign(FIRST_RUN)
+        assert len(set(first)) == 3
+        assert catalog.stats()['last_run']['new_products'] == 3
+        catalog.close()
+
+        catalog = CanonicalCatalog(path)
+        second = catalog.assign(SECOND_RUN)
+        # Renamed iPhone (blocking key), punctuation variant (LSH), exact name
+        assert second[:3] == [first[0], first[2], first[1]]
+        assert second[3] not in first
+        stats = catalog.stats()
+        assert stats['last_run'] == {'listings': 4, 'names_known': 1, 'matched': 3, 'new_products': 1}
+        assert stats['products'] == 4
+        assert catalog.lookup_name("Acme desk lamp, with USB charger") == first[2]
+        catalog.close()
+
+    def test_known_names_win_over_new_evidence(self):
+        """Once stored, a name's id is never reassigned."""
+        catalog = CanonicalCatalog()
+        original = catalog.assign([{"productName": "Acme desk lamp"}])[0]
+        # Same name now arrives with a GTIN that no stored product has
+        again = catalog.assign([{"productName": "Acme desk lamp", "gtin": "195949773389"}])[0]
+        assert again == original
+        # ... and the GTIN now points at it as well
+        assert catalog.assign([{"productName": "Lamp", "gtin": "0195949773389"}])[0] == original
+
+    def test_settings_mismatch(self, tmp_path):
+        """A catalog refuses signatures computed with different MinHash settings."""
+        path = str(tmp_path / "catalog.sqlite")
+        CanonicalCatalog(path).close()
+        with pytest.raises(ValueError):
+            CanonicalCatalog(path, engine=NearDuplicateEngine(num_perm=32, bands=4))
+
+    def test_empty_run(self):
+        """An empty run assigns nothing."""
+        catalog = CanonicalCatalog()
+        assert catalog.assign([]) == []
+        assert catalog.stats()['products'] == 0
+
+    def test_concurrent_upserts(self, tmp_path):
+        """Threads sharing a catalog agree on ids and never create a product twice."""
+        catalog = CanonicalCatalog(str(tmp_path / "catalog.sqlite"))
+        runs = [[dict(p) for p in (FIRST_RUN if index % 2 else SECOND_RUN)] for index in range(16)]
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            annotated = list(pool.map(catalog.annotate, runs))
+
+        ids = {p['productName']: p['canonical_id'] for run in annotated for p in run}
+        for run in annotated:
+            assert all(ids[p['productName']] == p['canonical_id'] for p in run)
+        assert catalog.lookup_name("Samsung Galaxy S24 256GB Black") == ids["Samsung Galaxy S24 256GB Black"]
+        assert catalog.stats()['products'] == len(set(ids.values()))
+        catalog.close()
+
+
+class TestDeduplicatorCatalog:
+    """Test class for the catalog inside the Deduplicator."""
+
+    def test_catalog_ids_on_output(self, tmp_path):
+        """Deduplicated products carry the catalog's canonical ids."""
+        config = {'modules': {'deduplicator': {
+            'use_mock': True,
+            'catalog': {'enabled': True, 'path': str(tmp_path / "catalog.sqlite")},
+        }}}
+        deduplicator = Deduplicator(config)
+        first = deduplicator.deduplicate([dict(p) for p in FIRST_RUN])
+        second = deduplicator.deduplicate([dict(p) for p in SECOND_RUN])
+        assert second[0]['canonical_id'] == first[0]['canonical_id']
+        assert deduplicator.catalog.stats()['products'] == 4
@@ -0,0 +1,123 @@
+"""
+Tests for blocking-key identity resolution (canonical product ids).
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.deduplicator.identity import IdentityResolver, merge_labels, normalize_gtin
+from src.deduplicator.interface import Deduplicator, RealDeduplicator
+from src.models.product import source_view
+from src.models.product_batch import ProductBatch
+
+
+LISTINGS = [
+    {"productName": "Apple iPhone 16 Pro 128GB - Silver", "price": "999", "currency": "USD",
+     "link": "https://bestbuy.com/iphone16pro", "site": "bestbuy.com"},
+    {"productName": "iPhone 16 Pro (128 GB) Silver by Apple", "price": "1009", "currency": "USD",
+     "link": "https://www.amazon.com/dp/B0DGHYDZR9?th=1", "site": "amazon.com"},
+    {"productName": "Apple iPhone 16 Pro 256GB - Silver", "price": "1099", "currency": "USD",
+     "link": "https://bestbuy.com/iphone16pro-256", "site": "bestbuy.com"},
+    {"productName": "Refurbished phone, silver", "price": "499", "currency": "USD",
+     "link": "https://walmart.com/p/1", "gtin": "195949773389", "site": "walmart.com"},
+    {"productName": "iPhone Sixteen Pro silver edition", "price": "989", "currency": "USD",
+     "link": "https://walmart.com/p/2", "ean": "0195949773389", "site": "walmart.com"},
+]
+
+
+class TestIdentityResolver:
+    """Test class for IdentityResolver."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.resolver = IdentityResolver()
+
+    def test_gtin_normalization(self):
+        """GTIN-12/13/14 forms normalize to the same 14 digits; bad check digits are rejected."""
+        assert normalize_gtin("195949773389") == "00195949773389"
+        assert normalize_gtin("0195949773389") == "00195949773389"
+        assert normalize_gtin("0-195949-773389") == "00195949773389"
+        assert normalize_gtin("195949773388") is None
+        assert normalize_gtin("ABC") is None
+
+    def test_blocking_keys(self):
+        """Identifiers come from fields and links; attributes from the normalized name."""
+        keys = self.resolver.blocking_keys(LISTINGS[1])
+        assert keys[0] == "asin:B0DGHYDZR9"
+        assert keys[1].startswith("attrs:apple|iphone 16 pro|128gb|silver")
+        assert self.resolver.blocking_keys(LISTINGS[3]) == ["gtin:00195949773389"]
+        # MPNs only count together with a recognized brand
+        keys = self.resolver.blocking_keys({"productName": "Galaxy S24 256GB", "mpn": "SM-S921B"})
+        assert "mpn:samsung|SMS921B" in keys
+        assert self.resolver.blocking_keys({"productName": "Widget", "mpn": "X-1"}) == ["name:widget"]
+
+    def test_cross_site_grouping(self):
+        """Same product on different sites shares an id; other variants do not."""
+        ids = self.resolver.resolve(LISTINGS)
+        assert ids[0] == ids[1]
+        assert ids[2] != ids[0]
+        assert ids[3] == ids[4]
+        assert all(canonical_id.startswith("cp_") and len(canonical_id) == 19 for canonical_id in ids)
+
+        groups = self.resolver.index(LISTINGS)
+        assert groups[ids[0]] == [0, 1]
+        assert groups[ids[3]] == [3, 4]
+
+    def test_ids_are_stable(self):
+        """Ids do not depend on listing order or on which other listings are present."""
+        ids = self.resolver.resolve(LISTINGS)
+        reversed_ids = self.resolver.resolve(list(reversed(LISTINGS)))
+        assert reversed_ids == list(reversed(ids))
+        assert IdentityResolver().resolve([LISTINGS[0]]) == [ids[0]]
+
+    def test_annotate(self):
+        """annotate sets canonical_id on each product; it is a derived field."""
+        products = [dict(LISTINGS[0]), dict(LISTINGS[1])]
+        self.resolver.annotate(products)
+        assert products[0]["canonical_id"] == products[1]["canonical_id"]
+        assert source_view(products[0]) == LISTINGS[0]
+
+    def test_merge_labels(self):
+        """Rows sharing a label in any labeling are merged."""
+        labels = merge_labels([0, 0, 1, 2, 3], ["a", "b", "b", "c", "d"])
+        assert labels.tolist() == [0, 0, 0, 3, 4]
+
+
+class TestDeduplicatorIdentity:
+    """Test class for identity resolution inside the Deduplicator."""
+
+    def test_same_product_same_price_collapses(self):
+        """Differently named listings of one product at one price are duplicates."""
+        config = {'modules': {'deduplicator': {'use_mock': True, 'identity': {'enabled': True}}}}
+        deduplicator = Deduplicator(config)
+        products = [
+            {"productName": "Apple iPhone 16 Pro 128GB - Silver", "price": "999", "currency": "USD"},
+            {"productName": "iPhone 16 Pro (128 GB) Silver by Apple", "price": "999", "currency": "USD"},
+            {"productName": "iPhone 16 Pro (128 GB) Silver by Apple", "price": "1009", "currency": "USD"},
+        ]
+        unique = deduplicator.deduplicate(products)
+        assert [p["price"] for p in unique] == ["999", "1009"]
+        assert unique[0]["canonical_id"] == unique[1]["canonical_id"]
+
+        without = Deduplicator({'modules': {'deduplicator': {'use_mock': True}}})
+        assert len(without.deduplicate([dict(p) for p in products])) == 3
+
+    def test_input_unchanged(self):
+        """deduplicate and deduplicate_batch annotate copies, not the caller's products."""
+        deduplicator = Deduplicator({'modules': {'deduplicator': {'use_mock': True, 'identity': {'enabled': True}}}})
+        products = [dict(listing) for listing in LISTINGS]
+        unique = deduplicator.deduplicate(products)
+        assert all('canonical_id' in product for product in unique)
+        assert products == LISTINGS
+        batch = ProductBatch.from_products(products)
+        deduped = deduplicator.deduplicate_batch(batch)
+        assert [source_view(product) for product in deduped.records] == [source_view(product) for product in unique]
+        assert all('canonical_id' in product for product in deduped.records)
+        assert batch.records == LISTINGS and products == LISTINGS
+
+    def test_real_deduplicator(self):
+        """RealDeduplicator resolves identities too."""
+        products = [dict(LISTINGS[3]), dict(LISTINGS[4], price="499")]
+        assert RealDeduplicator().deduplicate_products(products) == [products[0]]
@@ -0,0 +1,127 @@
+"""
+Tests for MinHash/LSH near-duplicate detection.
+"""
+
+import sys
+import os
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.deduplicator.interface import Deduplicator, RealDeduplicator
+from src.deduplicator.near_duplicate import NearDuplicateEngine, UnionFind
+from src.models.product_batch import ProductBatch
+
+
+def listing(name, price="999", currency="USD", link=None):
+    """Build a listing dict."""
+    return {"productName": name, "price": price, "currency": currency,
+            "link": link or f"https://shop/{abs(hash((name, price))) % 10000}"}
+
+
+class TestUnionFind:
+    """Test class for UnionFind."""
+
+    def test_chains_and_singletons(self):
+        """Chained unions collapse to the smallest id; untouched ids stay alone."""
+        union_find = UnionFind(7)
+        union_find.union_pairs(np.array([5, 4, 3, 1]), np.array([4, 3, 2, 6]))
+        assert union_find.roots().tolist() == [0, 1, 2, 2, 2, 2, 1]
+
+    def test_no_pairs(self):
+        """No unions leaves every id as its own root."""
+        union_find = UnionFind(3)
+        union_find.union_pairs(np.array([], dtype=np.int64), np.array([], dtype=np.int64))
+        assert union_find.roots().tolist() == [0, 1, 2]
+
+
+class TestNearDuplicateEngine:
+    """Test class for NearDuplicateEngine."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.engine = NearDuplicateEngine()
+
+    def test_punctuation_variants_cluster(self):
+        """Names that differ only in punctuation and case share a cluster."""
+        batch = ProductBatch.from_products([
+            listing("Apple iPhone 16 Pro 128GB - Silver"),
+            listing("Apple iPhone 16 Pro, 128GB, Silver"),
+            listing("apple iphone 16 pro 128gb silver"),
+            listing("Apple iPhone 16 Pro 128GB"),
+            listing("Samsung Galaxy S24 Ultra 256GB"),
+            listing(""),
+        ])
+        labels = self.engine.cluster(batch).tolist()
+        assert labels[0] == labels[1] == labels[2]
+        assert len({labels[0], labels[3], labels[4], labels[5]}) == 4
+
+    def test_threshold(self):
+        """Lowering the threshold merges names with one extra token."""
+        products = [listing("Apple iPhone 16 Pro 128GB Silver"), listing("Apple iPhone 16 Pro 128GB")]
+        batch = ProductBatch.from_products(products)
+        assert len(set(self.engine.cluster(batch).tolist())) == 2
+        loose = NearDuplicateEngine(threshold=0.8)
+        assert len(set(loose.cluster(batch).tolist())) == 1
+
+    def test_deterministic(self):
+        """The same input always yields the same signatures."""
+        batch = ProductBatch.from_products([listing("Apple iPhone 16 Pro"), listing("Pixel 9 Pro")])
+        hashes = self.engine.token_hashes(batch.token_vocab)
+        first, _ = self.engine.signatures(batch.name_token_ids, batch.name_token_offsets, hashes)
+        second, _ = NearDuplicateEngine().signatures(batch.name_token_ids, batch.name_token_offsets, hashes)
+        assert np.array_equal(first, second)
+
+    def test_finds_variants_at_scale(self):
+        """Every noisy variant is grouped with its base name among many distinct names."""
+        products = []
+        for i in range(2000):
+            products.append(listing(f"Brand{i % 40} Model {i} 128GB Black"))
+            products.append(listing(f"brand{i % 40} model {i}, 128gb - black"))
+        labels = self.engine.cluster(ProductBatch.from_products(products))
+        assert np.array_equal(labels[0::2], labels[1::2])
+        assert len(np.unique(labels)) == 2000
+
+    def test_invalid_configuration(self):
+        """Bands must divide the signature length."""
+        with pytest.raises(ValueError):
+            NearDuplicateEngine(num_perm=64, bands=10)
+        assert NearDuplicateEngine.from_config({'enabled': False}) is None
+        assert NearDuplicateEngine.from_config(None) is None
+
+
+class TestNearDuplicateDeduplication:
+    """Test class for near-duplicate removal in the deduplicators."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.products = [
+            listing("Apple iPhone 16 Pro 128GB - Silver", "979", link="https://bestbuy.com/a"),
+            listing("Apple iPhone 16 Pro, 128GB, Silver", "979", link="https://amazon.com/a"),
+            listing("Apple iPhone 16 Pro, 128GB, Silver", "999", link="https://apple.com/a"),
+            listing("Apple iPhone 16 Pro 128GB - Silver", "979", "EUR", link="https://amazon.de/a"),
+        ]
+
+    def test_basic_deduplicate_collapses_near_duplicates(self):
+        """Near-duplicate names collapse only when price and currency match."""
+        deduplicator = Deduplicator('config/phase1_config.yaml')
+        result = deduplicator.deduplicate(self.products)
+        assert [p['link'] for p in result] == [
+            "https://bestbuy.com/a", "https://apple.com/a", "https://amazon.de/a"
+        ]
+        batch = deduplicator.deduplicate_batch(ProductBatch.from_products(self.products))
+        assert batch.records == result
+
+    def test_disabled_keeps_exact_matching(self):
+        """Without near_duplicates config only exact keys are dropped."""
+        config = {'modules': {'deduplicator': {'use_mock': True}}}
+        result = Deduplicator(config).deduplicate(self.products)
+        assert len(result) == 4
+
+    def test_real_deduplicator(self):
+        """RealDeduplicator removes near-duplicate listings."""
+        result = RealDeduplicator().deduplicate_products(self.products)
+        assert len(result) == 3
+        assert RealDeduplicator().deduplicate_products([]) == []
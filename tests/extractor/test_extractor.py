@@ -28,7 +28,8 @@ def test_extractor_mock_mode():
                 "productName": "Apple iPhone 16 Pro 128GB",
                 "price": "999",
                 "currency": "USD",
-                "link": "https://amazon.com/iphone16pro"
+                "link": "https://amazon.com/iphone16pro",
+                "price_minor": 99900
             }
         },
         {
@@ -39,7 +40,8 @@ def test_extractor_mock_mode():
                 "productName": "Apple iPhone 16 Pro 128GB - Silver",
                 "price": "979",
                 "currency": "USD",
-                "link": "https://bestbuy.com/iphone16pro"
+                "link": "https://bestbuy.com/iphone16pro",
+                "price_minor": 97900
             }
         },
         {
@@ -50,7 +52,8 @@ def test_extractor_mock_mode():
                 "productName": "Apple iPhone 16 Pro 128GB - Natural Titanium",
                 "price": "999",
                 "currency": "USD",
-                "link": "https://apple.com/iphone16pro"
+                "link": "https://apple.com/iphone16pro",
+                "price_minor": 99900
             }
         }
     ]
@@ -96,7 +99,8 @@ def test_extractor_unknown_url():
             "productName": "Unknown Product",
             "price": "0",
             "currency": "USD",
-            "link": unknown_url
+            "link": unknown_url,
+            "price_minor": 0
         }
         
         if result == expected_default:
@@ -165,7 +169,8 @@ def test_config_loading():
             "productName": "Test Product",
             "price": "100",
             "currency": "USD",
-            "link": "https://test.com/product"
+            "link": "https://test.com/product",
+            "price_minor": 10000
         }
         
         if result == expected:
@@ -0,0 +1,124 @@
+"""
+Tests for the locale-aware Price Parser.
+"""
+
+import sys
+import os
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.extractor.price_parser import PriceParser, ParsedPrice, price_amount
+
+
+CONFIG = {
+    'countries': {
+        'US': {'currency': 'USD', 'sites': ['amazon.com']},
+        'IN': {'currency': 'INR', 'sites': ['flipkart.com', 'amazon.in']},
+        'DE': {'currency': 'EUR', 'sites': ['amazon.de']},
+        'UK': {'currency': 'GBP', 'sites': ['amazon.co.uk']},
+    }
+}
+
+
+class TestPriceParser:
+    """Test class for PriceParser."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.parser = PriceParser(CONFIG)
+
+    def test_plain_digits(self):
+        """Plain digit strings from mock data parse to minor units."""
+        assert self.parser.parse('89999', country='IN') == ParsedPrice(8999900, 'INR')
+
+    def test_indian_rupee_grouping(self):
+        """Lakh grouping and rupee symbol are understood."""
+        assert self.parser.parse('₹1,29,900', country='IN') == ParsedPrice(12990000, 'INR')
+        assert self.parser.parse('₹89,999').currency == 'INR'
+
+    def test_german_format(self):
+        """German decimal comma and dot grouping."""
+        assert self.parser.parse('1.099,00 €', country='DE') == ParsedPrice(109900, 'EUR')
+
+    def test_german_lone_dot_is_grouping(self):
+        """A lone dot in a DE price groups thousands."""
+        assert self.parser.parse('1.099 €', site='amazon.de').amount_minor == 109900
+
+    def test_symbol_resolves_locale(self):
+        """Without country or site, the currency symbol picks the locale."""
+        assert self.parser.parse('1.099 €') == ParsedPrice(109900, 'EUR')
+        assert self.parser.parse('€1.099') == ParsedPrice(109900, 'EUR')
+        assert self.parser.parse('1.099,50 €') == ParsedPrice(109950, 'EUR')
+        assert self.parser.parse('$1.09') == ParsedPrice(109, 'USD')
+        product = self.parser.attach({'price': '1.099 €', 'link': 'https://shop.example.com/p/1'})
+        assert (product['price_minor'], product['currency']) == (109900, 'EUR')
+
+    def test_british_format(self):
+        """Pound sign with comma grouping and decimal point."""
+        assert self.parser.parse('£1,049.00') == ParsedPrice(104900, 'GBP')
+
+    def test_site_resolves_locale(self):
+        """The site, not the symbol, decides separator meaning."""
+        assert self.parser.parse('1.099', site='https://www.amazon.de/dp/B0').amount_minor == 109900
+        assert self.parser.parse('1.09', site='https://amazon.com/x').amount_minor == 109
+
+    def test_iso_code_detected(self):
+        """Three-letter currency codes in the text are picked up."""
+        assert self.parser.parse('999.99 USD', country='DE').currency == 'USD'
+
+    def test_unparseable(self):
+        """Strings without digits yield no amount."""
+        assert self.parser.parse('Currently unavailable').amount_minor is None
+        assert self.parser.parse(None).amount_minor is None
+
+    def test_non_ascii_digits(self):
+        """Superscripts and other non-ASCII digits are not prices."""
+        assert self.parser.parse('²').amount_minor is None
+        assert self.parser.parse('²', currency='USD').amount_minor is None
+        assert self.parser.parse('$²³').amount_minor is None
+        assert self.parser.parse_many(['²', '99'], currency='USD') == [ParsedPrice(None, 'USD'),
+                                                                      ParsedPrice(9900, 'USD')]
+
+    def test_negative_keeps_sign(self):
+        """A leading minus is kept, so negative prices stay negative."""
+        assert self.parser.parse('-999', country='US').amount_minor == -99900
+        assert self.parser.parse('-$1,049.50').amount_minor == -104950
+        assert self.parser.parse('−1.099,00 €', country='DE').amount_minor == -109900
+        minor, valid, _ = self.parser.parse_many_arrays(['-999'], country='US')
+        assert valid.tolist() == [True] and minor[0] == -99900
+
+    def test_non_finite_numbers(self):
+        """NaN and infinite numeric prices are unparseable rather than errors."""
+        for raw in (float('nan'), float('inf'), float('-inf')):
+            assert self.parser.parse(raw).amount_minor is None
+        assert self.parser.parse_many([float('nan'), 5.0]) == [ParsedPrice(None, 'USD'), ParsedPrice(500, 'USD')]
+
+    def test_parse_many_matches_parse(self):
+        """Batch parsing agrees with single parsing."""
+        raws = ['999', '$1,049.00', 'n/a', '979.5']
+        batch = self.parser.parse_many(raws, country='US')
+        assert batch == [self.parser.parse(raw, country='US') for raw in raws]
+
+    def test_parse_many_arrays(self):
+        """Array form returns int64 minor units and a validity mask."""
+        minor, valid, currencies = self.parser.parse_many_arrays(['999', 'n/a', '1,5'], country='DE')
+        assert minor.dtype == np.int64
+        assert valid.tolist() == [True, False, True]
+        assert minor[0] == 99900 and minor[2] == 150
+        assert currencies == ['EUR', 'EUR', 'EUR']
+
+    def test_attach_sets_typed_price(self):
+        """attach stores price_minor and keeps the raw price string."""
+        product = {'productName': 'X', 'price': '89999', 'currency': 'INR', 'link': 'https://flipkart.com/x'}
+        self.parser.attach(product, url=product['link'])
+        assert product['price_minor'] == 8999900
+        assert product['price'] == '89999'
+        assert product['currency'] == 'INR'
+
+    def test_price_amount_prefers_typed_value(self):
+        """price_amount reads price_minor without re-parsing."""
+        assert price_amount({'price': 'garbage', 'price_minor': 97900, 'currency': 'USD'}) == 979.0
+        assert price_amount({'price': '979', 'currency': 'USD'}) == 979.0
+        assert price_amount({'price': 'garbage'}) is None
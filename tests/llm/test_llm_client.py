@@ -0,0 +1,196 @@
+"""
+Tests for the shared LLM client, run against a local stand-in model server.
+"""
+
+import sys
+import os
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.llm.client import HTTPBackend, LLMBudgetExceeded, LLMClient, shared_client
+from src.query_normalizer.real_normalizer import RealQueryNormalizer
+from src.validator.real_validator import RealValidator
+
+
+class StandInModelServer:
+    """Local model server speaking the batch JSON protocol; answers 'echo: <prompt>' by default."""
+
+    def __init__(self, delay: float = 0.0, respond=None):
+        self.delay = delay
+        self.respond = respond or (lambda prompt: f"echo: {prompt}")
+        self.batches = []
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                with server.lock:
+                    server.batches.append(body['prompts'])
+                    server.active += 1
+                    server.max_active = max(server.max_active, server.active)
+                time.sleep(server.delay)
+                with server.lock:
+                    server.active -= 1
+                if any(prompt == 'fail' for prompt in body['prompts']):
+                    self.send_response(500)
+                    self.end_headers()
+                    return
+                payload = json.dumps({'completions': [
+                    {'text': server.respond(prompt), 'prompt_tokens': len(prompt.split()), 'completion_tokens': 2}
+                    for prompt in body['prompts']
+                ]}).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.endpoint = f"http://127.0.0.1:{self.httpd.server_port}/v1/batch"
+        threading.Thread(target=self.httpd.serve_forever, args=(0.05,), daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class TestLLMClient:
+    """Test class for LLMClient."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.server = StandInModelServer()
+
+    def teardown_method(self):
+        """Stop the stand-in server."""
+        self.server.close()
+
+    def client(self, **kwargs):
+        return LLMClient(HTTPBackend(self.server.endpoint), **kwargs)
+
+    def test_micro_batching(self):
+        """Prompts arriving within the window go out in one request."""
+        with self.client(batch_window_ms=50, max_batch_size=16) as client:
+            responses = client.generate_many([f"item {i}" for i in range(10)])
+        assert [r.text for r in responses] == [f"echo: item {i}" for i in range(10)]
+        assert len(self.server.batches) == 1
+        assert client.stats()['batches'] == 1
+
+    def test_batches_from_threads(self):
+        """Single-prompt callers on different threads share batches."""
+        results = {}
+        with self.client(batch_window_ms=100, max_batch_size=8) as client:
+            def call(i):
+                results[i] = client.generate(f"thread {i}").text
+            threads = [threading.Thread(target=call, args=(i,)) for i in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        assert results == {i: f"echo: thread {i}" for i in range(8)}
+        assert len(self.server.batches) < 8
+
+    def test_full_batch_splits(self):
+        """Batches never exceed max_batch_size."""
+        with self.client(batch_window_ms=50, max_batch_size=4) as client:
+            client.generate_many([f"item {i}" for i in range(10)])
+        assert sorted(len(batch) for batch in self.server.batches) == [2, 4, 4]
+
+    def test_prompt_cache_and_coalescing(self):
+        """Repeated prompts are sent once; later repeats come from the cache."""
+        with self.client() as client:
+            first = client.generate_many(["same", "same", "other"])
+            again = client.generate("same")
+        assert [r.text for r in first] == ["echo: same", "echo: same", "echo: other"]
+        assert again.cached and again.text == "echo: same"
+        assert sum(len(batch) for batch in self.server.batches) == 2
+        stats = client.stats()
+        assert stats['coalesced'] == 1
+        assert stats['cache_hits'] == 1
+        assert stats['requests'] == 4
+
+    def test_concurrency_limit(self):
+        """No more than max_concurrency requests are in flight."""
+        self.server.delay = 0.05
+        with self.client(batch_window_ms=1, max_batch_size=1, max_concurrency=2) as client:
+            client.generate_many([f"item {i}" for i in range(6)])
+        assert self.server.max_active <= 2
+        assert len(self.server.batches) == 6
+
+    def test_token_budget(self):
+        """Requests that would overrun the budget fail without being sent."""
+        with self.client(max_tokens=10, token_budget=30) as client:
+            assert client.generate("one two three").text == "echo: one two three"
+            assert client.stats()['tokens_used'] == 5
+            with pytest.raises(LLMBudgetExceeded):
+                client.generate("x" * 200)
+        assert len(self.server.batches) == 1
+
+    def test_backend_errors(self):
+        """A failed batch raises for its callers and is not cached."""
+        with self.client() as client:
+            with pytest.raises(Exception):
+                client.generate("fail")
+            assert client.stats()['errors'] == 1
+            assert client.stats()['cache_size'] == 0
+
+    def test_from_config(self):
+        """Disabled or endpoint-less sections give no client; equal sections share one."""
+        assert LLMClient.from_config(None) is None
+        assert LLMClient.from_config({'enabled': False, 'endpoint': self.server.endpoint}) is None
+        section = {'endpoint': self.server.endpoint, 'max_batch_size': 8}
+        assert shared_client(section) is shared_client(dict(section))
+        assert shared_client(section).max_batch_size == 8
+
+
+class TestLLMCallers:
+    """Test class for modules calling the shared client."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        def respond(prompt):
+            if prompt.startswith("Product query:"):
+                return '{"brand": "Fairphone", "model": "Fairphone 5"}'
+            return "yes, confidence 0.9" if "128GB" in prompt.split("Product:")[1] else "no 0.95"
+        self.server = StandInModelServer(respond=respond)
+        self.section = {'endpoint': self.server.endpoint, 'batch_window_ms': 50}
+
+    def teardown_method(self):
+        """Stop the stand-in server."""
+        self.server.close()
+
+    def test_validator_llm_stage_batches(self):
+        """The validator sends every undecided product's prompt in one request."""
+        validator = RealValidator({'llm': self.section})
+        query = {"brand": "Apple", "model": "iPhone 16 Pro", "storage": "128GB"}
+        products = [{"productName": "Apple iPhone 16 Pro 128GB", "price": "999", "currency": "USD"},
+                    {"productName": "Apple iPhone 16 Pro 256GB", "price": "1099", "currency": "USD"},
+                    {"productName": "Apple iPhone 16 Pro 128GB", "price": "999", "currency": "USD"}]
+        results = validator._validate_llm_batch(query, products)
+        assert [(r.is_valid, r.confidence_score) for r in results] == [(True, 0.9), (False, 0.95), (True, 0.9)]
+        assert len(self.server.batches) == 1
+        assert len(self.server.batches[0]) == 2
+
+    def test_validator_without_client(self):
+        """Without an `llm` section the stage keeps its mock verdict."""
+        result = RealValidator()._validate_with_llm({"brand": "Apple"}, {"productName": "x"})
+        assert result.is_valid and result.confidence_score == 0.85
+
+    def test_normalizer_fills_missing_fields(self):
+        """The normalizer asks the LLM only when its patterns miss brand or model."""
+        normalizer = RealQueryNormalizer(llm_client=shared_client(self.section))
+        result = normalizer.normalize_query("fairphone 5 green")
+        assert (result['brand'], result['model']) == ("Fairphone", "Fairphone 5")
+        assert RealQueryNormalizer().normalize_query("fairphone 5 green")['brand'] is None
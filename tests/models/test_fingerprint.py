@@ -0,0 +1,62 @@
+"""
+Tests for order-independent product list fingerprints and FixtureIndex.
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.models.fingerprint import FixtureIndex, list_fingerprint, product_hash
+
+
+A = {"productName": "Apple iPhone 16 Pro 128GB", "price": "999", "currency": "USD"}
+B = {"productName": "Apple iPhone 16 Pro 128GB", "price": "979", "currency": "USD"}
+C = {"productName": "Samsung Galaxy S24", "price": "899", "currency": "USD"}
+
+
+class TestFingerprint:
+    """Test class for product and list fingerprints."""
+
+    def test_order_independent(self):
+        """Permutations share a fingerprint; multisets with different counts do not."""
+        assert list_fingerprint([A, B, C]) == list_fingerprint([C, A, B])
+        assert list_fingerprint([A, A, B]) != list_fingerprint([A, B, B])
+        assert list_fingerprint([A, B]) != list_fingerprint([A, B, C])
+        assert list_fingerprint([]) == (0, 0)
+
+    def test_source_fields_only(self):
+        """Derived fields and key order are ignored."""
+        record = dict(A)
+        record['ranking_score'] = 0.7
+        record['canonical_id'] = 'cp_0123456789abcdef'
+        assert product_hash(record) == product_hash(A)
+        assert product_hash(dict(reversed(list(A.items())))) == product_hash(A)
+        assert product_hash(B) != product_hash(A)
+
+
+class TestFixtureIndex:
+    """Test class for FixtureIndex."""
+
+    def test_single_case(self):
+        """A single case dict is indexed; lookups ignore order."""
+        index = FixtureIndex({'input_products': [A, B, C], 'output_products': [C]})
+        assert index.lookup([B, C, A]) == [C]
+        assert index.lookup([A, B]) is None
+        assert index.lookup([A, B, B]) is None
+
+    def test_many_cases(self):
+        """Several cases are all reachable; the first of duplicate inputs wins."""
+        index = FixtureIndex([
+            {'input_products': [A, B], 'output_products': ['first']},
+            {'input_products': [C], 'output_products': ['second']},
+            {'input_products': [B, A], 'output_products': ['shadowed']},
+        ])
+        assert len(index) == 2
+        assert index.lookup([B, A]) == ['first']
+        assert index.lookup([C]) == ['second']
+
+    def test_empty(self):
+        """No configured fixtures never match."""
+        assert FixtureIndex(None).lookup([A]) is None
+        assert FixtureIndex({}).lookup([]) is None
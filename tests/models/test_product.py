@@ -0,0 +1,49 @@
+"""
+Tests for the product records shared by the pipeline stages.
+"""
+
+import sys
+import os
+import json
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.models.product import DERIVED_FIELDS, source_view
+from src.extractor.interface import Extractor
+from src.ranker.real_ranker import RealRanker
+
+
+SAMPLE = {
+    "productName": "Apple iPhone 16 Pro 128GB",
+    "price": "999",
+    "currency": "USD",
+    "link": "https://amazon.com/iphone16pro"
+}
+
+
+class TestProductRecords:
+    """Test class for pipeline product records."""
+
+    def test_source_view_drops_derived_fields(self):
+        """Pipeline-computed fields are not source fields."""
+        record = {**SAMPLE, "rating": 4.5, "price_minor": 99900, "canonical_id": "cp_1", "ranking_rank": 1}
+        assert source_view(record) == {**SAMPLE, "rating": 4.5}
+        assert 'price_minor' in DERIVED_FIELDS
+
+    def test_extractor_returns_plain_dict(self):
+        """Extractor hands a plain, JSON-serializable dict downstream, leaving its fixture unchanged."""
+        extractor = Extractor("config/phase1_config.yaml")
+        product = extractor.extract("", "https://amazon.com/iphone16pro")
+        assert type(product) is dict
+        assert product['price_minor'] == 99900
+        assert json.loads(json.dumps(product)) == product
+        assert 'price_minor' not in extractor.mock_extracts["https://amazon.com/iphone16pro"]
+
+    def test_real_ranker_leaves_input_unchanged(self):
+        """RealRanker annotates copies of the ranked records, not the caller's."""
+        records = [{**SAMPLE, "price": price, "site": "amazon.com"} for price in ("1999", "1049")]
+        ranked = RealRanker().rank_products(records, explain=True)
+        assert type(ranked[0]) is dict and ranked[0] is not records[1]
+        assert [record['ranking_rank'] for record in ranked] == [1, 2]
+        assert source_view(ranked[0]) == records[1]
+        assert not any('ranking_score' in record or 'ranking_metadata' in record for record in records)
@@ -0,0 +1,133 @@
+"""
+Tests for the columnar ProductBatch and the batch entry points of
+Validator, Deduplicator and Ranker.
+"""
+
+import sys
+import os
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.models.product_batch import ProductBatch
+from src.validator.interface import Validator
+from src.deduplicator.interface import Deduplicator
+from src.ranker.interface import Ranker
+
+
+CONFIG_PATH = 'config/phase1_config.yaml'
+
+QUERY = {"brand": "Apple", "model": "iPhone 16 Pro", "storage": "128GB"}
+
+PRODUCTS = [
+    {"productName": "Apple iPhone 16 Pro 128GB", "price": "999", "currency": "USD",
+     "link": "https://amazon.com/a", "site": "https://amazon.com"},
+    {"productName": "Apple iPhone 16 Pro 128GB", "price": "999", "currency": "USD",
+     "link": "https://bestbuy.com/a", "site": "https://bestbuy.com"},
+    {"productName": "Apple iPhone 16 Pro 256GB", "price": "1,099.00", "currency": "USD",
+     "link": "https://walmart.com/a", "site": "https://walmart.com"},
+    {"productName": "Samsung Galaxy S24", "price": "799", "currency": "USD",
+     "link": "https://amazon.com/b", "site": "https://amazon.com"},
+    {"productName": "Apple iPhone 16 Pro 128GB Case", "price": "n/a", "currency": "USD",
+     "link": "https://amazon.com/c", "site": "https://amazon.com"},
+    {"productName": "apple iphone 16 pro 128gb", "price": "979", "currency": "USD",
+     "link": "https://target.com/a"},
+]
+
+
+class TestProductBatch:
+    """Test class for ProductBatch."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.batch = ProductBatch.from_products(PRODUCTS)
+
+    def test_columns(self):
+        """Prices are parsed and strings are interned."""
+        assert len(self.batch) == len(PRODUCTS)
+        assert self.batch.price[0] == 999.0
+        assert self.batch.price[2] == 1099.0
+        assert np.isnan(self.batch.price[4])
+        assert self.batch.site[0] == self.batch.site[3]
+        assert self.batch.site_vocab[self.batch.site[1]] == "https://bestbuy.com"
+        assert self.batch.name[0] == self.batch.name[1]
+        assert len(self.batch.currency_vocab) == 1
+
+    def test_name_tokens(self):
+        """Name tokens are lowercased and shared across rows."""
+        tokens = [self.batch.token_vocab[t] for t in self.batch.tokens(0)]
+        assert tokens == ["apple", "iphone", "16", "pro", "128gb"]
+        assert list(self.batch.tokens(0)) == list(self.batch.tokens(5))
+
+    def test_take_keeps_rows_aligned(self):
+        """take() reorders every column, including the token CSR layout."""
+        subset = self.batch.take(np.array([3, 0]))
+        assert subset.records[0]["productName"] == "Samsung Galaxy S24"
+        assert subset.price.tolist() == [799.0, 999.0]
+        assert [subset.token_vocab[t] for t in subset.tokens(0)] == ["samsung", "galaxy", "s24"]
+        assert list(subset.tokens(1)) == list(self.batch.tokens(0))
+
+        masked = self.batch.take(self.batch.price > 990)
+        assert [r["link"] for r in masked.records] == [
+            "https://amazon.com/a", "https://bestbuy.com/a", "https://walmart.com/a"
+        ]
+
+    def test_empty_batch(self):
+        """An empty batch flows through every stage."""
+        empty = ProductBatch.from_products([])
+        assert len(empty) == 0
+        assert Validator(CONFIG_PATH).validate_batch(QUERY, empty).tolist() == []
+        assert len(Deduplicator(CONFIG_PATH).deduplicate_batch(empty)) == 0
+        assert len(Ranker(CONFIG_PATH).rank_batch(empty)) == 0
+
+
+class TestBatchStages:
+    """The batch entry points agree with the per-product paths."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.validator = Validator(CONFIG_PATH)
+        self.deduplicator = Deduplicator(CONFIG_PATH)
+        self.ranker = Ranker(CONFIG_PATH)
+
+    def test_validate_batch_matches_validate(self):
+        """validate_batch returns the same verdicts as validate."""
+        batch = ProductBatch.from_products(PRODUCTS)
+        expected = [self.validator.validate(QUERY, p) for p in batch.records]
+        assert self.validator.validate_batch(QUERY, batch).tolist() == expected
+
+    def test_validate_batch_uses_fixtures(self):
+        """Exact fixture cases win over the partial match."""
+        cases = self.validator.mock_validations
+        case = next(c for c in cases if not c.get('is_valid', False))
+        batch = ProductBatch.from_products([case['product']])
+        expected = self.validator.validate(case['query'], case['product'])
+        assert self.validator.validate_batch(case['query'], batch).tolist() == [expected]
+
+    def test_deduplicate_batch_matches_deduplicate(self):
+        """deduplicate_batch keeps the same rows in the same order."""
+        batch = ProductBatch.from_products(PRODUCTS)
+        expected = self.deduplicator.deduplicate(batch.records)
+        assert self.deduplicator.deduplicate_batch(batch).records == expected
+
+    def test_deduplicate_batch_uses_fixture(self):
+        """The fixture input returns the fixture output."""
+        mock_input = self.deduplicator.mock_results['input_products']
+        batch = ProductBatch.from_products(mock_input)
+        expected = self.deduplicator.deduplicate(mock_input)
+        assert self.deduplicator.deduplicate_batch(batch).records == expected
+
+    def test_rank_batch_matches_rank(self):
+        """rank_batch orders rows exactly like rank, invalid prices last."""
+        batch = ProductBatch.from_products(PRODUCTS)
+        expected = self.ranker.rank(batch.records)
+        ranked = self.ranker.rank_batch(batch)
+        assert ranked.records == expected
+        assert ranked.records[-1]["price"] == "n/a"
+
+    def test_rank_batch_uses_fixture(self):
+        """The fixture input returns the fixture output."""
+        mock_input = self.ranker.mock_results['input_products']
+        batch = ProductBatch.from_products(mock_input)
+        assert self.ranker.rank_batch(batch).records == self.ranker.rank(mock_input)
@@ -0,0 +1,139 @@
+"""
+Tests for batch mode and cross-request work sharing.
+"""
+
+import json
+import sys
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.config.loader import load_config
+from src.orchestrator.batch import BatchRunner, SharedWork, read_requests
+from src.orchestrator.interface import Orchestrator
+from tests.orchestrator.test_run_many import CountingScraper
+
+
+class TestSharedWork:
+    """Test class for SharedWork."""
+
+    def test_computed_once(self):
+        """Repeated calls reuse the first result."""
+        work = SharedWork()
+        calls = []
+        for _ in range(3):
+            assert work.call('stage', 'key', lambda: calls.append(1) or 'value') == 'value'
+        assert len(calls) == 1
+        assert work.stats() == {'stage': {'calls': 3, 'computed': 1, 'shared': 2}}
+
+    def test_concurrent_callers_wait(self):
+        """A call running in one thread is not repeated by others."""
+        work = SharedWork()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return 'value'
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            first = executor.submit(work.call, 'stage', 'key', compute)
+            started.wait(5)
+            others = [executor.submit(work.call, 'stage', 'key', compute) for _ in range(3)]
+            release.set()
+            results = [first.result()] + [future.result() for future in others]
+        assert results == ['value'] * 4
+        assert len(calls) == 1
+
+    def test_failures_not_kept(self):
+        """A failed call raises and is retried by the next caller."""
+        work = SharedWork()
+
+        def fail():
+            raise FileNotFoundError("missing")
+
+        with pytest.raises(FileNotFoundError):
+            work.call('stage', 'key', fail)
+        assert work.call('stage', 'key', lambda: 'value') == 'value'
+
+    def test_bounded(self):
+        """Only the most recently used results are kept."""
+        work = SharedWork(max_entries=2)
+        for key in ('a', 'b', 'c'):
+            work.call('stage', key, lambda: key)
+        work.call('stage', 'a', lambda: 'again')
+        assert work.stats()['stage']['computed'] == 4
+
+
+class TestBatchRunner:
+    """Test class for BatchRunner."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.config = load_config(os.path.join("config", "phase1_config.yaml"))
+        self.requests = [
+            {"query": "iPhone 16 Pro, 128GB", "country": "US"},
+            {"query": "Samsung Galaxy S24", "country": "US", "id": 7},
+            {"query": "iPhone 16 Pro, 128GB", "country": "US"},
+            {"query": "iPhone 16 Pro", "country": "US", "limit": 1},
+        ]
+
+    def test_read_requests(self):
+        """Bad lines become errors; blank lines are skipped."""
+        parsed = list(read_requests(['{"query": "iPhone"}', '', 'not json', '{"country": "US"}']))
+        assert parsed[0] == (1, {"query": "iPhone"})
+        assert [number for number, _ in parsed] == [1, 3, 4]
+        assert all(isinstance(request, ValueError) for _, request in parsed[1:])
+
+    def test_same_results_as_run(self):
+        """Each line carries its request and the results Orchestrator.run gives."""
+        runner = BatchRunner(self.config, workers=2)
+        lines = [json.dumps(request) for request in self.requests] + ['not json']
+        records = sorted(runner.run(read_requests(lines)), key=lambda record: record['line'])
+        assert [record['line'] for record in records] == [1, 2, 3, 4, 5]
+        for record, request in zip(records, self.requests):
+            expected = Orchestrator(self.config).run(
+                {"query": request["query"], "country": request["country"]}, limit=request.get("limit"))
+            assert record['results'] == expected
+            assert all(record[key] == value for key, value in request.items())
+        assert 'error' in records[4]
+        assert runner.stats()['completed'] == 4 and runner.stats()['failed'] == 1
+
+    def test_work_shared(self):
+        """Site selection and page fetches are not repeated across requests."""
+        runner = BatchRunner(self.config, workers=2)
+        scraper = CountingScraper(runner.pool.orchestrators[0].scraper._module)
+        for orchestrator in runner.pool.orchestrators:
+            orchestrator.scraper._module = scraper
+        list(runner.run(read_requests(json.dumps(request) for request in self.requests)))
+        shared = runner.stats()['shared']
+        assert shared['select_sites']['computed'] == 1
+        # Repeated pages come from the shared memo or the product-data cache
+        assert scraper.urls and len(scraper.urls) == len(set(scraper.urls))
+
+    def test_input_read_lazily(self):
+        """Only a window of requests is read ahead of the results."""
+        runner = BatchRunner(self.config, workers=2)
+        read = []
+
+        def lines():
+            for number in range(100):
+                read.append(number)
+                yield json.dumps({"query": "iPhone 16 Pro, 128GB", "country": "US"})
+
+        records = runner.run(read_requests(lines()))
+        next(records)
+        assert len(read) <= 2 * runner.workers + 1
+        assert len(list(records)) == 99
+
+    def test_result_cache_bounded(self):
+        """Batch mode bounds the result cache unless the config does."""
+        runner = BatchRunner(self.config, workers=1, result_cache_entries=3)
+        assert runner.pool.cache_manager.cache.max_entries == 3
@@ -0,0 +1,96 @@
+"""
+Tests for Orchestrator.compare.
+"""
+
+import sys
+import os
+import time
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.config.loader import load_config
+from src.extractor.fx import FxTable
+from src.orchestrator.interface import Orchestrator
+from tests.orchestrator.test_run_many import CountingScraper
+
+
+QUERY = "iPhone 16 Pro, 128GB"
+
+
+class TestCompare:
+    """Test class for Orchestrator.compare."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.config = load_config(os.path.join("config", "phase1_config.yaml"))
+        self.orchestrator = Orchestrator(self.config)
+
+    def test_matches_run_per_country(self):
+        """Each country contributes the products run() ranks for it."""
+        comparison = self.orchestrator.compare(QUERY, ["US", "UK"])
+        for country in ("US", "UK"):
+            expected = Orchestrator(self.config).run({"query": QUERY, "country": country})
+            products = [{key: value for key, value in product.items()
+                         if key not in ('country', 'converted_price', 'converted_currency')}
+                        for product in comparison['results'] if product['country'] == country]
+            assert products == expected
+            assert comparison['countries'][country] == {'products': len(expected)}
+
+    def test_converted_and_sorted(self):
+        """Prices are converted with the FX table and ranked cheapest first."""
+        comparison = self.orchestrator.compare(QUERY, ["US"], currency="EUR")
+        fx = FxTable.from_config(self.config.get('fx'))
+        assert comparison['currency'] == "EUR" and comparison['fx_as_of'] == fx.as_of
+        prices = [product['converted_price'] for product in comparison['results']]
+        assert prices and prices == sorted(prices)
+        first = comparison['results'][0]
+        assert first['converted_price'] == round(fx.convert(float(first['price']), first['currency'], "EUR"), 2)
+
+    def test_limit_and_default_currency(self):
+        """The FX base is the default currency; limit trims the merged ranking."""
+        comparison = self.orchestrator.compare(QUERY, ["US", "UK"], limit=1)
+        assert comparison['currency'] == FxTable.from_config(self.config.get('fx')).base
+        assert len(comparison['results']) == 1
+
+    def test_normalized_per_country_and_fetched_concurrently(self):
+        """The query is normalized for each market; pages of all countries are fetched together."""
+        calls = []
+        normalize = self.orchestrator.query_normalizer.normalize
+        self.orchestrator.query_normalizer.normalize = lambda *args: calls.append(args) or normalize(*args)
+        scraper = CountingScraper(self.orchestrator.scraper, delay=0.02)
+        self.orchestrator.scraper = scraper
+        self.orchestrator.compare(QUERY, ["US", "UK", "DE", "IN"])
+        assert sorted(calls) == sorted((QUERY, country) for country in ["US", "UK", "DE", "IN"])
+        assert scraper.max_active > 1
+        assert len(scraper.urls) == len(set(scraper.urls))
+
+    def test_stage_counts_merged(self):
+        """Each country's Steps 2-3 are counted once in the merged stats."""
+        self.orchestrator.compare(QUERY, ["US", "UK", "DE", "IN"])
+        stats = self.orchestrator.run_many_stats
+        assert stats['select_sites']['calls'] == 4 and stats['search']['calls'] == 4
+
+    def test_failing_country_reported(self):
+        """A country that fails is reported; the others are still ranked."""
+        comparison = self.orchestrator.compare(QUERY, ["US", "IN"])
+        assert 'error' in comparison['countries']['IN']
+        assert {product['country'] for product in comparison['results']} == {"US"}
+
+    def test_errors(self):
+        """Unknown currencies and empty country lists are rejected; all-failed raises."""
+        with pytest.raises(ValueError):
+            self.orchestrator.compare(QUERY, ["US"], currency="XYZ")
+        with pytest.raises(ValueError):
+            self.orchestrator.compare(QUERY, [])
+        with pytest.raises(FileNotFoundError):
+            self.orchestrator.compare(QUERY, ["IN"])
+
+    def test_all_failed_in_ranking(self):
+        """When every country fails in Step 8, the first country's error is raised."""
+        def fail(products):
+            raise RuntimeError("ranker unavailable")
+        self.orchestrator.ranker.rank = fail
+        with pytest.raises(RuntimeError, match="ranker unavailable"):
+            self.orchestrator.compare(QUERY, ["US", "UK"])
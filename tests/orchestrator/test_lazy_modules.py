@@ -0,0 +1,75 @@
+"""
+Tests for lazy module construction in the Orchestrator.
+"""
+
+import sys
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.config.loader import load_config
+from src.orchestrator.interface import Orchestrator, _Module
+
+
+MODULES = ['query_normalizer', 'site_selector', 'search_agent', 'scraper', 'extractor',
+           'validator', 'deduplicator', 'ranker', 'cache_manager']
+
+
+def slow_factory(config):
+    """Module factory that takes long enough for threads to race on first access."""
+    time.sleep(0.05)
+    config['built'].append(object())
+    return config['built'][-1]
+
+
+class SlowOrchestrator(Orchestrator):
+    """Orchestrator with one slowly built module."""
+    slow = _Module('tests.orchestrator.test_lazy_modules', 'slow_factory')
+
+
+class TestLazyModules:
+    """Test class for lazily built orchestrator modules."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.config = load_config(os.path.join("config", "phase1_config.yaml"))
+
+    def test_nothing_built_up_front(self):
+        """Constructing the orchestrator builds no module."""
+        orchestrator = Orchestrator(self.config)
+        assert not any(name in vars(orchestrator) for name in MODULES)
+
+    def test_built_once_on_use(self):
+        """A module is built on first access and then reused."""
+        orchestrator = Orchestrator(self.config)
+        normalizer = orchestrator.query_normalizer
+        assert orchestrator.query_normalizer is normalizer
+        assert normalizer.config is orchestrator.config
+        assert [name for name in MODULES if name in vars(orchestrator)] == ['query_normalizer']
+
+    def test_replaceable(self):
+        """A module can be swapped by assignment, as before."""
+        orchestrator = Orchestrator(self.config)
+        orchestrator.ranker = "stand-in"
+        assert orchestrator.ranker == "stand-in"
+
+    def test_cached_run_builds_only_cache(self):
+        """A run answered from the result cache builds no pipeline module."""
+        orchestrator = Orchestrator(self.config)
+        user_input = {"query": "iPhone 16 Pro, 128GB", "country": "US"}
+        first = orchestrator.run(user_input)
+        again = Orchestrator(self.config)
+        again.cache_manager = orchestrator.cache_manager
+        assert again.run(user_input) == first
+        assert [name for name in MODULES if name in vars(again)] == ['cache_manager']
+
+    def test_concurrent_first_access_builds_once(self):
+        """Threads racing on first access all get the one module built."""
+        built = []
+        orchestrator = SlowOrchestrator({'built': built})
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            modules = list(executor.map(lambda _: orchestrator.slow, range(8)))
+        assert len(built) == 1
+        assert all(module is built[0] for module in modules)
@@ -0,0 +1,104 @@
+"""
+Tests for Orchestrator.run_many.
+"""
+
+import sys
+import os
+import threading
+import time
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.config.loader import load_config
+from src.orchestrator.interface import Orchestrator
+
+
+REQUESTS = [
+    {"query": "iPhone 16 Pro, 128GB", "country": "US"},
+    {"query": "iPhone 16 Pro", "country": "US"},
+    {"query": "Samsung Galaxy S24", "country": "US"},
+    {"query": "iPhone 16 Pro, 128GB", "country": "US"},
+    {"query": "MacBook Air M3", "country": "IN"},
+]
+
+
+class CountingScraper:
+    """Scraper stand-in that counts fetches and how many run at once."""
+
+    def __init__(self, scraper, delay=0.0):
+        self.scraper = scraper
+        self.delay = delay
+        self.urls = []
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def fetch_html(self, url_entry):
+        with self.lock:
+            self.urls.append(url_entry['url'])
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        return self.scraper.fetch_html(url_entry)
+
+
+class TestRunMany:
+    """Test class for Orchestrator.run_many."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.config = load_config(os.path.join("config", "phase1_config.yaml"))
+        self.orchestrator = Orchestrator(self.config)
+
+    def test_same_results_as_run(self):
+        """Each request gets what run() returns for it."""
+        reference = Orchestrator(self.config)
+        expected = [reference.run(request) for request in REQUESTS]
+        assert self.orchestrator.run_many(REQUESTS) == expected
+
+    def test_fetches_deduplicated(self):
+        """Every distinct page is fetched once across requests."""
+        scraper = CountingScraper(self.orchestrator.scraper)
+        self.orchestrator.scraper = scraper
+        self.orchestrator.run_many(REQUESTS)
+        assert len(scraper.urls) == len(set(scraper.urls))
+        stats = self.orchestrator.run_many_stats
+        assert stats['fetch']['computed'] == len(scraper.urls)
+        assert stats['fetch']['shared'] > 0 and stats['extract']['shared'] > 0
+        assert stats['requests'] == {'calls': 5, 'computed': 4, 'shared': 1}
+
+    def test_bounded_concurrency(self):
+        """No more than max_concurrency pages are fetched at once."""
+        scraper = CountingScraper(self.orchestrator.scraper, delay=0.02)
+        self.orchestrator.scraper = scraper
+        self.orchestrator.run_many(REQUESTS, max_concurrency=2)
+        assert 1 < scraper.max_active <= 2
+
+    def test_cached_requests_skip_work(self):
+        """Requests answered from the result cache plan nothing."""
+        self.orchestrator.run_many(REQUESTS[:1])
+        self.orchestrator.run_many(REQUESTS[:1])
+        assert self.orchestrator.run_many_stats['requests']['computed'] == 0
+        assert self.orchestrator.run_many_stats['fetch']['calls'] == 0
+
+    def test_products_not_shared_between_requests(self):
+        """Requests get their own product records."""
+        first, second = self.orchestrator.run_many(REQUESTS[:2])
+        assert first and second
+        assert all(a is not b for a in first for b in second)
+
+    def test_failures(self):
+        """A failing request raises, or takes its slot with return_exceptions."""
+        class FailingScraper:
+            def fetch_html(self, url_entry):
+                raise FileNotFoundError(url_entry['url'])
+
+        self.orchestrator.scraper = FailingScraper()
+        with pytest.raises(FileNotFoundError):
+            self.orchestrator.run_many(REQUESTS[:2])
+        results = self.orchestrator.run_many(REQUESTS[:2], return_exceptions=True)
+        assert all(isinstance(result, FileNotFoundError) for result in results)
@@ -0,0 +1,148 @@
+"""
+Tests for the pipeline server and its forwarding client.
+"""
+
+import socket
+import sys
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import main
+from src.config.loader import load_config
+from src.orchestrator.client import forward_run, server_settings
+from src.orchestrator.interface import Orchestrator
+from src.orchestrator.pool import OrchestratorPool
+from src.orchestrator.server import PipelineServer
+
+
+QUERIES = ["iPhone 16 Pro, 128GB", "Samsung Galaxy S24 Ultra", "MacBook Air M3", "Pixel 8 Pro"]
+
+
+class TestPipelineServer:
+    """Test class for PipelineServer and forward_run."""
+
+    def setup_method(self):
+        """Start a server on a free port."""
+        self.config = load_config(os.path.join("config", "phase1_config.yaml"))
+        self.server = PipelineServer(self.config, port=0, workers=2)
+        self.address = self.server.server_address[:2]
+        self.thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+        self.thread.start()
+
+    def teardown_method(self):
+        """Stop the server."""
+        self.server.shutdown()
+        self.server.server_close()
+
+    def forward(self, query, country="US", **kwargs):
+        kwargs.setdefault('config', self.config)
+        return forward_run({"query": query, "country": country}, address=self.address, **kwargs)
+
+    def test_same_results_as_in_process(self):
+        """A forwarded run returns what Orchestrator.run returns."""
+        expected = Orchestrator(self.config).run({"query": QUERIES[0], "country": "US"})
+        assert self.forward(QUERIES[0]) == expected
+        assert self.forward(QUERIES[0]) == expected
+        assert self.server.health()['requests'] == 2
+
+    def test_pages(self):
+        """Limit and cursor are passed through to run_page."""
+        first = self.forward(QUERIES[0], limit=1)
+        assert len(first['results']) == 1
+        rest = self.forward(QUERIES[0], cursor=first['next_cursor'])
+        assert first['results'] + rest['results'] == self.forward(QUERIES[0])
+
+    def test_bad_request(self):
+        """Rejected requests raise ValueError on the client, as run_page would."""
+        with pytest.raises(ValueError, match="cursor"):
+            self.forward(QUERIES[0], cursor="bad")
+        with pytest.raises(ValueError, match="query"):
+            self.forward("")
+
+    def test_different_config(self):
+        """A server started from another config does not run the request."""
+        changed = dict(self.config, settings=dict(self.config.get('settings') or {}, max_results=3))
+        assert self.forward(QUERIES[0], config=changed) is None
+        assert self.forward(QUERIES[0], config=None) is None
+        assert self.server.health()['requests'] == 0
+
+    def test_server_error(self, capsys):
+        """A failed run raises RuntimeError, which the CLI reports like a bad request."""
+        self.server.run = lambda request: 1 / 0
+        with pytest.raises(RuntimeError, match="ZeroDivisionError"):
+            self.forward(QUERIES[0])
+
+        def run_cli(*argv):
+            settings = dict(server_settings(self.config), host=self.address[0], port=self.address[1])
+            with mock.patch('src.orchestrator.client.server_settings', return_value=settings):
+                if main.USE_TYPER:
+                    from typer.testing import CliRunner
+                    return CliRunner(mix_stderr=False).invoke(main.app, list(argv)).exit_code
+                with mock.patch.object(sys, 'argv', ['main.py', *argv]), pytest.raises(SystemExit) as exit_info:
+                    main.main()
+                return exit_info.value.code
+
+        assert run_cli('--query', QUERIES[0], '--country', 'US') == 1
+        assert "❌ Pipeline server error: ZeroDivisionError" in capsys.readouterr().err
+
+    def test_concurrent_requests(self):
+        """Concurrent requests get their own results and share one cache."""
+        expected = [Orchestrator(self.config).run({"query": query, "country": "US"}) for query in QUERIES]
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(self.forward, QUERIES * 2))
+        assert results == expected * 2
+        orchestrators = self.server.pool.orchestrators
+        assert all(o.cache_manager is self.server.pool.cache_manager for o in orchestrators)
+        for query, result in zip(QUERIES, expected):
+            assert self.server.pool.cache_manager.get_cached_query_results(query, "US") == result
+
+    def test_health(self):
+        """GET /health reports the server status."""
+        health = self.server.health()
+        assert health['status'] == 'ok' and health['workers'] == 2 and health['pid'] == os.getpid()
+
+
+class TestForwarding:
+    """Test class for the client without a server."""
+
+    def test_no_server(self):
+        """With nothing listening, forward_run returns None for an in-process run."""
+        probe = socket.socket()
+        probe.bind(('127.0.0.1', 0))
+        port = probe.getsockname()[1]
+        probe.close()
+        assert forward_run({"query": "iPhone 16 Pro", "country": "US"}, address=('127.0.0.1', port)) is None
+
+    def test_not_a_pipeline_server(self):
+        """Anything other than a pipeline server on the port counts as no server."""
+        for reply in (b"SSH-2.0-OpenSSH_9.6\r\n", b"HTTP/1.1 200 OK\r\n\r\n<html></html>", b""):
+            listener = socket.create_server(('127.0.0.1', 0))
+
+            def answer(listener=listener, reply=reply):
+                connection, _ = listener.accept()
+                with connection:
+                    connection.recv(65536)
+                    connection.sendall(reply)
+
+            thread = threading.Thread(target=answer, daemon=True)
+            thread.start()
+            with listener:
+                address = listener.getsockname()[:2]
+                assert forward_run({"query": "iPhone 16 Pro", "country": "US"}, address=address) is None
+            thread.join()
+
+    def test_settings(self):
+        """Server settings default when the config has no server section."""
+        assert server_settings({})['port'] == 8765
+        assert server_settings({'server': {'port': 9000}})['port'] == 9000
+
+    def test_pool_size(self):
+        """A pool needs at least one orchestrator."""
+        with pytest.raises(ValueError):
+            OrchestratorPool({}, size=0)
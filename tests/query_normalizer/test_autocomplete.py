@@ -0,0 +1,83 @@
+"""
+Tests for query autocomplete.
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.query_normalizer.autocomplete import Autocomplete, read_query_log
+from src.query_normalizer.interface import QueryNormalizer
+from src.query_normalizer.real_normalizer import RealQueryNormalizer
+
+
+def queries_of(completions):
+    return [completion['query'] for completion in completions]
+
+
+class TestAutocomplete:
+    """Test class for Autocomplete."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.index = Autocomplete(top_k=3, scan_limit=2)
+        for name in ["iPhone 16", "iPhone 16 Pro", "iPhone 15", "iPad Air", "Galaxy S24"]:
+            self.index.add(name, count=0)
+
+    def test_prefix_ranking(self):
+        """Without popularity, shorter then alphabetical completions come first."""
+        assert queries_of(self.index.complete("iph", 5)) == ["iPhone 15", "iPhone 16", "iPhone 16 Pro"]
+        assert queries_of(self.index.complete("IPHONE 16 ", 5)) == ["iPhone 16 Pro"]
+        assert self.index.complete("x") == [] and self.index.complete("  ") == []
+
+    def test_popularity(self):
+        """More used completions rank first; folded variants count together."""
+        self.index.add_many(["iphone 16 pro", "iPhone 16 Pro", "IPHONE  16 PRO", "iphone 15"])
+        assert self.index.complete("i", 2) == [{'query': "iPhone 16 Pro", 'count': 3},
+                                               {'query': "iPhone 15", 'count': 1}]
+
+    def test_incremental_updates_cached_prefixes(self):
+        """Cached top lists of wide prefixes follow later count increases and new queries."""
+        assert queries_of(self.index.complete("i", 3)) == ["iPad Air", "iPhone 15", "iPhone 16"]
+        self.index.add("iPhone 16 Pro")
+        self.index.add("ipod touch")
+        self.index.add("ipod touch")
+        assert queries_of(self.index.complete("i", 3)) == ["ipod touch", "iPhone 16 Pro", "iPad Air"]
+        uncached = Autocomplete(top_k=3, scan_limit=100)
+        for name, count in [("iPhone 16", 0), ("iPhone 16 Pro", 1), ("iPhone 15", 0), ("iPad Air", 0),
+                            ("ipod touch", 2)]:
+            uncached.add(name, count)
+        assert self.index.complete("i", 3) == uncached.complete("i", 3)
+
+    def test_larger_k_than_cached(self):
+        """k beyond top_k is answered from the index, not the cache."""
+        self.index.complete("i", 3)
+        assert len(self.index.complete("i", 5)) == 4
+
+    def test_from_normalizer(self):
+        """The normalizer's brand/model names seed the index, with brand-prefixed forms."""
+        index = Autocomplete.from_normalizer(RealQueryNormalizer(), ["nike air max 270 size 10"])
+        assert queries_of(index.complete("samsung gal", 2)) == ["Samsung Galaxy S23", "Samsung Galaxy S24"]
+        assert index.complete("nike", 1) == [{'query': "nike air max 270 size 10", 'count': 1}]
+
+    def test_read_query_log(self, tmp_path):
+        """Logs may be plain lines or JSON lines."""
+        path = tmp_path / "queries.txt"
+        path.write_text('iphone 16\n\n{"query": "MacBook Pro", "country": "US"}\n', encoding='utf-8')
+        assert list(read_query_log(str(path))) == ["iphone 16", "MacBook Pro"]
+
+
+class TestNormalizerAutocomplete:
+    """Test class for QueryNormalizer.complete."""
+
+    def test_counts_normalized_queries(self, tmp_path):
+        """The configured log seeds popularity of canonical names; normalized queries add to it."""
+        log = tmp_path / "queries.txt"
+        log.write_text("macbook air\n", encoding='utf-8')
+        normalizer = QueryNormalizer({'modules': {'query_normalizer': {
+            'use_mock': True, 'mock_outputs': {}, 'autocomplete': {'query_log': str(log)}}}})
+        assert normalizer.complete("mac", 1) == [{'query': "MacBook Air", 'count': 1}]
+        normalizer.normalize("MacBook Pro")
+        normalizer.normalize("MacBook Pro")
+        assert normalizer.complete("mac", 1) == [{'query': "MacBook Pro", 'count': 2}]
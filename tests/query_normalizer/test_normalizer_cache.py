@@ -0,0 +1,116 @@
+"""
+Tests for the QueryNormalizer memo cache and normalize_many.
+"""
+
+import sys
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.query_normalizer.interface import QueryNormalizer
+from src.query_normalizer.real_normalizer import RealQueryNormalizer
+
+
+def real_config(**section):
+    return {'modules': {'query_normalizer': dict(section, use_mock=False)}}
+
+
+class TestNormalizationCache:
+    """Test class for the QueryNormalizer LRU."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.normalizer = QueryNormalizer(real_config())
+
+    def test_folded_queries_hit(self):
+        """Case, comma and whitespace variants share one entry."""
+        first = self.normalizer.normalize("iPhone 16 Pro, 128GB")
+        second = self.normalizer.normalize("  iphone 16   PRO 128gb ")
+        assert self.normalizer.cache_info()['hits'] == 1
+        assert self.normalizer.cache_info()['misses'] == 1
+        assert {k: v for k, v in first.items() if k != 'normalized'} == \
+            {k: v for k, v in second.items() if k != 'normalized'}
+
+    def test_normalized_field_per_query(self):
+        """A hit still reports the query it was called with."""
+        self.normalizer.normalize("MacBook Pro")
+        assert self.normalizer.normalize("macbook pro")['normalized'] == "macbook pro"
+        assert self.normalizer.normalize("MacBook Pro")['normalized'] == "MacBook Pro"
+
+    def test_country_in_key(self):
+        """The same query in another country is a separate entry."""
+        self.normalizer.normalize("Nike Air Max 270", "US")
+        self.normalizer.normalize("Nike Air Max 270", "UK")
+        assert self.normalizer.cache_info()['size'] == 2
+
+    def test_spellings_patterns_distinguish(self):
+        """'weiß' and 'weiss' are different keys, as they are to the colour patterns."""
+        assert self.normalizer.cache_key("iPhone Weiß") != self.normalizer.cache_key("iphone weiss")
+        assert self.normalizer.normalize("iPhone 16 weiß")['color'] == 'White'
+        assert self.normalizer.normalize("iPhone 16 weiss")['color'] is None
+
+    def test_results_are_copies(self):
+        """Changing a returned dict does not change the cached result."""
+        self.normalizer.normalize("Samsung Galaxy S24")['brand'] = "Changed"
+        assert self.normalizer.normalize("Samsung Galaxy S24")['brand'] == "Samsung"
+
+    def test_bounded(self):
+        """The least recently used entry is evicted beyond cache_size."""
+        normalizer = QueryNormalizer(real_config(cache_size=2))
+        normalizer.normalize("iPhone 16")
+        normalizer.normalize("Galaxy S24")
+        normalizer.normalize("iPhone 16")
+        normalizer.normalize("Pixel 8")
+        assert normalizer.cache_info()['size'] == 2
+        normalizer.normalize("iPhone 16")
+        assert normalizer.cache_info()['hits'] == 2
+
+    def test_concurrent_normalize(self):
+        """Threads sharing a small LRU get correct results and consistent counters."""
+        normalizer = QueryNormalizer(real_config(cache_size=3))
+        queries = ["iPhone 16", "Galaxy S24", "Pixel 8", "MacBook Pro", "Nike Air Max 270"] * 200
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(normalizer.normalize, queries))
+        expected = {query: RealQueryNormalizer().normalize_query(query) for query in set(queries)}
+        assert all(result['brand'] == expected[query]['brand'] for query, result in zip(queries, results))
+        info = normalizer.cache_info()
+        assert info['hits'] + info['misses'] == len(queries)
+        assert info['size'] <= 3
+
+
+class TestNormalizeMany:
+    """Test class for QueryNormalizer.normalize_many."""
+
+    QUERIES = ["iPhone 16 Pro, 128GB", "iphone 16 pro 128gb", "Dell XPS 15 intel i7 16GB RAM",
+               "Nike Air Max 270 size 10", "unknown gadget", "IPHONE 16 PRO 128GB"] * 3
+
+    def test_matches_normalize_query(self):
+        """Results equal per-query normalization, in input order."""
+        normalizer = QueryNormalizer(real_config())
+        reference = RealQueryNormalizer()
+        results = normalizer.normalize_many(self.QUERIES)
+        assert results == [reference.normalize_query(query) for query in self.QUERIES]
+
+    def test_distinct_keys_normalized_once(self):
+        """Each folded query is normalized once; cached ones not at all."""
+        normalizer = QueryNormalizer(real_config())
+        normalizer.normalize("Nike Air Max 270 size 10")
+        normalizer.normalize_many(self.QUERIES)
+        assert normalizer.cache_info()['misses'] == 4
+        assert normalizer.cache_info()['hits'] == len(self.QUERIES) - 3
+
+    def test_worker_processes(self):
+        """Chunks spread over worker processes give the same results."""
+        normalizer = QueryNormalizer(real_config())
+        queries = [f"iPhone {n} Pro {gb}GB" for n in range(10, 20) for gb in (64, 128, 256)]
+        results = normalizer.normalize_many(queries, workers=2, chunk_size=8)
+        assert results == QueryNormalizer(real_config()).normalize_many(queries)
+
+    def test_mock_mode(self):
+        """In mock mode the config outputs are returned as before."""
+        config = {'modules': {'query_normalizer': {'use_mock': True, 'mock_outputs': {
+            'laptop': {'brand': 'Apple', 'category': 'Laptop'},
+            'smartphone': {'brand': 'Apple', 'category': 'Smartphone'}}}}}
+        results = QueryNormalizer(config).normalize_many(["MacBook Pro", "iPhone"])
+        assert [r['category'] for r in results] == ['Laptop', 'Smartphone']
@@ -0,0 +1,92 @@
+"""
+Tests for the normalizer's keyword automaton.
+"""
+
+import sys
+import os
+import re
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.query_normalizer.patterns import KeywordAutomaton, compile_automaton, freeze_tables
+from src.query_normalizer.real_normalizer import RealQueryNormalizer
+
+
+TABLES = freeze_tables([
+    ('color', [('Natural Titanium', r'\b(natural\s*titanium|titanium)\b'),
+               ('Black', r'\b(black|noir)\b'),
+               ('Midnight', r'\b(midnight|noir)\b')]),
+    ('category', [('Phone', r'\b(phone|iphone)\b'), ('Phone', r'\b(pixel)\b'), ('Laptop', r'\b(laptop)\b')]),
+    ('processor', [('Intel i9', r'\b(intel\s*)?i9\b'), ('M3 Pro', r'\bm3\s*pro\b')]),
+])
+
+
+class TestKeywordAutomaton:
+    """Test class for KeywordAutomaton."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.automaton = KeywordAutomaton(TABLES)
+
+    def test_first_is_table_order(self):
+        """The earliest matching entry wins, not the earliest position in the query."""
+        assert self.automaton.scan("noir natural titanium").first('color') == 'Natural Titanium'
+        assert self.automaton.scan("midnight noir").first('color') == 'Black'
+        assert self.automaton.scan("plain").first('color') is None
+
+    def test_counts_per_label(self):
+        """Counts add up the non-overlapping matches of every entry of a label."""
+        counts = self.automaton.scan("iphone phone pixel").counts('category')
+        assert counts == {'Phone': 3, 'Laptop': 0}
+
+    def test_words_match_whole_tokens(self):
+        """Plain words only match whole tokens, like the `\\b` patterns."""
+        assert self.automaton.scan("blackout").first('color') is None
+        assert self.automaton.scan("iphone-black").first('color') == 'Black'
+
+    def test_gated_alternatives(self):
+        """Multi-word and optional-lead alternatives match through their prefix gates."""
+        assert self.automaton.scan("naturaltitanium").first('color') == 'Natural Titanium'
+        assert self.automaton.scan("intel i9").first('processor') == 'Intel i9'
+        assert self.automaton.scan("core i9").first('processor') == 'Intel i9'
+        assert self.automaton.scan("m3pro").first('processor') == 'M3 Pro'
+        assert self.automaton.scan("m3 max").first('processor') is None
+
+    def test_matches_ignorecase_search(self):
+        """Every table agrees with re.search(pattern, query, re.IGNORECASE), including its case folds."""
+        queries = ["titanium noir", "ſilver", "laptop pixel intel   i9", "m3 pro", "i9s", "ıphone"]
+        for query in queries:
+            scan = self.automaton.scan(query)
+            for name, entries in TABLES:
+                expected = next((label for label, pattern in entries
+                                 if re.search(pattern, query, re.IGNORECASE)), None)
+                assert scan.first(name) == expected, (query, name)
+
+    def test_compiled_once(self):
+        """Equal tables share one compiled automaton."""
+        assert compile_automaton(TABLES) is compile_automaton(freeze_tables(TABLES))
+
+
+class TestNormalizerScan:
+    """Test class for RealQueryNormalizer on the automaton."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.normalizer = RealQueryNormalizer()
+
+    def test_shared_automaton(self):
+        """Normalizers with the same tables reuse one automaton."""
+        assert RealQueryNormalizer().automaton is self.normalizer.automaton
+
+    def test_attributes(self):
+        """Attributes from one scan match the per-pattern results."""
+        result = self.normalizer.normalize_query("dell xps 13 intel i9 16gb ram")
+        assert (result['brand'], result['model'], result['category'], result['processor']) == \
+            ('Dell', 'XPS', 'Laptop', 'Intel i9')
+        result = self.normalizer.normalize_query("iphone16promax 256gb")
+        assert (result['model'], result['category'], result['storage']) == ('iPhone 16 Pro Max', 'Smartphone', '256GB')
+
+    def test_default_type_shares_alternatives(self):
+        """An alternative used by two tables ('air max') is matched for both."""
+        result = self.normalizer.normalize_query("nike air max 270")
+        assert (result['model'], result['type']) == ('Air Max 270', 'Running Shoes')
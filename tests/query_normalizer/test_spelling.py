@@ -0,0 +1,118 @@
+"""
+Tests for brand/model spelling correction.
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.query_normalizer.real_normalizer import RealQueryNormalizer
+from src.query_normalizer.spelling import SpellingCorrector, osa_distance, pattern_words
+
+
+class TestSpellingCorrector:
+    """Test class for SpellingCorrector."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.corrector = SpellingCorrector(["iphone", "galaxy", "thinkpad", "pixel", "pavilion"],
+                                           known=["phone", "black"])
+
+    def test_osa_distance(self):
+        """Transpositions count as one edit."""
+        assert osa_distance("iphnoe", "iphone") == 1
+        assert osa_distance("galxy", "galaxy") == 1
+        assert osa_distance("thnikpda", "thinkpad") == 2
+        assert osa_distance("same", "same") == 0
+
+    def test_lookup(self):
+        """Misspellings within the allowed distance map to the vocabulary word."""
+        assert self.corrector.lookup("iphnoe") == ("iphone", 1)
+        assert self.corrector.lookup("galxy") == ("galaxy", 1)
+        assert self.corrector.lookup("thnikpda") == ("thinkpad", 2)
+
+    def test_distance_depends_on_length(self):
+        """Short words get one edit; long words two."""
+        assert self.corrector.lookup("gxlxy") is None
+        assert self.corrector.lookup("pavlino") is None
+        assert self.corrector.lookup("pavliion") == ("pavilion", 1)
+
+    def test_known_and_short_words_untouched(self):
+        """Known words and words below min_length are never corrected."""
+        assert self.corrector.lookup("phone") is None
+        assert self.corrector.lookup("black") is None
+        assert self.corrector.lookup("pxel") is None
+
+    def test_short_brand_typos(self):
+        """Short words are corrected towards short brands only, and only by an adjacent swap."""
+        corrector = SpellingCorrector(["iphone", "galaxy", "pixel"], known=["phone", "shoes"],
+                                      short_targets=["nike", "dell", "xps"])
+        assert corrector.lookup("nkie") == ("nike", 1)
+        assert corrector.lookup("dlel") == ("dell", 1)
+        assert corrector.lookup("xsp") == ("xps", 1)
+        for word in ("bike", "mike", "like", "sell", "well", "bell", "ups", "pxel", "dells", "enki"):
+            assert corrector.lookup(word) is None, word
+
+    def test_correct_reports_each_fix(self):
+        """Alphabetic runs are corrected in place, digits kept."""
+        text, corrections = self.corrector.correct("iphnoe16 pro galxy black")
+        assert text == "iphone16 pro galaxy black"
+        assert [(c['original'], c['corrected'], c['distance']) for c in corrections] == \
+            [("iphnoe", "iphone", 1), ("galxy", "galaxy", 1)]
+
+    def test_pattern_words(self):
+        """Regex escapes are not words."""
+        assert pattern_words(r'\biphone\s*16\s*pro\s*max\b') == ['iphone', 'pro', 'max']
+        assert pattern_words(r'\b(huawei|mate|p\d+)\b') == ['huawei', 'mate', 'p']
+
+
+class TestNormalizerCorrection:
+    """Test class for spelling correction in RealQueryNormalizer."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.normalizer = RealQueryNormalizer()
+
+    def test_corrects_brand_and_model(self):
+        """Misspelt queries get brand and model, with the corrections reported."""
+        result = self.normalizer.normalize_query("iphnoe 16 pro, 128GB")
+        assert (result['brand'], result['model'], result['storage']) == ('Apple', 'iPhone 16 Pro', '128GB')
+        assert result['corrections'] == [{'original': 'iphnoe', 'corrected': 'iphone', 'distance': 1}]
+        assert result['normalized'] == "iphnoe 16 pro 128GB"
+        result = self.normalizer.normalize_query("galxy s24")
+        assert (result['brand'], result['model']) == ('Samsung', 'Galaxy S24')
+
+    def test_corrects_short_brands(self):
+        """Short brand typos resolve the brand, and the model it names."""
+        result = self.normalizer.normalize_query("nkie running shoes")
+        assert result['brand'] == 'Nike'
+        assert result['corrections'] == [{'original': 'nkie', 'corrected': 'nike', 'distance': 1}]
+        result = self.normalizer.normalize_query("dell xsp 13")
+        assert (result['brand'], result['model']) == ('Dell', 'XPS')
+        assert result['corrections'] == [{'original': 'xsp', 'corrected': 'xps', 'distance': 1}]
+
+    def test_short_words_not_brands_untouched(self):
+        """Ordinary words one edit from a brand, or near a brand phrase ('air max'), are not corrected."""
+        for query in ("bike helmet", "sell laptop", "well phone", "bell headphones", "mike stand"):
+            result = self.normalizer.normalize_query(query)
+            assert result['brand'] is None and 'corrections' not in result, query
+        result = self.normalizer.normalize_query("like new iphone")
+        assert result['brand'] == 'Apple' and 'corrections' not in result
+        result = self.normalizer.normalize_query("a pair of nike socks")
+        assert result['brand'] == 'Nike' and 'corrections' not in result
+
+    def test_correct_queries_unchanged(self):
+        """Queries the patterns already resolve get no correction entry."""
+        result = self.normalizer.normalize_query("Samsung Galaxy S24 Ultra")
+        assert 'corrections' not in result
+        assert result == RealQueryNormalizer(correct_spelling=False).normalize_query("Samsung Galaxy S24 Ultra")
+
+    def test_disabled(self):
+        """Without correction misspelt words stay unresolved."""
+        result = RealQueryNormalizer(correct_spelling=False).normalize_query("galxy s24")
+        assert result['brand'] is None and 'corrections' not in result
+
+    def test_shared_corrector(self):
+        """The delete index is built once for all normalizers."""
+        assert RealQueryNormalizer().spelling is self.normalizer.spelling
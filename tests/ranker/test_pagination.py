@@ -0,0 +1,126 @@
+"""
+Tests for top-k ranking selection and pagination cursors.
+"""
+
+import sys
+import os
+import random
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.ranker.interface import Ranker
+from src.ranker.pagination import decode_cursor, encode_cursor, select_page, select_page_array
+from src.ranker.real_ranker import RealRanker
+
+
+CONFIG_PATH = 'config/phase1_config.yaml'
+
+
+def make_products(count, seed=7):
+    """Products with many repeated prices so ties cross page boundaries."""
+    rng = random.Random(seed)
+    sites = ['amazon.com', 'bestbuy.com', 'walmart.com', 'apple.com']
+    return [
+        {"productName": f"Phone {i}", "price": str(rng.choice([999, 1049, 1099, 1199, 'n/a'])),
+         "currency": "USD", "link": f"https://shop/{i}", "site": sites[i % 4]}
+        for i in range(count)
+    ]
+
+
+def walk(fetch_page, limit):
+    """Follow next_cursor until exhausted and collect every result."""
+    results, cursor = [], None
+    while True:
+        page = fetch_page(limit, cursor)
+        assert len(page['results']) <= limit
+        results.extend(page['results'])
+        cursor = page['next_cursor']
+        if cursor is None:
+            return results
+
+
+class TestPagination:
+    """Test class for the pagination helpers."""
+
+    def test_cursor_round_trip(self):
+        """Cursors decode to the key and rank they were built from."""
+        cursor = encode_cursor((999.5, 3), 10)
+        assert decode_cursor(cursor) == ((999.5, 3), 10)
+        assert decode_cursor(encode_cursor((float('inf'), 4), 5)) == ((float('inf'), 4), 5)
+
+    @pytest.mark.parametrize("cursor", ["not-a-cursor", encode_cursor((1.0, 1), 1)[:-3],
+                                        encode_cursor(("a", 1), 1)])
+    def test_bad_cursor(self, cursor):
+        """Malformed cursors raise ValueError."""
+        with pytest.raises(ValueError):
+            select_page([(1.0, 0)], 1, cursor)
+
+    def test_select_page_matches_sort(self):
+        """Heap pages concatenate to the full sorted order."""
+        keys = [(float(v), i) for i, v in enumerate([5, 1, 3, 1, 5, 2, 3, 3])]
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        indices, cursor, rank = [], None, 1
+        while True:
+            page = select_page(keys, 3, cursor)
+            assert page['first_rank'] == rank
+            indices.extend(page['indices'])
+            rank += len(page['indices'])
+            cursor = page['next_cursor']
+            if cursor is None:
+                break
+        assert indices == order
+        assert select_page(keys, 0)['indices'] == []
+        with pytest.raises(ValueError):
+            select_page(keys, -1)
+
+    def test_select_page_array_matches_select_page(self):
+        """The partition-based selection agrees with the heap selection."""
+        rng = np.random.default_rng(3)
+        primary = rng.integers(0, 5, size=200).astype(float)
+        keys = [(value, i) for i, value in enumerate(primary.tolist())]
+        for limit in (1, 7, 50, 200, 500):
+            cursor_list = cursor_array = None
+            while True:
+                expected = select_page(keys, limit, cursor_list)
+                actual = select_page_array(primary, limit, cursor_array)
+                assert actual['indices'].tolist() == expected['indices']
+                assert actual['next_cursor'] == expected['next_cursor']
+                cursor_list = expected['next_cursor']
+                cursor_array = actual['next_cursor']
+                if cursor_list is None:
+                    break
+
+
+class TestRankerPaging:
+    """Test class for paged ranking in Ranker and RealRanker."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.ranker = Ranker(CONFIG_PATH)
+        self.products = make_products(60)
+
+    def test_ranker_top_k(self):
+        """rank(limit=k) is the first k of the full ranking."""
+        full = self.ranker.rank(self.products)
+        assert self.ranker.rank(self.products, limit=5) == full[:5]
+        assert walk(lambda limit, cursor: self.ranker.rank_page(self.products, limit, cursor), 7) == full
+
+    def test_ranker_fixture_paging(self):
+        """Fixture rankings page in fixture order."""
+        mock_input = self.ranker.mock_results['input_products']
+        full = self.ranker.rank(mock_input)
+        assert walk(lambda limit, cursor: self.ranker.rank_page(mock_input, limit, cursor), 2) == full
+
+    def test_real_ranker_pages(self):
+        """RealRanker pages carry absolute ranks and match the full ranking."""
+        ranker = RealRanker()
+        full = [dict(p) for p in ranker.rank_products([dict(p) for p in self.products])]
+        paged = walk(lambda limit, cursor: ranker.rank_page([dict(p) for p in self.products],
+                                                            limit=limit, cursor=cursor), 9)
+        assert [dict(p) for p in paged] == full
+        assert [p['ranking_rank'] for p in paged] == list(range(1, len(full) + 1))
+        with pytest.raises(ValueError):
+            ranker.rank_page(self.products, limit=3, cursor="bogus")
@@ -0,0 +1,105 @@
+"""
+Tests for the vectorized ranking ScoringEngine and RealRanker's use of it.
+"""
+
+import sys
+import os
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.models.product_batch import ProductBatch
+from src.ranker.real_ranker import RealRanker
+from src.ranker.scoring_engine import ScoringEngine
+
+
+PRODUCTS = [
+    {"productName": "iPhone 16 Pro", "price": "1999", "currency": "USD", "site": "amazon.com"},
+    {"productName": "iPhone 16 Pro", "price": "1049", "currency": "USD", "site": "walmart.com"},
+    {"productName": "iPhone 16 Pro", "price": "1049", "currency": "USD", "site": "apple.com"},
+    {"productName": "iPhone 16 Pro", "price": "999", "currency": "USD", "site": "unknown-shop.com"},
+    {"productName": "iPhone 16 Pro", "price": "call us", "currency": "USD", "site": "bestbuy.com"},
+    {"productName": "iPhone 16 Pro", "price": "1049", "currency": "USD"},
+]
+
+
+class TestScoringEngine:
+    """Test class for ScoringEngine."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.ranker = RealRanker()
+        self.engine = self.ranker.scoring_engine
+        self.batch = ProductBatch.from_products(PRODUCTS)
+
+    def test_matches_per_product_scores(self):
+        """Batch totals equal the per-product factor scoring."""
+        self.engine.score(self.batch)
+        expected = [
+            self.ranker._calculate_total_score(self.ranker._calculate_factor_scores(product))
+            for product in self.batch.records
+        ]
+        assert np.allclose(self.batch.scores, expected)
+
+    def test_factor_columns(self):
+        """Price and vendor trust columns come from prices and vendor_database."""
+        matrix = self.engine.factor_matrix(self.batch)
+        price = matrix[:, self.engine.factors.index('price')]
+        trust = matrix[:, self.engine.factors.index('vendor_trust')]
+        assert price.tolist()[:4] == [1000 / 1999, 1000 / 1049, 1000 / 1049, 1.0]
+        assert price[4] == 0.0
+        assert trust.tolist() == [0.9, 0.7, 0.95, 0.5, 0.8, 0.5]
+
+    def test_weight_overrides(self):
+        """Configured weights replace the defaults; unknown factors are rejected."""
+        engine = ScoringEngine(weights={'price': 1.0, 'vendor_trust': 0, 'delivery_speed': 0,
+                                        'availability': 0, 'user_ratings': 0, 'price_history': 0})
+        matrix = engine.factor_matrix(self.batch)
+        assert np.allclose(engine.total_scores(matrix), matrix[:, 0])
+        with pytest.raises(ValueError):
+            ScoringEngine(weights={'popularity': 0.5})
+
+    def test_empty_batch(self):
+        """An empty batch scores to an empty array."""
+        empty = ProductBatch.from_products([])
+        self.engine.score(empty)
+        assert empty.scores.shape == (0,)
+
+
+class TestRealRankerRanking:
+    """Test class for RealRanker ranking on top of the engine."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.ranker = RealRanker()
+
+    def test_order_and_ties(self):
+        """Best score first; equal scores keep input order."""
+        ranked = self.ranker.rank_products([dict(p) for p in PRODUCTS])
+        sites = [product.get('site') for product in ranked]
+        assert sites == ['apple.com', 'walmart.com', 'unknown-shop.com', None, 'amazon.com', 'bestbuy.com']
+        assert [product['ranking_rank'] for product in ranked] == [1, 2, 3, 4, 5, 6]
+        scores = [product['ranking_score'] for product in ranked]
+        assert scores == sorted(scores, reverse=True)
+
+    def test_explanations_on_request(self):
+        """ranking_metadata is only built when explain is requested."""
+        ranked = self.ranker.rank_products([dict(p) for p in PRODUCTS])
+        assert all('ranking_metadata' not in product for product in ranked)
+
+        ranked = self.ranker.rank_products([dict(p) for p in PRODUCTS], explain=True)
+        breakdown = ranked[2]['ranking_metadata']['factor_breakdown']
+        assert breakdown['price'] == {'score': 1.0, 'weight': 0.3, 'weighted_score': 0.3}
+        assert breakdown['vendor_trust']['score'] == 0.5
+
+        explaining = RealRanker({'explain': True})
+        assert 'ranking_metadata' in explaining.rank_products([dict(PRODUCTS[0])])[0]
+
+    def test_rank_batch(self):
+        """rank_batch gives the same order as rank_products."""
+        ranked = self.ranker.rank_batch(ProductBatch.from_products(PRODUCTS))
+        expected = self.ranker.rank_products([dict(p) for p in PRODUCTS])
+        assert [r.get('site') for r in ranked.records] == [r.get('site') for r in expected]
+        assert ranked.scores.tolist() == [r['ranking_score'] for r in expected]
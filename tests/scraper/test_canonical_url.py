@@ -0,0 +1,100 @@
+"""
+Tests for URL canonicalization and fetch deduplication.
+"""
+
+import copy
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.cache.interface import create_cache_manager
+from src.config.loader import load_config
+from src.orchestrator.interface import Orchestrator
+from src.scraper.canonical_url import UrlCanonicalizer, collapse_duplicates
+from tests.orchestrator.test_run_many import CountingScraper
+
+
+class TestUrlCanonicalizer:
+    """Test class for UrlCanonicalizer."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.canonicalizer = UrlCanonicalizer()
+
+    def test_general_rules(self):
+        """Tracking params, fragments, hosts, ports and slashes are normalized."""
+        canonical = "https://shop.example/p/42?color=red&size=m"
+        for url in ["https://shop.example/p/42?size=m&color=red",
+                    "https://WWW.Shop.Example:443/p/42/?color=red&utm_source=mail&size=m#reviews",
+                    "https://m.shop.example//p/42?gclid=abc&color=red&size=m&ref=home"]:
+            assert self.canonicalizer.canonicalize(url) == canonical
+
+    def test_site_rules(self):
+        """Built-in site rules strip site-specific decoration."""
+        assert self.canonicalizer.canonicalize(
+            "https://www.amazon.de/Apple-iPhone-16-Pro/dp/B0DGHYDZR9/ref=sr_1_3?keywords=iphone&qid=1&th=1"
+        ) == "https://amazon.de/dp/B0DGHYDZR9"
+        assert self.canonicalizer.canonicalize(
+            "https://m.flipkart.com/apple-iphone-16-pro/p/itm1?pid=MOB1&lid=LST1&marketplace=FLIPKART"
+        ) == "https://flipkart.com/apple-iphone-16-pro/p/itm1?pid=MOB1"
+
+    def test_configured_rules(self):
+        """Config rules add params, host aliases and path rewrites."""
+        canonicalizer = UrlCanonicalizer.from_config({'sites': {'shop.example': {
+            'strip_params': ['session*'], 'hosts': {'eu.shop.example': 'shop.example'},
+            'path_rewrites': [[r'^/item/[^/]+/(\d+)$', r'/item/\1']]}}})
+        assert canonicalizer.canonicalize(
+            "https://eu.shop.example/item/blue-phone/7?sessionid=1") == "https://shop.example/item/7"
+
+    def test_unchanged(self):
+        """Canonical and non-HTTP URLs come back as they are."""
+        for url in ["https://amazon.com/iphone16pro", "mailto:sales@example.com", "not a url"]:
+            assert self.canonicalizer.canonicalize(url) == url
+
+    def test_collapse_duplicates(self):
+        """The first result per canonical URL is kept, with its URL canonicalized."""
+        results = [{"site": "amazon.com", "url": "https://amazon.com/iphone16pro?utm_source=x", "html_file": "a"},
+                   {"site": "amazon.com", "url": "https://www.amazon.com/iphone16pro/", "html_file": "b"},
+                   {"site": "amazon.com", "url": "https://amazon.com/iphone16pro-silver", "html_file": "c"}]
+        collapsed = collapse_duplicates(results, self.canonicalizer)
+        assert [(result['url'], result['html_file']) for result in collapsed] == [
+            ("https://amazon.com/iphone16pro", "a"), ("https://amazon.com/iphone16pro-silver", "c")]
+        assert results[0]['url'].endswith('utm_source=x')
+
+    def test_product_cache_keyed_by_canonical_url(self):
+        """Equivalent URLs share a product-data cache entry."""
+        cache_manager = create_cache_manager({})
+        cache_manager.cache_product_data("https://www.amazon.com/iphone16pro?tag=aff-20", {"productName": "iPhone"})
+        assert cache_manager.get_cached_product_data("https://amazon.com/iphone16pro") == {"productName": "iPhone"}
+
+
+class TestFetchDeduplication:
+    """The orchestrator fetches each canonical URL once."""
+
+    def setup_method(self):
+        """Set up a config whose search results repeat pages under other URLs."""
+        self.config = copy.deepcopy(load_config(os.path.join("config", "phase1_config.yaml")))
+        results = self.config['modules']['search_agent']['mock_results']['amazon.com']['Smartphone']
+        results += [dict(results[0], url="https://www.amazon.com/iphone16pro/?utm_campaign=deal#top"),
+                    dict(results[1], url="https://m.amazon.com/iphone16pro-silver?ref_=nav")]
+        self.user_input = {"query": "iPhone 16 Pro, 128GB", "country": "US"}
+
+    def test_duplicates_collapsed(self):
+        """Variants of a URL are fetched once and give the same results."""
+        orchestrator = Orchestrator(self.config)
+        scraper = CountingScraper(orchestrator.scraper)
+        orchestrator.scraper = scraper
+        results = orchestrator.run(self.user_input)
+        assert len(scraper.urls) == len(set(scraper.urls))
+        assert not any('utm_' in url or 'www.' in url for url in scraper.urls)
+        assert results == Orchestrator(load_config(os.path.join("config", "phase1_config.yaml"))).run(self.user_input)
+
+    def test_product_cache_reused(self):
+        """A later query finds already extracted pages in the product-data cache."""
+        orchestrator = Orchestrator(self.config)
+        orchestrator.run(self.user_input)
+        scraper = CountingScraper(orchestrator.scraper)
+        orchestrator.scraper = scraper
+        orchestrator.run({"query": "iPhone 16 Pro", "country": "US"})
+        assert scraper.urls == []
@@ -0,0 +1,140 @@
+"""
+Tests for the pre-fetch relevance filter.
+"""
+
+import copy
+import sys
+import os
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.config.loader import load_config
+from src.orchestrator.interface import Orchestrator
+from src.search_agent.prefilter import RelevanceFilter
+from src.validator.matcher import QueryMatcher
+from tests.orchestrator.test_run_many import CountingScraper
+
+
+QUERY = {"brand": "Apple", "model": "iPhone 16 Pro", "storage": "128GB", "category": "Smartphone"}
+
+RESULTS = [
+    {"site": "a.com", "url": "https://a.com/1", "title": "Apple iPhone 16 Pro 128GB - Black"},
+    {"site": "a.com", "url": "https://a.com/2", "title": "Apple iPhone 16 Pro", "snippet": "128GB, unlocked"},
+    {"site": "a.com", "url": "https://a.com/3", "title": "Apple iPhone 16 Pro 256GB"},
+    {"site": "a.com", "url": "https://a.com/4", "title": "Silicone case for iPhone 16 Pro"},
+    {"site": "a.com", "url": "https://a.com/5"},
+]
+
+
+class TestRelevanceFilter:
+    """Test class for RelevanceFilter."""
+
+    def test_score_text(self):
+        """Scores are the share of query terms found."""
+        matcher = QueryMatcher(QUERY)
+        assert matcher.score_text("apple iphone 16 pro 128gb") == 1.0
+        assert matcher.score_text("apple iphone 16 pro 256gb") == pytest.approx(2 / 3)
+        assert matcher.score_text("usb cable") == 0.0
+        assert QueryMatcher({}).score_text("anything") == 1.0
+
+    def test_split(self):
+        """Low-scoring results are dropped; results without text are kept."""
+        relevance_filter = RelevanceFilter(threshold=1.0)
+        kept, dropped = relevance_filter.split(QUERY, RESULTS)
+        assert [result['url'][-1] for result in kept] == ['1', '2', '5']
+        assert [result['url'][-1] for result in dropped] == ['3', '4']
+        stats = relevance_filter.stats()
+        assert (stats['results'], stats['unscored'], stats['kept'], stats['dropped']) == (5, 1, 3, 2)
+
+    def test_threshold_and_disabled(self):
+        """A lower threshold keeps near misses; a disabled filter keeps everything."""
+        kept, _ = RelevanceFilter(threshold=0.6).split(QUERY, RESULTS)
+        assert len(kept) == 4
+        kept, dropped = RelevanceFilter(enabled=False).split(QUERY, RESULTS)
+        assert kept == RESULTS and dropped == []
+
+    def test_audit_counts(self):
+        """Every Nth dropped result is audited; valid audits count as recall lost."""
+        relevance_filter = RelevanceFilter(audit_every=3)
+        for _ in range(3):
+            _, dropped = relevance_filter.split(QUERY, RESULTS)
+            for result in relevance_filter.audit_sample(dropped):
+                relevance_filter.record_audit(result['url'].endswith('3'))
+        stats = relevance_filter.stats()
+        assert stats['dropped'] == 6 and stats['audited'] == 2
+        assert stats['recall_lost'] == 1
+        assert stats['estimated_recall_lost'] == 3.0
+
+    def test_from_config(self):
+        """The prefilter config section sets the filter up."""
+        relevance_filter = RelevanceFilter.from_config({'threshold': 0.5, 'audit_every': 10})
+        assert (relevance_filter.threshold, relevance_filter.enabled, relevance_filter.audit_every) == (0.5, True, 10)
+
+
+class TestPrefilterInPipeline:
+    """The orchestrator filters search results before fetching them."""
+
+    def setup_method(self):
+        """Set up a config whose mock search results carry titles, plus an accessory."""
+        self.config = copy.deepcopy(load_config(os.path.join("config", "phase1_config.yaml")))
+        self.config['modules']['search_agent']['mock_results'] = {'amazon.com': {'Smartphone': [
+            {'url': 'https://amazon.com/iphone16pro', 'html_file': 'mocks/html/amazon_iphone16pro.html',
+             'title': 'Apple iPhone 16 Pro 128GB'},
+            {'url': 'https://amazon.com/iphone16pro-case', 'html_file': 'mocks/html/missing_case.html',
+             'title': 'Clear Case for iPhone 16 Pro'},
+        ]}}
+        self.user_input = {"query": "iPhone 16 Pro, 128GB", "country": "US"}
+
+    def test_mismatch_not_fetched(self):
+        """The accessory is dropped before Step 4, so its page is never fetched."""
+        orchestrator = Orchestrator(self.config)
+        results = orchestrator.run(self.user_input)
+        assert [product['link'] for product in results] == ['https://amazon.com/iphone16pro']
+        assert orchestrator.relevance_filter.stats()['dropped'] == 1
+
+        self.config['modules']['search_agent']['prefilter'] = {'enabled': False}
+        with pytest.raises(FileNotFoundError):
+            Orchestrator(self.config).run(self.user_input)
+
+    def test_audit(self):
+        """Audited results are fetched and validated to count recall lost."""
+        results = self.config['modules']['search_agent']['mock_results']['amazon.com']['Smartphone']
+        # A listing of the right product under a misleading title
+        results[1].update(url='https://bestbuy.com/iphone16pro', html_file='mocks/html/bestbuy_iphone16pro.html')
+        self.config['modules']['search_agent']['prefilter'] = {'audit_every': 1}
+        orchestrator = Orchestrator(self.config)
+        orchestrator.run(self.user_input)
+        stats = orchestrator.relevance_filter.stats()
+        assert stats['audited'] == 1 and stats['recall_lost'] == 1
+        assert stats['audit_fetches'] == 1 and stats['fetches_avoided'] == 0
+
+    def test_audit_uses_product_cache(self):
+        """An audit answered by the product-data cache costs no fetch."""
+        results = self.config['modules']['search_agent']['mock_results']['amazon.com']['Smartphone']
+        results[1].update(url='https://bestbuy.com/iphone16pro', html_file='mocks/html/bestbuy_iphone16pro.html')
+        self.config['modules']['search_agent']['prefilter'] = {'audit_every': 1}
+        orchestrator = Orchestrator(self.config)
+        orchestrator.scraper = CountingScraper(orchestrator.scraper)
+        orchestrator.run(self.user_input)
+        # Another spelling of the query misses the result cache but not the product cache
+        orchestrator.run({"query": "iphone 16 pro 128gb", "country": "US"})
+        assert orchestrator.scraper.urls.count('https://bestbuy.com/iphone16pro') == 1
+        stats = orchestrator.relevance_filter.stats()
+        assert stats['audited'] == 2 and stats['recall_lost'] == 2
+        assert stats['audit_fetches'] == 1 and stats['fetches_avoided'] == 1
+
+    def test_audit_shares_step4_fetch(self):
+        """An audited page that Step 4 fetches anyway is fetched once."""
+        results = self.config['modules']['search_agent']['mock_results']['amazon.com']['Smartphone']
+        # The same page behind a tracking URL and a misleading title
+        results[1].update(url='https://amazon.com/iphone16pro?utm_source=feed',
+                          html_file='mocks/html/amazon_iphone16pro.html')
+        self.config['modules']['search_agent']['prefilter'] = {'audit_every': 1}
+        orchestrator = Orchestrator(self.config)
+        orchestrator.scraper = CountingScraper(orchestrator.scraper)
+        orchestrator.run(self.user_input)
+        assert orchestrator.scraper.urls == ['https://amazon.com/iphone16pro']
+        stats = orchestrator.relevance_filter.stats()
+        assert stats['audited'] == 1 and stats['audit_fetches'] == 0 and stats['fetches_avoided'] == 1
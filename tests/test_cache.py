@@ -108,6 +108,18 @@ class TestMockCache(unittest.TestCase):
         self.assertFalse(self.cache.exists("key2"))
         self.assertTrue(self.cache.exists("key3"))
 
+    def test_max_entries(self):
+        """Test that a bounded cache evicts the oldest entries."""
+        cache = MockCache(max_entries=2)
+        cache.set("key1", "value1")
+        cache.set("key2", "value2")
+        cache.set("key1", "value1b")
+        cache.set("key3", "value3")
+        self.assertIsNone(cache.get("key2"))
+        self.assertEqual(cache.get("key1"), "value1b")
+        self.assertEqual(cache.get("key3"), "value3")
+        self.assertEqual(len(cache.expiry_times), 2)
+
 
 class TestRedisCache(unittest.TestCase):
     """Test cases for RedisCache implementation."""
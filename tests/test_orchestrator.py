@@ -156,6 +156,29 @@ class TestOrchestratorPipeline(unittest.TestCase):
             print(f"❌ Pipeline failed with empty query: {e}")
             # This might be expected behavior depending on implementation
     
+    def test_paged_results(self):
+        """Test that following next_cursor walks the full ranking in order."""
+        print("\n📄 Testing Paged Results")
+        print("=" * 25)
+        
+        full_results = self.orchestrator.run(self.user_input)
+        
+        paged_results = []
+        cursor = None
+        while True:
+            page = self.orchestrator.run_page(self.user_input, limit=1, cursor=cursor)
+            self.assertLessEqual(len(page['results']), 1)
+            paged_results.extend(page['results'])
+            cursor = page['next_cursor']
+            if cursor is None:
+                break
+        
+        self.assertEqual(paged_results, full_results)
+        self.assertEqual(self.orchestrator.run(self.user_input, limit=2), full_results[:2])
+        with self.assertRaises(ValueError):
+            self.orchestrator.run_page(self.user_input, limit=1, cursor="not-a-cursor")
+        print(f"✅ Paged through {len(paged_results)} products")
+    
     def _validate_output_structure(self, results):
         """Validate that output has correct structure."""
         print("🔍 Validating output structure...")
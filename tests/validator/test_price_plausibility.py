@@ -0,0 +1,135 @@
+"""
+Tests for FX conversion and the per-product price plausibility check.
+"""
+
+import sys
+import os
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.extractor.fx import FxTable
+from src.validator.plausibility import PricePlausibility, group_medians
+from src.validator.real_validator import RealValidator
+
+
+QUERY = {"brand": "Apple", "model": "iPhone 16 Pro", "storage": "128GB", "category": "Smartphone"}
+
+
+def listing(price, currency="USD", canonical_id=None, name="Apple iPhone 16 Pro 128GB"):
+    product = {"productName": name, "price": price, "currency": currency}
+    if canonical_id:
+        product["canonical_id"] = canonical_id
+    return product
+
+
+class TestFxTable:
+    """Test class for FxTable."""
+
+    def test_convert(self):
+        """Amounts convert through the base currency; unknown currencies give None/NaN."""
+        fx = FxTable({'USD': 1.0, 'INR': 80.0, 'EUR': 0.8})
+        assert fx.convert(8000, 'INR') == pytest.approx(100.0)
+        assert fx.convert(100, 'EUR', target='INR') == pytest.approx(10000.0)
+        assert fx.convert(1, 'XYZ') is None
+        converted = fx.to_base(np.array([8000.0, 80.0, 5.0, np.nan]), ['INR', 'EUR', 'XYZ', 'USD'])
+        assert converted[:2].tolist() == pytest.approx([100.0, 100.0])
+        assert np.isnan(converted[2]) and np.isnan(converted[3])
+
+    def test_save_and_load(self, tmp_path):
+        """A saved table is the local cache the config path loads."""
+        path = str(tmp_path / "fx_rates.json")
+        FxTable({'USD': 1.0, 'GBP': 0.5}, as_of='2024-01-01').save(path)
+        loaded = FxTable.from_config({'path': path, 'rates': {'USD': 1.0}})
+        assert loaded.rate('GBP') == 0.5 and loaded.as_of == '2024-01-01'
+        assert FxTable.from_config({'path': str(tmp_path / "missing.json")}).rate('INR') is not None
+
+    def test_invalid_rates(self):
+        """Rates must be positive and the base must be 1."""
+        with pytest.raises(ValueError):
+            FxTable({'USD': 1.0, 'INR': 0})
+        with pytest.raises(ValueError):
+            FxTable({'USD': 2.0})
+
+
+class TestPricePlausibility:
+    """Test class for PricePlausibility."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.checker = PricePlausibility()
+
+    def test_group_medians(self):
+        """Medians per group in one sort, even and odd sizes, empty groups NaN."""
+        medians, sizes = group_medians(np.array([3.0, 1.0, 10.0, 2.0, 20.0]), np.array([0, 0, 1, 0, 1]), 3)
+        assert medians[:2].tolist() == [2.0, 15.0]
+        assert np.isnan(medians[2])
+        assert sizes.tolist() == [3, 2, 0]
+
+    def test_currency_aware_band(self):
+        """INR prices are judged in the common currency, not against USD numbers."""
+        result = self.checker.assess([listing("89999", "INR"), listing("999"), listing("₹89,999", currency=None)],
+                                     category="Smartphone")
+        assert result.in_band.tolist() == [True, True, True]
+        assert result.currency == ['INR', 'USD', 'INR']
+
+    def test_accessory_outlier(self):
+        """A case listed at 1% of the product price is flagged; the real listings are not."""
+        products = [listing(p, canonical_id="cp_iphone") for p in ("999", "1019", "979", "1049")]
+        products.append(listing("12", canonical_id="cp_iphone", name="Apple iPhone 16 Pro 128GB Case"))
+        result = self.checker.assess(products, category="Smartphone")
+        assert result.outlier.tolist() == [False, False, False, False, True]
+        assert result.median[0] == pytest.approx(999.0)
+
+    def test_groups_by_canonical_product(self):
+        """Each canonical product gets its own median."""
+        products = ([listing(p, canonical_id="cp_pro") for p in ("999", "1019", "989")] +
+                    [listing(p, canonical_id="cp_se") for p in ("429", "419", "439")])
+        result = self.checker.assess(products, category="Smartphone")
+        assert not result.outlier.any()
+        assert result.median.tolist() == [999.0] * 3 + [429.0] * 3
+
+    def test_cached_stats_per_category_and_country(self):
+        """Statistics of a well-sampled product are reused for a lone later listing."""
+        products = [listing(p, canonical_id="cp_pro") for p in ("999", "1019", "989")]
+        self.checker.assess(products, category="Smartphone", country="US")
+        lone = self.checker.assess([listing("15", canonical_id="cp_pro")], category="Smartphone", country="US")
+        assert lone.outlier.tolist() == [True]
+        other_country = self.checker.assess([listing("15", canonical_id="cp_pro")], category="Smartphone", country="UK")
+        assert other_country.outlier.tolist() == [False]
+        assert self.checker.cache_info() == {'bands': 2, 'products': 1}
+
+    def test_small_groups_not_judged(self):
+        """Without enough listings (and nothing cached), only the band applies."""
+        result = self.checker.assess([listing("999"), listing("15")], category="Smartphone")
+        assert not result.outlier.any()
+        assert result.in_band.tolist() == [True, False]
+
+    def test_country_band_override(self):
+        """Bands can be overridden per country and are resolved once."""
+        checker = PricePlausibility(country_price_ranges={'IN': {'smartphone': [100, 3000]}})
+        assert checker.band("Smartphone", "IN") == (100.0, 3000.0)
+        assert checker.band("Smartphone", "US") == (200.0, 2000.0)
+        assert checker.band("Unknown") == (0.0, float('inf'))
+
+
+class TestPriceStage:
+    """Test class for the price stage of RealValidator."""
+
+    def test_price_stage_in_cascade(self):
+        """INR listings pass; an accessory-priced listing of the same product is rejected as an outlier."""
+        validator = RealValidator()
+        products = [listing(p, "INR", canonical_id="cp_pro") for p in ("89999", "91999", "88999", "90999")]
+        products.append(listing("899", "INR", canonical_id="cp_pro"))
+        results = validator._validate_price_batch(QUERY, products)
+        assert [r.is_valid for r in results] == [True, True, True, True, False]
+        assert results[4].validation_details['outlier']
+        assert results[0].validation_details['base_price'] == pytest.approx(89999 / 83.0, abs=0.01)
+
+    def test_unknown_currency(self):
+        """A currency without an FX rate gets no opinion rather than a reject."""
+        validator = RealValidator({'fx': {'rates': {'USD': 1.0}}})
+        result = validator._validate_price_range(QUERY, listing("89999", "INR"))
+        assert result.is_valid and result.confidence_score == 0.5
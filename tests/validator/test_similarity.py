@@ -0,0 +1,91 @@
+"""
+Tests for the hashed character n-gram similarity engine.
+"""
+
+import sys
+import os
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.validator.similarity import NgramSimilarity, query_text
+from src.validator.real_validator import RealValidator
+
+
+QUERY = "Apple iPhone 16 Pro 128GB"
+NAMES = [
+    "Apple iPhone 16 Pro 128GB - Silver",
+    "Samsung Galaxy S24 Ultra",
+    "APPLE IPHONE 16 PRO 128GB",
+    "",
+    "Apple iPhone 16 Pro 128GB - Silver",
+]
+
+
+class TestNgramSimilarity:
+    """Test class for NgramSimilarity."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.engine = NgramSimilarity()
+
+    def test_scores(self):
+        """Similar names score high, unrelated and empty names score 0, repeats score alike."""
+        scores = self.engine.scores(QUERY, NAMES)
+        assert scores.dtype == np.float32
+        assert scores[0] > 0.7
+        assert scores[1] == 0.0
+        assert scores[2] == pytest.approx(1.0, abs=1e-6)
+        assert scores[3] == 0.0
+        assert scores[4] == scores[0]
+
+    def test_batch_matches_single(self):
+        """The batch product gives the same cosine as scoring names one by one without IDF."""
+        engine = NgramSimilarity(use_idf=False)
+        batch = engine.scores(QUERY, NAMES)
+        single = [engine.score(QUERY, name) for name in NAMES]
+        assert np.allclose(batch, single)
+
+    def test_vector_cache(self):
+        """Each distinct name is vectorized once; the cache is bounded."""
+        self.engine.scores(QUERY, NAMES)
+        assert self.engine.cache_info()['misses'] == 4 + 1
+        self.engine.scores(QUERY, NAMES)
+        assert self.engine.cache_info()['hits'] == 4 + 1
+
+        small = NgramSimilarity(cache_size=2)
+        small.scores(QUERY, NAMES)
+        assert small.cache_info()['size'] == 2
+
+    def test_fitted_idf(self):
+        """A fitted corpus down-weights n-grams every name shares."""
+        corpus = [f"Apple iPhone 16 Pro {size}" for size in ("128GB", "256GB", "512GB", "1TB")]
+        fitted = NgramSimilarity().fit(corpus)
+        plain = NgramSimilarity(use_idf=False)
+        names = ["Apple iPhone 16 Pro 256GB"]
+        assert fitted.scores(QUERY, names)[0] < plain.scores(QUERY, names)[0]
+
+    def test_empty_inputs(self):
+        """Empty batches and empty queries are handled."""
+        assert self.engine.scores(QUERY, []).shape == (0,)
+        assert self.engine.scores("", NAMES).tolist() == [0.0] * len(NAMES)
+        with pytest.raises(ValueError):
+            NgramSimilarity(ngram_sizes=())
+
+    def test_query_text(self):
+        """Query text joins the non-empty brand, model and storage."""
+        assert query_text({"brand": "Apple", "model": "iPhone 16 Pro", "storage": None}) == "Apple iPhone 16 Pro"
+
+
+class TestSemanticStage:
+    """Test class for the semantic stage of RealValidator."""
+
+    def test_semantic_stage_batches(self):
+        """The semantic stage scores every undecided product in one call."""
+        validator = RealValidator({'modules': {'validator': {'semantic': {'threshold': 0.6}}}})
+        query = {"brand": "Apple", "model": "iPhone 16 Pro", "storage": "128GB", "category": "Smartphone"}
+        results = validator._validate_semantic_batch(query, [{"productName": name} for name in NAMES])
+        assert [r.is_valid for r in results] == [True, False, True, False, True]
+        assert results[0].validation_details['similarity_score'] == results[0].confidence_score
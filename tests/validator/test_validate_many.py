@@ -0,0 +1,90 @@
+"""
+Tests for Validator.validate_many and the precompiled QueryMatcher.
+"""
+
+import sys
+import os
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.models.product_batch import ProductBatch
+from src.validator.interface import Validator
+from src.validator.matcher import QueryMatcher
+
+
+QUERY = {"brand": "Apple", "model": "iPhone 16 Pro", "storage": "128GB", "category": "Smartphone"}
+
+PRODUCTS = [
+    {"productName": "Apple iPhone 16 Pro 128GB", "price": "999", "currency": "USD"},
+    {"productName": "Apple iPhone 16 Pro 256GB", "price": "1099", "currency": "USD"},
+    {"productName": "APPLE IPHONE 16 PRO 128GB", "price": "0", "currency": "USD"},
+    {"productName": "Apple iPhone 16 Pro 128GB (fixture says no)", "price": "949", "currency": "USD"},
+    {"productName": "Apple iPhone 16 Pro 128GB", "price": "call us", "currency": "USD"},
+]
+
+CONFIG = {'modules': {'validator': {'use_mock': True, 'mock_validations': [
+    {'query': QUERY, 'product': PRODUCTS[3], 'is_valid': False},
+    {'query': QUERY, 'product': PRODUCTS[1], 'is_valid': True},
+    {'query': QUERY, 'product': PRODUCTS[1], 'is_valid': False},
+]}}}
+
+
+class TestQueryMatcher:
+    """Test class for QueryMatcher."""
+
+    def test_terms_compiled_once(self):
+        """Empty and missing fields are dropped; terms are lowercased."""
+        matcher = QueryMatcher({"brand": "Apple", "model": None, "storage": "", "category": "Smartphone"})
+        assert matcher.terms == ("apple",)
+
+    def test_matches(self):
+        """Every term must be in the name and the price must be positive."""
+        matcher = QueryMatcher(QUERY)
+        assert [matcher.matches(p) for p in PRODUCTS] == [True, False, False, True, False]
+        assert not matcher.matches({"price": "10"})
+
+    def test_negative_price_rejected(self):
+        """A negative price is not a positive one, in either form."""
+        matcher = QueryMatcher(QUERY)
+        negative = {"productName": "Apple iPhone 16 Pro 128GB", "price": "-999", "currency": "USD"}
+        assert not matcher.matches(negative)
+        assert not Validator(CONFIG).validate(QUERY, negative)
+        assert matcher.mask(ProductBatch.from_products([negative])).tolist() == [False]
+
+    def test_mask_agrees(self):
+        """The columnar mask gives the same answers as matches()."""
+        matcher = QueryMatcher(QUERY)
+        mask = matcher.mask(ProductBatch.from_products(PRODUCTS))
+        assert mask.tolist() == [matcher.matches(p) for p in PRODUCTS]
+
+
+class TestValidateMany:
+    """Test class for Validator.validate_many."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.validator = Validator(CONFIG)
+
+    def test_fixture_cases_override_matcher(self):
+        """Indexed fixture cases win over partial matching; the first duplicate case wins."""
+        assert self.validator.validate_many(QUERY, PRODUCTS) == [True, True, False, False, False]
+
+    def test_same_as_validate(self):
+        """validate_many and validate_batch agree with validate."""
+        expected = [self.validator.validate(QUERY, p) for p in PRODUCTS]
+        assert self.validator.validate_many(QUERY, PRODUCTS) == expected
+        assert self.validator.validate_batch(QUERY, ProductBatch.from_products(PRODUCTS)).tolist() == expected
+
+    def test_other_query_skips_fixtures(self):
+        """A query without fixture cases only uses the matcher."""
+        other = dict(QUERY, storage="256GB")
+        assert self.validator.validate_many(other, PRODUCTS) == [False, True, False, False, False]
+        assert self.validator.validate_many(other, []) == []
+
+    def test_real_mode(self):
+        """Real validation is not implemented in the facade."""
+        validator = Validator({'modules': {'validator': {'use_mock': False}}})
+        with pytest.raises(NotImplementedError):
+            validator.validate_many(QUERY, PRODUCTS)
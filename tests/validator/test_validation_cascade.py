@@ -0,0 +1,126 @@
+"""
+Tests for the cost-ordered validation cascade in RealValidator.
+"""
+
+import sys
+import os
+import copy
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.config.loader import load_config
+from src.validator.real_validator import RealValidator, ValidationMethod
+
+
+QUERY = {"brand": "Apple", "model": "iPhone 16 Pro", "storage": "128GB", "category": "Smartphone"}
+
+MATCH = {"productName": "Apple iPhone 16 Pro 128GB - Silver", "price": "999", "currency": "USD"}
+WRONG_BRAND = {"productName": "Samsung Galaxy S24", "price": "799", "currency": "USD"}
+WRONG_STORAGE = {"productName": "Apple iPhone 16 Pro 256GB", "price": "1099", "currency": "USD"}
+WRONG_MODEL = {"productName": "Apple iPhone 15 Pro 128GB", "price": "899", "currency": "USD"}
+TOO_CHEAP = {"productName": "Apple iPhone 16 Pro 128GB", "price": "5", "currency": "USD"}
+
+
+def validator_config(**sections):
+    """Pipeline config with the given `modules.validator` sections."""
+    return {'modules': {'validator': sections}}
+
+
+class TestValidationCascade:
+    """Test class for the RealValidator cascade."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.validator = RealValidator()
+
+    def test_default_order_by_cost_per_rejection(self):
+        """Cheap, selective stages come before embeddings and the LLM."""
+        assert self.validator.stage_order == ['brand_model', 'price_range', 'semantic_similarity', 'llm']
+
+    def test_early_reject_skips_expensive_stages(self):
+        """A plain brand mismatch is rejected without running later stages."""
+        result = self.validator.validate_product(QUERY, WRONG_BRAND)
+        assert not result.is_valid
+        assert result.validation_method == ValidationMethod.BRAND_MODEL_RECOGNITION
+        assert result.validation_details['exit'] == 'reject'
+        assert result.validation_details['stages_run'] == ['brand_model_recognition']
+
+    def test_wrong_storage_and_model_rejected(self):
+        """A partial brand/model match (other storage, other model) is a definite reject."""
+        for product in (WRONG_STORAGE, WRONG_MODEL):
+            result = self.validator.validate_product(QUERY, product)
+            assert result.is_valid is False
+            assert result.validation_details['exit'] == 'reject'
+            assert result.validation_method == ValidationMethod.BRAND_MODEL_RECOGNITION
+
+    def test_completion_needs_every_stage(self):
+        """Run to the end, a product that failed any stage is still rejected."""
+        validator = RealValidator(validator_config(cascade={'stages': {
+            'brand_model': {'reject_on_fail': False, 'reject_below': None},
+            'price_range': {'accept_above': None}}}))
+        result = validator.validate_product(QUERY, WRONG_STORAGE)
+        assert result.validation_details['exit'] == 'complete'
+        assert result.is_valid is False
+
+    def test_confident_accept(self):
+        """Brand/model and price both passing accept the product early."""
+        result = self.validator.validate_product(QUERY, MATCH)
+        assert result.is_valid
+        assert result.validation_details['exit'] == 'accept'
+        assert result.confidence_score == pytest.approx((0.9 * 0.3 + 0.8 * 0.2) / 0.5)
+
+    def test_stats(self):
+        """Run counts show how often each stage ran and how it ended the cascade."""
+        results = self.validator.validate_products(QUERY, [MATCH, WRONG_BRAND, WRONG_STORAGE, TOO_CHEAP])
+        assert [r.validation_details['exit'] for r in results] == ['accept', 'reject', 'reject', 'reject']
+        assert [r.is_valid for r in results] == [True, False, False, False]
+
+        stats = self.validator.cascade_stats()
+        assert stats['products'] == 4
+        assert stats['runs'] == {'brand_model': 4, 'price_range': 2, 'semantic_similarity': 0, 'llm': 0}
+        assert stats['early_rejects']['brand_model'] == 2
+        assert stats['early_rejects']['price_range'] == 1
+        assert stats['early_accepts']['price_range'] == 1
+        assert stats['completed'] == 0
+        assert stats['run_rate']['llm'] == 0.0
+
+        self.validator.reset_stats()
+        assert self.validator.cascade_stats()['products'] == 0
+
+    def test_config_thresholds_and_order(self):
+        """Thresholds and order come from the `cascade` config section."""
+        validator = RealValidator(validator_config(cascade={
+            'order': ['price_range', 'brand_model', 'semantic_similarity', 'llm'],
+            'stages': {'price_range': {'accept_above': None}},
+        }))
+        result = validator.validate_product(QUERY, MATCH)
+        assert result.validation_details['stages_run'][:2] == ['price_validation', 'brand_model_recognition']
+        # Without the price accept, nothing settles the product before the LLM
+        assert result.validation_details['exit'] == 'complete'
+        assert result.is_valid
+        assert validator.cascade_stats()['runs']['llm'] == 1
+
+    def test_unknown_stage(self):
+        """Unknown stages in config are rejected."""
+        with pytest.raises(ValueError):
+            RealValidator(validator_config(cascade={'stages': {'vision': {'cost': 5}}}))
+        with pytest.raises(ValueError):
+            RealValidator(validator_config(cascade={'order': ['brand_model', 'vision']}))
+
+    def test_reads_pipeline_config_layout(self):
+        """Validator sections come from modules.validator, llm and fx from the top level."""
+        config = copy.deepcopy(load_config("config/phase1_config.yaml"))
+        settings = config['modules']['validator']
+        settings['cascade']['accept_score'] = 0.7
+        settings['semantic']['threshold'] = 0.55
+        settings['price_plausibility']['z_threshold'] = 4.0
+        config['fx'] = {'base': 'USD', 'rates': {'USD': 1.0, 'EUR': 0.5}}
+        config['llm'] = dict(config['llm'], enabled=True)
+        validator = RealValidator(config)
+        assert validator.accept_score == 0.7
+        assert validator.semantic_threshold == 0.55
+        assert validator.price_plausibility.z_threshold == 4.0
+        assert validator.price_plausibility.fx is validator.fx and validator.fx.rate('EUR') == 0.5
+        assert validator.llm_client is not None